@@ -0,0 +1,344 @@
+"""
+렌더 파이프라인 벤치마크 (오프라인, 재현 가능)
+
+합성 프로젝트를 만들어 네트워크 없이 주요 렌더링 경로의 시간을 잰다.
+- 씬 이미지: __tests__/test_data/create_test_images.py
+- 나레이션: TTS 대신 사인파 오디오 (나레이션 길이에 비례, 단어 타임스탬프는 균등 분배)
+- 자막: --subtitles로 선택
+
+측정 대상:
+- create_all_videos: VideoFromFolderCreator.create_all_videos (씬 렌더링 + 마스터링 병합)
+- combine_videos: VideoFromFolderCreator._combine_videos
+- concatenate_videos: video_merge.concatenate_videos
+- remove_watermark: chinese_video_converter.remove_watermark_ai (하단 자막 띠가 있는 합성 영상)
+
+결과는 JSON으로 저장한다. 처리량 = 출력 영상 길이(초) / CPU 시간(초, 자식 ffmpeg 포함).
+--compare로 이전 결과와 비교하면 처리량이 허용치보다 떨어진 항목이 있을 때 종료 코드 1.
+
+사용법:
+    python -m __tests__.benchmark.bench_render --scenes 4 --seconds 3 --output bench.json
+    python -m __tests__.benchmark.bench_render --compare baseline.json --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import resource  # 자식 프로세스 CPU 포함 (Windows에는 없음)
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+RESULT_SCHEMA = 1
+BENCHMARKS = ('create_all_videos', 'combine_videos', 'concatenate_videos', 'remove_watermark')
+# 사인파 나레이션 길이 계산 (한국어 나레이션 평균 속도)
+CHARS_PER_SECOND = 7.0
+SCENE_COLORS = [(100, 150, 200), (200, 100, 150), (150, 200, 100), (200, 150, 100),
+                (90, 90, 160), (160, 90, 90), (90, 160, 90), (120, 120, 120)]
+NARRATION_WORDS = ['오늘은', '조용한', '마을에서', '시작된', '이야기를', '들려드릴게요',
+                   '그날', '아침', '하늘은', '유난히', '맑았습니다']
+
+
+def cpu_seconds() -> float:
+    """이 프로세스 + 종료된 자식 프로세스(ffmpeg 등)의 CPU 시간"""
+    if resource is None:
+        return time.process_time()
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def measure(fn: Callable[[], Optional[Path]]) -> Dict:
+    """한 번 실행해서 벽시계 / CPU 시간과 출력 영상 길이 측정"""
+    wall_started, cpu_started = time.perf_counter(), cpu_seconds()
+    output = fn()
+    wall = time.perf_counter() - wall_started
+    cpu = cpu_seconds() - cpu_started
+    if not output or not Path(output).exists():
+        raise RuntimeError(f"출력 영상이 없습니다: {output}")
+    video_seconds = probe_duration(Path(output))
+    return {
+        'wall': round(wall, 3),
+        'cpu': round(cpu, 3),
+        'video_seconds': round(video_seconds, 3),
+        'throughput': round(video_seconds / cpu, 4) if cpu > 0 else None,
+    }
+
+
+def probe_duration(path: Path) -> float:
+    from src.utils.ffmpeg_utils import get_video_duration
+    return float(get_video_duration(path))
+
+
+def _ffmpeg() -> str:
+    from src.utils.ffmpeg_utils import get_ffmpeg_path
+    ffmpeg = get_ffmpeg_path()
+    if not ffmpeg:
+        raise RuntimeError("FFmpeg not found.")
+    return ffmpeg
+
+
+def narration_for(scene_num: int, seconds: float) -> str:
+    """사인파 길이가 seconds가 되도록 글자 수를 맞춘 결정적 나레이션"""
+    words = []
+    i = scene_num
+    while len(' '.join(words)) < seconds * CHARS_PER_SECOND:
+        words.append(NARRATION_WORDS[i % len(NARRATION_WORDS)])
+        i += 1
+    return ' '.join(words)
+
+
+def make_synthetic_project(folder: Path, scenes: int, seconds: float) -> Path:
+    """story.json + scene_XX_image.jpg 합성 프로젝트"""
+    from __tests__.test_data.create_test_images import create_test_image
+
+    folder.mkdir(parents=True, exist_ok=True)
+    story = {'title': 'benchmark', 'scenes': []}
+    for n in range(1, scenes + 1):
+        create_test_image(str(folder / f"scene_{n:02d}_image.jpg"), f"Scene {n}",
+                          SCENE_COLORS[(n - 1) % len(SCENE_COLORS)], size=(1024, 1024))
+        story['scenes'].append({'scene_number': n, 'narration': narration_for(n, seconds)})
+    (folder / 'story.json').write_text(json.dumps(story, ensure_ascii=False, indent=2), encoding='utf-8')
+    return folder
+
+
+def make_synthetic_clips(folder: Path, count: int, seconds: float, subtitle_band: bool = False) -> List[Path]:
+    """테스트 패턴 + 사인파 오디오 클립 (subtitle_band면 하단에 자막처럼 흰 띠)"""
+    folder.mkdir(parents=True, exist_ok=True)
+    clips = []
+    for n in range(1, count + 1):
+        clip = folder / f"clip_{n:02d}.mp4"
+        video_filter = 'drawbox=x=iw*0.1:y=ih-110:w=iw*0.8:h=50:color=white@0.9:t=fill' if subtitle_band else 'null'
+        subprocess.run([
+            _ffmpeg(), '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', f"testsrc2=size=1280x720:rate=25:duration={seconds}",
+            '-f', 'lavfi', '-i', f"sine=frequency={220 * n}:sample_rate=44100:duration={seconds}",
+            '-vf', video_filter, '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac', '-shortest', str(clip),
+        ], check=True)
+        clips.append(clip)
+    return clips
+
+
+def _sine_tone_creator_class():
+    """TTS 대신 사인파를 쓰는 VideoFromFolderCreator (네트워크 없음)"""
+    from src.video_generator.create_video_from_folder import VideoFromFolderCreator
+
+    class SineToneCreator(VideoFromFolderCreator):
+        def _create_thumbnail(self):
+            pass
+
+        async def _generate_tts(self, text: str, output_path: Path) -> tuple:
+            clean = self._clean_narration(text)
+            duration = round(max(1.0, len(clean) / CHARS_PER_SECOND), 2)
+            await asyncio.to_thread(subprocess.run, [
+                _ffmpeg(), '-y', '-loglevel', 'error',
+                '-f', 'lavfi', '-i', f"sine=frequency=330:sample_rate=24000:duration={duration}",
+                '-c:a', 'libmp3lame', '-b:a', '48k', str(output_path),
+            ], check=True)
+            words = clean.split() or [clean]
+            step = duration / len(words)
+            timings = [{'word': w, 'start': round(i * step, 3), 'end': round((i + 1) * step, 3)}
+                       for i, w in enumerate(words)]
+            return duration, timings
+
+    return SineToneCreator
+
+
+def _force_cpu_encoder():
+    """GPU 유무와 상관없이 libx264로 고정 (커밋 간 비교용)"""
+    from src.utils.encoder_session import get_encoder_session, CPU_ENCODER
+    session = get_encoder_session()
+    for encoder in session._list_encoders():
+        if encoder != CPU_ENCODER:
+            session.mark_unhealthy(encoder, 'benchmark: CPU 인코더 고정')
+
+
+class RenderBenchmark:
+    """합성 입력을 한 번 만들고 각 벤치마크를 repeat번 실행 (중앙값 기록)"""
+
+    def __init__(self, workdir: Path, scenes: int = 4, seconds: float = 3.0, subtitles: bool = False,
+                 aspect_ratio: str = '9:16', repeat: int = 1):
+        self.workdir = Path(workdir)
+        self.scenes = scenes
+        self.seconds = seconds
+        self.subtitles = subtitles
+        self.aspect_ratio = aspect_ratio
+        self.repeat = max(1, repeat)
+
+    def params(self) -> Dict:
+        return {'scenes': self.scenes, 'seconds': self.seconds, 'subtitles': self.subtitles,
+                'aspect_ratio': self.aspect_ratio, 'repeat': self.repeat}
+
+    def _creator(self, folder: Path):
+        creator_class = _sine_tone_creator_class()
+        return creator_class(str(folder), aspect_ratio=self.aspect_ratio, add_subtitles=self.subtitles,
+                             resume=False, profile=None)
+
+    # 벤치마크 본체: 출력 영상 경로 반환
+    def bench_create_all_videos(self, run: int) -> Callable[[], Optional[Path]]:
+        folder = make_synthetic_project(self.workdir / f"project_{run}", self.scenes, self.seconds)
+        creator = self._creator(folder)
+        return lambda: asyncio.run(creator.create_all_videos(combine=True))
+
+    def bench_combine_videos(self, run: int) -> Callable[[], Optional[Path]]:
+        clips = make_synthetic_clips(self.workdir / 'clips', self.scenes, self.seconds)
+        folder = make_synthetic_project(self.workdir / f"combine_{run}", 1, self.seconds)
+        creator = self._creator(folder)
+        output = self.workdir / f"combined_{run}.mp4"
+        return lambda: creator._combine_videos(clips, output, time.time())
+
+    def bench_concatenate_videos(self, run: int) -> Callable[[], Optional[Path]]:
+        from src.video_generator.video_merge import concatenate_videos
+        clips = make_synthetic_clips(self.workdir / 'clips', self.scenes, self.seconds)
+        output = self.workdir / f"concatenated_{run}.mp4"
+        return lambda: concatenate_videos(clips, output)
+
+    def bench_remove_watermark(self, run: int) -> Callable[[], Optional[Path]]:
+        from src.video_generator.chinese_video_converter import remove_watermark_ai
+        clip = make_synthetic_clips(self.workdir / 'subtitled', 1, self.seconds * self.scenes,
+                                    subtitle_band=True)[0]
+        output = self.workdir / f"no_watermark_{run}.mp4"
+        return lambda: output if remove_watermark_ai(clip, output, quality_mode='fast') else None
+
+    def run(self, names: List[str]) -> Dict[str, Dict]:
+        results = {}
+        for name in names:
+            runs = []
+            try:
+                for run in range(self.repeat):
+                    fn = getattr(self, f"bench_{name}")(run)
+                    runs.append(measure(fn))
+            except Exception as e:
+                logger.error(f"❌ {name} 실패: {e}")
+                results[name] = {'status': 'error', 'error': f"{type(e).__name__}: {e}"[:300]}
+                continue
+
+            results[name] = {
+                'status': 'ok',
+                'runs': runs,
+                **{key: statistics.median(r[key] for r in runs) for key in ('wall', 'cpu', 'video_seconds')},
+            }
+            cpu = results[name]['cpu']
+            results[name]['throughput'] = round(results[name]['video_seconds'] / cpu, 4) if cpu > 0 else None
+            logger.info(f"⏱️ {name}: {results[name]['wall']:.2f}초, CPU {cpu:.2f}초, "
+                        f"처리량 {results[name]['throughput']} (영상 초 / CPU 초)")
+        return results
+
+
+def host_info() -> Dict:
+    info = {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()}
+    try:
+        version = subprocess.run([_ffmpeg(), '-version'], capture_output=True, text=True, timeout=10)
+        info['ffmpeg'] = version.stdout.splitlines()[0] if version.stdout else None
+    except Exception:
+        info['ffmpeg'] = None
+    return info
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=project_root,
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float = 0.1) -> List[str]:
+    """
+    처리량이 baseline 대비 tolerance 비율 넘게 떨어진 벤치마크 목록
+
+    파라미터(씬 수, 길이 등)가 다르면 비교하지 않는다.
+    """
+    if baseline.get('params') != current.get('params'):
+        logger.warning("⚠️ 벤치마크 파라미터가 달라 비교하지 않습니다")
+        return []
+    regressions = []
+    for name, result in current.get('results', {}).items():
+        before = baseline.get('results', {}).get(name, {})
+        if result.get('status') != 'ok' or before.get('status') != 'ok':
+            continue
+        if not before.get('throughput') or not result.get('throughput'):
+            continue
+        ratio = result['throughput'] / before['throughput']
+        logger.info(f"   {name}: 처리량 {before['throughput']} → {result['throughput']} ({ratio - 1:+.1%})")
+        if ratio < 1 - tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="렌더 파이프라인 벤치마크 (오프라인)")
+    parser.add_argument("--scenes", type=int, default=4, help="씬 개수 (기본: 4)")
+    parser.add_argument("--seconds", type=float, default=3.0, help="씬당 나레이션 길이 초 (기본: 3)")
+    parser.add_argument("--subtitles", action="store_true", help="자막 포함")
+    parser.add_argument("--aspect-ratio", default="9:16", choices=["9:16", "16:9"])
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수 (중앙값 기록)")
+    parser.add_argument("--only", default=",".join(BENCHMARKS),
+                        help=f"실행할 벤치마크 (쉼표 구분, 기본: 전체 {','.join(BENCHMARKS)})")
+    parser.add_argument("--allow-gpu", action="store_true", help="GPU 인코더 허용 (기본: libx264 고정)")
+    parser.add_argument("--workdir", default=None, help="작업 폴더 (기본: 임시 폴더, 끝나면 삭제)")
+    parser.add_argument("--output", "-o", default="benchmark_results.json", help="결과 JSON 경로")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="허용 처리량 감소 비율 (기본: 0.1)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    names = [n.strip() for n in args.only.split(',') if n.strip()]
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"알 수 없는 벤치마크: {', '.join(sorted(unknown))}")
+
+    # 다른 작업의 자원 리스 / 취소 파일 / 프로파일링 설정에 영향받지 않도록 격리
+    os.environ['RESOURCE_BROKER'] = '0'
+    os.environ.pop('PIPELINE_PROFILE', None)
+    if not args.allow_gpu:
+        _force_cpu_encoder()
+
+    with tempfile.TemporaryDirectory(prefix='render-bench-') as tmp:
+        bench = RenderBenchmark(Path(args.workdir or tmp), scenes=args.scenes, seconds=args.seconds,
+                                subtitles=args.subtitles, aspect_ratio=args.aspect_ratio, repeat=args.repeat)
+        results = bench.run(names)
+
+    data = {
+        'schema': RESULT_SCHEMA,
+        'commit': git_commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'host': host_info(),
+        'params': {**bench.params(), 'cpu_encoder_only': not args.allow_gpu},
+        'results': results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+    logger.info(f"📄 결과 저장: {output}")
+
+    status = 0 if all(r.get('status') == 'ok' for r in results.values()) else 1
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare(baseline, data, args.tolerance)
+        if regressions:
+            logger.error(f"❌ 처리량 저하: {', '.join(regressions)}")
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
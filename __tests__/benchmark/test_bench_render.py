@@ -0,0 +1,73 @@
+"""
+렌더 벤치마크 하네스 테스트
+
+테스트 범위:
+- CPU 측정에 자식 프로세스(ffmpeg) 시간 포함
+- 이전 결과 대비 처리량 저하 판정 (파라미터가 다르면 비교 안 함)
+- 합성 프로젝트 생성 (story.json + 씬 이미지)
+- ffmpeg가 있으면 1씬 스모크 실행 → 결과 JSON
+"""
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from __tests__.benchmark import bench_render
+from __tests__.benchmark.bench_render import compare, cpu_seconds, narration_for
+
+
+def result(throughput, status='ok', **params):
+    return {
+        'params': {'scenes': 4, 'seconds': 3.0, **params},
+        'results': {'create_all_videos': {'status': status, 'throughput': throughput}},
+    }
+
+
+class TestMeasurement:
+    def test_cpu_includes_child_processes(self):
+        before = cpu_seconds()
+        subprocess.run([sys.executable, '-c', 'sum(i * i for i in range(3_000_000))'], check=True)
+        assert cpu_seconds() - before > 0.05
+
+    def test_narration_length_tracks_seconds(self):
+        short, long = narration_for(1, 2), narration_for(1, 8)
+        assert len(long) > len(short) * 3
+        assert narration_for(3, 5) == narration_for(3, 5)
+
+
+class TestCompare:
+    def test_regression_detected(self):
+        assert compare(result(2.0), result(1.7), tolerance=0.1) == ['create_all_videos']
+        assert compare(result(2.0), result(1.9), tolerance=0.1) == []
+
+    def test_different_params_or_failures_skipped(self):
+        assert compare(result(2.0), result(1.0, scenes=8)) == []
+        assert compare(result(2.0, status='error'), result(1.0)) == []
+
+
+class TestSyntheticProject:
+    def test_project_layout(self, tmp_path):
+        pytest.importorskip('PIL')
+        folder = bench_render.make_synthetic_project(tmp_path / 'project', scenes=3, seconds=2)
+        story = json.loads((folder / 'story.json').read_text(encoding='utf-8'))
+        assert [s['scene_number'] for s in story['scenes']] == [1, 2, 3]
+        assert sorted(p.name for p in folder.glob('scene_*_image.jpg')) == [
+            'scene_01_image.jpg', 'scene_02_image.jpg', 'scene_03_image.jpg']
+
+    @pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg 필요')
+    def test_smoke_run_writes_json(self, tmp_path):
+        pytest.importorskip('PIL')
+        output = tmp_path / 'bench.json'
+        bench_render.main(['--scenes', '2', '--seconds', '1', '--only', 'combine_videos',
+                           '--workdir', str(tmp_path / 'work'), '--output', str(output)])
+        data = json.loads(output.read_text(encoding='utf-8'))
+        assert data['schema'] == bench_render.RESULT_SCHEMA
+        assert data['params']['scenes'] == 2
+        assert 'combine_videos' in data['results']
@@ -0,0 +1,171 @@
+"""
+DB 로그 핸들러 테스트 (contents_logs)
+
+테스트 범위:
+- 백그라운드 writer의 배치 저장 + close() 시 전부 flush
+- 여러 스레드에서 동시에 로깅
+- WAL 모드
+- level 컬럼 / (content_id, id) 인덱스 / since_id 증분 조회 (조회는 읽기 전용, 마이그레이션 전 DB도 허용)
+- 끝난 작업 로그 보관 (gzip JSONL)
+"""
+import logging
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.db_log_handler import (
+    DatabaseLogHandler,
+    ensure_log_schema,
+    read_logs,
+    compact_logs,
+    read_archived_logs,
+)
+
+
+def make_logger(handler, name):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger
+
+
+def count_logs(db_path, job_id):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT COUNT(*) FROM contents_logs WHERE content_id = ?', (job_id,)).fetchone()[0]
+
+
+class TestDatabaseLogHandler:
+    def test_close_flushes_all_records(self, tmp_path):
+        db_path = str(tmp_path / 'database.sqlite')
+        handler = DatabaseLogHandler(db_path, 'job-1', batch_size=50, flush_interval=10)
+        logger = make_logger(handler, 'test_db_log_close')
+
+        for i in range(120):
+            logger.info(f"line {i}")
+        handler.close()
+        logger.removeHandler(handler)
+
+        assert count_logs(db_path, 'job-1') == 120
+        with sqlite3.connect(db_path) as conn:
+            rows = [r[0] for r in conn.execute('SELECT log_message FROM contents_logs ORDER BY id')]
+        assert rows[0] == 'line 0' and rows[-1] == 'line 119'
+
+    def test_flush_without_close(self, tmp_path):
+        db_path = str(tmp_path / 'database.sqlite')
+        handler = DatabaseLogHandler(db_path, 'job-2', batch_size=1000, flush_interval=60)
+        logger = make_logger(handler, 'test_db_log_flush')
+
+        logger.info("hello")
+        handler.flush()
+        assert count_logs(db_path, 'job-2') == 1
+
+        handler.close()
+        logger.removeHandler(handler)
+
+    def test_concurrent_threads(self, tmp_path):
+        db_path = str(tmp_path / 'database.sqlite')
+        handler = DatabaseLogHandler(db_path, 'job-3')
+        logger = make_logger(handler, 'test_db_log_threads')
+
+        def worker(n):
+            for i in range(100):
+                logger.info(f"worker {n} line {i}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        handler.close()
+        logger.removeHandler(handler)
+
+        assert count_logs(db_path, 'job-3') == 400
+
+    def test_wal_mode(self, tmp_path):
+        db_path = str(tmp_path / 'database.sqlite')
+        handler = DatabaseLogHandler(db_path, 'job-4')
+        handler.close()
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+class TestLogSchemaAndRetention:
+    def test_level_column_and_since_id(self, tmp_path):
+        db_path = str(tmp_path / 'database.sqlite')
+        handler = DatabaseLogHandler(db_path, 'job-5')
+        logger = make_logger(handler, 'test_db_log_since')
+        logger.info("first")
+        logger.warning("second")
+        logger.error("third")
+        handler.close()
+        logger.removeHandler(handler)
+
+        rows = read_logs(db_path, 'job-5')
+        assert [r['level'] for r in rows] == ['INFO', 'WARNING', 'ERROR']
+
+        newer = read_logs(db_path, 'job-5', since_id=rows[0]['id'])
+        assert [r['log_message'] for r in newer] == ['second', 'third']
+        assert [r['log_message'] for r in read_logs(db_path, 'job-5', levels=['error'])] == ['third']
+
+    def test_index_and_legacy_migration(self, tmp_path):
+        db_path = str(tmp_path / 'database.sqlite')
+        with sqlite3.connect(db_path) as conn:
+            conn.execute('''CREATE TABLE contents_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, content_id TEXT NOT NULL,
+                log_message TEXT NOT NULL, created_at TEXT DEFAULT (datetime('now')))''')
+            conn.execute("INSERT INTO contents_logs (content_id, log_message) VALUES ('old', 'legacy')")
+
+        DatabaseLogHandler(db_path, 'job-6').close()
+
+        with sqlite3.connect(db_path) as conn:
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(contents_logs)')}
+            indexes = {row[1] for row in conn.execute('PRAGMA index_list(contents_logs)')}
+            plan = ' '.join(str(r) for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM contents_logs WHERE content_id = 'x' AND id > 5"))
+        assert 'level' in columns
+        assert 'idx_contents_logs_content_id' in indexes
+        assert 'idx_contents_logs_content_id' in plan
+        assert read_logs(db_path, 'old')[0]['log_message'] == 'legacy'
+
+    def test_read_logs_does_not_migrate(self, tmp_path):
+        db_path = str(tmp_path / 'database.sqlite')
+        assert read_logs(db_path, 'job') == []
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+            conn.execute('''CREATE TABLE contents_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, content_id TEXT NOT NULL,
+                log_message TEXT NOT NULL, created_at TEXT DEFAULT (datetime('now')))''')
+            conn.execute("INSERT INTO contents_logs (content_id, log_message) VALUES ('old', 'legacy')")
+
+        rows = read_logs(db_path, 'old')
+        assert [(r['log_message'], r['level']) for r in rows] == [('legacy', None)]
+        assert read_logs(db_path, 'old', levels=['error']) == []
+        with sqlite3.connect(db_path) as conn:
+            assert 'level' not in {row[1] for row in conn.execute('PRAGMA table_info(contents_logs)')}
+
+    def test_compact_archives_finished_jobs(self, tmp_path):
+        db_path = str(tmp_path / 'database.sqlite')
+        archive_dir = tmp_path / 'log_archive'
+        with sqlite3.connect(db_path) as conn:
+            ensure_log_schema(conn)
+            conn.execute('CREATE TABLE contents (id TEXT PRIMARY KEY, status TEXT)')
+            conn.executemany('INSERT INTO contents VALUES (?, ?)',
+                             [('done', 'completed'), ('running', 'processing')])
+            conn.executemany(
+                "INSERT INTO contents_logs (content_id, log_message, level, created_at) "
+                "VALUES (?, ?, 'INFO', datetime('now', '-3 days'))",
+                [('done', 'a'), ('done', 'b'), ('running', 'c')])
+
+        result = compact_logs(db_path, archive_dir, retention_hours=24)
+
+        assert result['jobs'] == 1
+        assert read_logs(db_path, 'done') == []
+        assert len(read_logs(db_path, 'running')) == 1
+        assert [r['log_message'] for r in read_archived_logs(archive_dir, 'done')] == ['a', 'b']
@@ -0,0 +1,183 @@
+"""
+호스트 자원 브로커 테스트 (resource_leases / resource_waiters)
+
+테스트 범위:
+- 용량 안에서만 리스 발급, 반납 시 대기자 깨움
+- 여러 자원을 한꺼번에 받음 / 용량보다 큰 요청은 용량으로 제한
+- 먼저 기다린 요청 우선 (큰 요청 기아 방지)
+- 같은 스레드 중첩 요청은 다시 받지 않음
+- 종료된 프로세스의 리스 회수, 타임아웃 / 취소
+- resource_lease / async_resource_lease, RESOURCE_BROKER=0
+"""
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import resource_broker
+from src.utils.cancellation import OperationCancelled
+from src.utils.resource_broker import ResourceBroker, ResourceTimeout, resource_lease, async_resource_lease
+
+
+def make_broker(tmp_path, **capacity):
+    broker = ResourceBroker(str(tmp_path / 'resources.db'))
+    for name, value in capacity.items():
+        broker.set_capacity(name, value)
+    return broker
+
+
+@pytest.fixture
+def shared_broker(tmp_path, monkeypatch):
+    """resource_lease()가 쓰는 공용 브로커를 임시 DB로 교체"""
+    broker = make_broker(tmp_path, cpu=2, ram_mb=4096, browser=1, gpu=0)
+    monkeypatch.setattr(resource_broker, '_broker', broker)
+    monkeypatch.delenv('RESOURCE_BROKER', raising=False)
+    return broker
+
+
+class TestAcquire:
+    def test_capacity_enforced_and_release_wakes_waiter(self, tmp_path):
+        broker = make_broker(tmp_path, cpu=2)
+        first = broker.acquire('a', cpu=2)
+        got = []
+
+        def other():
+            with make_broker(tmp_path).acquire('b', cpu=1, reentrant=False) as lease:
+                got.append(lease.waited)
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        time.sleep(0.3)
+        assert got == []
+
+        first.release()
+        thread.join(timeout=5)
+        assert len(got) == 1 and got[0] >= 0.2
+        assert broker.snapshot()['used']['cpu'] == 0
+
+    def test_all_or_nothing(self, tmp_path):
+        broker = make_broker(tmp_path, cpu=4, ram_mb=1000)
+        held = broker.acquire('big', ram_mb=800)
+        with pytest.raises(ResourceTimeout):
+            make_broker(tmp_path).acquire('x', timeout=0.3, reentrant=False, cpu=1, ram_mb=500)
+        # 대기하다 포기한 요청은 cpu를 잡고 있지 않음
+        assert broker.snapshot()['used']['cpu'] == 0
+        assert broker.snapshot()['waiters'] == []
+        held.release()
+
+    def test_request_larger_than_capacity_is_clamped(self, tmp_path):
+        broker = make_broker(tmp_path, cpu=2, gpu=0)
+        with broker.acquire('huge', timeout=1, cpu=16, gpu=1) as lease:
+            assert lease.amounts == {'cpu': 2}
+
+    def test_unknown_resource_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            make_broker(tmp_path).acquire('x', disk=1)
+
+    def test_nested_acquire_in_same_thread(self, tmp_path):
+        broker = make_broker(tmp_path, cpu=2)
+        with broker.acquire('outer', cpu=2):
+            with broker.acquire('inner', timeout=0.5, cpu=2) as inner:
+                assert inner.amounts == {}
+        assert broker.snapshot()['used']['cpu'] == 0
+
+    def test_older_waiter_goes_first(self, tmp_path):
+        broker = make_broker(tmp_path, cpu=2)
+        holder = broker.acquire('holder', cpu=1)
+        order = []
+
+        def waiter(name, amount):
+            with make_broker(tmp_path).acquire(name, reentrant=False, cpu=amount):
+                order.append(name)
+                time.sleep(0.1)
+
+        big = threading.Thread(target=waiter, args=('big', 2))
+        big.start()
+        time.sleep(0.3)
+        # cpu 1개가 비어 있어도 먼저 기다린 big이 같은 자원을 원하므로 끼어들지 않음
+        small = threading.Thread(target=waiter, args=('small', 1))
+        small.start()
+        time.sleep(0.3)
+        assert order == []
+
+        holder.release()
+        big.join(timeout=5)
+        small.join(timeout=5)
+        assert order == ['big', 'small']
+
+
+class TestRecovery:
+    def test_dead_process_lease_reclaimed(self, tmp_path):
+        db = tmp_path / 'resources.db'
+        broker = make_broker(tmp_path, cpu=1)
+        script = (
+            f"import sys; sys.path.insert(0, {str(project_root)!r})\n"
+            "from src.utils.resource_broker import ResourceBroker\n"
+            f"ResourceBroker({str(db)!r}).acquire('child', cpu=1)\n"
+        )
+        subprocess.run([sys.executable, '-c', script], check=True, timeout=30)
+        # 자식은 반납 없이 종료 → PID 확인으로 바로 회수
+        with broker.acquire('parent', timeout=2, cpu=1) as lease:
+            assert lease.amounts == {'cpu': 1}
+
+    def test_expired_lease_reclaimed(self, tmp_path):
+        broker = make_broker(tmp_path, cpu=1)
+        broker.acquire('stale', cpu=1)
+        with broker._transaction() as conn:
+            conn.execute('UPDATE resource_leases SET expires_at = 0')
+        with make_broker(tmp_path).acquire('next', timeout=2, reentrant=False, cpu=1):
+            pass
+
+    def test_cancel_while_waiting(self, tmp_path):
+        broker = make_broker(tmp_path, cpu=1)
+        held = broker.acquire('held', cpu=1)
+        cancelled = threading.Event()
+        threading.Timer(0.2, cancelled.set).start()
+        with pytest.raises(OperationCancelled):
+            make_broker(tmp_path).acquire('x', cancel_check=cancelled.is_set, reentrant=False, cpu=1)
+        held.release()
+
+
+class TestStageLease:
+    def test_stage_defaults_and_overrides(self, shared_broker):
+        with resource_lease('browser') as lease:
+            assert lease.amounts == {'browser': 1, 'ram_mb': 1024}
+            assert shared_broker.snapshot()['used']['browser'] == 1
+        with resource_lease('whisper', ram_mb=100) as lease:
+            assert lease.amounts == {'cpu': 2, 'ram_mb': 100}
+        assert shared_broker.snapshot()['leases'] == []
+
+    def test_async_lease(self, shared_broker):
+        async def main():
+            async with async_resource_lease('browser') as lease:
+                assert shared_broker.snapshot()['used']['browser'] == 1
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(async_resource_lease('browser').__aenter__(), 0.3)
+            return lease
+
+        lease = asyncio.run(main())
+        assert lease.released
+        assert _wait_until(lambda: shared_broker.snapshot()['leases'] == [])
+
+    def test_disabled_by_env(self, shared_broker, monkeypatch):
+        monkeypatch.setenv('RESOURCE_BROKER', '0')
+        with resource_lease('render', cpu=100) as lease:
+            assert lease.amounts == {}
+        assert shared_broker.snapshot()['leases'] == []
+
+
+def _wait_until(predicate, timeout: float = 3.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return predicate()
@@ -0,0 +1,210 @@
+"""
+SQLite 작업 큐 테스트 (queue_tasks / queue_limits)
+
+테스트 범위:
+- 우선순위 → 등록 순서로 claim
+- 작업 타입별 동시 실행 제한
+- task_id 지정 claim은 자기 차례일 때만 (FIFO)
+- 리스 만료 회수 / 하트비트 연장, 리스를 둔 대기 작업은 만료되면 삭제 (뒤의 대기자가 진행)
+- wait_and_claim이 다른 스레드의 enqueue로 깨어남
+- 다른 형식의 queue_tasks 테이블은 변경하지 않음, QueueManager 락 (중단 시 대기 작업 정리)
+"""
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.work_queue import WorkQueue, PENDING, PROCESSING, COMPLETED, FAILED
+
+
+def make_queue(tmp_path, **kwargs):
+    return WorkQueue(str(tmp_path / 'queue.db'), **kwargs)
+
+
+class TestClaim:
+    def test_priority_then_fifo(self, tmp_path):
+        queue = make_queue(tmp_path)
+        queue.enqueue('video', task_id='a')
+        queue.enqueue('video', task_id='b', priority=5)
+        queue.enqueue('video', task_id='c')
+
+        assert [queue.claim().id for _ in range(3)] == ['b', 'a', 'c']
+        assert queue.claim() is None
+
+    def test_per_type_limit(self, tmp_path):
+        queue = make_queue(tmp_path)
+        queue.set_limit('image', 1)
+        queue.enqueue('image', task_id='i1')
+        queue.enqueue('image', task_id='i2')
+        queue.enqueue('video', task_id='v1')
+
+        assert queue.claim(['image']).id == 'i1'
+        assert queue.claim(['image']) is None
+        assert queue.claim().id == 'v1'  # 다른 타입은 막히지 않음
+
+        queue.complete('i1')
+        assert queue.claim(['image']).id == 'i2'
+
+    def test_claim_own_task_waits_for_turn(self, tmp_path):
+        queue = make_queue(tmp_path)
+        queue.enqueue('video', task_id='first')
+        queue.enqueue('video', task_id='second')
+
+        assert queue.claim(task_id='second') is None
+        assert queue.claim(task_id='first').id == 'first'
+        assert queue.claim(task_id='second').id == 'second'
+
+    def test_claim_is_exclusive_across_workers(self, tmp_path):
+        db_path = str(tmp_path / 'queue.db')
+        WorkQueue(db_path).enqueue('video', task_id='only')
+        claimed = []
+
+        def worker(n):
+            task = WorkQueue(db_path, worker_id=f'w{n}').claim()
+            if task:
+                claimed.append(task.id)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert claimed == ['only']
+
+
+class TestLease:
+    def test_expired_lease_is_reclaimed(self, tmp_path):
+        db_path = str(tmp_path / 'queue.db')
+        dead = WorkQueue(db_path, worker_id='dead', lease_seconds=0.1)
+        dead.enqueue('video', task_id='t', max_attempts=2)
+        assert dead.claim().id == 't'
+
+        time.sleep(0.2)
+        task = WorkQueue(db_path, worker_id='alive').claim()
+        assert task.id == 't' and task.lease_owner == 'alive' and task.attempts == 2
+        assert dead.heartbeat('t') is False
+
+    def test_expired_lease_without_retries_fails(self, tmp_path):
+        queue = make_queue(tmp_path, lease_seconds=0.1)
+        queue.enqueue('video', task_id='t')
+        queue.claim()
+
+        time.sleep(0.2)
+        assert queue.claim() is None
+        assert queue.get('t').status == FAILED
+
+    def test_expired_waiter_is_removed(self, tmp_path):
+        db_path = str(tmp_path / 'queue.db')
+        dead = WorkQueue(db_path, worker_id='dead', lease_seconds=0.2)
+        dead.enqueue('video', task_id='dead-waiter', lease=True)
+        alive = WorkQueue(db_path, worker_id='alive', lease_seconds=0.2)
+        alive.enqueue('video', task_id='next', lease=True)
+
+        assert alive.claim(task_id='next') is None  # 먼저 온 대기 작업이 앞
+        with alive.keep_alive('next', interval=0.05):
+            task = alive.wait_and_claim(['video'], task_id='next', timeout=3)
+        assert task.id == 'next'
+        assert dead.get('dead-waiter') is None
+
+    def test_keep_alive_extends_lease(self, tmp_path):
+        queue = make_queue(tmp_path, lease_seconds=0.3)
+        queue.enqueue('video', task_id='t')
+        queue.claim()
+
+        with queue.keep_alive('t', interval=0.05) as heartbeat:
+            time.sleep(0.6)
+            assert queue.claim() is None
+            assert queue.get('t').status == PROCESSING
+        assert heartbeat.lost is False
+
+
+class TestWaitAndStatus:
+    def test_wait_wakes_on_enqueue(self, tmp_path):
+        db_path = str(tmp_path / 'queue.db')
+        queue = WorkQueue(db_path)
+        threading.Timer(0.2, lambda: WorkQueue(db_path).enqueue('video', task_id='late')).start()
+
+        started = time.time()
+        task = queue.wait_and_claim(['video'], timeout=10)
+
+        assert task.id == 'late'
+        assert time.time() - started < 1.5  # 폴링 간격(2초)을 기다리지 않음
+
+    def test_wait_timeout(self, tmp_path):
+        queue = make_queue(tmp_path)
+        assert queue.wait_and_claim(['video'], timeout=0.2) is None
+
+    def test_foreign_table_is_not_altered(self, tmp_path):
+        db_path = str(tmp_path / 'queue.db')
+        with sqlite3.connect(db_path) as conn:
+            conn.execute('CREATE TABLE queue_tasks (id TEXT PRIMARY KEY, type TEXT, status TEXT)')
+
+        with pytest.raises(sqlite3.OperationalError):
+            WorkQueue(db_path)
+        with sqlite3.connect(db_path) as conn:
+            assert [row[1] for row in conn.execute('PRAGMA table_info(queue_tasks)')] == ['id', 'type', 'status']
+
+    def test_update_status(self, tmp_path):
+        queue = make_queue(tmp_path)
+        queue.enqueue('image', task_id='img-1')
+        queue.claim()
+
+        assert queue.update_status('img-1', COMPLETED) is True
+        assert queue.update_status('missing', COMPLETED) is False
+        task = queue.get('img-1')
+        assert task.status == COMPLETED and task.lease_owner is None
+
+    def test_fail_with_retry_requeues(self, tmp_path):
+        queue = make_queue(tmp_path)
+        queue.enqueue('video', task_id='t', max_attempts=2)
+        queue.claim()
+        assert queue.fail('t', 'boom', retry=True)
+        assert queue.get('t').status == PENDING
+
+        queue.claim()
+        queue.fail('t', 'boom again', retry=True)
+        task = queue.get('t')
+        assert task.status == FAILED and task.error == 'boom again'
+
+
+class TestQueueManager:
+    def test_lock_is_exclusive_and_released(self, tmp_path):
+        pytest.importorskip('colorama')  # src.ai_aggregator 패키지 의존성
+        from src.ai_aggregator.queue_manager import QueueManager
+
+        first = QueueManager(queue_dir=str(tmp_path / '.queue'))
+        second = QueueManager(queue_dir=str(tmp_path / '.queue'))
+
+        assert first.acquire_lock(timeout=1)
+        assert second.acquire_lock(timeout=0.3) is False
+
+        first.release_lock()
+        assert second.acquire_lock(timeout=1)
+        second.release_lock()
+        assert first.queue.list_tasks() == []
+
+    def test_interrupted_wait_leaves_no_waiter(self, tmp_path, monkeypatch):
+        pytest.importorskip('colorama')
+        from src.ai_aggregator.queue_manager import QueueManager
+
+        manager = QueueManager(queue_dir=str(tmp_path / '.queue'))
+
+        def interrupted(*args, **kwargs):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(manager.queue, 'wait_and_claim', interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            manager.acquire_lock(timeout=1)
+        assert manager.queue.list_tasks() == []
+
+        monkeypatch.undo()
+        other = QueueManager(queue_dir=str(tmp_path / '.queue'))
+        assert other.acquire_lock(timeout=1)
+        other.release_lock()
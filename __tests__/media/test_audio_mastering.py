@@ -0,0 +1,55 @@
+"""
+오디오 마스터링 타임라인 테스트
+
+테스트 범위:
+- 샘플 단위 오프셋 배치
+- 슬롯 길이 제한 (넘치는 나레이션 잘라냄)
+- 모노 → 스테레오 확장
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.audio_mastering import AudioTimeline
+
+
+class TestAudioTimeline:
+    def test_place_at_sample_offsets(self):
+        timeline = AudioTimeline(sample_rate=48000, channels=2, num_samples=10)
+        pcm = np.ones((3, 2), dtype=np.float32)
+
+        timeline.place(pcm, 0)
+        timeline.place(pcm * 0.5, 5)
+
+        buf = timeline.render()
+        assert buf.shape == (10, 2)
+        assert buf[0:3, 0].tolist() == [1.0, 1.0, 1.0]
+        assert buf[3:5, 0].tolist() == [0.0, 0.0]
+        assert buf[5:8, 1].tolist() == [0.5, 0.5, 0.5]
+        assert timeline.segments == [(0, 3), (5, 3)]
+
+    def test_slot_limit_truncates(self):
+        timeline = AudioTimeline(sample_rate=48000, channels=2, num_samples=4)
+        placed = timeline.place(np.ones((10, 2), dtype=np.float32), 0, max_samples=4)
+        assert placed == 4
+        assert timeline.num_samples == 4
+
+    def test_mono_input_expanded(self):
+        timeline = AudioTimeline(sample_rate=48000, channels=2)
+        timeline.place(np.full(4, 0.25, dtype=np.float32), 2)
+        buf = timeline.render()
+        assert buf.shape == (6, 2)
+        assert buf[2:, 0].tolist() == buf[2:, 1].tolist() == [0.25] * 4
+
+    def test_frame_aligned_offsets(self):
+        """48kHz / 25fps → 프레임당 1920샘플로 정확히 나누어 떨어짐"""
+        timeline = AudioTimeline(sample_rate=48000, channels=2)
+        assert timeline.sample_rate % 25 == 0
+        assert timeline.seconds_to_samples(84 / 25) == 84 * 1920
@@ -0,0 +1,123 @@
+"""
+오디오 메타데이터 리더 테스트
+
+테스트 범위:
+- WAV (RIFF) 샘플 수/길이
+- MP3 CBR 프레임 순회, Xing/LAME 태그 (gapless)
+- AAC (ADTS) 프레임 순회
+- 지원하지 않는 형식
+"""
+import sys
+import wave
+import struct
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.audio_metadata import probe_audio_bytes, read_audio_info, get_exact_audio_duration
+
+
+# MPEG1 Layer III, 128kbps, 44100Hz, 스테레오, 패딩 없음 → 417바이트 프레임
+MP3_HEADER = bytes([0xFF, 0xFB, 0x90, 0x00])
+MP3_FRAME_LEN = 417
+
+
+def make_mp3_frames(count: int) -> bytes:
+    return (MP3_HEADER + b'\x00' * (MP3_FRAME_LEN - 4)) * count
+
+
+def make_adts_frames(count: int, sr_index: int = 4, channels: int = 2, frame_len: int = 200) -> bytes:
+    frame = bytearray(frame_len)
+    frame[0] = 0xFF
+    frame[1] = 0xF1  # MPEG-4, layer 0, CRC 없음
+    frame[2] = (1 << 6) | (sr_index << 2) | (channels >> 2)
+    frame[3] = ((channels & 0x3) << 6) | ((frame_len >> 11) & 0x3)
+    frame[4] = (frame_len >> 3) & 0xFF
+    frame[5] = ((frame_len & 0x7) << 5) | 0x1F
+    frame[6] = 0xFC  # raw data block 1개
+    return bytes(frame) * count
+
+
+class TestWav:
+    def test_pcm_wav_duration(self, tmp_path):
+        path = tmp_path / "tone.wav"
+        with wave.open(str(path), 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes(b'\x00\x00' * 24000)
+
+        info = read_audio_info(path)
+        assert info.codec == 'pcm'
+        assert info.sample_rate == 16000
+        assert info.channels == 1
+        assert info.num_samples == 24000
+        assert info.duration == pytest.approx(1.5)
+
+    def test_streamed_wav_with_unknown_size(self):
+        """파이프로 기록된 WAV (data 크기 0xFFFFFFFF)"""
+        fmt = struct.pack('<HHIIHH', 1, 2, 48000, 48000 * 4, 4, 16)
+        body = b'\x00' * (4 * 4800)
+        data = (b'RIFF' + struct.pack('<I', 0xFFFFFFFF) + b'WAVE' +
+                b'fmt ' + struct.pack('<I', 16) + fmt +
+                b'data' + struct.pack('<I', 0xFFFFFFFF) + body)
+
+        info = probe_audio_bytes(data)
+        assert info.num_samples == 4800
+        assert info.duration == pytest.approx(0.1)
+
+
+class TestMp3:
+    def test_cbr_frame_walk(self):
+        info = probe_audio_bytes(make_mp3_frames(100))
+        assert info.codec == 'mp3'
+        assert info.sample_rate == 44100
+        assert info.channels == 2
+        assert info.num_samples == 100 * 1152
+
+    def test_id3v2_tag_skipped(self):
+        tag_body = b'\x00' * 300
+        id3 = b'ID3\x04\x00\x00' + bytes([0, 0, 0x02, 0x2C]) + tag_body
+        info = probe_audio_bytes(id3 + make_mp3_frames(10))
+        assert info.num_samples == 10 * 1152
+
+    def test_xing_lame_tag_gapless(self):
+        """Xing 태그의 프레임 수와 LAME 인코더 지연/패딩 반영"""
+        frame = bytearray(MP3_HEADER + b'\x00' * (MP3_FRAME_LEN - 4))
+        xing = 4 + 32
+        frame[xing:xing + 4] = b'Info'
+        frame[xing + 4:xing + 8] = struct.pack('>I', 0x1)
+        frame[xing + 8:xing + 12] = struct.pack('>I', 50)
+        lame = xing + 12
+        frame[lame:lame + 4] = b'LAME'
+        # delay=576, padding=1000 (12비트씩)
+        frame[lame + 21:lame + 24] = bytes([576 >> 4, ((576 & 0xF) << 4) | (1000 >> 8), 1000 & 0xFF])
+
+        info = probe_audio_bytes(bytes(frame) + make_mp3_frames(50))
+        assert info.num_samples == 50 * 1152 - 576 - 1000
+
+    def test_exact_duration_from_file(self, tmp_path):
+        path = tmp_path / "scene_01_audio.mp3"
+        path.write_bytes(make_mp3_frames(441))
+        assert get_exact_audio_duration(path) == pytest.approx(441 * 1152 / 44100)
+
+
+class TestAdts:
+    def test_adts_frame_walk(self):
+        info = probe_audio_bytes(make_adts_frames(43))
+        assert info.codec == 'aac'
+        assert info.sample_rate == 44100
+        assert info.channels == 2
+        assert info.num_samples == 43 * 1024
+
+
+class TestUnsupported:
+    def test_garbage_returns_none(self):
+        assert probe_audio_bytes(b'not audio at all' * 10) is None
+
+    def test_missing_file_returns_zero(self, tmp_path):
+        assert get_exact_audio_duration(tmp_path / "missing.mp3") == 0.0
@@ -0,0 +1,88 @@
+"""
+배경음악 / 효과음 믹싱 테스트
+
+테스트 범위:
+- 단어 타임스탬프 → 타임라인 발화 구간 변환
+- 덕킹 엔벨로프 (attack/hold/release, 짧은 공백 병합)
+- BGM 반복 길이
+- story.json 효과음 설정 정규화
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.audio_mixing import (
+    speech_intervals_from_word_timings,
+    merge_intervals,
+    build_ducking_envelope,
+    loop_to_length,
+    mix_music_bed,
+    parse_scene_sfx,
+    db_to_gain,
+)
+
+
+class TestSpeechIntervals:
+    def test_offset_and_slot_limit(self):
+        timings = [
+            {'word': '안녕', 'start': 0.1, 'end': 0.5},
+            {'word': '하세요', 'start': 0.5, 'end': 1.2},
+            {'word': '넘침', 'start': 2.5, 'end': 3.0},
+        ]
+        intervals = speech_intervals_from_word_timings(timings, offset=10.0, limit=2.0)
+        assert intervals == [(10.1, 10.5), (10.5, 11.2)]
+
+    def test_merge_short_gaps(self):
+        merged = merge_intervals([(0.0, 1.0), (1.2, 2.0), (3.0, 4.0)], gap=0.3)
+        assert merged == [(0.0, 2.0), (3.0, 4.0)]
+
+
+class TestDuckingEnvelope:
+    def test_attack_hold_release(self):
+        sr = 1000
+        env = build_ducking_envelope(5000, sr, [(2.0, 3.0)], duck_db=-20.0,
+                                     attack=0.1, release=0.5)
+        duck = db_to_gain(-20.0)
+
+        assert env[0] == 1.0
+        assert env[1950] < 1.0                     # attack 구간
+        assert env[2000:3000] == pytest.approx(duck)
+        assert duck < env[3250] < 1.0              # release 구간
+        assert env[3600:].min() == pytest.approx(1.0)
+
+    def test_no_speech_keeps_unity(self):
+        env = build_ducking_envelope(100, 1000, [])
+        assert env.min() == 1.0
+
+
+class TestMusicBed:
+    def test_loop_to_length(self):
+        bgm = np.ones((300, 2), dtype=np.float32)
+        bed = loop_to_length(bgm, 1000, 100, crossfade=0.5, fade_out=0.0)
+        assert bed.shape == (1000, 2)
+        assert bed[500:700].min() > 0.9  # 이음새에서 끊기지 않음
+
+    def test_mix_ducks_under_speech(self):
+        sr = 1000
+        speech = np.zeros((4000, 2), dtype=np.float32)
+        bgm = np.full((4000, 2), 0.5, dtype=np.float32)
+        out = mix_music_bed(speech, bgm, sr, [(1.0, 2.0)], bgm_volume_db=0.0, duck_db=-12.0)
+
+        assert out[500, 0] == pytest.approx(0.5)
+        assert out[1500, 0] == pytest.approx(0.5 * db_to_gain(-12.0), rel=1e-3)
+
+
+class TestSceneSfx:
+    def test_formats(self):
+        assert parse_scene_sfx({}) == []
+        assert parse_scene_sfx({'sfx': 'whoosh.mp3'}) == [
+            {'file': 'whoosh.mp3', 'offset': 0.0, 'volume': 0.0}]
+        assert parse_scene_sfx({'sfx': [{'file': 'hit.wav', 'offset': 1.5, 'volume': -6}, {}]}) == [
+            {'file': 'hit.wav', 'offset': 1.5, 'volume': -6.0}]
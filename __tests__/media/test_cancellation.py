@@ -0,0 +1,246 @@
+"""
+취소 토큰 테스트
+
+테스트 범위:
+- STOP / .cancel 파일 생성 → 즉시 취소 (inotify / 폴링), 감시 하나만 해제
+- 취소 시 ffmpeg 프로세스 그룹(손자 프로세스 포함) 종료 및 부분 출력 삭제
+- asyncio 태스크 / 스레드 풀 취소 전달
+- 폴더별 공유 토큰 재사용 / 초기화, STOP 체크는 감시 이벤트 전에도 파일을 직접 확인 / 컨트롤러 종료 시 해제
+"""
+import asyncio
+import concurrent.futures
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import cancellation
+from src.utils.cancellation import (
+    CancellationToken,
+    OperationCancelled,
+    cancel_token_for,
+    release_cancel_token,
+    run_cancellable,
+)
+from src.utils.ffmpeg_runner import run_ffmpeg, FFmpegCancelled
+
+# 출력 파일을 쓰다가 손자 프로세스(sleep)를 띄우고 멈춰 있는 가짜 ffmpeg
+# 인자: ... <손자 PID 기록 파일> <출력 파일>
+FAKE_FFMPEG = (
+    f"#!{sys.executable}\n"
+    "import subprocess, sys, time\n"
+    "from pathlib import Path\n"
+    "Path(sys.argv[-1]).write_bytes(b'partial')\n"
+    "child = subprocess.Popen(['sleep', '30'])\n"
+    "Path(sys.argv[-2]).write_text(str(child.pid))\n"
+    "time.sleep(30)\n"
+)
+
+
+def _alive(pid: int) -> bool:
+    """/proc 기준 생존 여부 (좀비는 종료된 것으로 간주)"""
+    try:
+        stat = Path(f'/proc/{pid}/stat').read_text()
+    except OSError:
+        return False
+    return stat.rsplit(')', 1)[1].split()[0] != 'Z'
+
+
+def _wait_until(predicate, timeout: float = 3.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return predicate()
+
+
+class TestCancelFiles:
+    def test_file_created_cancels_within_a_second(self, tmp_path):
+        token = CancellationToken()
+        token.watch_files(tmp_path)
+        try:
+            assert not token.cancelled
+            (tmp_path / 'STOP').touch()
+            assert token.wait(1.0)
+            assert 'STOP' in token.reason
+        finally:
+            token.close()
+
+    def test_existing_file_cancels_immediately(self, tmp_path):
+        (tmp_path / '.cancel').touch()
+        token = CancellationToken()
+        token.watch_files(tmp_path)
+        assert token.cancelled
+        token.close()
+
+    def test_polling_fallback(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cancellation, '_load_inotify', lambda: None)
+        token = CancellationToken()
+        token.watch_files(tmp_path)
+        try:
+            (tmp_path / '.cancel').touch()
+            assert token.wait(cancellation.POLL_INTERVAL + 1.0)
+        finally:
+            token.close()
+
+    def test_other_files_ignored(self, tmp_path):
+        token = CancellationToken()
+        token.watch_files(tmp_path, names=('STOP',))
+        try:
+            (tmp_path / '.cancel').touch()
+            (tmp_path / 'scene_01.mp4').touch()
+            assert not token.wait(0.3)
+        finally:
+            token.close()
+
+    def test_unwatch_stops_only_that_watch(self, tmp_path):
+        mine, callers = tmp_path / 'mine', tmp_path / 'callers'
+        mine.mkdir()
+        callers.mkdir()
+        token = CancellationToken()
+        token.watch_files(callers)
+        watcher = token.watch_files(mine)
+        try:
+            token.unwatch(watcher)
+            token.unwatch(watcher)  # 두 번 호출해도 무시
+            (mine / 'STOP').touch()
+            assert not token.wait(0.3)
+            (callers / 'STOP').touch()
+            assert token.wait(1.0)
+        finally:
+            token.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='/proc 기반 프로세스 확인')
+class TestProcessGroup:
+    def test_run_ffmpeg_kills_group_and_removes_partial_output(self, tmp_path):
+        fake = tmp_path / 'ffmpeg'
+        fake.write_text(FAKE_FFMPEG)
+        fake.chmod(0o755)
+        pid_file = tmp_path / 'child.pid'
+        output = tmp_path / 'out.mp4'
+
+        token = CancellationToken()
+        threading.Thread(
+            target=lambda: _wait_until(pid_file.exists) and token.cancel('test'), daemon=True
+        ).start()
+
+        started = time.time()
+        with pytest.raises(FFmpegCancelled):
+            run_ffmpeg([str(fake), str(pid_file), str(output)], cancel_check=token)
+
+        assert time.time() - started < 5
+        assert not output.exists()
+        grandchild = int(pid_file.read_text())
+        assert _wait_until(lambda: not _alive(grandchild))
+
+    def test_run_cancellable(self, tmp_path):
+        token = CancellationToken()
+        threading.Timer(0.2, token.cancel).start()
+        started = time.time()
+        with pytest.raises(OperationCancelled):
+            run_cancellable(['sleep', '30'], token, capture_output=True)
+        assert time.time() - started < 5
+
+    def test_run_cancellable_without_token(self):
+        result = run_cancellable([sys.executable, '-c', 'print("ok")'], capture_output=True, text=True)
+        assert result.returncode == 0
+        assert result.stdout.strip() == 'ok'
+
+
+class TestPropagation:
+    def test_asyncio_task_cancelled_from_thread(self):
+        token = CancellationToken()
+
+        async def main():
+            task = asyncio.ensure_future(asyncio.sleep(30))
+            token.bind_task(task)
+            threading.Timer(0.1, token.cancel).start()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(asyncio.wait_for(main(), 5))
+
+    def test_executor_pending_work_cancelled(self):
+        token = CancellationToken()
+        started, gate = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            return gate.wait(5)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            token.bind_executor(executor)
+            running = executor.submit(work)
+            pending = executor.submit(time.sleep, 0)
+            assert started.wait(5)
+            token.cancel()
+            gate.set()
+            assert pending.cancelled()
+            assert running.result() is True
+
+    def test_callback_after_cancel_runs_immediately(self):
+        token = CancellationToken()
+        token.cancel()
+        called = []
+        token.add_callback(lambda: called.append(1))
+        assert called == [1]
+
+    def test_partial_output_removed(self, tmp_path):
+        token = CancellationToken()
+        tracked = tmp_path / 'scene.mp4'
+        tracked.write_bytes(b'x')
+        token.track_output(tracked)
+
+        kept = tmp_path / 'done.mp4'
+        with token.partial_output(kept):
+            kept.write_bytes(b'x')
+
+        failed = tmp_path / 'failed.mp4'
+        with pytest.raises(OperationCancelled):
+            with token.partial_output(failed):
+                failed.write_bytes(b'x')
+                token.cancel()
+                token.raise_if_cancelled()
+
+        assert not tracked.exists()
+        assert not failed.exists()
+        assert kept.exists()
+
+
+class TestFolderToken:
+    def test_shared_and_reset_after_stop_file_removed(self, tmp_path):
+        try:
+            first = cancel_token_for(tmp_path, names=('STOP',))
+            assert cancel_token_for(tmp_path, names=('STOP',)) is first
+
+            (tmp_path / 'STOP').touch()
+            assert first.wait(1.0)
+
+            (tmp_path / 'STOP').unlink()
+            second = cancel_token_for(tmp_path, names=('STOP',))
+            assert second is not first
+            assert not second.cancelled
+        finally:
+            release_cancel_token(tmp_path, names=('STOP',))
+
+    def test_stop_checks_see_file_before_watcher_and_release(self, tmp_path):
+        from src.process_control import ProcessController, should_stop
+        from src.utils.cancellation import find_cancel_token
+
+        assert not should_stop(tmp_path)
+        (tmp_path / 'STOP').touch()
+        assert should_stop(tmp_path)                       # 감시 이벤트를 기다리지 않음
+        assert find_cancel_token(tmp_path, names=('STOP',)) is None  # 간단 체크는 감시 스레드를 만들지 않음
+
+        with ProcessController(tmp_path) as controller:
+            assert controller.check_stop_signal()
+            assert find_cancel_token(tmp_path, names=('STOP',)) is controller.cancel_token
+        assert find_cancel_token(tmp_path, names=('STOP',)) is None
@@ -0,0 +1,98 @@
+"""
+더빙 타임라인 테스트
+
+테스트 범위:
+- 세그먼트를 원본 시작 시각에 배치, 앞 세그먼트가 넘쳐도 밀림이 누적되지 않음
+- 구간보다 긴 세그먼트 압축 배율 (최대 배율 제한, 마지막 세그먼트는 영상 끝까지 사용)
+- NumPy 믹스: 시작 위치, 겹침 합산 / 클리핑, 전체 길이
+- ffmpeg로 실제 디코딩 + 압축 + 인코딩 (ffmpeg 있을 때만)
+"""
+import shutil
+import subprocess
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.dubbing_timeline import MAX_TEMPO, mix_clips, plan_timeline, render_dub_track
+
+
+def segment(start, end, duration, path=None):
+    return {'path': path, 'original_start': start, 'original_end': end, 'actual_duration': duration}
+
+
+class TestPlanTimeline:
+    def test_fitting_segments_keep_original_start(self):
+        placements = plan_timeline([segment(0.0, 2.0, 1.5), segment(3.0, 5.0, 1.0)])
+
+        assert [p.start for p in placements] == [0.0, 3.0]
+        assert [p.tempo for p in placements] == [1.0, 1.0]
+        assert placements[0].end == pytest.approx(1.5)
+
+    def test_overrun_is_compressed_to_next_start(self):
+        placements = plan_timeline([segment(0.0, 2.0, 3.6), segment(3.0, 5.0, 1.0)])
+
+        assert placements[0].tempo == pytest.approx(1.2)
+        assert placements[0].end == pytest.approx(3.0)
+        assert placements[1].start == 3.0
+
+    def test_tempo_is_capped_and_drift_does_not_accumulate(self):
+        placements = plan_timeline(
+            [segment(0.0, 1.0, 4.0), segment(2.0, 4.0, 1.0), segment(6.0, 8.0, 1.0)], max_tempo=1.25)
+
+        assert placements[0].tempo == 1.25
+        assert placements[0].end == pytest.approx(3.2)
+        assert placements[1].start == pytest.approx(3.2)   # 넘친 만큼만 밀림
+        assert placements[1].tempo == 1.0
+        assert placements[2].start == 6.0                  # 다음 세그먼트는 원본 시각으로 복귀
+
+    def test_last_segment_may_use_remaining_video(self):
+        assert plan_timeline([segment(0.0, 1.0, 2.0)], total_duration=5.0)[0].tempo == 1.0
+        assert plan_timeline([segment(0.0, 1.0, 2.0)])[0].tempo == MAX_TEMPO
+
+
+class TestMixClips:
+    def test_clips_are_placed_and_summed(self):
+        np = pytest.importorskip('numpy')
+        a = np.full(4, 0.25, dtype=np.float32)
+        b = np.full(4, 0.5, dtype=np.float32)
+
+        track = mix_clips([(0.0, a), (0.2, b)], sample_rate=10)
+
+        assert track.dtype == np.float32
+        assert track.tolist() == pytest.approx([0.25, 0.25, 0.75, 0.75, 0.5, 0.5])
+
+    def test_overlap_is_clipped_and_length_is_extended(self):
+        np = pytest.importorskip('numpy')
+        loud = np.full(2, 0.8, dtype=np.float32)
+
+        track = mix_clips([(0.0, loud), (0.0, loud)], sample_rate=10, length=1.0)
+
+        assert len(track) == 10
+        assert track[:2].tolist() == [1.0, 1.0]
+        assert not track[2:].any()
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg 필요")
+class TestRenderDubTrack:
+    def test_renders_single_track_on_timeline(self, tmp_path):
+        pytest.importorskip('numpy')
+        paths = []
+        for i, seconds in enumerate((1.0, 1.0)):
+            path = tmp_path / f"seg_{i}.wav"
+            subprocess.run(['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i',
+                            f'sine=frequency=440:duration={seconds}', str(path)], check=True)
+            paths.append(path)
+        output = tmp_path / "dub.wav"
+
+        placements = render_dub_track(
+            [segment(0.5, 1.0, 1.0, paths[0]), segment(1.4, 2.5, 1.0, paths[1])], output, total_duration=3.0)
+
+        assert placements[0].tempo == pytest.approx(1.0 / 0.9)
+        with wave.open(str(output)) as w:
+            assert w.getnframes() / w.getframerate() == pytest.approx(3.0, abs=0.01)
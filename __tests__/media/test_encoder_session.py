@@ -0,0 +1,72 @@
+"""
+인코더 세션 테스트
+
+테스트 범위:
+- stderr 스트리밍 중 인코더 초기화 실패 조기 감지 + CPU 폴백
+- 런타임 실패한 인코더는 이후 선택에서 제외
+- CPU 인코더까지 실패하면 CalledProcessError
+"""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.encoder_session import EncoderSession, CPU_ENCODER
+
+# GPU 인코더면 초기화 실패 메시지를 찍고 오래 대기, CPU 인코더면 바로 성공하는 가짜 ffmpeg
+FAKE_FFMPEG = (
+    f"#!{sys.executable}\n"
+    "import sys, time\n"
+    "if 'h264_nvenc' in sys.argv:\n"
+    "    sys.stderr.write('[h264_nvenc @ 0x1] No NVENC capable devices found\\n')\n"
+    "    sys.stderr.flush()\n"
+    "    time.sleep(30)\n"
+    "    sys.exit(1)\n"
+    "sys.exit(int(sys.argv[-1]))\n"
+)
+
+
+def make_session(gpu_healthy=True):
+    session = EncoderSession(ffmpeg_path='ffmpeg')
+    session._available = ['h264_nvenc']
+    session._health['h264_nvenc'] = gpu_healthy
+    return session
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path):
+    path = tmp_path / "ffmpeg"
+    path.write_text(FAKE_FFMPEG)
+    path.chmod(0o755)
+
+    def build(exit_code=0):
+        return lambda video_args: [str(path), *video_args, str(exit_code)]
+    return build
+
+
+class TestEncoderSession:
+    def test_select_prefers_healthy_gpu(self):
+        assert make_session().select() == ('h264_nvenc', 'p4')
+        assert make_session(gpu_healthy=False).select() == (CPU_ENCODER, 'ultrafast')
+
+    def test_early_failure_falls_back_to_cpu(self, fake_ffmpeg):
+        session = make_session()
+
+        started = time.time()
+        result = session.run(fake_ffmpeg())
+
+        assert time.time() - started < 10  # 30초 인코딩을 기다리지 않음
+        assert CPU_ENCODER in result.args
+        assert session.is_healthy('h264_nvenc') is False
+        assert session.select()[0] == CPU_ENCODER
+
+    def test_cpu_failure_raises(self, fake_ffmpeg):
+        session = make_session(gpu_healthy=False)
+        with pytest.raises(subprocess.CalledProcessError):
+            session.run(fake_ffmpeg(exit_code=1))
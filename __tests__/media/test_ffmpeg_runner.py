@@ -0,0 +1,88 @@
+"""
+공통 FFmpeg 실행기 / 단계별 메트릭 테스트
+
+테스트 범위:
+- -progress 출력 파싱 (frame, fps, speed, out_time)
+- STOP / .cancel 파일로 취소
+- 진행 없는 프로세스 멈춤 감지
+- 단계별 메트릭 JSON 누적 저장
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.ffmpeg_runner import run_ffmpeg, cancel_files_check, FFmpegCancelled
+from src.utils.stage_metrics import StageMetrics
+
+# -progress pipe:1 형식으로 진행률을 출력하는 가짜 ffmpeg (마지막 인자: 동작 모드)
+FAKE_FFMPEG = (
+    f"#!{sys.executable}\n"
+    "import sys, time\n"
+    "mode = sys.argv[-1]\n"
+    "assert sys.argv[1:4] == ['-progress', 'pipe:1', '-nostats']\n"
+    "if mode == 'hang':\n"
+    "    time.sleep(30)\n"
+    "for i in range(1, 4):\n"
+    "    print(f'frame={i * 25}\\nfps=50.0\\nout_time=00:00:0{i}.000000\\nspeed=2.0x\\n'\n"
+    "          f\"progress={'end' if i == 3 else 'continue'}\", flush=True)\n"
+    "    time.sleep(0.3 if mode == 'slow' else 0)\n"
+)
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path):
+    path = tmp_path / "ffmpeg"
+    path.write_text(FAKE_FFMPEG)
+    path.chmod(0o755)
+    return str(path)
+
+
+class TestRunFfmpeg:
+    def test_progress_parsed(self, fake_ffmpeg):
+        seen = []
+        result = run_ffmpeg([fake_ffmpeg, 'ok'], duration=3.0, on_progress=lambda p: seen.append(p.frame))
+
+        assert result.returncode == 0
+        assert seen == [25, 50, 75]
+        assert result.progress.out_time == pytest.approx(3.0)
+        assert result.progress.speed == pytest.approx(2.0)
+        assert result.progress.status == 'end'
+
+    def test_cancel_file(self, fake_ffmpeg, tmp_path):
+        (tmp_path / '.cancel').touch()
+        with pytest.raises(FFmpegCancelled):
+            run_ffmpeg([fake_ffmpeg, 'hang'], cancel_check=cancel_files_check(tmp_path))
+
+    def test_stall_detected(self, fake_ffmpeg):
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_ffmpeg([fake_ffmpeg, 'hang'], stall_timeout=1.0)
+
+
+class TestStageMetrics:
+    def test_stages_saved_and_merged(self, tmp_path):
+        path = tmp_path / 'metrics.json'
+
+        render = StageMetrics(job_id='job-1')
+        with render.stage('render', scene=1):
+            pass
+        with render.stage('render', scene=2):
+            pass
+        render.save(path)
+
+        upload = StageMetrics(job_id='job-1')
+        with pytest.raises(RuntimeError):
+            with upload.stage('upload'):
+                raise RuntimeError('network')
+        upload.save(path)
+
+        data = json.loads(path.read_text(encoding='utf-8'))
+        assert data['stages']['render']['count'] == 2
+        assert data['stages']['upload']['count'] == 1
+        assert data['records'][-1]['status'] == 'error'
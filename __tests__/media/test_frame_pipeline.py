@@ -0,0 +1,180 @@
+"""
+rawvideo 프레임 파이프라인 테스트
+
+테스트 범위:
+- ffprobe 결과 파싱 (원본 fps 문자열 유지, 오디오 유무)
+- ROI(워터마크 영역 + 여백) 좌표 계산과 마스크, 여러 영역 배치 (겹치는 상자만 합침)
+- 시간축 재사용: ROI가 거의 같으면 기준 프레임 결과 재사용
+- ffmpeg가 있으면: ROI 밖 픽셀 보존, 프레임 수 / fps 유지, 취소 시 부분 출력 삭제
+- EncodePlan: 같은 인코딩에서 오디오 교체 + 영상 필터 (오디오가 길면 마지막 프레임 연장, 짧으면 오디오 길이에서 끝)
+"""
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.cancellation import OperationCancelled
+from src.utils.frame_pipeline import FramePipelineError, as_regions, parse_probe, roi_box, roi_layout
+
+needs_ffmpeg = pytest.mark.skipif(
+    shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None, reason='ffmpeg 필요')
+
+
+def probe_data(fps='30000/1001', audio=True, **video):
+    streams = [{'codec_type': 'video', 'width': 640, 'height': 360, 'r_frame_rate': fps, 'nb_frames': '90', **video}]
+    if audio:
+        streams.append({'codec_type': 'audio'})
+    return {'streams': streams}
+
+
+class TestProbe:
+    def test_fps_string_kept(self):
+        info = parse_probe(probe_data())
+        assert (info.width, info.height, info.frames, info.has_audio) == (640, 360, 90, True)
+        assert info.fps == '30000/1001'
+        assert info.fps_value == pytest.approx(29.97, abs=0.01)
+
+    def test_missing_fields(self):
+        info = parse_probe(probe_data(fps='0/0', audio=False, avg_frame_rate='25/1', nb_frames='N/A'))
+        assert info.fps == '25/1'
+        assert info.frames is None and not info.has_audio
+        with pytest.raises(FramePipelineError):
+            parse_probe({'streams': [{'codec_type': 'audio'}]})
+
+
+class TestRoi:
+    def test_box_clamped_to_frame(self):
+        assert roi_box((100, 50, 200, 40), 640, 360, margin=16) == (84, 34, 316, 106)
+        assert roi_box((0, 300, 640, 60), 640, 360, margin=16) == (0, 284, 640, 360)
+
+    def test_layout_merges_only_overlapping_boxes(self):
+        logo, subtitle, near = (10, 10, 40, 20), (100, 300, 400, 40), (480, 310, 60, 20)
+        layout = roi_layout([subtitle, logo, near], 640, 360, margin=16)
+        assert layout == [((0, 0, 66, 46), [logo]), ((84, 284, 556, 356), [subtitle, near])]
+        assert as_regions((1, 2, 3, 4)) == [(1, 2, 3, 4)]
+        assert as_regions([[1, 2, 3, 4], (5, 6, 7, 8)]) == [(1, 2, 3, 4), (5, 6, 7, 8)]
+
+    def test_box_outside_frame(self):
+        with pytest.raises(ValueError):
+            roi_box((700, 0, 50, 50), 640, 360, margin=0)
+
+    def test_mask_in_crop_coordinates(self):
+        np = pytest.importorskip('numpy')
+        from src.utils.frame_pipeline import roi_mask
+
+        box = roi_box((100, 50, 20, 10), 640, 360, margin=4)
+        mask = roi_mask((100, 50, 20, 10), box)
+        assert mask.shape == (18, 28)
+        assert mask.sum() == 20 * 10 * 255
+        assert mask[4, 4] == 255 and mask[3, 4] == 0 and mask[4, 24] == 0
+
+
+@needs_ffmpeg
+class TestInpaintVideo:
+    @pytest.fixture
+    def source(self, tmp_path):
+        pytest.importorskip('numpy')
+        pytest.importorskip('cv2')
+        path = tmp_path / 'source.mp4'
+        subprocess.run(
+            ['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', 'testsrc2=size=320x240:rate=25:duration=1',
+             '-f', 'lavfi', '-i', 'sine=duration=1', '-shortest',
+             '-c:v', 'libx264', '-crf', '0', '-c:a', 'aac', str(path)],
+            check=True,
+        )
+        return path
+
+    def test_roi_only_and_fps_preserved(self, source, tmp_path):
+        from src.utils.frame_pipeline import FrameReader, inpaint_video, probe_video
+
+        output = tmp_path / 'out.mp4'
+        region = (100, 180, 120, 40)
+        lossless = ['-c:v', 'libx264', '-crf', '0', '-preset', 'ultrafast']
+        count = inpaint_video(source, output, region, inpaint=lambda crop, mask: crop * 0,
+                              margin=8, video_args=lossless)
+
+        info = probe_video(output)
+        assert count == 25
+        assert info.fps == '25/1' and info.has_audio
+
+        np = pytest.importorskip('numpy')
+        before, after = FrameReader(source, probe_video(source)), FrameReader(output, info)
+        for a, b in zip(before, after):
+            # bgr24 → yuv420p 변환 오차 (crf 0이어도 색 변환은 무손실이 아님)
+            assert b[172:228, 92:228].max() <= 2
+            assert np.abs(a[:160].astype(int) - b[:160]).mean() <= 2
+        before.close(kill=True)
+        after.close(kill=True)
+
+    def test_encode_plan_replaces_audio_and_applies_filter(self, source, tmp_path):
+        from src.utils.frame_pipeline import EncodePlan, inpaint_video, probe_video
+
+        dub = tmp_path / 'dub.wav'
+        subprocess.run(['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', 'sine=frequency=880:duration=2',
+                        str(dub)], check=True)
+        output = tmp_path / 'out.mp4'
+        plan = EncodePlan(audio=dub, video_filter='tpad=stop_mode=clone:stop_duration=1,hflip',
+                          output_args=['-shortest'])
+        inpaint_video(source, output, (0, 0, 10, 10), inpaint=lambda crop, mask: crop, plan=plan)
+
+        info = probe_video(output)
+        assert info.has_audio
+        assert info.duration == pytest.approx(2.0, abs=0.15)
+
+    @pytest.mark.parametrize('duration', [2.0, None])
+    def test_encode_plan_shorter_audio_ends_output(self, tmp_path, duration):
+        pytest.importorskip('numpy')
+        from src.utils.frame_pipeline import EncodePlan, inpaint_video, probe_video
+
+        source, dub = tmp_path / 'long.mp4', tmp_path / 'dub.wav'
+        subprocess.run(['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', 'testsrc2=size=320x240:rate=25:duration=6',
+                        '-c:v', 'libx264', '-preset', 'ultrafast', str(source)], check=True)
+        subprocess.run(['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', 'sine=duration=2', str(dub)], check=True)
+        output = tmp_path / 'out.mp4'
+        # duration 없음 = -shortest로 인코더가 먼저 정상 종료하는 경우
+        plan = EncodePlan(audio=dub, video_filter='hflip', output_args=['-shortest'], duration=duration)
+        inpaint_video(source, output, (0, 0, 10, 10), inpaint=lambda crop, mask: crop, plan=plan)
+
+        assert probe_video(output).duration == pytest.approx(2.0, abs=0.15)
+
+    def test_cancel_removes_partial_output(self, source, tmp_path):
+        from src.utils.frame_pipeline import inpaint_video
+
+        output = tmp_path / 'out.mp4'
+        calls = []
+        with pytest.raises(OperationCancelled):
+            inpaint_video(source, output, (0, 0, 10, 10), cancel_check=lambda: calls.append(1) or len(calls) > 5)
+        assert not output.exists()
+
+
+class TestTemporalReuse:
+    def test_reuses_reference_result_until_roi_changes(self):
+        np = pytest.importorskip('numpy')
+        pytest.importorskip('cv2')
+        from src.utils.frame_pipeline import TemporalReuse
+
+        mask = np.zeros((6, 8), dtype=np.uint8)
+        mask[2:4, 2:6] = 255
+        reuse = TemporalReuse(mask, threshold=1.0)
+
+        first = np.full((6, 8, 3), 50, dtype=np.uint8)
+        assert not reuse.matches(first)
+        result = first.copy()
+        result[2:4, 2:6] = 9
+        reuse.remember(result)
+
+        noisy = first.copy()
+        noisy[0, 0] = 60  # 평균 차이 10/48 → 재사용
+        assert reuse.matches(noisy)
+        reuse.apply(noisy)
+        assert (noisy[2:4, 2:6] == 9).all() and noisy[0, 0, 0] == 60
+
+        changed = np.full((6, 8, 3), 200, dtype=np.uint8)
+        assert not reuse.matches(changed)
+        assert (reuse.inpainted, reuse.reused) == (2, 1)
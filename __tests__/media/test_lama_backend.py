@@ -0,0 +1,60 @@
+"""
+LaMa 배치 백엔드 테스트
+
+테스트 범위:
+- 분할 모델 파일(big-lama_N.pt) 번호 순서 병합, 이미 병합된 파일 재사용
+- 배치 텐서 변환: BGR → RGB [0, 1], 8의 배수 패딩, 패딩 제거 후 원복
+- 마스크 텐서 하나를 배치 전체에 재사용 (1, 1, H, W)
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.lama_backend import LamaBackendError, model_path, pad_amounts
+
+
+class TestModelFile:
+    def test_parts_merged_in_numeric_order(self, tmp_path):
+        for n, data in ((10, b'C'), (2, b'B'), (1, b'A')):
+            (tmp_path / f'big-lama_{n}.pt').write_bytes(data)
+        merged = model_path(tmp_path)
+        assert merged.name == 'big-lama.pt'
+        assert merged.read_bytes() == b'ABC'
+
+        (tmp_path / 'big-lama_1.pt').write_bytes(b'changed')
+        assert model_path(tmp_path).read_bytes() == b'ABC'  # 이미 병합된 파일 사용
+
+    def test_missing_model(self, tmp_path):
+        with pytest.raises(LamaBackendError):
+            model_path(tmp_path)
+
+
+class TestTensors:
+    def test_pad_amounts(self):
+        assert pad_amounts(64, 64) == (0, 0)
+        assert pad_amounts(150, 1921) == (2, 7)
+
+    def test_batch_round_trip(self):
+        np = pytest.importorskip('numpy')
+        from src.utils.lama_backend import from_batch, mask_tensor, to_batch
+
+        rng = np.random.default_rng(0)
+        crops = [rng.integers(0, 256, (13, 21, 3), dtype=np.uint8) for _ in range(3)]
+        batch = to_batch(crops)
+        assert batch.shape == (3, 3, 16, 24) and batch.dtype == np.float32
+        assert batch[0, 0, 0, 0] == pytest.approx(crops[0][0, 0, 2] / 255)  # R 채널 먼저
+
+        restored = from_batch(batch, 13, 21)
+        for crop, result in zip(crops, restored):
+            assert np.abs(crop.astype(int) - result).max() <= 1
+
+        mask = np.zeros((13, 21), dtype=np.uint8)
+        mask[4:9, 5:15] = 255
+        tensor = mask_tensor(mask)
+        assert tensor.shape == (1, 1, 16, 24)
+        assert tensor.sum() == 50 and set(np.unique(tensor)) == {0.0, 1.0}
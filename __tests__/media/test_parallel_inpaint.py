@@ -0,0 +1,182 @@
+"""
+병렬 인페인팅 테스트
+
+테스트 범위:
+- 'module:factory' 인페인터 해석, INPAINT_WORKERS 환경변수
+- 워커 함수: 공유 메모리 슬롯의 ROI만 제자리 수정, inpaint_batch 인페인터에는 묶음 통째로 전달
+- ffmpeg가 있으면: 병렬 결과 = 순차 결과 (프레임 순서 포함, 시간축 재사용 포함), 취소 시 부분 출력 삭제
+- EncodePlan 오디오가 영상보다 짧으면 오디오 길이에서 출력 종료 (실패 / 출력 삭제 없음)
+"""
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import parallel_inpaint
+from src.utils.cancellation import OperationCancelled
+from src.utils.parallel_inpaint import inpaint_workers, resolve_inpainter
+
+needs_ffmpeg = pytest.mark.skipif(
+    shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None, reason='ffmpeg 필요')
+
+
+def constant_inpainter(value: int = 0):
+    """테스트용 팩토리 - 워커 프로세스에서 이 모듈을 import해서 사용"""
+    def inpaint(crop, mask):
+        out = crop.copy()
+        out[mask > 0] = value
+        return out
+    return inpaint
+
+
+class BatchInpainter:
+    def __init__(self):
+        self.batches = []
+
+    def inpaint_batch(self, crops, mask):
+        self.batches.append(len(crops))
+        return [crop * 0 + len(crops) for crop in crops]
+
+
+def batch_inpainter():
+    return BatchInpainter()
+
+
+CONSTANT = f'{__name__}:constant_inpainter'
+
+
+class TestConfig:
+    def test_resolve_inpainter(self):
+        fn = resolve_inpainter(CONSTANT, value=5)
+        assert fn.__qualname__ == 'constant_inpainter.<locals>.inpaint'
+        with pytest.raises(ValueError):
+            resolve_inpainter('os.path.join')
+
+    def test_workers_from_env(self, monkeypatch):
+        monkeypatch.setenv('INPAINT_WORKERS', '3')
+        assert inpaint_workers() == 3
+        monkeypatch.setenv('INPAINT_WORKERS', 'auto')
+        assert inpaint_workers() >= 1
+
+
+class TestWorker:
+    def test_slots_inpainted_in_place(self):
+        np = pytest.importorskip('numpy')
+        from multiprocessing import shared_memory
+
+        shape = (3, 8, 10, 3)
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        try:
+            frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            frames[...] = 100
+            mask = np.full((4, 5), 255, dtype=np.uint8)
+            parallel_inpaint._init_worker(shm.name, shape, [((2, 1, 7, 5), mask)], CONSTANT, {'value': 7})
+            assert parallel_inpaint._inpaint_slots([[0, 2]]) == 2
+            assert (frames[0, 1:5, 2:7] == 7).all() and (frames[2, 1:5, 2:7] == 7).all()
+            assert (frames[1] == 100).all()
+            assert frames[0].sum() == (80 - 20) * 3 * 100 + 20 * 3 * 7
+        finally:
+            parallel_inpaint._worker.clear()
+            del frames
+            shm.close()
+            shm.unlink()
+
+    def test_batch_inpainter_gets_whole_batch(self):
+        np = pytest.importorskip('numpy')
+        from multiprocessing import shared_memory
+
+        shape = (4, 6, 6, 3)
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        try:
+            frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            frames[...] = 100
+            mask = np.full((2, 2), 255, dtype=np.uint8)
+            rois = [((1, 1, 3, 3), mask), ((3, 3, 5, 5), mask)]
+            parallel_inpaint._init_worker(shm.name, shape, rois, f'{__name__}:batch_inpainter', {})
+            assert parallel_inpaint._inpaint_slots([[0, 1, 3], [1]]) == 4
+            assert parallel_inpaint._worker['inpaint'].batches == [3, 1]
+            assert (frames[[0, 1, 3], 1:3, 1:3] == 3).all()
+            assert (frames[1, 3:5, 3:5] == 1).all() and (frames[0, 3:5, 3:5] == 100).all()
+            assert (frames[2] == 100).all()
+        finally:
+            parallel_inpaint._worker.clear()
+            del frames
+            shm.close()
+            shm.unlink()
+
+
+@needs_ffmpeg
+class TestParallelVideo:
+    @pytest.fixture
+    def source(self, tmp_path):
+        pytest.importorskip('numpy')
+        path = tmp_path / 'source.mp4'
+        subprocess.run(
+            ['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', 'testsrc2=size=160x120:rate=25:duration=2',
+             '-c:v', 'libx264', '-crf', '0', str(path)],
+            check=True,
+        )
+        return path
+
+    def test_matches_serial_output(self, source, tmp_path):
+        from src.utils.frame_pipeline import inpaint_video
+
+        lossless = ['-c:v', 'libx264', '-crf', '0', '-preset', 'ultrafast']
+        region = (20, 80, 60, 20)
+        serial, parallel = tmp_path / 'serial.mp4', tmp_path / 'parallel.mp4'
+        inpaint_video(source, serial, region, inpaint=constant_inpainter(), video_args=lossless)
+        count = parallel_inpaint.parallel_inpaint_video(
+            source, parallel, region, inpainter=CONSTANT, workers=3, batch=2, slots=5, video_args=lossless)
+        assert count == 50
+        self.assert_same_frames(serial, parallel)
+
+    def test_temporal_reuse_matches_serial(self, source, tmp_path):
+        pytest.importorskip('cv2')
+        from src.utils.frame_pipeline import inpaint_video
+
+        lossless = ['-c:v', 'libx264', '-crf', '0', '-preset', 'ultrafast']
+        region = (20, 80, 60, 20)
+        serial, parallel = tmp_path / 'serial.mp4', tmp_path / 'parallel.mp4'
+        inpaint_video(source, serial, region, inpaint=constant_inpainter(), video_args=lossless,
+                      temporal_threshold=3.0)
+        parallel_inpaint.parallel_inpaint_video(
+            source, parallel, region, inpainter=CONSTANT, workers=2, batch=3, video_args=lossless,
+            temporal_threshold=3.0)
+        self.assert_same_frames(serial, parallel)
+
+    @staticmethod
+    def assert_same_frames(first, second):
+        from src.utils.frame_pipeline import FrameReader, probe_video
+
+        a, b = FrameReader(first, probe_video(first)), FrameReader(second, probe_video(second))
+        for frame_a, frame_b in zip(a, b):
+            assert (frame_a == frame_b).all()
+        a.close(kill=True)
+        b.close(kill=True)
+
+    @pytest.mark.parametrize('duration', [0.8, None])
+    def test_shorter_audio_ends_output(self, source, tmp_path, duration):
+        from src.utils.frame_pipeline import EncodePlan, probe_video
+
+        dub, output = tmp_path / 'dub.wav', tmp_path / 'out.mp4'
+        subprocess.run(['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', 'sine=duration=0.8', str(dub)], check=True)
+        plan = EncodePlan(audio=dub, output_args=['-shortest'], duration=duration)
+        parallel_inpaint.parallel_inpaint_video(
+            source, output, (0, 0, 10, 10), inpainter=CONSTANT, workers=2, batch=2, slots=4, plan=plan)
+
+        assert probe_video(output).duration == pytest.approx(0.8, abs=0.15)
+
+    def test_cancel_removes_partial_output(self, source, tmp_path):
+        output = tmp_path / 'out.mp4'
+        calls = []
+        with pytest.raises(OperationCancelled):
+            parallel_inpaint.parallel_inpaint_video(
+                source, output, (0, 0, 10, 10), inpainter=CONSTANT, workers=2,
+                cancel_check=lambda: calls.append(1) or len(calls) > 10)
+        assert not output.exists()
@@ -0,0 +1,125 @@
+"""
+작업 프로파일링 테스트
+
+테스트 범위:
+- 단계별 벽시계 / CPU 시간, begin()/end() 중첩
+- 샘플링: 단계별 분류 (python / subprocess), speedscope 파일 형식
+- cProfile 모드 .prof 저장, 결과 파일 위치 (영상 옆 / 폴더)
+- PIPELINE_PROFILE 환경변수
+"""
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.profiling import JobProfiler, classify_frame, profile_mode
+from src.utils.stage_metrics import StageMetrics
+
+
+def busy(n: int = 300_000) -> int:
+    return sum(i * i for i in range(n))
+
+
+class TestStageTimers:
+    def test_cpu_and_wait_separated(self):
+        metrics = StageMetrics()
+        with metrics.stage('python'):
+            busy()
+        with metrics.stage('ffmpeg'):
+            subprocess.run(['sleep', '0.3'])
+
+        summary = JobProfiler(metrics).summary()
+        assert summary['python']['cpu'] > 0
+        assert summary['ffmpeg']['wait'] >= 0.25
+        assert summary['ffmpeg']['cpu'] < 0.1
+
+    def test_begin_end_nesting(self):
+        metrics = StageMetrics()
+        outer = metrics.begin('images', scenes=2)
+        inner = metrics.begin('upload')
+        assert metrics.active_stage(threading.get_ident()) == 'upload'
+        metrics.end(inner)
+        assert metrics.active_stage(threading.get_ident()) == 'images'
+        metrics.end(outer, error=RuntimeError('api'))
+        assert metrics.active_stage(threading.get_ident()) is None
+        assert [r['stage'] for r in metrics.records] == ['upload', 'images']
+        assert metrics.records[-1]['status'] == 'error'
+        assert metrics.records[-1]['scenes'] == 2
+
+    def test_profile_mode_from_env(self, monkeypatch):
+        monkeypatch.delenv('PIPELINE_PROFILE', raising=False)
+        assert profile_mode() is None
+        assert profile_mode('sample') == 'sample'
+        monkeypatch.setenv('PIPELINE_PROFILE', '1')
+        assert profile_mode() == 'stages'
+        monkeypatch.setenv('PIPELINE_PROFILE', 'off')
+        assert profile_mode() is None
+
+    def test_classify_frame(self):
+        assert classify_frame('/usr/lib/python3.11/subprocess.py') == 'subprocess'
+        assert classify_frame('/usr/lib/python3.11/selectors.py') == 'network'
+        assert classify_frame('/usr/lib/python3.11/threading.py',
+                              ('/src/utils/ffmpeg_runner.py',)) == 'subprocess'
+        assert classify_frame('/usr/lib/python3.11/threading.py') == 'wait'
+        assert classify_frame('/src/video_generator/create_video_from_folder.py') == 'python'
+
+
+class TestOutput:
+    def test_sampling_attributes_samples_to_stages(self, tmp_path):
+        metrics = StageMetrics()
+        with JobProfiler(metrics, mode='sample', interval=0.005) as profiler:
+            def render():
+                with metrics.stage('render', scene=1):
+                    subprocess.run(['sleep', '0.3'])
+
+            thread = threading.Thread(target=render, name='scene-worker')
+            thread.start()
+            with metrics.stage('tts'):
+                busy(2_000_000)
+            thread.join()
+
+        summary = profiler.summary()
+        assert summary['render']['samples'].get('subprocess', 0) > 0.1
+        assert summary['tts']['samples'].get('python', 0) > 0
+
+        video = tmp_path / 'final.mp4'
+        video.write_bytes(b'')
+        written = profiler.write(video)
+        assert [p.name for p in written] == ['final.speedscope.json', 'final.profile.txt']
+
+        data = json.loads(written[0].read_text(encoding='utf-8'))
+        frames = data['shared']['frames']
+        profiles = {p['name']: p for p in data['profiles']}
+        assert '단계 (scene-worker)' in profiles
+        sampled = profiles['샘플 (scene-worker)']
+        assert len(sampled['samples']) == len(sampled['weights'])
+        assert frames[sampled['samples'][-1][0]]['name'] in ('[render]', '[(단계 밖)]')
+
+        for profile in data['profiles']:
+            if profile['type'] == 'evented':
+                ats = [e['at'] for e in profile['events']]
+                assert ats == sorted(ats)
+                assert [e['type'] for e in profile['events']].count('O') == \
+                    [e['type'] for e in profile['events']].count('C')
+
+        assert 'render' in written[1].read_text(encoding='utf-8')
+
+    def test_cprofile_written_to_folder(self, tmp_path):
+        metrics = StageMetrics()
+        with JobProfiler(metrics, mode='cprofile') as profiler:
+            with metrics.stage('subtitles'):
+                busy()
+        written = profiler.write(tmp_path)
+        assert sorted(p.name for p in written) == ['profile.prof', 'profile.profile.txt', 'profile.speedscope.json']
+        assert 'busy' in (tmp_path / 'profile.profile.txt').read_text(encoding='utf-8')
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            JobProfiler(StageMetrics(), mode='perf')
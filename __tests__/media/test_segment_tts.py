@@ -0,0 +1,125 @@
+"""
+중국어 영상 변환 - 세그먼트 TTS 동시 합성 테스트
+
+테스트 범위:
+- 동시 합성 수 제한 (concurrency)
+- 완료 순서와 무관하게 세그먼트 순서 유지, 빈 텍스트 / 실패 세그먼트 제외
+- 길이는 오디오 바이트 헤더에서 계산, 읽을 수 없으면 원본 구간 길이
+- 청크 파이프라인: 인식 청크마다 번역 → TTS, 파일 번호 연속, 번역 실패 시 원문 유지, 인식 실패 시 None
+"""
+import asyncio
+import io
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip('cv2')
+from src.video_generator import chinese_video_converter as converter
+
+
+@pytest.fixture(autouse=True)
+def broker_db(tmp_path, monkeypatch):
+    """자원 브로커 DB는 테스트 임시 디렉토리에 (저장소에 .queue/를 남기지 않음)"""
+    monkeypatch.setenv('RESOURCE_BROKER_DB', str(tmp_path / 'resources.db'))
+
+
+def wav_bytes(seconds: float, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b'\0\0' * int(seconds * rate))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fake_tts(monkeypatch):
+    state = {'active': 0, 'peak': 0}
+
+    async def synthesize(text, client=None):
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        await asyncio.sleep(0.01 * (len(text) % 4))  # 일부러 완료 순서를 섞음
+        state['active'] -= 1
+        if text == 'fail':
+            return None
+        if text == 'garbage':
+            return b'not audio'
+        return wav_bytes(len(text) / 10)
+
+    monkeypatch.setattr(converter, 'EDGE_TTS_AVAILABLE', True)
+    monkeypatch.setattr(converter, '_segment_tts_bytes', synthesize)
+    return state
+
+
+def segment(i, text):
+    return {'start': float(i), 'end': i + 0.5, 'translated': text}
+
+
+class TestSegmentTTS:
+    def test_bounded_concurrency_and_order(self, tmp_path, fake_tts):
+        segments = [segment(i, 'x' * (i + 5)) for i in range(12)]
+        result = asyncio.run(converter.generate_audio_for_segments(segments, tmp_path, concurrency=3))
+
+        assert fake_tts['peak'] == 3
+        assert [r['original_start'] for r in result] == [float(i) for i in range(12)]
+        assert [r['path'].name for r in result] == [f'segment_{i:03d}.mp3' for i in range(1, 13)]
+        assert result[0]['actual_duration'] == pytest.approx(0.5)
+        assert all(r['path'].exists() for r in result)
+
+    def test_failures_skipped_and_duration_fallback(self, tmp_path, fake_tts):
+        segments = [segment(0, 'hello'), segment(1, ''), segment(2, 'fail'), segment(3, 'garbage')]
+        result = asyncio.run(converter.generate_audio_for_segments(segments, tmp_path))
+
+        assert [r['text'] for r in result] == ['hello', 'garbage']
+        assert result[1]['path'].name == 'segment_004.mp3'
+        assert result[1]['actual_duration'] == pytest.approx(0.5)  # 원본 구간 길이
+
+
+class TestTranscribeTranslateDub:
+    def test_chunks_flow_through_translation_and_tts_in_order(self, tmp_path, fake_tts, monkeypatch):
+        batches = [[{'start': 0.0, 'end': 1.0, 'text': 'aa'}, {'start': 1.0, 'end': 2.0, 'text': 'bbb'}],
+                   [],
+                   [{'start': 5.0, 'end': 6.0, 'text': 'cccc'}]]
+        translated_batches = []
+
+        def fake_stream(audio_path, language='zh', cancel_check=None):
+            yield from batches
+
+        def fake_translate(batch, source_lang='zh', target_lang='ko'):
+            translated_batches.append([item['text'] for item in batch])
+            if batch[0]['text'] == 'cccc':
+                return batch  # 번역 실패 → 원문 유지
+            return [{'start': item['start'], 'end': item['end'], 'original': item['text'],
+                     'translated': item['text'].upper()} for item in batch]
+
+        monkeypatch.setattr(converter, 'stream_transcribe', fake_stream)
+        monkeypatch.setattr(converter, 'translate_segments_claude', fake_translate)
+        monkeypatch.setattr(converter, 'ANTHROPIC_AVAILABLE', True)
+
+        segments, translated, audio = asyncio.run(
+            converter.transcribe_translate_dub(tmp_path / 'audio.wav', tmp_path))
+
+        assert [s['text'] for s in segments] == ['aa', 'bbb', 'cccc']
+        assert translated_batches == [['aa', 'bbb'], ['cccc']]
+        assert [t['translated'] for t in translated] == ['AA', 'BBB', 'cccc']
+        assert [a['path'].name for a in audio] == ['segment_001.mp3', 'segment_002.mp3', 'segment_003.mp3']
+        assert [a['original_start'] for a in audio] == [0.0, 1.0, 5.0]
+
+    def test_recognition_failure_returns_none(self, tmp_path, fake_tts, monkeypatch):
+        def broken_stream(audio_path, language='zh', cancel_check=None):
+            yield [{'start': 0.0, 'end': 1.0, 'text': 'aa'}]
+            raise RuntimeError('decoder crashed')
+
+        monkeypatch.setattr(converter, 'stream_transcribe', broken_stream)
+        monkeypatch.setattr(converter, 'translate_segments_claude', lambda batch, **kwargs: batch)
+        monkeypatch.setattr(converter, 'ANTHROPIC_AVAILABLE', True)
+
+        assert asyncio.run(converter.transcribe_translate_dub(tmp_path / 'audio.wav', tmp_path)) is None
@@ -0,0 +1,125 @@
+"""
+VAD 청크 스트리밍 음성 인식 테스트
+
+테스트 범위:
+- 오디오 길이별 모델 선택, WHISPER_MODEL 환경변수 우선
+- 에너지 VAD: 무음 구간 제외, 짧은 쉼은 이어 붙임, 청크 길이 상한 / 긴 발화 분할
+- 16kHz mono WAV 로딩 (다른 형식은 거부)
+- 청크별 인식 결과를 원본 시각으로 옮겨 순서대로 yield, 이전 청크 문장을 다음 청크 프롬프트로
+"""
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import model_cache
+from src.utils.cancellation import OperationCancelled
+from src.utils.streaming_asr import SAMPLE_RATE, choose_model, load_pcm, stream_transcribe, vad_chunks
+
+np = pytest.importorskip('numpy')
+
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.random.default_rng(0).normal(0, 1e-4, int(seconds * SAMPLE_RATE)).astype(np.float32)
+
+
+def write_wav(path, pcm, rate=SAMPLE_RATE):
+    with wave.open(str(path), 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes((pcm * 32767).astype('<i2').tobytes())
+    return path
+
+
+class TestChooseModel:
+    def test_longer_audio_gets_smaller_model(self, monkeypatch):
+        monkeypatch.delenv('WHISPER_MODEL', raising=False)
+        assert choose_model(60) == 'medium'
+        assert choose_model(600) == 'small'
+        assert choose_model(3600) == 'base'
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv('WHISPER_MODEL', 'large-v3')
+        assert choose_model(3600) == 'large-v3'
+
+
+class TestVadChunks:
+    def test_silence_is_skipped_and_short_pauses_joined(self):
+        pcm = np.concatenate([silence(2), tone(3), silence(0.2), tone(2), silence(40), tone(4), silence(1)])
+        chunks = [(s / SAMPLE_RATE, e / SAMPLE_RATE) for s, e in vad_chunks(pcm)]
+
+        assert len(chunks) == 2
+        assert chunks[0][0] == pytest.approx(1.8, abs=0.1)
+        assert chunks[0][1] == pytest.approx(7.4, abs=0.1)
+        assert chunks[1][0] == pytest.approx(47.0, abs=0.1)
+
+    def test_chunks_respect_length_limit(self):
+        pcm = np.concatenate([tone(10), silence(1), tone(10), silence(1), tone(10), silence(1), tone(75)])
+        chunks = vad_chunks(pcm, chunk_seconds=30)
+
+        assert all(e - s <= 30 * SAMPLE_RATE for s, e in chunks)
+        assert all(a[1] <= b[0] for a, b in zip(chunks, chunks[1:]))
+        assert chunks[-1][1] == len(pcm)
+        assert sum(e - s for s, e in chunks) >= 105 * SAMPLE_RATE
+
+    def test_all_silence(self):
+        assert vad_chunks(np.zeros(SAMPLE_RATE * 5, dtype=np.float32)) == []
+
+
+class TestLoadPcm:
+    def test_round_trip_and_format_check(self, tmp_path):
+        pcm = load_pcm(write_wav(tmp_path / 'a.wav', tone(0.5)))
+        assert pcm.dtype == np.float32 and len(pcm) == SAMPLE_RATE // 2
+        assert np.abs(pcm).max() == pytest.approx(0.3, abs=0.01)
+
+        with pytest.raises(ValueError):
+            load_pcm(write_wav(tmp_path / 'b.wav', tone(0.5), rate=44100))
+
+
+class FakeWhisper:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, language=None, task=None, verbose=None, initial_prompt=None):
+        self.calls.append((len(audio) / SAMPLE_RATE, initial_prompt))
+        n = len(self.calls)
+        return {'segments': [{'start': 0.1, 'end': 0.9, 'text': f' 第{n}句 '}, {'start': 1.0, 'end': 1.1, 'text': ' '}]}
+
+
+class TestStreamTranscribe:
+    def test_offsets_prompts_and_model_choice(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('WHISPER_MODEL', raising=False)
+        whisper = FakeWhisper()
+        requested = []
+        monkeypatch.setattr(model_cache, 'get_whisper_model', lambda name: requested.append(name) or whisper)
+        path = write_wav(tmp_path / 'a.wav', np.concatenate([silence(1), tone(2), silence(35), tone(2)]))
+
+        batches = list(stream_transcribe(path))
+
+        assert requested == ['medium']
+        assert [[s['text'] for s in batch] for batch in batches] == [['第1句'], ['第2句']]
+        assert batches[0][0]['start'] == pytest.approx(0.9, abs=0.1)
+        assert batches[1][0]['start'] == pytest.approx(37.9, abs=0.1)
+        assert [prompt for _, prompt in whisper.calls] == [None, '第1句']
+
+    def test_cancel_between_chunks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(model_cache, 'get_whisper_model', lambda name: FakeWhisper())
+        path = write_wav(tmp_path / 'a.wav', np.concatenate([tone(2), silence(35), tone(2)]))
+        stop = []
+
+        stream = stream_transcribe(path, cancel_check=lambda: bool(stop))
+        next(stream)
+        stop.append(True)
+        with pytest.raises(OperationCancelled):
+            next(stream)
@@ -0,0 +1,87 @@
+"""
+자막 / 워터마크 영역 자동 감지 테스트
+
+테스트 범위:
+- 여러 프레임에 반복되는 글자 띠 감지 (하단 자막 + 상단 로고 → 영역 2개)
+- 배경 질감 / 한두 프레임만 나오는 글자는 무시
+- 분석 해상도 → 원본 해상도 변환, 전체를 덮는 사각형
+- ffmpeg가 있으면: 영상에서 샘플링 → 원본 좌표 영역
+"""
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.text_regions import bounding_region, detect_text_bands, scale_regions
+
+
+def make_frames(n=24, height=120, width=200, seed=0):
+    """부드러운 배경 + 하단 자막(프레임마다 길이 / 내용 변경) + 좌상단 고정 로고"""
+    np = pytest.importorskip('numpy')
+    rng = np.random.default_rng(seed)
+    base = np.linspace(60, 140, width, dtype=np.float32)[None, :].repeat(height, 0)
+    frames, spans = [], []
+    for i in range(n):
+        frame = base + rng.normal(0, 2, (height, width))
+        if i % 4 != 3:  # 자막 없는 프레임도 섞음
+            length = rng.integers(60, 140)
+            start = (width - length) // 2
+            spans.append((start, start + length))
+            strokes = rng.integers(0, 2, length) * 200
+            frame[96:108, start:start + length] = np.maximum(frame[96:108, start:start + length], strokes)
+        frame[6:14, 8:40] = np.tile([20, 230], 16)  # 로고
+        frames.append(np.clip(frame, 0, 255).astype(np.uint8))
+    return np.stack(frames), (min(s for s, _ in spans), max(e for _, e in spans))
+
+
+class TestDetectTextBands:
+    def test_subtitle_band_and_logo(self):
+        frames, (first, last) = make_frames()
+        regions = detect_text_bands(frames)
+        assert len(regions) == 2
+        (lx, ly, lw, lh), (sx, sy, sw, sh) = sorted(regions, key=lambda r: r[1])
+        assert 5 <= ly <= 7 and 12 <= ly + lh <= 15 and lx <= 9 and lx + lw >= 39
+        assert 94 <= sy <= 97 and 107 <= sy + sh <= 110
+        # 프레임마다 길이가 달라도 가장 긴 자막까지 덮음
+        assert first - 1 <= sx <= first + 1 and last - 1 <= sx + sw <= last + 1
+
+    def test_texture_and_rare_text_ignored(self):
+        frames, _ = make_frames()
+        np = pytest.importorskip('numpy')
+        frames[:, 96:108, :] = frames[:, 90:91, :]  # 자막 제거
+        frames[:, 6:14, 8:40] = 100  # 로고 제거
+        frames[0, 50:60, 50:150] = np.tile([0, 255], 50)  # 한 프레임에만 나온 글자
+        assert detect_text_bands(frames) == []
+
+    def test_scale_to_source_resolution(self):
+        assert scale_regions([(10, 90, 50, 10)], 4.0, 800, 400, padding=6) == [(34, 354, 212, 46)]
+        assert scale_regions([(0, 95, 200, 5)], 4.0, 800, 400, padding=6) == [(0, 374, 800, 26)]
+
+    def test_bounding_region(self):
+        assert bounding_region([(10, 5, 20, 10), (0, 80, 100, 20)]) == (0, 5, 100, 95)
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None, reason='ffmpeg 필요')
+def test_detect_from_video(tmp_path):
+    from src.utils.text_regions import detect_subtitle_regions
+
+    video = tmp_path / 'sub.mp4'
+    subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', 'color=c=0x406080:size=640x360:rate=25:duration=4',
+         # 평평한 배경, 글자 같은 획은 300~330 띠 안에만 (자막 상자를 잘라 격자를 그린 뒤 다시 얹음)
+         '-vf', "drawbox=x=120:y=300:w=400:h=30:color=white:t=fill,split[bg][box];"
+                "[box]crop=400:30:120:300,drawgrid=w=8:h=30:t=3:color=black@1[text];"
+                "[bg][text]overlay=120:300",
+         '-c:v', 'libx264', str(video)],
+        check=True,
+    )
+    regions = detect_subtitle_regions(video, count=8)
+    assert regions
+    x, y, w, h = bounding_region(regions)
+    assert y >= 280 and y + h <= 345 and x >= 100 and x + w <= 540
@@ -0,0 +1,68 @@
+"""
+워터마크 제거 취소 처리 테스트
+
+테스트 범위:
+- STOP 신호 / 인페인팅 중 취소는 CancelledException으로 전파 (오류로 보고 원본을 복사해 성공 처리하지 않음)
+- 실제 오류는 기존처럼 원본 복사 (encode_plan이 있으면 False)
+- LAMA 모드도 취소를 실패(False)로 바꾸지 않음
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip('cv2')
+from src.utils.cancellation import OperationCancelled
+from src.video_generator import chinese_video_converter as converter
+
+
+@pytest.fixture
+def video(tmp_path, monkeypatch):
+    monkeypatch.setattr(converter, 'get_video_dimensions', lambda path: (320, 240))
+    path = tmp_path / 'input.mp4'
+    path.write_bytes(b'source')
+    yield path
+    converter.release_cancel_token(tmp_path, names=('STOP',))  # should_stop이 만든 폴더 감시 해제
+
+
+class TestRemoveWatermarkCancel:
+    def test_stop_before_start(self, video, tmp_path):
+        (tmp_path / 'STOP').touch()
+        output = tmp_path / 'out.mp4'
+
+        with pytest.raises(converter.CancelledException):
+            converter.remove_watermark_ai(video, output, (0, 200, 320, 40), output_dir=tmp_path)
+        assert not output.exists()
+
+    def test_cancel_during_inpainting(self, video, tmp_path, monkeypatch):
+        def cancelled(*args, **kwargs):
+            raise OperationCancelled("인페인팅 중 작업 취소됨")
+
+        monkeypatch.setattr(converter, 'parallel_inpaint_video', cancelled)
+        output = tmp_path / 'out.mp4'
+
+        with pytest.raises(converter.CancelledException):
+            converter.remove_watermark_ai(video, output, (0, 200, 320, 40), output_dir=tmp_path)
+        assert not output.exists()
+
+    def test_error_still_copies_original(self, video, tmp_path, monkeypatch):
+        def broken(*args, **kwargs):
+            raise RuntimeError("encoder failed")
+
+        monkeypatch.setattr(converter, 'parallel_inpaint_video', broken)
+        output = tmp_path / 'out.mp4'
+
+        assert converter.remove_watermark_ai(video, output, (0, 200, 320, 40), output_dir=tmp_path) is True
+        assert output.read_bytes() == b'source'
+        assert converter.remove_watermark_ai(video, tmp_path / 'final.mp4', (0, 200, 320, 40),
+                                             encode_plan=converter.EncodePlan()) is False
+
+    def test_lama_stop_is_not_reported_as_failure(self, video, tmp_path):
+        (tmp_path / 'STOP').touch()
+
+        with pytest.raises(converter.CancelledException):
+            converter._remove_watermark_lama(video, tmp_path / 'out.mp4', [(0, 200, 320, 40)], output_dir=tmp_path)
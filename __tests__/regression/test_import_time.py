@@ -0,0 +1,111 @@
+"""
+import 시간 회귀 테스트 (지연 import 가드)
+
+새 인터프리터에서 모듈을 import하고
+- 무거운 패키지(numpy / PIL / cv2 / edge_tts / boto3 / openai ...)가 로드되지 않았는지
+- import 시간이 예산 안인지
+확인한다. 무거운 패키지는 빈 가짜 모듈로 대체해서, 설치 여부와 관계없이
+누군가 모듈 최상단에서 import하면 바로 잡힌다.
+
+벤치마크만 보려면:
+    python __tests__/regression/test_import_time.py
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent
+
+HEAVY_MODULES = [
+    'numpy', 'PIL', 'cv2', 'edge_tts', 'boto3', 'botocore', 'google.cloud.texttospeech',
+    'openai', 'anthropic', 'moviepy', 'whisper', 'requests',
+]
+
+# 모듈 → import 시간 예산 (초). 로컬 측정값의 수 배로 잡아 CI 부하에도 견디게 함
+IMPORT_BUDGETS = {
+    'src.utils': 0.5,
+    'src.utils.audio_mixing': 0.5,
+    'src.video_generator.create_video_from_folder': 2.0,
+    'src.video_generator.long_form_creator': 2.0,
+}
+
+MEASURE = '''
+import json, sys, time
+started = time.perf_counter()
+try:
+    import {module}
+    error = None
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+elapsed = time.perf_counter() - started
+heavy = {heavy!r}
+print(json.dumps({{"elapsed": elapsed, "error": error, "loaded": [m for m in heavy if m in sys.modules]}}))
+'''
+
+
+def make_fake_packages(root: Path):
+    """무거운 패키지를 빈 모듈로 흉내 (find_spec은 성공, import하면 sys.modules에 남음)"""
+    for name in HEAVY_MODULES:
+        path = root.joinpath(*name.split('.'))
+        path.mkdir(parents=True, exist_ok=True)
+        (path / '__init__.py').write_text('')
+    (root / 'PIL' / 'Image.py').write_text('')
+
+
+def measure_import(module: str, fake_root: Path, cwd: Path) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(fake_root), str(BACKEND_ROOT)]))
+    result = subprocess.run(
+        [sys.executable, '-c', MEASURE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=60,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope='module')
+def fake_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp('fake_heavy')
+    make_fake_packages(root)
+    return root
+
+
+class TestImportTime:
+    @pytest.mark.parametrize('module', list(IMPORT_BUDGETS))
+    def test_no_heavy_imports_at_module_load(self, module, fake_root, tmp_path):
+        result = measure_import(module, fake_root, tmp_path)
+
+        if result['error'] and result['error'].startswith('ModuleNotFoundError'):
+            pytest.skip(f"{module}: {result['error']}")  # 가벼운 필수 의존성이 없는 환경
+        assert result['error'] is None, result['error']
+        assert result['loaded'] == [], f"{module} import 시 로드됨: {result['loaded']}"
+        assert result['elapsed'] < IMPORT_BUDGETS[module], f"{module}: {result['elapsed']:.3f}초"
+
+    def test_lazy_module_loads_on_first_use(self, fake_root, tmp_path):
+        (fake_root / 'edge_tts' / '__init__.py').write_text('VALUE = 42\n')
+        code = (
+            "import sys\n"
+            "from src.utils.lazy_import import lazy_module, module_available\n"
+            "m = lazy_module('edge_tts')\n"
+            "assert 'edge_tts' not in sys.modules and module_available('edge_tts')\n"
+            "assert not module_available('definitely_not_installed_pkg')\n"
+            "assert m.VALUE == 42 and 'edge_tts' in sys.modules\n"
+            "print('ok')\n"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(fake_root), str(BACKEND_ROOT)]))
+        result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env,
+                                capture_output=True, text=True, timeout=60)
+        assert result.stdout.strip() == 'ok', result.stderr
+
+
+if __name__ == '__main__':
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'fake'
+        make_fake_packages(root)
+        for module, budget in IMPORT_BUDGETS.items():
+            result = measure_import(module, root, Path(tmp))
+            status = result['error'] or ('heavy: ' + ', '.join(result['loaded']) if result['loaded'] else 'ok')
+            print(f"{module:50s} {result['elapsed'] * 1000:8.1f} ms (budget {budget * 1000:.0f} ms)  {status}")
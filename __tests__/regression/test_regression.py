@@ -37,11 +37,15 @@ TEST_OUTPUT_DIR = Path(__file__).parent / 'test_output'
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_environment():
+def setup_test_environment(tmp_path_factory):
     """Setup and cleanup test environment"""
     # Create output directory
     TEST_OUTPUT_DIR.mkdir(exist_ok=True)
 
+    # Keep the resource broker DB out of the repo (inherited by pipeline subprocesses)
+    previous_broker_db = os.environ.get('RESOURCE_BROKER_DB')
+    os.environ['RESOURCE_BROKER_DB'] = str(tmp_path_factory.mktemp('broker') / 'resources.db')
+
     safe_print(f"\n{'='*70}")
     safe_print(f"Regression Test Environment")
     safe_print(f"{'='*70}")
@@ -52,6 +56,11 @@ def setup_test_environment():
 
     yield
 
+    if previous_broker_db is None:
+        os.environ.pop('RESOURCE_BROKER_DB', None)
+    else:
+        os.environ['RESOURCE_BROKER_DB'] = previous_broker_db
+
     # Cleanup is optional - keep output for inspection
     # shutil.rmtree(TEST_OUTPUT_DIR, ignore_errors=True)
 
@@ -580,6 +589,7 @@ class TestProcessControl:
         assert controller.output_dir == output_dir
         assert controller.stop_file == output_dir / 'STOP'
         assert controller.should_stop == False
+        controller.close()
 
         safe_print("\n[SUCCESS] ProcessController initialization test passed")
 
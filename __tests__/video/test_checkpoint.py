@@ -0,0 +1,118 @@
+"""
+단계별 체크포인트 저널 테스트
+
+테스트 범위:
+- 기록 → 다시 열어서 조회 (상대 경로 저장, 폴더 이동 후에도 유효)
+- 입력 지문이 다르거나 출력 파일이 없거나 잘렸으면 다시 실행 (미디어 파일 지문은 폴더를 옮겨도 같음)
+- 손상된 파일 / 저장 중 임시 파일 정리, 여러 스레드 동시 기록
+- clear()로 처음부터 다시
+"""
+import json
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.checkpoint import CheckpointJournal, CHECKPOINT_FILENAME, fingerprint, file_signature
+
+
+def make_journal(folder: Path) -> CheckpointJournal:
+    return CheckpointJournal(folder / CHECKPOINT_FILENAME)
+
+
+class TestLookup:
+    def test_record_survives_reopen(self, tmp_path):
+        audio = tmp_path / 'scene_01_audio.mp3'
+        audio.write_bytes(b'audio')
+        key = fingerprint('안녕하세요', 'ko-KR-SoonBokNeural', 1.0)
+        make_journal(tmp_path).record('tts', 1, key, outputs=[audio], duration=1.5,
+                                      word_timings=[{'word': '안녕하세요', 'start': 0.0, 'end': 1.5}])
+
+        cached = make_journal(tmp_path).lookup('tts', 1, key)
+        assert cached['duration'] == 1.5
+        assert cached['word_timings'][0]['word'] == '안녕하세요'
+
+        saved = json.loads((tmp_path / CHECKPOINT_FILENAME).read_text(encoding='utf-8'))
+        assert saved['stages']['tts']['1']['outputs'][0]['path'] == 'scene_01_audio.mp3'
+
+    def test_folder_moved(self, tmp_path):
+        folder = tmp_path / 'project'
+        folder.mkdir()
+        video = folder / 'scene_01.mp4'
+        video.write_bytes(b'video')
+        make_journal(folder).record('render', 1, 'k', outputs=[video])
+
+        moved = tmp_path / 'moved'
+        shutil.move(str(folder), str(moved))
+        assert make_journal(moved).lookup('render', 1, 'k') == {}
+
+    def test_key_mismatch(self, tmp_path):
+        video = tmp_path / 'scene_01.mp4'
+        video.write_bytes(b'video')
+        journal = make_journal(tmp_path)
+        journal.record('render', 1, fingerprint('a', 1920, 1080), outputs=[video])
+        assert journal.lookup('render', 1, fingerprint('a', 1080, 1920)) is None
+        assert journal.lookup('render', 2, fingerprint('a', 1920, 1080)) is None
+
+    def test_missing_or_truncated_output(self, tmp_path):
+        video = tmp_path / 'scene_01.mp4'
+        video.write_bytes(b'complete video')
+        journal = make_journal(tmp_path)
+        journal.record('render', 1, 'k', outputs=[video])
+
+        video.write_bytes(b'cut')
+        assert journal.lookup('render', 1, 'k') is None
+        video.unlink()
+        assert journal.lookup('render', 1, 'k') is None
+
+    def test_file_signature_tracks_changes(self, tmp_path):
+        media = tmp_path / '01.jpg'
+        assert file_signature(media) is None
+        media.write_bytes(b'a')
+        before = fingerprint(file_signature(media))
+        media.write_bytes(b'ab')
+        assert fingerprint(file_signature(media)) != before
+
+    def test_file_signature_survives_moved_folder(self, tmp_path):
+        media = tmp_path / 'project' / '01.jpg'
+        media.parent.mkdir()
+        media.write_bytes(b'a')
+        before = file_signature(media)
+
+        moved = tmp_path / 'mounted' / 'project'
+        moved.parent.mkdir()
+        media.parent.rename(moved)
+        assert file_signature(moved / '01.jpg') == before
+
+
+class TestPersistence:
+    def test_corrupt_file_starts_fresh(self, tmp_path):
+        (tmp_path / CHECKPOINT_FILENAME).write_text('{"version": 1, "stag', encoding='utf-8')
+        journal = make_journal(tmp_path)
+        assert journal.lookup('tts', 1, 'k') is None
+        journal.record('concat', 'final.mp4', 'k')
+        assert make_journal(tmp_path).lookup('concat', 'final.mp4', 'k') == {}
+
+    def test_concurrent_records(self, tmp_path):
+        journal = make_journal(tmp_path)
+        threads = [threading.Thread(target=journal.record, args=('render', n, f'k{n}')) for n in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        reopened = make_journal(tmp_path)
+        assert reopened.completed('render') == 20
+        assert all(reopened.lookup('render', n, f'k{n}') == {} for n in range(20))
+        assert [p.name for p in tmp_path.iterdir()] == [CHECKPOINT_FILENAME]
+
+    def test_clear(self, tmp_path):
+        journal = make_journal(tmp_path)
+        journal.record('tts', 1, 'k')
+        journal.clear()
+        assert not (tmp_path / CHECKPOINT_FILENAME).exists()
+        assert make_journal(tmp_path).lookup('tts', 1, 'k') is None
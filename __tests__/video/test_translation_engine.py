@@ -0,0 +1,131 @@
+"""
+세그먼트 번역 엔진 테스트
+
+테스트 범위:
+- 추정 토큰 예산 / 최대 항목 수에 따른 청크 분할
+- 코드블록 응답 파싱 → id별 dict
+- 입력 순서 유지, 중복 문장은 한 번만 요청, 빈 문장 제외
+- 응답에서 빠진 id만 재시도, 끝내 실패한 항목은 None
+- 번역 메모리에 있는 문장은 요청하지 않음 (언어 쌍별로 구분)
+"""
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import translation_engine
+from src.utils.translation_engine import (
+    TranslationMemory, chunk_items, estimate_tokens, parse_translations, translate_texts,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(translation_engine, 'RETRY_DELAY', 0)
+
+
+class FakeModel:
+    """항목마다 '<원문>!' 로 번역, skip에 든 원문은 처음 한 번 응답에서 뺌"""
+
+    def __init__(self, skip=(), always_skip=()):
+        self.calls = []
+        self.skip = set(skip)
+        self.always_skip = set(always_skip)
+        self._lock = threading.Lock()
+
+    def __call__(self, items):
+        with self._lock:
+            self.calls.append([item['text'] for item in items])
+        output = []
+        for item in items:
+            if item['text'] in self.always_skip:
+                continue
+            if item['text'] in self.skip:
+                with self._lock:
+                    self.skip.discard(item['text'])
+                continue
+            output.append({'id': item['id'], 'text': item['text'] + '!'})
+        return '```json\n' + json.dumps(output, ensure_ascii=False) + '\n```'
+
+
+class TestChunking:
+    def test_cjk_costs_more_than_latin(self):
+        assert estimate_tokens('你好世界你好世界') > estimate_tokens('hello wo')
+
+    def test_chunks_respect_budget_and_order(self):
+        items = [{'id': i, 'text': '你' * 50} for i in range(10)]
+        chunks = chunk_items(items, token_budget=estimate_tokens('你' * 50) * 3)
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+        assert [item['id'] for chunk in chunks for item in chunk] == list(range(10))
+
+    def test_max_items_and_oversized_item(self):
+        items = [{'id': 0, 'text': '你' * 500}] + [{'id': i, 'text': 'a'} for i in range(1, 6)]
+        chunks = chunk_items(items, token_budget=100, max_items=2)
+
+        assert [len(chunk) for chunk in chunks] == [1, 2, 2, 1]
+
+
+class TestParse:
+    def test_code_block_and_invalid_items(self):
+        text = '```json\n[{"id": 1, "text": "하나"}, {"id": "2", "text": "둘"}, {"text": "id 없음"}]\n```'
+        assert parse_translations(text) == {1: '하나', 2: '둘'}
+
+
+class TestTranslateTexts:
+    def test_order_dedup_and_empty(self):
+        model = FakeModel()
+        result = translate_texts(['a', 'b', 'a', '', ' b '], model, 'zh', 'ko', token_budget=10)
+
+        assert result == ['a!', 'b!', 'a!', None, 'b!']
+        assert sorted(text for call in model.calls for text in call) == ['a', 'b']
+
+    def test_missing_ids_are_retried_alone(self):
+        model = FakeModel(skip={'b'})
+        result = translate_texts(['a', 'b', 'c'], model, 'zh', 'ko')
+
+        assert result == ['a!', 'b!', 'c!']
+        assert model.calls == [['a', 'b', 'c'], ['b']]
+
+    def test_permanent_failure_leaves_none(self):
+        model = FakeModel(always_skip={'b'})
+        result = translate_texts(['a', 'b'], model, 'zh', 'ko', retries=1)
+
+        assert result == ['a!', None]
+        assert len(model.calls) == 2
+
+    def test_request_errors_do_not_fail_other_chunks(self):
+        def request(items):
+            if items[0]['text'] == 'bad':
+                raise RuntimeError('rate limited')
+            return json.dumps([{'id': item['id'], 'text': 'ok'} for item in items])
+
+        result = translate_texts(['good', 'bad'], request, 'zh', 'ko', token_budget=1, retries=0)
+        assert result == ['ok', None]
+
+
+class TestTranslationMemory:
+    def test_cached_lines_are_not_requested(self, tmp_path):
+        memory = TranslationMemory(str(tmp_path / 'tm.db'))
+        translate_texts(['a', 'b'], FakeModel(), 'zh', 'ko', memory=memory)
+        memory.close()
+
+        memory = TranslationMemory(str(tmp_path / 'tm.db'))
+        model = FakeModel()
+        result = translate_texts(['a', 'b', 'c'], model, 'zh', 'ko', memory=memory)
+
+        assert result == ['a!', 'b!', 'c!']
+        assert model.calls == [['c']]
+
+    def test_language_pair_is_part_of_key(self):
+        memory = TranslationMemory(':memory:')
+        memory.store({'a': '에이'}, 'zh', 'ko')
+
+        assert memory.lookup(['a'], 'zh', 'ko') == {'a': '에이'}
+        assert memory.lookup(['a'], 'zh', 'en') == {}
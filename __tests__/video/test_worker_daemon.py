@@ -0,0 +1,108 @@
+"""
+상주 워커 데몬 테스트
+
+테스트 범위:
+- 작업 후 argv / cwd / 환경변수 / 로깅 핸들러 복원, 종료 코드 전달
+- 스크립트 전역 상태는 작업마다 새로, import된 모듈은 재사용 (warm)
+- 작업 출력 로그 파일 (자식 프로세스 출력 포함)
+- 큐 작업 처리 + N개 처리 후 재시작 요청
+"""
+import logging
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.work_queue import WorkQueue, COMPLETED, FAILED
+from src.worker_daemon import JobWorker, run_script, JOB_TYPE_PREFIX, RECYCLE_EXIT_CODE
+
+STATEFUL_SCRIPT = '''
+import logging, os, sys
+import warm_counter
+
+warm_counter.calls += 1
+COUNT = globals().get('COUNT', 0) + 1
+os.environ['WORKER_TEST_VAR'] = 'changed'
+os.chdir(sys.argv[1])
+logging.getLogger().addHandler(logging.StreamHandler())
+print(f"count={COUNT} warm={warm_counter.calls}")
+sys.exit(int(sys.argv[2]))
+'''
+
+
+def write_scripts(tmp_path):
+    (tmp_path / 'warm_counter.py').write_text('calls = 0\n')
+    script = tmp_path / 'job.py'
+    script.write_text(STATEFUL_SCRIPT)
+    return script
+
+
+class TestRunScript:
+    def test_state_restored_and_exit_code(self, tmp_path, monkeypatch):
+        script = write_scripts(tmp_path)
+        monkeypatch.setenv('WORKER_TEST_VAR', 'original')
+        cwd = os.getcwd()
+        argv = sys.argv[:]
+        handlers = list(logging.getLogger().handlers)
+
+        code = run_script(script, [str(tmp_path), '3'])
+
+        assert code == 3
+        assert os.environ['WORKER_TEST_VAR'] == 'original'
+        assert os.getcwd() == cwd
+        assert sys.argv == argv
+        assert logging.getLogger().handlers == handlers
+
+    def test_script_globals_fresh_imports_warm(self, tmp_path):
+        script = write_scripts(tmp_path)
+        log_file = tmp_path / 'job.log'
+        sys.modules.pop('warm_counter', None)
+        try:
+            for _ in range(2):
+                assert run_script(script, [str(tmp_path), '0'], log_file=str(log_file)) == 0
+        finally:
+            sys.modules.pop('warm_counter', None)
+
+        assert log_file.read_text().splitlines() == ['count=1 warm=1', 'count=1 warm=2']
+
+    def test_log_file_captures_child_processes(self, tmp_path):
+        script = tmp_path / 'child.py'
+        script.write_text(
+            "import subprocess, sys\n"
+            "subprocess.run([sys.executable, '-c', 'print(\"from child\")'])\n"
+            "raise RuntimeError('boom')\n"
+        )
+        log_file = tmp_path / 'job.log'
+
+        assert run_script(script, log_file=str(log_file)) == 1
+        text = log_file.read_text()
+        assert 'from child' in text
+        assert 'RuntimeError: boom' in text
+
+
+class TestJobWorker:
+    def test_processes_jobs_and_recycles(self, tmp_path):
+        script = write_scripts(tmp_path)
+        db_path = str(tmp_path / 'worker.db')
+        queue = WorkQueue(db_path)
+        queue.enqueue(JOB_TYPE_PREFIX + 'fake', {'args': [str(tmp_path), '0']}, task_id='ok')
+        queue.enqueue(JOB_TYPE_PREFIX + 'fake', {'args': [str(tmp_path), '2']}, task_id='bad')
+        queue.enqueue(JOB_TYPE_PREFIX + 'fake', {'args': [str(tmp_path), '0']}, task_id='next')
+
+        worker = JobWorker(db_path=db_path, scripts={'fake': str(script)}, max_jobs=2, max_memory_mb=None)
+        try:
+            assert worker.serve(idle_timeout=1) == RECYCLE_EXIT_CODE
+        finally:
+            sys.modules.pop('warm_counter', None)
+
+        assert queue.get('ok').status == COMPLETED
+        bad = queue.get('bad')
+        assert bad.status == FAILED and bad.error == 'Exit code: 2'
+        assert queue.get('next').status == 'pending'  # 다음 워커가 처리
+
+    def test_idle_timeout(self, tmp_path):
+        worker = JobWorker(db_path=str(tmp_path / 'worker.db'), scripts={'fake': 'job.py'}, max_memory_mb=None)
+        assert worker.serve(idle_timeout=0.2) == 0
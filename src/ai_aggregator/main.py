@@ -19,6 +19,13 @@ from .agents import ChatGPTAgent, ClaudeAgent, GeminiAgent, GrokAgent
 from .aggregator import ResponseAggregator
 from colorama import Fore, Style, init
 import argparse
+from pathlib import Path
+
+try:
+    from src.utils.resource_broker import async_resource_lease
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from src.utils.resource_broker import async_resource_lease
 
 # Initialize colorama with strip=False to preserve ANSI codes and UTF-8
 # On Windows, colorama wraps stdout which can cause encoding issues
@@ -87,7 +94,8 @@ async def main(question: str, headless: bool = False, agents_to_use: list = None
 
     aggregator = ResponseAggregator()
 
-    async with async_playwright() as p:
+    # 동시에 도는 다른 작업(이미지 크롤러 등)과 브라우저 슬롯 공유
+    async with async_resource_lease('browser'), async_playwright() as p:
         import os
         import pathlib
 
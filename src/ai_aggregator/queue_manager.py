@@ -1,170 +1,102 @@
 """
-Simple file-based queue manager for concurrent request handling
+Queue manager for concurrent request handling
 서버 환경에서 여러 요청을 순차적으로 처리하기 위한 큐 시스템
+
+SQLite 작업 큐(src.utils.work_queue) 위에서 동작한다.
+- acquire_lock: 'ai_aggregator' 타입(동시 실행 1개) 작업을 등록하고 차례가 올 때까지 대기
+  (파일 락 + 1초 폴링 대신 Condition 대기, 먼저 온 요청부터 처리)
+- 대기 중 / 락을 잡은 동안 하트비트로 리스를 연장하므로, 프로세스가 죽으면 리스 만료 후 다음 요청이 진행
 """
 
-import os
 import sys
-import time
-import json
 from pathlib import Path
 from typing import Optional, Dict
-from datetime import datetime
 
-# Windows와 Unix 모두 지원
-if sys.platform == 'win32':
-    import msvcrt
-else:
-    import fcntl
+try:
+    from src.utils.work_queue import WorkQueue, LeaseHeartbeat, FINISHED_STATUSES
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from src.utils.work_queue import WorkQueue, LeaseHeartbeat, FINISHED_STATUSES
+
+
+LOCK_TASK_TYPE = 'ai_aggregator'
 
 
 class QueueManager:
-    """File-based queue manager using file locking"""
+    """SQLite-backed queue manager (one running execution at a time)"""
 
-    def __init__(self, queue_dir: str = ".queue"):
+    def __init__(self, queue_dir: str = ".queue", lease_seconds: float = 30.0):
         self.queue_dir = Path(queue_dir)
         self.queue_dir.mkdir(exist_ok=True)
-        self.lock_file = self.queue_dir / "queue.lock"
-        self.queue_file = self.queue_dir / "queue.json"
-        self.lock_fd = None
+        self.queue_file = self.queue_dir / "queue.db"
+        self.queue = WorkQueue(str(self.queue_file), lease_seconds=lease_seconds)
+        self.queue.set_limit(LOCK_TASK_TYPE, 1)
+        self._lock_task_id: Optional[str] = None
+        self._heartbeat: Optional[LeaseHeartbeat] = None
 
     def acquire_lock(self, timeout: int = 300) -> bool:
         """
         Acquire exclusive lock with timeout
-        다른 프로세스가 실행중이면 대기
+        다른 프로세스가 실행중이면 대기 (먼저 요청한 순서대로)
+        대기 중에도 하트비트로 리스를 연장 - 대기하던 프로세스가 죽으면 리스 만료 후 대기열에서 빠짐
         """
-        start_time = time.time()
-
-        while True:
-            try:
-                # Open lock file
-                if sys.platform == 'win32':
-                    # Windows: Open file for exclusive access
-                    self.lock_fd = open(self.lock_file, 'w')
-                    msvcrt.locking(self.lock_fd.fileno(), msvcrt.LK_NBLCK, 1)
-                else:
-                    # Unix: Use fcntl
-                    self.lock_fd = open(self.lock_file, 'w')
-                    fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-
-                # Successfully acquired lock
-                self._write_lock_info()
-                return True
-
-            except (IOError, OSError) as e:
-                # Lock is held by another process
-                if self.lock_fd is not None:
-                    try:
-                        self.lock_fd.close()
-                    except:
-                        pass
-                    self.lock_fd = None
-
-                # Check timeout
-                elapsed = time.time() - start_time
-                if elapsed >= timeout:
-                    print(f"[QUEUE] Timeout after {timeout}s waiting for lock")
-                    return False
-
-                # Wait and retry
-                if int(elapsed) % 10 == 0 and int(elapsed) > 0:
-                    print(f"[QUEUE] Waiting for lock... ({int(elapsed)}s)")
-
-                time.sleep(1)
-
-            except Exception as e:
-                print(f"[QUEUE] Error acquiring lock: {e}")
-                if self.lock_fd is not None:
-                    try:
-                        self.lock_fd.close()
-                    except:
-                        pass
-                    self.lock_fd = None
-                return False
+        task_id = self.queue.enqueue(LOCK_TASK_TYPE, {'pid': self.queue.worker_id}, lease=True)
+        heartbeat = LeaseHeartbeat(self.queue, task_id)
+        heartbeat.start()
+        task = None
+        try:
+            task = self.queue.wait_and_claim([LOCK_TASK_TYPE], task_id=task_id, timeout=timeout)
+            if task is None:
+                print(f"[QUEUE] Timeout after {timeout}s waiting for lock")
+        except Exception as e:
+            print(f"[QUEUE] Error acquiring lock: {e}")
+        finally:
+            # KeyboardInterrupt 등으로 빠져나가도 대기 작업을 남기지 않음
+            if task is None:
+                heartbeat.stop()
+                self.queue.remove(task_id)
+
+        if task is None:
+            return False
+        self._lock_task_id = task_id
+        self._heartbeat = heartbeat
+        return True
 
     def release_lock(self):
         """Release the lock"""
-        if self.lock_fd is not None:
-            try:
-                if sys.platform == 'win32':
-                    msvcrt.locking(self.lock_fd.fileno(), msvcrt.LK_UNLCK, 1)
-                else:
-                    fcntl.flock(self.lock_fd.fileno(), fcntl.LOCK_UN)
-
-                self.lock_fd.close()
-                self.lock_fd = None
-
-                # Clean up lock file
-                if self.lock_file.exists():
-                    try:
-                        os.remove(self.lock_file)
-                    except:
-                        pass
-
-            except Exception as e:
-                print(f"[QUEUE] Error releasing lock: {e}")
-
-    def _write_lock_info(self):
-        """Write lock information to file"""
+        if self._lock_task_id is None:
+            return
         try:
-            info = {
-                "pid": os.getpid(),
-                "timestamp": datetime.now().isoformat(),
-            }
-            self.lock_fd.write(json.dumps(info))
-            self.lock_fd.flush()
-        except:
-            pass
-
-    def add_to_queue(self, task_id: str, task_data: Dict):
+            if self._heartbeat is not None:
+                self._heartbeat.stop()
+            self.queue.remove(self._lock_task_id)
+        except Exception as e:
+            print(f"[QUEUE] Error releasing lock: {e}")
+        finally:
+            self._lock_task_id = None
+            self._heartbeat = None
+
+    def add_to_queue(self, task_id: str, task_data: Dict, task_type: str = 'default', priority: int = 0):
         """Add task to queue"""
         try:
-            queue = self._load_queue()
-            queue[task_id] = {
-                "data": task_data,
-                "status": "pending",
-                "created_at": datetime.now().isoformat(),
-            }
-            self._save_queue(queue)
+            self.queue.enqueue(task_type, task_data, task_id=task_id, priority=priority)
         except Exception as e:
             print(f"[QUEUE] Error adding to queue: {e}")
 
-    def update_task_status(self, task_id: str, status: str):
+    def update_task_status(self, task_id: str, status: str, error: Optional[str] = None):
         """Update task status"""
         try:
-            queue = self._load_queue()
-            if task_id in queue:
-                queue[task_id]["status"] = status
-                queue[task_id]["updated_at"] = datetime.now().isoformat()
-                self._save_queue(queue)
+            self.queue.update_status(task_id, status, error if status in FINISHED_STATUSES else None)
         except Exception as e:
             print(f"[QUEUE] Error updating task: {e}")
 
     def remove_from_queue(self, task_id: str):
         """Remove task from queue"""
         try:
-            queue = self._load_queue()
-            if task_id in queue:
-                del queue[task_id]
-                self._save_queue(queue)
+            self.queue.remove(task_id)
         except Exception as e:
             print(f"[QUEUE] Error removing from queue: {e}")
 
-    def _load_queue(self) -> Dict:
-        """Load queue from file"""
-        if self.queue_file.exists():
-            try:
-                with open(self.queue_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-
-    def _save_queue(self, queue: Dict):
-        """Save queue to file"""
-        with open(self.queue_file, 'w') as f:
-            json.dump(queue, f, indent=2)
-
     def __enter__(self):
         """Context manager entry"""
         if self.acquire_lock():
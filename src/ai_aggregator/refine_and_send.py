@@ -17,6 +17,13 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from .queue_manager import QueueManager
+from pathlib import Path
+
+try:
+    from src.utils.resource_broker import async_resource_lease
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from src.utils.resource_broker import async_resource_lease
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -182,7 +189,7 @@ async def main(headless: bool = False, use_queue: bool = True):
         print(f"{Fore.GREEN}[QUEUE] Lock acquired! Starting execution...{Style.RESET_ALL}\n")
 
     try:
-        async with async_playwright() as p:
+        async with async_resource_lease('browser'), async_playwright() as p:
             import pathlib
 
             # Create profile directory if not exists
@@ -31,6 +31,12 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
 import re
 
+try:
+    from src.utils.resource_broker import acquire_stage
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from src.utils.resource_broker import acquire_stage
+
 def detect_policy_violation(driver):
     """
     페이지에서 Google 정책 위반 메시지를 감지합니다.
@@ -2048,6 +2054,8 @@ def main(scenes_json_file, use_imagefx=False, use_flow=False, output_dir=None, c
         print(f"📁 출력 폴더 생성: {output_folder}", flush=True)
 
     driver = None
+    # 동시에 실행 중인 다른 작업과 브라우저 슬롯 / 메모리 공유 (브라우저를 닫을 때 반납)
+    browser_lease = acquire_stage('browser')
     try:
         driver = setup_chrome_driver(headless=headless)
 
@@ -2915,6 +2923,7 @@ def main(scenes_json_file, use_imagefx=False, use_flow=False, output_dir=None, c
                     print("✅ 브라우저 프로세스 강제 종료 완료", flush=True)
                 except:
                     pass
+        browser_lease.release()
 
 def update_queue_task_status(queue_db_path, task_id, status, error=None):
     """queue_tasks 테이블의 작업 상태를 업데이트합니다."""
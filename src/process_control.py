@@ -10,6 +10,12 @@ import signal
 from pathlib import Path
 from typing import Optional
 
+try:
+    from src.utils.cancellation import cancel_token_for, find_cancel_token, release_cancel_token
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from src.utils.cancellation import cancel_token_for, find_cancel_token, release_cancel_token
+
 try:
     import psutil
     PSUTIL_AVAILABLE = True
@@ -29,6 +35,9 @@ class ProcessController:
         self.output_dir = Path(output_dir)
         self.stop_file = self.output_dir / 'STOP'
         self.should_stop = False
+        # 감시 스레드는 _run 등으로 실행 중인 외부 프로세스를 바로 종료하는 용도
+        # (감시 이벤트는 늦게 올 수 있으므로 check_stop_signal은 파일도 직접 확인). 끝나면 close()
+        self.cancel_token = cancel_token_for(self.output_dir, names=('STOP',))
 
         # Signal handler 등록
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -41,20 +50,31 @@ class ProcessController:
         """시그널 핸들러"""
         print(f"\n🛑 시그널 받음: {signum}")
         self.should_stop = True
+        self.cancel_token.cancel(f"시그널 {signum}")
         self.cleanup_and_exit()
 
     def check_stop_signal(self) -> bool:
-        """STOP 파일 존재 여부 확인"""
+        """STOP 신호 여부 확인"""
         if self.should_stop:
             return True
 
-        if self.stop_file.exists():
+        if self.cancel_token.cancelled or self.stop_file.exists():
             print(f"🛑 STOP 신호 파일 감지: {self.stop_file}")
             self.should_stop = True
             return True
 
         return False
 
+    def close(self):
+        """STOP 파일 감시 중지 (작업이 끝나면 호출 - 상주 프로세스에서 감시 스레드가 쌓이지 않도록)"""
+        release_cancel_token(self.output_dir, names=('STOP',))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def cleanup_and_exit(self, exit_code: int = 0):
         """자식 프로세스 정리 후 종료"""
         print("🧹 자식 프로세스 정리 시작...")
@@ -103,6 +123,7 @@ class ProcessController:
         except Exception as e:
             print(f"⚠️ STOP 파일 삭제 실패: {e}")
 
+        self.close()
         print(f"👋 프로세스 종료 (코드: {exit_code})")
         sys.exit(exit_code)
 
@@ -117,5 +138,6 @@ def should_stop(output_dir: Path) -> bool:
     Returns:
         bool: STOP 신호 존재 여부
     """
-    stop_file = Path(output_dir) / 'STOP'
-    return stop_file.exists()
+    # 감시 토큰은 만들지 않음 (이 함수만 쓰는 호출자는 해제할 곳이 없음) - 이미 있으면 그 결과도 사용
+    token = find_cancel_token(output_dir, names=('STOP',))
+    return bool(token and token.cancelled) or (Path(output_dir) / 'STOP').exists()
@@ -1,22 +1,133 @@
-"""Utility modules for trend-video-backend."""
-from .db_log_handler import DatabaseLogHandler, setup_db_logging, auto_setup_db_logging
-from .ffmpeg_utils import (
-    get_ffmpeg_path,
-    get_video_duration,
-    get_audio_duration,
-    detect_best_encoder,
-    format_ass_time,
-    format_ass_timestamp,
-)
-
-__all__ = [
-    'DatabaseLogHandler',
-    'setup_db_logging',
-    'auto_setup_db_logging',
-    'get_ffmpeg_path',
-    'get_video_duration',
-    'get_audio_duration',
-    'detect_best_encoder',
-    'format_ass_time',
-    'format_ass_timestamp',
-]
+"""Utility modules for trend-video-backend.
+
+패키지 import 시에는 아무 하위 모듈도 로드하지 않는다. ``from src.utils import get_ffmpeg_path``
+처럼 이름에 처음 접근할 때 해당 하위 모듈만 import한다 (PEP 562).
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+# 공개 이름 → 하위 모듈
+_EXPORTS = {
+    'DatabaseLogHandler': 'db_log_handler',
+    'setup_db_logging': 'db_log_handler',
+    'auto_setup_db_logging': 'db_log_handler',
+    'read_logs': 'db_log_handler',
+    'archive_job_logs': 'db_log_handler',
+    'compact_logs': 'db_log_handler',
+    'get_ffmpeg_path': 'ffmpeg_utils',
+    'get_video_duration': 'ffmpeg_utils',
+    'get_audio_duration': 'ffmpeg_utils',
+    'detect_best_encoder': 'ffmpeg_utils',
+    'format_ass_time': 'ffmpeg_utils',
+    'format_ass_timestamp': 'ffmpeg_utils',
+    'AudioInfo': 'audio_metadata',
+    'read_audio_info': 'audio_metadata',
+    'probe_audio_bytes': 'audio_metadata',
+    'get_exact_audio_duration': 'audio_metadata',
+    'EncoderSession': 'encoder_session',
+    'get_encoder_session': 'encoder_session',
+    'run_ffmpeg': 'ffmpeg_runner',
+    'cancel_files_check': 'ffmpeg_runner',
+    'FFmpegCancelled': 'ffmpeg_runner',
+    'FFmpegProgress': 'ffmpeg_runner',
+    'FFmpegResult': 'ffmpeg_runner',
+    'StageMetrics': 'stage_metrics',
+    'WorkQueue': 'work_queue',
+    'Task': 'work_queue',
+    'LeaseHeartbeat': 'work_queue',
+    'lazy_module': 'lazy_import',
+    'module_available': 'lazy_import',
+    'CancellationToken': 'cancellation',
+    'OperationCancelled': 'cancellation',
+    'cancel_token_for': 'cancellation',
+    'run_cancellable': 'cancellation',
+    'release_cancel_token': 'cancellation',
+    'find_cancel_token': 'cancellation',
+    'ResourceBroker': 'resource_broker',
+    'ResourceLease': 'resource_broker',
+    'ResourceTimeout': 'resource_broker',
+    'resource_lease': 'resource_broker',
+    'async_resource_lease': 'resource_broker',
+    'acquire_stage': 'resource_broker',
+    'CheckpointJournal': 'checkpoint',
+    'fingerprint': 'checkpoint',
+    'file_signature': 'checkpoint',
+    'JobProfiler': 'profiling',
+    'profile_mode': 'profiling',
+    'inpaint_video': 'frame_pipeline',
+    'probe_video': 'frame_pipeline',
+    'FrameReader': 'frame_pipeline',
+    'FrameWriter': 'frame_pipeline',
+    'FramePipelineError': 'frame_pipeline',
+    'VideoInfo': 'frame_pipeline',
+    'TemporalReuse': 'frame_pipeline',
+    'EncodePlan': 'frame_pipeline',
+    'parallel_inpaint_video': 'parallel_inpaint',
+    'inpaint_workers': 'parallel_inpaint',
+    'LamaInpainter': 'lama_backend',
+    'lama_inpainter': 'lama_backend',
+    'detect_subtitle_regions': 'text_regions',
+    'detect_text_bands': 'text_regions',
+    'render_dub_track': 'dubbing_timeline',
+    'plan_timeline': 'dubbing_timeline',
+    'translate_texts': 'translation_engine',
+    'TranslationMemory': 'translation_engine',
+    'stream_transcribe': 'streaming_asr',
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .db_log_handler import (
+        DatabaseLogHandler,
+        setup_db_logging,
+        auto_setup_db_logging,
+        read_logs,
+        archive_job_logs,
+        compact_logs,
+    )
+    from .ffmpeg_utils import (
+        get_ffmpeg_path,
+        get_video_duration,
+        get_audio_duration,
+        detect_best_encoder,
+        format_ass_time,
+        format_ass_timestamp,
+    )
+    from .audio_metadata import AudioInfo, read_audio_info, probe_audio_bytes, get_exact_audio_duration
+    from .encoder_session import EncoderSession, get_encoder_session
+    from .ffmpeg_runner import run_ffmpeg, cancel_files_check, FFmpegCancelled, FFmpegProgress, FFmpegResult
+    from .stage_metrics import StageMetrics
+    from .work_queue import WorkQueue, Task, LeaseHeartbeat
+    from .lazy_import import lazy_module, module_available
+    from .cancellation import (
+        CancellationToken, OperationCancelled, cancel_token_for, run_cancellable,
+        release_cancel_token, find_cancel_token,
+    )
+    from .resource_broker import (
+        ResourceBroker, ResourceLease, ResourceTimeout, resource_lease, async_resource_lease, acquire_stage,
+    )
+    from .checkpoint import CheckpointJournal, fingerprint, file_signature
+    from .profiling import JobProfiler, profile_mode
+    from .frame_pipeline import (
+        inpaint_video, probe_video, FrameReader, FrameWriter, FramePipelineError, VideoInfo, TemporalReuse, EncodePlan,
+    )
+    from .parallel_inpaint import parallel_inpaint_video, inpaint_workers
+    from .lama_backend import LamaInpainter, lama_inpainter
+    from .text_regions import detect_subtitle_regions, detect_text_bands
+    from .dubbing_timeline import render_dub_track, plan_timeline
+    from .translation_engine import translate_texts, TranslationMemory
+    from .streaming_asr import stream_transcribe
+
+
+def __getattr__(name: str):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{submodule}', __name__), name)
+    globals()[name] = value  # 다음 접근부터는 일반 조회
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
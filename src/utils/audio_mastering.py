@@ -0,0 +1,227 @@
+"""
+프로젝트 단위 오디오 마스터링
+
+씬별 나레이션을 한 번만 디코딩하여 하나의 PCM 타임라인(샘플 단위 오프셋)에
+배치하고, EBU R128 기준으로 라우드니스를 한 번에 맞춘 뒤 최종 AAC를
+딱 한 번 인코딩하여 (스트림 복사된) 비디오와 먹싱한다.
+씬마다 AAC를 재인코딩하면서 생기던 세대 손실과 씬 간 음량 차이를 없앤다.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .ffmpeg_utils import get_ffmpeg_path
+from .lazy_import import lazy_module
+
+# numpy는 PCM을 실제로 만질 때 로드 (모듈 import만으로는 로드하지 않음)
+np = lazy_module('numpy')
+
+logger = logging.getLogger(__name__)
+
+# 마스터 타임라인 포맷 (48kHz는 25fps 기준 프레임당 1920샘플로 나누어 떨어짐)
+MASTER_SAMPLE_RATE = 48000
+MASTER_CHANNELS = 2
+
+# 유튜브 기준 라우드니스 / 트루피크 상한
+TARGET_LUFS = -14.0
+TARGET_TRUE_PEAK = -1.0
+
+
+def _require_ffmpeg() -> str:
+    ffmpeg = get_ffmpeg_path()
+    if not ffmpeg:
+        raise RuntimeError("FFmpeg not found.")
+    return ffmpeg
+
+
+def decode_audio_pcm(audio_path: Path, sample_rate: int = MASTER_SAMPLE_RATE,
+                     channels: int = MASTER_CHANNELS) -> np.ndarray:
+    """
+    오디오 파일을 float32 PCM으로 디코딩
+
+    Returns:
+        (샘플 수, 채널 수) 형태의 float32 배열
+    """
+    cmd = [
+        _require_ffmpeg(), '-hide_banner', '-nostdin', '-v', 'error',
+        '-i', str(audio_path),
+        '-vn',
+        '-f', 'f32le',
+        '-acodec', 'pcm_f32le',
+        '-ar', str(sample_rate),
+        '-ac', str(channels),
+        'pipe:1'
+    ]
+    result = subprocess.run(cmd, capture_output=True, timeout=300)
+    if result.returncode != 0:
+        raise RuntimeError(f"오디오 디코딩 실패 ({Path(audio_path).name}): "
+                           f"{result.stderr.decode('utf-8', errors='ignore')[-500:]}")
+
+    pcm = np.frombuffer(result.stdout, dtype=np.float32)
+    return pcm.reshape(-1, channels)
+
+
+class AudioTimeline:
+    """샘플 단위 오프셋으로 오디오를 배치하는 PCM 타임라인"""
+
+    def __init__(self, sample_rate: int = MASTER_SAMPLE_RATE,
+                 channels: int = MASTER_CHANNELS, num_samples: int = 0):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.buffer = np.zeros((num_samples, channels), dtype=np.float32)
+        self.segments: List[Tuple[int, int]] = []  # (시작 샘플, 샘플 수)
+
+    @property
+    def num_samples(self) -> int:
+        return self.buffer.shape[0]
+
+    @property
+    def duration(self) -> float:
+        return self.num_samples / self.sample_rate
+
+    def seconds_to_samples(self, seconds: float) -> int:
+        return int(round(seconds * self.sample_rate))
+
+    def _ensure_length(self, num_samples: int):
+        if num_samples > self.num_samples:
+            grown = np.zeros((num_samples, self.channels), dtype=np.float32)
+            grown[:self.num_samples] = self.buffer
+            self.buffer = grown
+
+    def place(self, pcm: np.ndarray, offset: int, max_samples: Optional[int] = None,
+              gain: float = 1.0) -> int:
+        """
+        PCM을 offset(샘플) 위치에 믹스
+
+        Args:
+            pcm: (샘플 수, 채널 수) float32 배열
+            offset: 시작 위치 (샘플)
+            max_samples: 슬롯 길이 제한 (넘치는 부분은 잘라냄)
+            gain: 선형 게인
+
+        Returns:
+            실제로 배치된 샘플 수
+        """
+        if pcm.ndim == 1:
+            pcm = pcm[:, None]
+        if pcm.shape[1] != self.channels:
+            pcm = np.repeat(pcm[:, :1], self.channels, axis=1) if pcm.shape[1] == 1 \
+                else pcm[:, :self.channels]
+
+        length = pcm.shape[0] if max_samples is None else min(pcm.shape[0], max_samples)
+        if length <= 0:
+            return 0
+
+        self._ensure_length(offset + length)
+        if gain == 1.0:
+            self.buffer[offset:offset + length] += pcm[:length]
+        else:
+            self.buffer[offset:offset + length] += pcm[:length] * np.float32(gain)
+        self.segments.append((offset, length))
+        return length
+
+    def render(self) -> np.ndarray:
+        """최종 PCM 버퍼 반환"""
+        return self.buffer
+
+
+def measure_loudness(pcm: np.ndarray, sample_rate: int = MASTER_SAMPLE_RATE) -> Optional[dict]:
+    """
+    EBU R128 통합 라우드니스 측정 (ffmpeg loudnorm 분석, 오디오만 처리)
+
+    Returns:
+        {'input_i': LUFS, 'input_tp': dBTP, 'input_lra': LU} 또는 None
+    """
+    channels = pcm.shape[1] if pcm.ndim > 1 else 1
+    cmd = [
+        _require_ffmpeg(), '-hide_banner', '-nostats',
+        '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(channels),
+        '-i', 'pipe:0',
+        '-af', f'loudnorm=I={TARGET_LUFS}:TP={TARGET_TRUE_PEAK}:LRA=11:print_format=json',
+        '-f', 'null', '-'
+    ]
+    try:
+        result = subprocess.run(cmd, input=np.ascontiguousarray(pcm, dtype=np.float32).tobytes(),
+                                capture_output=True, timeout=300)
+        stderr = result.stderr.decode('utf-8', errors='ignore')
+        start = stderr.rfind('{')
+        end = stderr.rfind('}')
+        if result.returncode != 0 or start < 0 or end < start:
+            logger.warning(f"⚠️ 라우드니스 측정 실패: {stderr[-300:]}")
+            return None
+
+        stats = json.loads(stderr[start:end + 1])
+        return {
+            'input_i': float(stats['input_i']),
+            'input_tp': float(stats['input_tp']),
+            'input_lra': float(stats['input_lra']),
+        }
+    except Exception as e:
+        logger.warning(f"⚠️ 라우드니스 측정 실패: {e}")
+        return None
+
+
+def normalize_loudness(pcm: np.ndarray, sample_rate: int = MASTER_SAMPLE_RATE,
+                       target_lufs: float = TARGET_LUFS,
+                       true_peak: float = TARGET_TRUE_PEAK) -> Tuple[np.ndarray, float]:
+    """
+    전체 타임라인에 단일 게인을 적용하여 목표 라우드니스로 정규화
+
+    씬 경계에서 음량이 튀지 않도록 동적 처리 없이 선형 게인 하나만 적용하며,
+    피크가 true_peak를 넘지 않도록 게인을 제한한다.
+
+    Returns:
+        (정규화된 PCM, 적용된 게인 dB)
+    """
+    stats = measure_loudness(pcm, sample_rate)
+    if not stats or not np.isfinite(stats['input_i']) or stats['input_i'] < -70:
+        logger.warning("⚠️ 라우드니스를 측정할 수 없어 정규화를 건너뜁니다 (무음?)")
+        return pcm, 0.0
+
+    gain_db = target_lufs - stats['input_i']
+    # 트루피크 상한 보호
+    if np.isfinite(stats['input_tp']):
+        gain_db = min(gain_db, true_peak - stats['input_tp'])
+
+    gain = np.float32(10 ** (gain_db / 20))
+    logger.info(f"🎚️ 라우드니스 정규화: {stats['input_i']:.1f} LUFS → "
+                f"{stats['input_i'] + gain_db:.1f} LUFS (게인 {gain_db:+.1f}dB)")
+    normalized = pcm * gain
+    np.clip(normalized, -1.0, 1.0, out=normalized)
+    return normalized, gain_db
+
+
+def mux_pcm_with_video(video_path: Path, pcm: np.ndarray, output_path: Path,
+                       sample_rate: int = MASTER_SAMPLE_RATE,
+                       audio_bitrate: str = '192k', timeout: int = 600) -> bool:
+    """
+    PCM 마스터를 AAC로 한 번만 인코딩하여 비디오(스트림 복사)와 먹싱
+
+    Returns:
+        성공 여부
+    """
+    channels = pcm.shape[1] if pcm.ndim > 1 else 1
+    cmd = [
+        _require_ffmpeg(), '-y', '-hide_banner',
+        '-i', str(video_path),
+        '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(channels),
+        '-i', 'pipe:0',
+        '-map', '0:v:0',
+        '-map', '1:a:0',
+        '-c:v', 'copy',
+        '-c:a', 'aac',
+        '-b:a', audio_bitrate,
+        '-movflags', '+faststart',
+        '-shortest',
+        str(output_path)
+    ]
+    result = subprocess.run(cmd, input=np.ascontiguousarray(pcm, dtype=np.float32).tobytes(),
+                            capture_output=True, timeout=timeout)
+    if result.returncode != 0:
+        logger.error(f"❌ 오디오 먹싱 실패: {result.stderr.decode('utf-8', errors='ignore')[-1000:]}")
+        return False
+    return True
@@ -0,0 +1,309 @@
+"""
+오디오 메타데이터 리더 (프로세스 내 헤더 파싱)
+
+MP3(프레임 헤더 / Xing·Info·VBRI 태그), WAV(RIFF), AAC(ADTS) 파일의
+샘플 수와 정확한 길이를 ffmpeg/MoviePy 서브프로세스 없이 계산한다.
+TTS 결과물처럼 짧은 파일을 씬마다 측정할 때 사용.
+"""
+import struct
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AudioInfo:
+    """오디오 스트림 정보"""
+    codec: str          # 'mp3', 'pcm', 'aac'
+    sample_rate: int
+    channels: int
+    num_samples: int    # 채널당 샘플 수 (인코더 지연/패딩 제외)
+
+    @property
+    def duration(self) -> float:
+        """길이 (초)"""
+        if self.sample_rate <= 0:
+            return 0.0
+        return self.num_samples / self.sample_rate
+
+
+# ============================================================
+# MP3 (MPEG-1/2/2.5 Layer I/II/III)
+# ============================================================
+
+# [version][layer] -> bitrate 테이블 (kbps), version: 1=MPEG1, 2=MPEG2/2.5
+_MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+# version bits -> 샘플레이트 테이블
+_MP3_SAMPLE_RATES = {
+    0b11: [44100, 48000, 32000],   # MPEG1
+    0b10: [22050, 24000, 16000],   # MPEG2
+    0b00: [11025, 12000, 8000],    # MPEG2.5
+}
+
+
+def _parse_mp3_header(data: bytes, pos: int) -> Optional[dict]:
+    """pos 위치의 MPEG 오디오 프레임 헤더 파싱 (유효하지 않으면 None)"""
+    if pos + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[pos], data[pos + 1], data[pos + 2], data[pos + 3]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sr_index = (b2 >> 2) & 0x03
+    padding = (b2 >> 1) & 0x01
+    channel_mode = (b3 >> 6) & 0x03
+
+    if version_bits == 0b01 or layer_bits == 0b00:
+        return None
+    if bitrate_index in (0, 15) or sr_index == 3:
+        # free format(0)은 프레임 길이를 알 수 없으므로 지원하지 않음
+        return None
+
+    layer = 4 - layer_bits  # 0b11 -> 1, 0b10 -> 2, 0b01 -> 3
+    version = 1 if version_bits == 0b11 else 2
+    bitrate = _MP3_BITRATES[(version, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version_bits][sr_index]
+
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2:
+        samples_per_frame = 1152
+        frame_length = 144 * bitrate // sample_rate + padding
+    else:
+        samples_per_frame = 1152 if version == 1 else 576
+        frame_length = (144 if version == 1 else 72) * bitrate // sample_rate + padding
+
+    return {
+        'version': version,
+        'layer': layer,
+        'sample_rate': sample_rate,
+        'channels': 1 if channel_mode == 0b11 else 2,
+        'samples_per_frame': samples_per_frame,
+        'frame_length': frame_length,
+    }
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """ID3v2 태그 길이만큼 건너뛴 오프셋 반환 (연속된 태그 포함)"""
+    pos = 0
+    while data[pos:pos + 3] == b'ID3' and pos + 10 <= len(data):
+        flags = data[pos + 5]
+        size_bytes = data[pos + 6:pos + 10]
+        size = ((size_bytes[0] & 0x7F) << 21 | (size_bytes[1] & 0x7F) << 14 |
+                (size_bytes[2] & 0x7F) << 7 | (size_bytes[3] & 0x7F))
+        pos += 10 + size + (10 if flags & 0x10 else 0)
+    return pos
+
+
+def _find_mp3_sync(data: bytes, start: int, limit: int = 64 * 1024) -> Optional[int]:
+    """start 이후 연속된 두 프레임이 유효한 첫 동기 위치 탐색"""
+    end = min(len(data) - 4, start + limit)
+    pos = start
+    while pos < end:
+        pos = data.find(b'\xff', pos, end)
+        if pos < 0:
+            return None
+        header = _parse_mp3_header(data, pos)
+        if header:
+            next_pos = pos + header['frame_length']
+            # 다음 프레임도 유효하거나 파일 끝이면 채택 (오탐 방지)
+            if next_pos >= len(data) - 4 or _parse_mp3_header(data, next_pos):
+                return pos
+        pos += 1
+    return None
+
+
+def _parse_vbr_tag(data: bytes, pos: int, header: dict) -> Optional[dict]:
+    """첫 프레임의 Xing/Info 또는 VBRI 태그 파싱"""
+    if header['version'] == 1:
+        side_info = 17 if header['channels'] == 1 else 32
+    else:
+        side_info = 9 if header['channels'] == 1 else 17
+
+    xing_pos = pos + 4 + side_info
+    tag = data[xing_pos:xing_pos + 4]
+    if tag in (b'Xing', b'Info') and xing_pos + 8 <= len(data):
+        flags = struct.unpack('>I', data[xing_pos + 4:xing_pos + 8])[0]
+        offset = xing_pos + 8
+        frames = None
+        if flags & 0x1:
+            frames = struct.unpack('>I', data[offset:offset + 4])[0]
+            offset += 4
+        if flags & 0x2:
+            offset += 4
+        if flags & 0x4:
+            offset += 100
+        if flags & 0x8:
+            offset += 4
+
+        # LAME 확장 태그: 인코더 지연/패딩 (gapless 정보)
+        delay = padding = 0
+        lame = data[offset:offset + 4]
+        if lame in (b'LAME', b'Lavf', b'Lavc') and offset + 24 <= len(data):
+            b = data[offset + 21:offset + 24]
+            delay = (b[0] << 4) | (b[1] >> 4)
+            padding = ((b[1] & 0x0F) << 8) | b[2]
+
+        return {'frames': frames, 'delay': delay, 'padding': padding}
+
+    vbri_pos = pos + 4 + 32
+    if data[vbri_pos:vbri_pos + 4] == b'VBRI' and vbri_pos + 18 <= len(data):
+        delay = struct.unpack('>H', data[vbri_pos + 6:vbri_pos + 8])[0]
+        frames = struct.unpack('>I', data[vbri_pos + 14:vbri_pos + 18])[0]
+        return {'frames': frames, 'delay': delay, 'padding': 0}
+
+    return None
+
+
+def _read_mp3(data: bytes) -> Optional[AudioInfo]:
+    """MP3 길이 계산 (VBR 태그 우선, 없으면 프레임 순회)"""
+    start = _skip_id3v2(data)
+    pos = _find_mp3_sync(data, start)
+    if pos is None:
+        return None
+
+    first = _parse_mp3_header(data, pos)
+    vbr = _parse_vbr_tag(data, pos, first)
+    if vbr and vbr['frames']:
+        num_samples = vbr['frames'] * first['samples_per_frame'] - vbr['delay'] - vbr['padding']
+        return AudioInfo('mp3', first['sample_rate'], first['channels'], max(0, num_samples))
+    if vbr:
+        # 프레임 수 없는 태그 프레임은 오디오가 아니므로 건너뜀
+        pos += first['frame_length']
+
+    # 태그가 없으면 (Edge TTS 등 CBR) 프레임 헤더를 끝까지 순회
+    frames = 0
+    samples = 0
+    while True:
+        header = _parse_mp3_header(data, pos)
+        if header is None or pos + header['frame_length'] > len(data):
+            break
+        frames += 1
+        samples += header['samples_per_frame']
+        pos += header['frame_length']
+
+    if frames == 0:
+        return None
+    return AudioInfo('mp3', first['sample_rate'], first['channels'], samples)
+
+
+# ============================================================
+# WAV (RIFF / WAVE)
+# ============================================================
+
+def _read_wav(data: bytes) -> Optional[AudioInfo]:
+    """RIFF 청크를 순회하여 fmt/data 청크로 샘플 수 계산"""
+    if len(data) < 12 or data[0:4] != b'RIFF' or data[8:12] != b'WAVE':
+        return None
+
+    pos = 12
+    fmt = None
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        chunk_size = struct.unpack('<I', data[pos + 4:pos + 8])[0]
+        body = pos + 8
+
+        if chunk_id == b'fmt ' and chunk_size >= 16:
+            audio_format, channels, sample_rate, _byte_rate, block_align, bits = \
+                struct.unpack('<HHIIHH', data[body:body + 16])
+            fmt = {
+                'codec': 'pcm' if audio_format in (1, 3, 0xFFFE) else f'wav_{audio_format}',
+                'channels': channels,
+                'sample_rate': sample_rate,
+                'block_align': block_align or max(1, channels * bits // 8),
+            }
+        elif chunk_id == b'data' and fmt:
+            # 파이프로 기록된 WAV는 크기 필드가 0 또는 0xFFFFFFFF일 수 있음
+            available = len(data) - body
+            if chunk_size == 0 or chunk_size > available:
+                chunk_size = available
+            return AudioInfo(fmt['codec'], fmt['sample_rate'], fmt['channels'],
+                             chunk_size // fmt['block_align'])
+
+        pos = body + chunk_size + (chunk_size & 1)
+
+    return None
+
+
+# ============================================================
+# AAC (ADTS)
+# ============================================================
+
+_AAC_SAMPLE_RATES = [96000, 88200, 64000, 48000, 44100, 32000, 24000,
+                     22050, 16000, 12000, 11025, 8000, 7350]
+
+
+def _read_adts(data: bytes) -> Optional[AudioInfo]:
+    """ADTS 프레임을 순회하여 AAC 샘플 수 계산"""
+    pos = _skip_id3v2(data)
+    sample_rate = channels = 0
+    samples = 0
+
+    while pos + 7 <= len(data):
+        if data[pos] != 0xFF or (data[pos + 1] & 0xF6) != 0xF0:
+            break
+        sr_index = (data[pos + 2] >> 2) & 0x0F
+        if sr_index >= len(_AAC_SAMPLE_RATES):
+            break
+        frame_length = ((data[pos + 3] & 0x03) << 11) | (data[pos + 4] << 3) | (data[pos + 5] >> 5)
+        if frame_length < 7:
+            break
+        if not sample_rate:
+            sample_rate = _AAC_SAMPLE_RATES[sr_index]
+            channels = ((data[pos + 2] & 0x01) << 2) | (data[pos + 3] >> 6)
+        raw_blocks = (data[pos + 6] & 0x03) + 1
+        samples += 1024 * raw_blocks
+        pos += frame_length
+
+    if not sample_rate:
+        return None
+    return AudioInfo('aac', sample_rate, channels, samples)
+
+
+# ============================================================
+# 공개 API
+# ============================================================
+
+def probe_audio_bytes(data: bytes) -> Optional[AudioInfo]:
+    """메모리의 오디오 데이터에서 정보 추출 (지원하지 않는 형식이면 None)"""
+    if not data:
+        return None
+    if data[0:4] == b'RIFF':
+        return _read_wav(data)
+
+    start = _skip_id3v2(data)
+    if start + 2 <= len(data) and data[start] == 0xFF and (data[start + 1] & 0xF6) == 0xF0:
+        return _read_adts(data)
+    return _read_mp3(data)
+
+
+def read_audio_info(audio_path: Union[str, Path]) -> Optional[AudioInfo]:
+    """오디오 파일 헤더를 읽어 정보 반환 (실패 시 None)"""
+    try:
+        with open(audio_path, 'rb') as f:
+            data = f.read()
+        return probe_audio_bytes(data)
+    except Exception as e:
+        logger.debug(f"오디오 헤더 파싱 실패 ({audio_path}): {e}")
+        return None
+
+
+def get_exact_audio_duration(audio_path: Union[str, Path]) -> float:
+    """헤더 기반 정확한 오디오 길이 (초), 파싱 불가 시 0.0"""
+    info = read_audio_info(audio_path)
+    return info.duration if info else 0.0
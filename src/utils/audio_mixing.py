@@ -0,0 +1,187 @@
+"""
+배경음악(BGM) / 효과음(SFX) 믹싱
+
+TTS 단어 타임스탬프로 나레이션 구간을 미리 알고 있으므로, 사이드체인
+컴프레서 대신 덕킹 엔벨로프를 NumPy로 미리 계산해서 PCM 타임라인에
+한 번에 믹스한다. 최종 인코딩은 audio_mastering에서 한 번만 수행.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .lazy_import import lazy_module
+
+# parse_scene_sfx / 기본값만 쓰는 경우에는 numpy를 로드하지 않음
+np = lazy_module('numpy')
+
+logger = logging.getLogger(__name__)
+
+# 기본 믹스 설정
+DEFAULT_BGM_VOLUME_DB = -20.0   # 나레이션 대비 BGM 기본 음량
+DEFAULT_DUCK_DB = -12.0         # 나레이션 구간에서 추가로 줄이는 양
+DEFAULT_ATTACK = 0.08           # 덕킹 시작 램프 (초)
+DEFAULT_RELEASE = 0.40          # 덕킹 해제 램프 (초)
+DEFAULT_MERGE_GAP = 0.35        # 이보다 짧은 단어 사이 공백은 덕킹 유지
+
+
+def db_to_gain(db: float) -> float:
+    return float(10 ** (db / 20))
+
+
+def speech_intervals_from_word_timings(word_timings: Iterable[dict], offset: float = 0.0,
+                                       limit: Optional[float] = None) -> List[Tuple[float, float]]:
+    """
+    Edge TTS 단어 타임스탬프를 타임라인 기준 발화 구간으로 변환
+
+    Args:
+        word_timings: [{"word", "start", "end"}, ...] (씬 오디오 기준 초)
+        offset: 씬 시작 위치 (타임라인 기준 초)
+        limit: 씬 슬롯 길이 (넘는 구간은 잘라냄)
+    """
+    intervals = []
+    for timing in word_timings or []:
+        start = float(timing.get('start', 0.0))
+        end = float(timing.get('end', start))
+        if limit is not None:
+            start, end = min(start, limit), min(end, limit)
+        if end > start:
+            intervals.append((offset + start, offset + end))
+    return intervals
+
+
+def merge_intervals(intervals: Sequence[Tuple[float, float]],
+                    gap: float = DEFAULT_MERGE_GAP) -> List[Tuple[float, float]]:
+    """짧은 공백을 사이에 둔 발화 구간을 하나로 병합 (단어 사이 펌핑 방지)"""
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if merged and start - merged[-1][1] <= gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def build_ducking_envelope(num_samples: int, sample_rate: int,
+                           speech_intervals: Sequence[Tuple[float, float]],
+                           duck_db: float = DEFAULT_DUCK_DB,
+                           attack: float = DEFAULT_ATTACK,
+                           release: float = DEFAULT_RELEASE,
+                           merge_gap: float = DEFAULT_MERGE_GAP) -> np.ndarray:
+    """
+    발화 구간 기반 덕킹 게인 엔벨로프 (1.0 = 원음량)
+
+    발화 시작 attack초 전부터 선형으로 내려가고, 끝난 뒤 release초 동안
+    선형으로 복귀한다. 구간이 겹치면 더 많이 줄이는 쪽(min)을 택한다.
+    """
+    envelope = np.ones(num_samples, dtype=np.float32)
+    duck = np.float32(db_to_gain(duck_db))
+    attack_n = max(1, int(attack * sample_rate))
+    release_n = max(1, int(release * sample_rate))
+
+    for start, end in merge_intervals(speech_intervals, merge_gap):
+        s = max(0, int(start * sample_rate))
+        e = min(num_samples, int(end * sample_rate))
+        if e <= 0 or s >= num_samples:
+            continue
+
+        # attack 램프 (1 → duck)
+        a0 = max(0, s - attack_n)
+        if s > a0:
+            ramp = np.linspace(1.0, duck, s - a0 + 1, dtype=np.float32)[1:]
+            np.minimum(envelope[a0:s], ramp[-(s - a0):], out=envelope[a0:s])
+
+        # hold
+        if e > s:
+            np.minimum(envelope[s:e], duck, out=envelope[s:e])
+
+        # release 램프 (duck → 1)
+        r1 = min(num_samples, e + release_n)
+        if r1 > e:
+            ramp = np.linspace(duck, 1.0, release_n + 1, dtype=np.float32)[1:r1 - e + 1]
+            np.minimum(envelope[e:r1], ramp, out=envelope[e:r1])
+
+    return envelope
+
+
+def loop_to_length(pcm: np.ndarray, num_samples: int, sample_rate: int,
+                   crossfade: float = 1.0, fade_out: float = 2.0) -> np.ndarray:
+    """BGM을 타임라인 길이만큼 반복 (이음새 크로스페이드 + 끝부분 페이드아웃)"""
+    if pcm.shape[0] == 0 or num_samples <= 0:
+        return np.zeros((max(0, num_samples), pcm.shape[1] if pcm.ndim > 1 else 1), dtype=np.float32)
+
+    xf = min(int(crossfade * sample_rate), pcm.shape[0] // 4)
+    if pcm.shape[0] >= num_samples or xf <= 0:
+        reps = -(-num_samples // pcm.shape[0])
+        out = np.tile(pcm, (reps, 1))[:num_samples].copy()
+    else:
+        # 이음새마다 앞 루프의 끝(페이드아웃)과 다음 루프의 시작(페이드인)을 겹침
+        step = pcm.shape[0] - xf
+        curve = np.linspace(0.0, 1.0, xf, dtype=np.float32)[:, None]
+        looped = pcm.copy()
+        looped[:xf] *= curve
+        looped[-xf:] *= curve[::-1]
+
+        out = np.zeros((num_samples + pcm.shape[0], pcm.shape[1]), dtype=np.float32)
+        out[:xf] = pcm[:xf]  # 첫 루프는 페이드인 없이 시작
+        for pos in range(0, num_samples, step):
+            out[pos:pos + pcm.shape[0]] += looped
+        out[:xf] -= looped[:xf]
+        out = out[:num_samples]
+
+    fade_n = min(int(fade_out * sample_rate), num_samples)
+    if fade_n > 0:
+        out[-fade_n:] *= np.linspace(1.0, 0.0, fade_n, dtype=np.float32)[:, None]
+    return out
+
+
+def mix_music_bed(speech: np.ndarray, bgm: np.ndarray, sample_rate: int,
+                  speech_intervals: Sequence[Tuple[float, float]],
+                  bgm_volume_db: float = DEFAULT_BGM_VOLUME_DB,
+                  duck_db: float = DEFAULT_DUCK_DB) -> np.ndarray:
+    """
+    나레이션 타임라인에 덕킹된 BGM을 한 번에 믹스
+
+    Args:
+        speech: 나레이션(+SFX) 타임라인 (샘플 수, 채널 수)
+        bgm: 디코딩된 BGM PCM (같은 샘플레이트/채널)
+        speech_intervals: 타임라인 기준 발화 구간 (초)
+    """
+    num_samples = speech.shape[0]
+    bed = loop_to_length(bgm, num_samples, sample_rate)
+    envelope = build_ducking_envelope(num_samples, sample_rate, speech_intervals, duck_db=duck_db)
+    gain = np.float32(db_to_gain(bgm_volume_db))
+
+    ducked_ratio = float(np.mean(envelope < 0.999)) if num_samples else 0.0
+    logger.info(f"🎵 BGM 믹스: 음량 {bgm_volume_db:+.1f}dB, 덕킹 {duck_db:+.1f}dB "
+                f"(타임라인의 {ducked_ratio * 100:.0f}% 구간)")
+
+    return speech + bed * (envelope * gain)[:, None]
+
+
+def parse_scene_sfx(scene: dict) -> List[dict]:
+    """
+    story.json 씬의 효과음 설정 정규화
+
+    지원 형식:
+        "sfx": "whoosh.mp3"
+        "sfx": {"file": "whoosh.mp3", "offset": 0.5, "volume": -6}
+        "sfx": [ ... 위 형식의 리스트 ... ]
+    """
+    raw = scene.get('sfx')
+    if not raw:
+        return []
+    items = raw if isinstance(raw, list) else [raw]
+
+    result = []
+    for item in items:
+        if isinstance(item, str):
+            item = {'file': item}
+        if not isinstance(item, dict) or not item.get('file'):
+            continue
+        result.append({
+            'file': item['file'],
+            'offset': float(item.get('offset', 0.0)),
+            'volume': float(item.get('volume', 0.0)),
+        })
+    return result
@@ -0,0 +1,444 @@
+"""
+취소 토큰 (이벤트 기반 취소)
+
+STOP / .cancel 파일을 매번 stat으로 확인하는 대신, 취소 신호를 한 곳(CancellationToken)에서
+받아서 실행 중인 작업 전체에 즉시 전달한다.
+
+신호 입력:
+- 파일: Linux는 inotify로 STOP / .cancel 생성 이벤트를 받음 (그 외 OS는 0.5초 폴링 스레드)
+- 시그널: SIGTERM / SIGINT (두 번째 시그널은 즉시 종료)
+
+전달 대상:
+- 자식 프로세스(ffmpeg 등): 프로세스 그룹 전체를 바로 종료 (popen_group_kwargs()로 실행)
+- asyncio 태스크: task.cancel()
+- 스레드 풀: 대기 중인 작업 취소 (실행 중인 작업은 자기 ffmpeg이 종료되면서 끝남)
+- 부분 출력 파일: 등록된 파일 삭제
+
+    token = CancellationToken()
+    token.watch_files(folder)
+    token.install_signal_handlers()
+    run_ffmpeg(cmd, cancel_check=token)   # 토큰을 넘기면 취소 즉시 ffmpeg 종료
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import signal
+import struct
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CANCEL_FILE_NAMES = ('STOP', '.cancel')
+POLL_INTERVAL = 0.5  # inotify를 못 쓸 때 파일 확인 간격 (초)
+KILL_GRACE_SECONDS = 3.0  # SIGTERM 후 SIGKILL까지 대기 (초)
+
+
+class OperationCancelled(Exception):
+    """취소 신호로 작업이 중단됨"""
+
+
+def popen_group_kwargs() -> Dict:
+    """자식 프로세스를 별도 프로세스 그룹으로 실행하기 위한 Popen 인자"""
+    if sys.platform == 'win32':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def terminate_process_group(process: subprocess.Popen, grace: float = KILL_GRACE_SECONDS):
+    """프로세스 그룹 전체 종료 (SIGTERM → grace초 후에도 살아 있으면 SIGKILL)"""
+    if process.poll() is not None:
+        return
+    if sys.platform == 'win32' or not hasattr(os, 'killpg'):
+        try:
+            process.kill()
+        except OSError:
+            pass
+        return
+
+    try:
+        pgid = os.getpgid(process.pid)
+    except OSError:
+        return
+    if pgid == os.getpgid(0):
+        # 같은 그룹이면 자기 자신까지 죽이지 않도록 해당 프로세스만 종료
+        try:
+            process.kill()
+        except OSError:
+            pass
+        return
+
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+    except OSError:
+        return
+
+    def force_kill():
+        try:
+            process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(pgid, signal.SIGKILL)
+            except OSError:
+                pass
+    threading.Thread(target=force_kill, name='cancel-force-kill', daemon=True).start()
+
+
+def run_cancellable(cmd, token: Optional['CancellationToken'] = None,
+                    timeout: Optional[float] = None, **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run 대체: 자식 프로세스를 별도 그룹으로 실행하고, 토큰이 취소되면 그룹 전체를
+    바로 종료한 뒤 OperationCancelled 발생. token이 None이면 subprocess.run과 동일.
+    """
+    if token is None:
+        return subprocess.run(cmd, timeout=timeout, **kwargs)
+    token.raise_if_cancelled()
+
+    if kwargs.pop('capture_output', False):
+        kwargs['stdout'] = subprocess.PIPE
+        kwargs['stderr'] = subprocess.PIPE
+    process = subprocess.Popen(cmd, **popen_group_kwargs(), **kwargs)
+    with token.process(process):
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            terminate_process_group(process, grace=0)
+            stdout, stderr = process.communicate()
+            raise subprocess.TimeoutExpired(cmd, timeout, output=stdout, stderr=stderr)
+    token.raise_if_cancelled()
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+class CancellationToken:
+    """작업 단위 취소 토큰 (스레드 안전, 호출하면 취소 여부 반환 → cancel_check로 바로 사용 가능)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.RLock()
+        self._callbacks: Dict[int, Callable[[], None]] = {}
+        self._next_id = 0
+        self._outputs: List[Path] = []
+        self._watchers: List['_CancelFileWatcher'] = []
+        self.reason: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------------
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def __call__(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """취소될 때까지 대기 (취소되면 True)"""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled(self.reason or 'cancelled')
+
+    def cancel(self, reason: str = 'cancelled'):
+        """취소: 등록된 콜백 실행(프로세스 종료, 태스크 취소 등) 후 부분 출력 정리"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+
+        logger.warning(f"🛑 취소 신호: {reason}")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"취소 콜백 오류: {e}")
+        self.cleanup_outputs()
+
+    # ------------------------------------------------------------------
+    # 전달 대상 등록
+    # ------------------------------------------------------------------
+    def add_callback(self, callback: Callable[[], None]) -> int:
+        """취소 시 호출할 콜백 등록 (이미 취소됐으면 바로 호출). 반환값은 remove_callback용"""
+        with self._lock:
+            if not self._event.is_set():
+                self._next_id += 1
+                self._callbacks[self._next_id] = callback
+                return self._next_id
+        callback()
+        return 0
+
+    def remove_callback(self, handle: int):
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    @contextmanager
+    def process(self, process: subprocess.Popen):
+        """블록 동안 취소 시 프로세스 그룹 종료"""
+        handle = self.add_callback(lambda: terminate_process_group(process))
+        try:
+            yield process
+        finally:
+            self.remove_callback(handle)
+
+    def bind_task(self, task=None, loop=None) -> int:
+        """asyncio 태스크 연결 (기본: 현재 태스크). 취소 시 다른 스레드에서도 안전하게 task.cancel()"""
+        import asyncio
+        task = task or asyncio.current_task()
+        loop = loop or task.get_loop()
+
+        def cancel_task():
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(task.cancel)
+        return self.add_callback(cancel_task)
+
+    def bind_executor(self, executor) -> int:
+        """concurrent.futures 실행기 연결: 취소 시 아직 시작하지 않은 작업 취소"""
+        return self.add_callback(lambda: executor.shutdown(wait=False, cancel_futures=True))
+
+    def track_output(self, path: Path):
+        """취소 시 삭제할 부분 출력 파일 등록"""
+        with self._lock:
+            self._outputs.append(Path(path))
+
+    def untrack_output(self, path: Path):
+        """완성된 출력 파일은 삭제 대상에서 제외"""
+        with self._lock:
+            try:
+                self._outputs.remove(Path(path))
+            except ValueError:
+                pass
+
+    @contextmanager
+    def partial_output(self, path: Path):
+        """블록이 정상 종료되면 유지, 예외(취소 포함)로 끝나면 파일 삭제"""
+        path = Path(path)
+        self.track_output(path)
+        try:
+            yield path
+        except BaseException:
+            _remove_file(path)
+            raise
+        finally:
+            self.untrack_output(path)
+
+    def cleanup_outputs(self) -> int:
+        with self._lock:
+            outputs, self._outputs = self._outputs, []
+        removed = sum(1 for path in outputs if _remove_file(path))
+        if removed:
+            logger.info(f"🧹 부분 출력 파일 {removed}개 삭제")
+        return removed
+
+    # ------------------------------------------------------------------
+    # 신호 입력
+    # ------------------------------------------------------------------
+    def watch_files(self, *dirs: Path, names: Iterable[str] = CANCEL_FILE_NAMES):
+        """dirs 안에 names 파일이 생기면 취소 (inotify, 불가하면 폴링)"""
+        watcher = _CancelFileWatcher(self, [Path(d) for d in dirs if d], tuple(names))
+        watcher.start()
+        with self._lock:
+            self._watchers.append(watcher)
+        return watcher
+
+    def unwatch(self, watcher: '_CancelFileWatcher'):
+        """watch_files로 시작한 감시 하나만 중지 (다른 감시 / 콜백은 그대로)"""
+        with self._lock:
+            if watcher not in self._watchers:
+                return
+            self._watchers.remove(watcher)
+        watcher.stop()
+
+    def install_signal_handlers(self, signals: Iterable[int] = (signal.SIGTERM, signal.SIGINT)):
+        """시그널 → 취소 (메인 스레드에서만). 이미 취소된 뒤 다시 받으면 즉시 종료"""
+        def handler(signum, frame):
+            if self._event.is_set():
+                raise KeyboardInterrupt(f"signal {signum}")
+            threading.Thread(target=self.cancel, args=(f"시그널 {signum}",), daemon=True).start()
+
+        for signum in signals:
+            signal.signal(signum, handler)
+
+    def close(self):
+        """파일 감시 중지"""
+        with self._lock:
+            watchers, self._watchers = self._watchers, []
+        for watcher in watchers:
+            watcher.stop()
+
+
+def _remove_file(path: Path) -> bool:
+    try:
+        if path.is_file():
+            path.unlink()
+            return True
+    except OSError as e:
+        logger.debug(f"부분 출력 삭제 실패: {path} ({e})")
+    return False
+
+
+# ----------------------------------------------------------------------
+# 파일 감시 (inotify / 폴링)
+# ----------------------------------------------------------------------
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_inotify():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class _CancelFileWatcher:
+    """취소 파일 생성 감시 스레드"""
+
+    def __init__(self, token: CancellationToken, dirs: List[Path], names: tuple):
+        self.token = token
+        self.dirs = dirs
+        self.names = names
+        self._stop = threading.Event()
+        self._closed = False
+        self._inotify_fd: Optional[int] = None
+        self._wake_r = self._wake_w = None
+        self._poll_dirs: List[Path] = []
+        self._thread = threading.Thread(target=self._run, name='cancel-file-watcher', daemon=True)
+
+    def _exists(self, dirs: Iterable[Path]) -> Optional[Path]:
+        for d in dirs:
+            for name in self.names:
+                if (d / name).exists():
+                    return d / name
+        return None
+
+    def _setup_inotify(self):
+        libc = _load_inotify()
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC) if libc is not None else -1
+        if fd < 0:
+            self._poll_dirs = list(self.dirs)
+            return
+        self._inotify_fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        for d in self.dirs:
+            if libc.inotify_add_watch(fd, os.fsencode(str(d)), _IN_CREATE | _IN_MOVED_TO) < 0:
+                self._poll_dirs.append(d)  # 폴더가 아직 없거나 감시 불가 → 폴링
+
+    def start(self):
+        self._setup_inotify()
+        # 감시 시작 전에 이미 만들어진 파일
+        existing = self._exists(self.dirs)
+        if existing:
+            self.token.cancel(f"{existing.name} 파일 감지")
+            return
+        self._thread.start()
+
+    def stop(self):
+        if self._closed:
+            return
+        self._stop.set()
+        if self._wake_w is not None:
+            os.write(self._wake_w, b'x')
+        if self._thread.is_alive() and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=2)
+        self._closed = True
+        for fd in (self._inotify_fd, self._wake_r, self._wake_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    def _run(self):
+        while not self._stop.is_set() and not self.token.cancelled:
+            if self._inotify_fd is None:
+                self._stop.wait(POLL_INTERVAL)
+            else:
+                timeout = POLL_INTERVAL if self._poll_dirs else None
+                readable, _, _ = select.select([self._inotify_fd, self._wake_r], [], [], timeout)
+                if self._inotify_fd in readable:
+                    name = self._read_events()
+                    if name:
+                        self.token.cancel(f"{name} 파일 감지")
+                        return
+            if self._poll_dirs and not self._stop.is_set():
+                found = self._exists(self._poll_dirs)
+                if found:
+                    self.token.cancel(f"{found.name} 파일 감지")
+                    return
+
+    def _read_events(self) -> Optional[str]:
+        try:
+            data = os.read(self._inotify_fd, 4096)
+        except BlockingIOError:
+            return None
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            start = offset + _EVENT_HEADER.size
+            name = data[start:start + length].rstrip(b'\0').decode('utf-8', 'ignore')
+            offset = start + length
+            if name in self.names:
+                return name
+        return None
+
+
+# ----------------------------------------------------------------------
+# 폴더별 공유 토큰
+# ----------------------------------------------------------------------
+_folder_tokens: Dict[str, CancellationToken] = {}
+_folder_tokens_lock = threading.Lock()
+
+
+def cancel_token_for(folder: Path, names: Iterable[str] = CANCEL_FILE_NAMES) -> CancellationToken:
+    """
+    폴더의 취소 파일을 감시하는 공유 토큰 (같은 폴더면 같은 토큰)
+
+    이미 취소된 토큰인데 취소 파일이 지워졌으면(다음 작업) 새 토큰을 만든다.
+    """
+    folder = Path(folder)
+    names = tuple(names)
+    key = f"{folder.resolve()}|{','.join(names)}"
+    with _folder_tokens_lock:
+        token = _folder_tokens.get(key)
+        if token is not None and token.cancelled and not any((folder / n).exists() for n in names):
+            token.close()
+            token = None
+        if token is None:
+            token = CancellationToken()
+            token.watch_files(folder, names=names)
+            _folder_tokens[key] = token
+        return token
+
+
+def find_cancel_token(folder: Path, names: Iterable[str] = CANCEL_FILE_NAMES) -> Optional[CancellationToken]:
+    """이미 만들어진 폴더 공유 토큰 (없으면 None - 감시 스레드를 새로 시작하지 않음)"""
+    key = f"{Path(folder).resolve()}|{','.join(tuple(names))}"
+    with _folder_tokens_lock:
+        return _folder_tokens.get(key)
+
+
+def release_cancel_token(folder: Path, names: Iterable[str] = CANCEL_FILE_NAMES):
+    """작업이 끝난 폴더의 공유 토큰 감시 중지 (상주 워커에서 감시 스레드가 쌓이지 않도록)"""
+    folder = Path(folder)
+    key = f"{folder.resolve()}|{','.join(tuple(names))}"
+    with _folder_tokens_lock:
+        token = _folder_tokens.pop(key, None)
+    if token is not None:
+        token.close()
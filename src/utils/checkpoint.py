@@ -0,0 +1,144 @@
+"""
+단계별 체크포인트 저널 (중단 후 이어하기)
+
+작업 폴더에 완료된 단계(TTS 생성, 씬 N 렌더링, 최종 병합)를 JSON으로 기록한다.
+다시 실행하면 입력이 같고 출력 파일이 그대로 남아 있는 단계는 건너뛴다.
+
+- 항목마다 입력 지문(key)을 저장: 나레이션 / 음성 / 미디어 파일 / 렌더 설정이 바뀌면 다시 실행
+- 출력 파일 크기도 저장: 파일이 지워졌거나 중간에 잘렸으면 다시 실행
+- 기록은 임시 파일 + os.replace로 원자적으로 저장 (저장 중 죽어도 이전 기록 유지)
+
+    journal = CheckpointJournal(output_folder / CHECKPOINT_FILENAME)
+    key = fingerprint(narration, voice, speed)
+    cached = journal.lookup('tts', scene_num, key)
+    if cached is None:
+        duration = generate(...)
+        journal.record('tts', scene_num, key, outputs=[audio_path], duration=duration)
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILENAME = 'checkpoint.json'
+CHECKPOINT_VERSION = 1
+
+
+def fingerprint(*parts: Any) -> str:
+    """입력 값들의 지문 (JSON으로 직렬화해서 해시, Path는 문자열로)"""
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def file_signature(path: Optional[Path]) -> Optional[list]:
+    """
+    파일 지문용 값 (파일 이름, 크기, 수정 시각) - 없으면 None
+
+    전체 경로는 넣지 않음: 작업 폴더를 옮기거나 다른 경로로 마운트해도 지문이 같아야 이어하기 가능
+    (출력 파일을 _relative()로 저장하는 것과 같은 이유). 내용이 바뀌면 크기 / 수정 시각이 바뀐다.
+    """
+    if path is None:
+        return None
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return [Path(path).name, stat.st_size, stat.st_mtime_ns]
+
+
+class CheckpointJournal:
+    """작업 폴더의 단계별 완료 기록 (스레드 안전)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        empty = {'version': CHECKPOINT_VERSION, 'stages': {}}
+        if not self.path.exists():
+            return empty
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 체크포인트를 읽을 수 없어 처음부터 진행: {e}")
+            return empty
+        if data.get('version') != CHECKPOINT_VERSION or not isinstance(data.get('stages'), dict):
+            return empty
+        return data
+
+    def _save(self):
+        """임시 파일에 쓰고 교체 (호출 측에서 _lock 보유)"""
+        self._data['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _relative(self, path: Path) -> str:
+        """작업 폴더 안의 파일은 상대 경로로 저장 (폴더를 옮겨도 이어하기 가능)"""
+        path = Path(path)
+        try:
+            return str(path.resolve().relative_to(self.path.parent.resolve()))
+        except ValueError:
+            return str(path)
+
+    def _absolute(self, stored: str) -> Path:
+        path = Path(stored)
+        return path if path.is_absolute() else self.path.parent / path
+
+    def lookup(self, stage: str, item: Any, key: str) -> Optional[Dict]:
+        """
+        완료 기록 조회
+
+        Returns:
+            기록할 때 넘긴 데이터 (key가 다르거나 출력 파일이 없거나 크기가 다르면 None)
+        """
+        with self._lock:
+            entry = self._data['stages'].get(stage, {}).get(str(item))
+        if not entry or entry.get('key') != key:
+            return None
+        for output in entry.get('outputs', []):
+            try:
+                if self._absolute(output['path']).stat().st_size != output['size']:
+                    return None
+            except OSError:
+                return None
+        return dict(entry.get('data', {}))
+
+    def record(self, stage: str, item: Any, key: str, outputs: Iterable[Path] = (), **data):
+        """단계 완료 기록 (출력 파일 크기 포함)"""
+        entry = {
+            'key': key,
+            'outputs': [{'path': self._relative(p), 'size': Path(p).stat().st_size} for p in outputs],
+            'data': data,
+            'done_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            self._data['stages'].setdefault(stage, {})[str(item)] = entry
+            try:
+                self._save()
+            except OSError as e:
+                logger.warning(f"⚠️ 체크포인트 저장 실패: {e}")
+
+    def completed(self, stage: str) -> int:
+        with self._lock:
+            return len(self._data['stages'].get(stage, {}))
+
+    def clear(self):
+        """기록 전체 삭제 (처음부터 다시 실행)"""
+        with self._lock:
+            self._data = {'version': CHECKPOINT_VERSION, 'stages': {}}
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
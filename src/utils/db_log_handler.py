@@ -2,88 +2,219 @@
 Database logging handler for Python logging module.
 Saves logs to contents_logs table in SQLite database.
 (v3: job_logs → contents_logs 통합)
+
+- (content_id, id) 인덱스: 작업별 폴링 시 전체 테이블 스캔 방지
+- since_id 증분 조회: 프론트엔드는 마지막으로 받은 id 이후만 요청
+- level 컬럼: LIKE 검색 없이 레벨 필터링
+- 보관 정책: 끝난 작업의 로그는 작업별 gzip(JSONL) 파일로 옮기고 테이블에서 삭제
 """
+import gzip
+import json
 import logging
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import closing
 from datetime import datetime
 import os
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# 작업이 끝난 것으로 보는 contents.status 값
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+def ensure_log_schema(connection: sqlite3.Connection):
+    """contents_logs 테이블 / level 컬럼 / 인덱스 생성 (기존 DB는 마이그레이션)"""
+    # contents_logs 테이블이 없으면 생성 (v3: job_logs → contents_logs 통합)
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS contents_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_id TEXT NOT NULL,
+            log_message TEXT NOT NULL,
+            created_at TEXT DEFAULT (datetime('now')),
+            level TEXT
+        )
+    ''')
+    columns = {row[1] for row in connection.execute('PRAGMA table_info(contents_logs)')}
+    if 'level' not in columns:
+        connection.execute('ALTER TABLE contents_logs ADD COLUMN level TEXT')
+    connection.execute(
+        'CREATE INDEX IF NOT EXISTS idx_contents_logs_content_id ON contents_logs (content_id, id)'
+    )
+    connection.commit()
 
 
 class DatabaseLogHandler(logging.Handler):
     """
     Custom logging handler that saves logs to SQLite database.
+
+    emit()은 포맷팅 후 큐에 넣기만 하고, 백그라운드 writer 스레드가
+    batch_size개 또는 flush_interval초마다 executemany + commit 한 번으로 저장한다.
+    (렌더링 스레드가 로그 한 줄마다 fsync를 기다리지 않음)
     """
 
-    def __init__(self, db_path: str, job_id: str):
+    # 큐가 가득 차면 (DB가 잠겨서 writer가 밀릴 때) 로그를 버리고 렌더링을 막지 않음
+    MAX_QUEUE_SIZE = 10000
+
+    def __init__(self, db_path: str, job_id: str, batch_size: int = 100,
+                 flush_interval: float = 0.5, busy_timeout_ms: int = 5000):
         """
         Initialize the database log handler.
 
         Args:
             db_path: Path to SQLite database file
             job_id: Job ID to associate logs with
+            batch_size: Commit after this many records
+            flush_interval: Commit at least this often (seconds) while records are pending
+            busy_timeout_ms: SQLite busy timeout (frontend may hold a write lock)
         """
         super().__init__()
         self.db_path = db_path
         self.job_id = job_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.busy_timeout_ms = busy_timeout_ms
         self.connection = None
-        self.cursor = None
+        self.dropped = 0
 
-        # DB 연결 초기화
-        self._init_connection()
+        self._queue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
+        self._ready = threading.Event()
+        self._closed = False
+
+        # writer 스레드 시작 (DB 연결은 writer 스레드가 소유)
+        self._writer = threading.Thread(target=self._writer_loop, name='db-log-writer', daemon=True)
+        self._writer.start()
+        self._ready.wait(timeout=10)
 
     def _init_connection(self):
-        """Initialize database connection."""
+        """Initialize database connection (writer thread)."""
         try:
-            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.cursor = self.connection.cursor()
-
-            # contents_logs 테이블이 없으면 생성 (v3: job_logs → contents_logs 통합)
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS contents_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content_id TEXT NOT NULL,
-                    log_message TEXT NOT NULL,
-                    created_at TEXT DEFAULT (datetime('now'))
-                )
-            ''')
-            self.connection.commit()
+            self.connection = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000)
+            # WAL: 프론트엔드 읽기와 동시에 쓰기 가능, synchronous=NORMAL: 커밋마다 fsync 안 함
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+            self.connection.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+
+            ensure_log_schema(self.connection)
         except Exception as e:
             print(f"Failed to initialize DB connection: {e}")
+            self.connection = None
+
+    def _write_batch(self, rows):
+        if not rows or not self.connection:
+            return
+        try:
+            self.connection.executemany(
+                'INSERT INTO contents_logs (content_id, log_message, level) VALUES (?, ?, ?)',
+                rows
+            )
+            self.connection.commit()
+        except Exception as e:
+            # 로그 저장 실패는 조용히 처리 (로그 무한 루프 방지)
+            print(f"Failed to save {len(rows)} log(s) to database: {e}")
+            try:
+                self.connection.rollback()
+            except Exception:
+                pass
+
+    def _writer_loop(self):
+        """큐에서 로그를 모아 배치로 저장"""
+        self._init_connection()
+        self._ready.set()
+
+        rows = []
+        deadline = None
+        running = True
+        while running:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+
+            if item is None:
+                running = False
+            elif isinstance(item, threading.Event):
+                # flush() 요청: 지금까지 쌓인 로그 저장 후 알림
+                self._write_batch(rows)
+                rows, deadline = [], None
+                item.set()
+                continue
+            elif item:
+                rows.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if not running or len(rows) >= self.batch_size or \
+                    (deadline is not None and time.monotonic() >= deadline):
+                self._write_batch(rows)
+                rows, deadline = [], None
+
+        if self.connection:
+            try:
+                self.connection.close()
+            except Exception as e:
+                print(f"Failed to close DB connection: {e}")
+            self.connection = None
 
     def emit(self, record):
         """
-        Emit a log record to the database.
+        Queue a log record for the background writer.
 
         Args:
             record: LogRecord instance
         """
+        if self._closed:
+            return
         try:
-            # 로그 메시지 포맷팅
+            # 로그 메시지 포맷팅 (호출 스레드에서, 레코드 상태가 바뀌기 전에)
             log_message = self.format(record)
-
-            # DB에 저장 (v3: job_logs → contents_logs)
-            if self.connection and self.cursor:
-                self.cursor.execute(
-                    'INSERT INTO contents_logs (content_id, log_message) VALUES (?, ?)',
-                    (self.job_id, log_message)
-                )
-                self.connection.commit()
+            self._queue.put_nowait((self.job_id, log_message, record.levelname))
+        except queue.Full:
+            self.dropped += 1
         except Exception as e:
-            # 로그 저장 실패는 조용히 처리 (로그 무한 루프 방지)
-            print(f"Failed to save log to database: {e}")
+            print(f"Failed to queue log for database: {e}")
 
-    def close(self):
-        """Close database connection."""
+    def flush(self, timeout: float = 10.0):
+        """Block until all queued records are committed."""
+        if self._closed or not self._writer.is_alive():
+            return
+        done = threading.Event()
         try:
-            if self.connection:
-                self.connection.close()
-        except Exception as e:
-            print(f"Failed to close DB connection: {e}")
+            self._queue.put(done, timeout=timeout)
+            done.wait(timeout)
+        except queue.Full:
+            pass
+
+    def close(self):
+        """Flush pending records and close database connection."""
+        if not self._closed:
+            self._closed = True
+            try:
+                self._queue.put(None, timeout=10)
+            except queue.Full:
+                pass
+            self._writer.join(timeout=30)
+            if self.dropped:
+                print(f"Warning: {self.dropped} log record(s) dropped (DB writer queue full)")
 
         super().close()
 
 
+def default_db_path() -> Path:
+    """프론트엔드 SQLite DB 경로 (프로젝트 루트에서 2단계 위)"""
+    backend_root = Path(__file__).parent.parent.parent
+    frontend_root = backend_root.parent / 'trend-video-frontend'
+    db_path = frontend_root / 'data' / 'database.sqlite'
+
+    if not db_path.exists():
+        print(f"Warning: Database not found at {db_path}")
+        db_path = backend_root.parent / 'data' / 'database.sqlite'
+    return db_path
+
+
 def setup_db_logging(job_id: str, logger_name: str = None, level=logging.INFO) -> logging.Logger:
     """
     Setup database logging for a job.
@@ -96,14 +227,7 @@ def setup_db_logging(job_id: str, logger_name: str = None, level=logging.INFO) -
     Returns:
         Logger instance with DB handler attached
     """
-    # DB 경로 찾기 (프로젝트 루트에서 2단계 위)
-    backend_root = Path(__file__).parent.parent.parent
-    frontend_root = backend_root.parent / 'trend-video-frontend'
-    db_path = frontend_root / 'data' / 'database.sqlite'
-
-    if not db_path.exists():
-        print(f"Warning: Database not found at {db_path}")
-        db_path = backend_root.parent / 'data' / 'database.sqlite'
+    db_path = default_db_path()
 
     # Logger 가져오기
     logger = logging.getLogger(logger_name)
@@ -149,3 +273,159 @@ def auto_setup_db_logging(logger_name: str = None, level=logging.INFO) -> loggin
         return logging.getLogger(logger_name)
 
     return setup_db_logging(job_id, logger_name, level)
+
+
+def read_logs(db_path: str, content_id: str, since_id: int = 0,
+              levels: Optional[Iterable[str]] = None, limit: int = 500) -> List[Dict]:
+    """
+    작업 로그 증분 조회 ((content_id, id) 인덱스 사용)
+
+    폴링마다 불리므로 읽기만 한다 (스키마 마이그레이션은 DatabaseLogHandler 초기화 때 한 번).
+    아직 마이그레이션 전인 DB면 테이블이 없을 때 빈 목록, level 컬럼이 없으면 level=None으로 반환.
+
+    Args:
+        db_path: SQLite DB 경로
+        content_id: 작업(컨텐츠) ID
+        since_id: 이 id 이후의 로그만 반환 (마지막으로 받은 id를 넘기면 됨)
+        levels: 레벨 필터 (예: ['WARNING', 'ERROR'])
+        limit: 최대 개수
+
+    Returns:
+        [{'id', 'log_message', 'level', 'created_at'}, ...] (id 오름차순)
+    """
+    levels = list(levels or [])
+
+    def build(level_column: str):
+        query = (f'SELECT id, log_message, {level_column} AS level, created_at FROM contents_logs'
+                 f' WHERE content_id = ? AND id > ?')
+        params: list = [content_id, since_id]
+        if levels:
+            query += f" AND {level_column} IN ({','.join('?' * len(levels))})"
+            params.extend(level.upper() for level in levels)
+        return query + ' ORDER BY id LIMIT ?', params + [limit]
+
+    with closing(sqlite3.connect(db_path, timeout=5)) as conn:
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(*build('level'))]
+        except sqlite3.OperationalError as e:
+            if 'no such table' in str(e):
+                return []
+            if 'no such column' not in str(e):
+                raise
+        return [dict(row) for row in conn.execute(*build('NULL'))]
+
+
+def archive_job_logs(db_path: str, content_id: str, archive_dir: Path) -> Optional[Path]:
+    """
+    작업 하나의 로그를 gzip JSONL 파일로 옮기고 테이블에서 삭제
+
+    같은 작업을 다시 보관하면 기존 파일 뒤에 이어 붙인다 (gzip 멤버 추가).
+
+    Returns:
+        보관 파일 경로 (옮길 로그가 없으면 None)
+    """
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    safe_id = "".join(c if c.isalnum() or c in '-_' else '_' for c in str(content_id))
+    archive_path = archive_dir / f"{safe_id}.jsonl.gz"
+
+    with closing(sqlite3.connect(db_path, timeout=30)) as conn, conn:
+        ensure_log_schema(conn)
+        rows = conn.execute(
+            'SELECT id, log_message, level, created_at FROM contents_logs WHERE content_id = ? ORDER BY id',
+            (content_id,)
+        ).fetchall()
+        if not rows:
+            return None
+
+        # 파일 기록이 끝난 뒤에만 삭제 (중간 실패 시 로그 유실 방지)
+        with gzip.open(archive_path, 'at', encoding='utf-8') as f:
+            for row_id, message, level, created_at in rows:
+                f.write(json.dumps({'id': row_id, 'content_id': content_id, 'level': level,
+                                    'created_at': created_at, 'log_message': message},
+                                   ensure_ascii=False) + '\n')
+        conn.execute('DELETE FROM contents_logs WHERE content_id = ? AND id <= ?', (content_id, rows[-1][0]))
+    return archive_path
+
+
+def read_archived_logs(archive_dir: Path, content_id: str) -> List[Dict]:
+    """보관된 작업 로그 읽기"""
+    safe_id = "".join(c if c.isalnum() or c in '-_' else '_' for c in str(content_id))
+    archive_path = Path(archive_dir) / f"{safe_id}.jsonl.gz"
+    if not archive_path.exists():
+        return []
+    with gzip.open(archive_path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_finished_jobs(db_path: str, retention_hours: float = 24.0) -> List[str]:
+    """
+    보관 대상 작업 ID 목록
+
+    contents 테이블이 있으면 status가 끝난 상태(completed/failed/cancelled)이고,
+    마지막 로그가 retention_hours보다 오래된 작업. contents 테이블이 없으면
+    마지막 로그 기준으로만 판단한다.
+    """
+    with closing(sqlite3.connect(db_path, timeout=5)) as conn:
+        ensure_log_schema(conn)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        cutoff = f'-{float(retention_hours)} hours'
+
+        query = '''
+            SELECT content_id FROM contents_logs
+            GROUP BY content_id
+            HAVING MAX(created_at) < datetime('now', ?)
+        '''
+        params: list = [cutoff]
+        if 'contents' in tables:
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(contents)')}
+            if {'id', 'status'} <= columns:
+                query = f'''
+                    SELECT l.content_id FROM contents_logs l
+                    JOIN contents c ON c.id = l.content_id
+                    WHERE c.status IN ({','.join('?' * len(FINISHED_STATUSES))})
+                    GROUP BY l.content_id
+                    HAVING MAX(l.created_at) < datetime('now', ?)
+                '''
+                params = [*FINISHED_STATUSES, cutoff]
+        return [row[0] for row in conn.execute(query, params)]
+
+
+def compact_logs(db_path: str, archive_dir: Path, retention_hours: float = 24.0) -> Dict[str, int]:
+    """
+    끝난 작업의 로그를 보관 파일로 옮기고 DB 파일 공간 정리
+
+    Returns:
+        {'jobs': 보관한 작업 수, 'remaining': DB에 남은 로그 수}
+    """
+    jobs = find_finished_jobs(db_path, retention_hours)
+    moved = 0
+    for content_id in jobs:
+        path = archive_job_logs(db_path, content_id, archive_dir)
+        if path:
+            moved += 1
+
+    if moved:
+        with closing(sqlite3.connect(db_path, timeout=30)) as conn:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    with closing(sqlite3.connect(db_path, timeout=5)) as conn:
+        remaining = conn.execute('SELECT COUNT(*) FROM contents_logs').fetchone()[0]
+    print(f"contents_logs compaction: {moved} job(s) archived to {archive_dir}, {remaining} row(s) remaining")
+    return {'jobs': moved, 'remaining': remaining}
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="contents_logs 보관/정리 (cron 등에서 주기 실행)")
+    parser.add_argument("--db", default=None, help="SQLite DB 경로 (기본: 프론트엔드 DB)")
+    parser.add_argument("--archive-dir", default=None, help="보관 폴더 (기본: DB 옆 log_archive)")
+    parser.add_argument("--retention-hours", type=float, default=24.0,
+                        help="작업 종료 후 DB에 남겨둘 시간 (기본: 24)")
+    args = parser.parse_args()
+
+    db = Path(args.db) if args.db else default_db_path()
+    compact_logs(str(db), Path(args.archive_dir) if args.archive_dir else db.parent / 'log_archive',
+                 args.retention_hours)
@@ -0,0 +1,133 @@
+"""
+더빙 타임라인 (세그먼트를 원본 시작 시각에 배치)
+
+세그먼트 MP3를 이어 붙이면 번역 TTS가 원문보다 길 때마다 뒤로 밀려 긴 영상에서 싱크가 어긋난다.
+여기서는:
+- 세그먼트마다 자기 구간(원본 시작 ~ 다음 세그먼트 시작)에 맞춰 배치
+- 구간보다 길면 atempo(WSOLA 계열)로 최대 MAX_TEMPO배까지 압축, 그래도 넘치면 그만큼만 뒤로 밀고
+  다음 세그먼트에서 다시 원본 시각으로 돌아옴 (밀림이 누적되지 않음)
+- 디코딩(+압축)은 세그먼트별 ffmpeg를 동시에 실행해 float32 PCM으로 받고,
+  NumPy 버퍼 하나에 한 번에 섞은 뒤 인코딩은 한 번만
+
+    placements = render_dub_track(audio_segments, output_audio, total_duration=video_duration)
+"""
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .lazy_import import lazy_module
+
+np = lazy_module('numpy')
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 24000  # Edge / OpenAI TTS 출력과 같은 샘플레이트 (리샘플링 최소화)
+MAX_TEMPO = 1.35     # 이보다 빠르면 부자연스러움 - 넘치는 만큼은 뒤로 밀림
+DECODE_WORKERS = 4
+
+
+class DubbingError(RuntimeError):
+    """세그먼트 디코딩 / 트랙 인코딩 실패"""
+
+
+@dataclass
+class Placement:
+    start: float      # 타임라인 시작 (초)
+    duration: float   # 압축 후 길이 (초)
+    tempo: float      # atempo 배율 (1.0 = 원래 속도)
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+def plan_timeline(segments: Sequence[Dict], max_tempo: float = MAX_TEMPO,
+                  total_duration: Optional[float] = None) -> List[Placement]:
+    """
+    세그먼트 배치 계산 (original_start / original_end / actual_duration 사용)
+
+    세그먼트가 쓸 수 있는 구간은 다음 세그먼트의 원본 시작까지 (마지막은 total_duration 또는 원본 끝).
+    """
+    placements = []
+    previous_end = 0.0
+    for i, segment in enumerate(segments):
+        start = max(float(segment['original_start']), previous_end)
+        if i + 1 < len(segments):
+            slot_end = float(segments[i + 1]['original_start'])
+        else:
+            slot_end = max(float(segment['original_end']), total_duration or 0.0)
+        duration = float(segment['actual_duration'])
+        available = slot_end - start
+        tempo = 1.0
+        if duration > available:
+            tempo = min(max_tempo, duration / available) if available > 0 else max_tempo
+        placement = Placement(start=start, duration=duration / tempo, tempo=tempo)
+        placements.append(placement)
+        previous_end = placement.end
+    return placements
+
+
+def mix_clips(clips: Sequence[Tuple[float, 'np.ndarray']], sample_rate: int = SAMPLE_RATE,
+              length: Optional[float] = None) -> 'np.ndarray':
+    """(시작 초, mono float32 PCM) 목록을 버퍼 하나에 섞기 (겹치는 부분은 더한 뒤 [-1, 1]로 자름)"""
+    end = max((round(start * sample_rate) + len(pcm) for start, pcm in clips), default=0)
+    total = max(end, round((length or 0) * sample_rate))
+    track = np.zeros(total, dtype=np.float32)
+    for start, pcm in clips:
+        offset = round(start * sample_rate)
+        track[offset:offset + len(pcm)] += pcm
+    np.clip(track, -1.0, 1.0, out=track)
+    return track
+
+
+def decode_clip(path: Path, tempo: float = 1.0, sample_rate: int = SAMPLE_RATE,
+                ffmpeg: str = 'ffmpeg') -> 'np.ndarray':
+    """오디오 파일 → mono float32 PCM (tempo != 1이면 atempo로 길이만 줄이고 음높이는 유지)"""
+    cmd = [ffmpeg, '-v', 'error', '-i', str(path)]
+    if abs(tempo - 1.0) > 1e-3:
+        cmd += ['-af', f'atempo={tempo:.4f}']
+    cmd += ['-ac', '1', '-ar', str(sample_rate), '-f', 'f32le', '-']
+    result = subprocess.run(cmd, capture_output=True, timeout=120)
+    if result.returncode != 0:
+        raise DubbingError(f"세그먼트 디코딩 실패 ({Path(path).name}): "
+                           f"{result.stderr.decode('utf-8', 'replace')[-300:]}")
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def encode_track(track: 'np.ndarray', output_audio: Path, sample_rate: int = SAMPLE_RATE,
+                 ffmpeg: str = 'ffmpeg'):
+    """float32 PCM → 출력 파일 (코덱은 확장자로 결정, 인코딩 1회)"""
+    result = subprocess.run(
+        [ffmpeg, '-v', 'error', '-y', '-f', 'f32le', '-ac', '1', '-ar', str(sample_rate), '-i', '-',
+         str(output_audio)],
+        input=track.tobytes(), capture_output=True, timeout=600,
+    )
+    if result.returncode != 0:
+        raise DubbingError(f"더빙 트랙 인코딩 실패: {result.stderr.decode('utf-8', 'replace')[-300:]}")
+
+
+def render_dub_track(segments: Sequence[Dict], output_audio: Path, total_duration: Optional[float] = None,
+                     sample_rate: int = SAMPLE_RATE, max_tempo: float = MAX_TEMPO,
+                     ffmpeg: str = 'ffmpeg') -> List[Placement]:
+    """
+    세그먼트(path / original_start / original_end / actual_duration)를 타임라인에 배치해 더빙 트랙 한 개로 저장
+
+    Returns:
+        세그먼트별 배치 (자막 타이밍에 그대로 사용)
+    """
+    placements = plan_timeline(segments, max_tempo, total_duration)
+    with ThreadPoolExecutor(max_workers=DECODE_WORKERS) as pool:
+        pcm = list(pool.map(lambda item: decode_clip(item[0]['path'], item[1].tempo, sample_rate, ffmpeg),
+                            zip(segments, placements)))
+    track = mix_clips([(p.start, clip) for p, clip in zip(placements, pcm)], sample_rate, total_duration)
+    encode_track(track, output_audio, sample_rate, ffmpeg)
+
+    stretched = [p for p in placements if p.tempo > 1.0]
+    shifted = sum(1 for segment, p in zip(segments, placements) if p.start > float(segment['original_start']) + 0.01)
+    logger.info(f"🎚️ 더빙 타임라인: {len(placements)}개 세그먼트, {len(track) / sample_rate:.2f}초 "
+                f"(압축 {len(stretched)}개, 최대 {max((p.tempo for p in stretched), default=1.0):.2f}배, "
+                f"밀림 {shifted}개)")
+    return placements
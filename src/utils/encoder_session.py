@@ -0,0 +1,185 @@
+"""
+비디오 인코더 세션 (GPU 인코더 상태 관리 + CPU 폴백)
+
+- 하드웨어 인코더는 프로세스당 한 번, 1프레임 테스트 인코딩으로 실제 사용 가능 여부를 확인
+- 실행 중 실패한 인코더는 프로세스가 끝날 때까지 unhealthy로 표시 (다음 씬부터 바로 CPU 사용)
+- stderr를 실시간으로 읽어서 인코더 초기화 실패를 즉시 감지하고 프로세스를 중단
+  (capture_output으로 전체 인코딩이 끝날 때까지 기다리지 않음, ffmpeg_runner 사용)
+"""
+import logging
+import subprocess
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .ffmpeg_runner import run_ffmpeg, FFmpegResult
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 순서의 하드웨어 인코더 후보
+HW_ENCODERS = ['h264_nvenc', 'h264_qsv', 'h264_amf', 'h264_videotoolbox']
+CPU_ENCODER = 'libx264'
+
+# 인코더별 프리셋
+ENCODER_PRESETS = {
+    'h264_nvenc': 'p4',
+    'h264_qsv': 'fast',
+    'h264_amf': 'speed',
+    'h264_videotoolbox': 'medium',
+    'libx264': 'ultrafast',
+}
+
+# stderr에 나타나면 인코더 초기화 실패로 간주하는 문구
+ENCODER_FAILURE_MARKERS = (
+    'cannot load',
+    'no nvenc capable devices',
+    'openencodesessionex failed',
+    'no capable devices found',
+    'failed to initialise',
+    'failed to initialize',
+    'error initializing output stream',
+    'error while opening encoder',
+    'could not open encoder',
+    'unknown encoder',
+    'driver does not support',
+    'device creation failed',
+)
+
+
+def _is_encoder_failure(line: str) -> bool:
+    lowered = line.lower()
+    return any(marker in lowered for marker in ENCODER_FAILURE_MARKERS)
+
+
+class EncoderSession:
+    """프로세스 단위 인코더 선택/상태 관리"""
+
+    def __init__(self, ffmpeg_path: Optional[str] = None):
+        self._ffmpeg_path = ffmpeg_path
+        self._lock = threading.RLock()
+        self._available: Optional[List[str]] = None  # ffmpeg -encoders 결과
+        self._health: Dict[str, bool] = {CPU_ENCODER: True}
+
+    @property
+    def ffmpeg_path(self) -> Optional[str]:
+        if self._ffmpeg_path is None:
+            from .ffmpeg_utils import get_ffmpeg_path
+            self._ffmpeg_path = get_ffmpeg_path() or ''
+        return self._ffmpeg_path or None
+
+    def _list_encoders(self) -> List[str]:
+        with self._lock:
+            return self._list_encoders_locked()
+
+    def _list_encoders_locked(self) -> List[str]:
+        if self._available is None:
+            self._available = []
+            if self.ffmpeg_path:
+                try:
+                    result = subprocess.run(
+                        [self.ffmpeg_path, '-hide_banner', '-encoders'],
+                        capture_output=True, text=True, timeout=10
+                    )
+                    self._available = [enc for enc in HW_ENCODERS if enc in result.stdout]
+                except Exception as e:
+                    logger.warning(f"인코더 목록 확인 실패: {e}")
+        return self._available
+
+    def _probe(self, encoder: str) -> bool:
+        """1프레임 테스트 인코딩으로 인코더 실제 동작 여부 확인"""
+        cmd = [
+            self.ffmpeg_path, '-hide_banner', '-nostdin', '-v', 'error',
+            '-f', 'lavfi', '-i', 'color=c=black:s=256x256:r=25:d=0.04',
+            '-frames:v', '1',
+            '-c:v', encoder,
+            '-pix_fmt', 'yuv420p',
+            '-f', 'null', '-'
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True,
+                                    encoding='utf-8', errors='ignore', timeout=20)
+            if result.returncode == 0:
+                return True
+            logger.info(f"인코더 프로브 실패 ({encoder}): {result.stderr.strip()[-200:]}")
+        except Exception as e:
+            logger.info(f"인코더 프로브 실패 ({encoder}): {e}")
+        return False
+
+    def is_healthy(self, encoder: str) -> bool:
+        """인코더 사용 가능 여부 (처음 물어볼 때 한 번만 프로브)"""
+        with self._lock:
+            if encoder not in self._health:
+                self._health[encoder] = encoder in self._list_encoders() and self._probe(encoder)
+            return self._health[encoder]
+
+    def mark_unhealthy(self, encoder: str, reason: str = ''):
+        """실행 중 실패한 인코더를 이 프로세스에서 더 이상 사용하지 않음"""
+        if encoder == CPU_ENCODER:
+            return
+        with self._lock:
+            if self._health.get(encoder) is not False:
+                logger.warning(f"⚠️ {encoder} 인코더 비활성화 (이후 CPU 인코더 사용): {reason[-200:]}")
+            self._health[encoder] = False
+
+    def select(self) -> Tuple[str, str]:
+        """
+        현재 사용 가능한 최고의 인코더 선택
+
+        Returns:
+            (인코더 이름, 프리셋)
+        """
+        for encoder in self._list_encoders():
+            if self.is_healthy(encoder):
+                return encoder, ENCODER_PRESETS[encoder]
+        return CPU_ENCODER, ENCODER_PRESETS[CPU_ENCODER]
+
+    def video_args(self, encoder: Optional[str] = None) -> List[str]:
+        """'-c:v <인코더> -preset <프리셋>' 인자"""
+        encoder = encoder or self.select()[0]
+        return ['-c:v', encoder, '-preset', ENCODER_PRESETS.get(encoder, 'medium')]
+
+    def run(self, build_cmd: Callable[[List[str]], List[str]], cwd: Optional[str] = None,
+            timeout: Optional[float] = None, duration: Optional[float] = None,
+            label: Optional[str] = None,
+            cancel_check: Optional[Callable[[], bool]] = None) -> FFmpegResult:
+        """
+        인코더 인자를 받아 명령어를 만드는 함수로 ffmpeg 실행 (실패 시 다음 인코더로 재시도)
+
+        Args:
+            build_cmd: video_args() 결과(['-c:v', ..., '-preset', ...])를 받아 전체 명령어를 반환
+            cwd: 작업 디렉토리
+            timeout: 타임아웃 (초)
+            duration: 예상 출력 길이 (진행률 표시용)
+            label: 로그에 표시할 작업 이름
+            cancel_check: STOP / .cancel 확인 함수
+
+        Raises:
+            subprocess.CalledProcessError: CPU 인코더까지 실패한 경우 (stderr 포함)
+            FFmpegCancelled: 취소 신호 감지
+        """
+        while True:
+            encoder, _ = self.select()
+            cmd = build_cmd(self.video_args(encoder))
+            # GPU 인코더는 stderr에 초기화 실패가 보이는 즉시 중단 (전체 인코딩을 기다리지 않음)
+            abort_on = None if encoder == CPU_ENCODER else _is_encoder_failure
+            result = run_ffmpeg(cmd, cwd=cwd, timeout=timeout, duration=duration, label=label,
+                                cancel_check=cancel_check, abort_on=abort_on)
+            if result.returncode == 0 and not result.aborted:
+                return result
+
+            if encoder != CPU_ENCODER and (result.aborted or encoder in result.stderr):
+                self.mark_unhealthy(encoder, result.stderr.strip())
+                continue
+            raise subprocess.CalledProcessError(result.returncode, result.args, stderr=result.stderr)
+
+
+_session: Optional[EncoderSession] = None
+_session_lock = threading.Lock()
+
+
+def get_encoder_session() -> EncoderSession:
+    """프로세스 전역 인코더 세션"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = EncoderSession()
+        return _session
@@ -0,0 +1,245 @@
+"""
+공통 FFmpeg 실행기 (실시간 진행률 + 멈춤 감지 + 취소)
+
+`-progress pipe:1`로 frame/fps/speed/out_time을 실시간으로 읽어서
+- 진행률을 주기적으로 로그 (DB 로그 핸들러가 붙어 있으면 작업 로그에 기록)
+- 일정 시간 진행이 없으면(멈춤) 타임아웃까지 기다리지 않고 중단
+- STOP / .cancel 파일이 생기면 즉시 중단
+- cancel_check로 CancellationToken을 넘기면 폴링 없이 취소 즉시 프로세스 그룹 종료
+- 취소되면 만들다 만 출력 파일 삭제
+"""
+import logging
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from .cancellation import (
+    CancellationToken,
+    OperationCancelled,
+    popen_group_kwargs,
+    terminate_process_group,
+)
+
+logger = logging.getLogger(__name__)
+
+# 진행률 갱신 없이 이 시간이 지나면 멈춘 것으로 판단 (초)
+STALL_TIMEOUT = 120.0
+# 진행률 로그 간격 (초)
+PROGRESS_LOG_INTERVAL = 10.0
+
+
+class FFmpegCancelled(OperationCancelled):
+    """STOP / .cancel 신호로 FFmpeg 실행이 중단됨"""
+
+
+@dataclass
+class FFmpegProgress:
+    """-progress 출력 한 블록"""
+    frame: int = 0
+    fps: float = 0.0
+    speed: float = 0.0          # 실시간 대비 배속 (1.0 = 실시간)
+    out_time: float = 0.0       # 출력된 미디어 시간 (초)
+    total_size: int = 0
+    status: str = 'continue'    # continue / end
+
+
+@dataclass
+class FFmpegResult:
+    """FFmpeg 실행 결과"""
+    args: List[str]
+    returncode: int
+    stderr: str
+    elapsed: float
+    progress: FFmpegProgress = field(default_factory=FFmpegProgress)
+    aborted: bool = False       # abort_on 조건으로 조기 중단됨
+
+
+def cancel_files_check(*dirs: Path) -> Callable[[], bool]:
+    """STOP / .cancel 파일 존재 여부를 확인하는 함수 생성"""
+    flags = [Path(d) / name for d in dirs if d for name in ('STOP', '.cancel')]
+
+    def check() -> bool:
+        return any(flag.exists() for flag in flags)
+    return check
+
+
+def _parse_out_time(value: str) -> float:
+    """out_time=00:01:02.345000 → 초"""
+    try:
+        h, m, s = value.split(':')
+        return int(h) * 3600 + int(m) * 60 + float(s)
+    except ValueError:
+        return 0.0
+
+
+def _with_progress_args(cmd: List[str]) -> List[str]:
+    """ffmpeg 실행 파일 바로 뒤에 -progress pipe:1 -nostats 삽입"""
+    if '-progress' in cmd:
+        return list(cmd)
+    return [cmd[0], '-progress', 'pipe:1', '-nostats', *cmd[1:]]
+
+
+def _remove_partial_output(cmd: List[str], started: float):
+    """취소된 실행이 쓰던 출력 파일(cmd[-1]) 삭제"""
+    target = str(cmd[-1])
+    if target.startswith('-') or target.startswith('pipe:'):
+        return
+    path = Path(target)
+    try:
+        if path.is_file() and path.stat().st_mtime >= started - 1:
+            path.unlink()
+            logger.info(f"🧹 부분 출력 삭제: {path.name}")
+    except OSError:
+        pass
+
+
+def run_ffmpeg(cmd: List[str], *, cwd: Optional[str] = None,
+               timeout: Optional[float] = None,
+               stall_timeout: Optional[float] = STALL_TIMEOUT,
+               duration: Optional[float] = None,
+               label: Optional[str] = None,
+               on_progress: Optional[Callable[[FFmpegProgress], None]] = None,
+               cancel_check: Optional[Callable[[], bool]] = None,
+               abort_on: Optional[Callable[[str], bool]] = None,
+               check: bool = False) -> FFmpegResult:
+    """
+    FFmpeg 실행 (진행률 스트리밍)
+
+    Args:
+        cmd: ffmpeg 명령어 (cmd[0]이 ffmpeg 실행 파일)
+        cwd: 작업 디렉토리
+        timeout: 전체 타임아웃 (초)
+        stall_timeout: 진행 없이 허용하는 최대 시간 (초, None이면 무제한)
+        duration: 예상 출력 길이 (초, 진행률 % 계산용)
+        label: 로그에 표시할 작업 이름
+        on_progress: 진행률 블록마다 호출되는 콜백
+        cancel_check: True를 반환하면 즉시 중단 (예: cancel_files_check(folder)).
+            CancellationToken이면 폴링을 기다리지 않고 취소 즉시 종료
+        abort_on: stderr 한 줄을 받아 True면 즉시 중단 (예: 인코더 초기화 실패)
+        check: 실패 시 CalledProcessError 발생
+
+    Raises:
+        FFmpegCancelled: 취소 신호 감지
+        subprocess.TimeoutExpired: 전체 타임아웃 또는 멈춤 감지
+        subprocess.CalledProcessError: check=True이고 실패한 경우
+    """
+    args = _with_progress_args(cmd)
+    label = label or Path(str(cmd[-1])).name
+    started = time.time()
+
+    process = subprocess.Popen(
+        args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, encoding='utf-8', errors='ignore', cwd=cwd, **popen_group_kwargs()
+    )
+
+    tail = deque(maxlen=200)
+    progress = FFmpegProgress()
+    state = {'last_update': started, 'reason': None, 'aborted': False}
+    done = threading.Event()
+
+    def kill(reason: str):
+        if state['reason'] is None:
+            state['reason'] = reason
+        if reason == 'cancel':
+            terminate_process_group(process)
+            return
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+    def read_stderr():
+        for line in process.stderr:
+            tail.append(line)
+            if abort_on and not state['aborted'] and abort_on(line):
+                state['aborted'] = True
+                kill('abort')
+
+    def watchdog():
+        while not done.wait(0.5):
+            now = time.time()
+            if cancel_check and cancel_check():
+                kill('cancel')
+            elif timeout and now - started > timeout:
+                kill('timeout')
+            elif stall_timeout and now - state['last_update'] > stall_timeout:
+                kill('stall')
+
+    stderr_thread = threading.Thread(target=read_stderr, daemon=True)
+    watchdog_thread = threading.Thread(target=watchdog, daemon=True)
+    stderr_thread.start()
+    watchdog_thread.start()
+    cancel_handle = None
+    if isinstance(cancel_check, CancellationToken):
+        cancel_handle = cancel_check.add_callback(lambda: kill('cancel'))
+
+    last_log = started
+    block = {}
+    try:
+        for line in process.stdout:
+            key, _, value = line.strip().partition('=')
+            if not key:
+                continue
+            block[key] = value
+            if key != 'progress':
+                continue
+
+            # 블록 완료 → 스냅샷 갱신
+            try:
+                progress.frame = int(block.get('frame', progress.frame) or 0)
+                progress.fps = float(block.get('fps', progress.fps) or 0)
+            except ValueError:
+                pass
+            speed = block.get('speed', '').rstrip('x').strip()
+            if speed and speed != 'N/A':
+                try:
+                    progress.speed = float(speed)
+                except ValueError:
+                    pass
+            if block.get('out_time', 'N/A') != 'N/A':
+                progress.out_time = _parse_out_time(block['out_time'])
+            if block.get('total_size', 'N/A').isdigit():
+                progress.total_size = int(block['total_size'])
+            progress.status = value
+            block = {}
+            state['last_update'] = time.time()
+
+            if on_progress:
+                on_progress(progress)
+            if state['last_update'] - last_log >= PROGRESS_LOG_INTERVAL:
+                last_log = state['last_update']
+                pct = f" {min(100.0, progress.out_time / duration * 100):.0f}%" if duration else ''
+                logger.info(f"⏳ {label}:{pct} frame={progress.frame} fps={progress.fps:.1f} "
+                            f"speed={progress.speed:.2f}x time={progress.out_time:.1f}s")
+        process.wait()
+    finally:
+        done.set()
+        if cancel_handle is not None:
+            cancel_check.remove_callback(cancel_handle)
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        stderr_thread.join(timeout=5)
+        process.stdout.close()
+        process.stderr.close()
+
+    elapsed = time.time() - started
+    stderr = ''.join(tail)
+
+    if state['reason'] == 'cancel':
+        _remove_partial_output(args, started)
+        raise FFmpegCancelled(f"{label}: 취소 신호 감지")
+    if state['reason'] in ('timeout', 'stall'):
+        what = '타임아웃' if state['reason'] == 'timeout' else f"{stall_timeout:.0f}초 동안 진행 없음"
+        logger.error(f"❌ {label}: FFmpeg 중단 ({what})")
+        raise subprocess.TimeoutExpired(args, timeout or stall_timeout, stderr=stderr)
+
+    result = FFmpegResult(args=args, returncode=process.returncode, stderr=stderr,
+                          elapsed=elapsed, progress=progress, aborted=state['aborted'])
+    if check and (result.returncode != 0 or result.aborted):
+        raise subprocess.CalledProcessError(result.returncode, args, stderr=stderr)
+    return result
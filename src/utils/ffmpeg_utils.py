@@ -7,6 +7,8 @@ import logging
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+from .audio_metadata import read_audio_info
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,7 +55,12 @@ def get_video_duration(video_path: Path) -> float:
 
 
 def get_audio_duration(audio_path: Path) -> float:
-    """FFprobe로 오디오 길이 확인"""
+    """오디오 길이 확인 (헤더 파싱 우선, 실패 시 FFprobe)"""
+    # MP3/WAV/AAC(ADTS)는 서브프로세스 없이 헤더에서 정확한 길이 계산
+    info = read_audio_info(audio_path)
+    if info and info.num_samples > 0:
+        return info.duration
+
     ffmpeg = get_ffmpeg_path()
     if not ffmpeg:
         raise RuntimeError("FFmpeg not found.")
@@ -101,47 +108,32 @@ def detect_best_encoder() -> Tuple[str, str]:
     """
     Detect the best available video encoder (GPU or CPU).
 
+    Hardware encoders are listed via `ffmpeg -encoders` and then verified once per
+    process with a one-frame test encode (see EncoderSession), so an encoder that is
+    compiled in but has no usable device falls back to libx264 up front.
+
     Returns:
         Tuple[str, str]: (encoder_name, encoder_type) where encoder_type is 'gpu' or 'cpu'
     """
-    ffmpeg_path = get_ffmpeg_path()
-    if not ffmpeg_path:
+    from .encoder_session import get_encoder_session, CPU_ENCODER
+
+    if not get_ffmpeg_path():
         logger.warning("FFmpeg not found, defaulting to libx264")
         return ("libx264", "cpu")
 
-    # Check for NVIDIA GPU encoder
     try:
-        result = subprocess.run(
-            [ffmpeg_path, "-hide_banner", "-encoders"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True,
-            timeout=10
-        )
-
-        encoders = result.stdout
-
-        if "h264_nvenc" in encoders:
-            logger.info("Using NVIDIA GPU encoder (h264_nvenc)")
-            return ("h264_nvenc", "gpu")
-        elif "h264_qsv" in encoders:
-            logger.info("Using Intel Quick Sync encoder (h264_qsv)")
-            return ("h264_qsv", "gpu")
-        elif "h264_amf" in encoders:
-            logger.info("Using AMD AMF encoder (h264_amf)")
-            return ("h264_amf", "gpu")
-        elif "h264_videotoolbox" in encoders:
-            logger.info("Using Apple VideoToolbox encoder (h264_videotoolbox)")
-            return ("h264_videotoolbox", "gpu")
-        else:
-            logger.info("Using CPU encoder (libx264)")
-            return ("libx264", "cpu")
-
+        encoder_name, _ = get_encoder_session().select()
     except Exception as e:
         logger.warning(f"Failed to detect encoder, defaulting to libx264: {e}")
         return ("libx264", "cpu")
 
+    if encoder_name == CPU_ENCODER:
+        logger.info("Using CPU encoder (libx264)")
+        return ("libx264", "cpu")
+
+    logger.info(f"Using GPU encoder ({encoder_name})")
+    return (encoder_name, "gpu")
+
 
 def concatenate_videos_with_fps_normalization(
     video_paths: List[Path],
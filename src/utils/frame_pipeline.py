@@ -0,0 +1,416 @@
+"""
+ffmpeg rawvideo 파이프 기반 프레임 파이프라인 (워터마크 / 자막 인페인팅)
+
+PNG 시퀀스를 디스크에 쓰고 읽는 대신:
+- 디코더 ffmpeg → stdout rawvideo(bgr24) → 재사용 NumPy 버퍼 (프레임마다 할당 없음)
+- 워터마크 영역 + 여백(margin)만 잘라서 인페인팅 (전체 프레임 대비 연산량 수십 분의 1)
+- 결과 프레임 → stdin rawvideo → 인코더 ffmpeg (원본 fps 유지, 원본 오디오 복사)
+
+디스크에는 최종 출력 영상만 쓴다.
+
+    inpaint_video(input_video, output_video, (x, y, w, h), cancel_check=token)
+"""
+import json
+import logging
+import math
+import subprocess
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .cancellation import OperationCancelled, popen_group_kwargs, terminate_process_group
+from .lazy_import import lazy_module
+
+np = lazy_module('numpy')
+cv2 = lazy_module('cv2')
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MARGIN = 16  # Telea(radius=3)는 경계 주변 픽셀만 쓰므로 이 정도 여백이면 전체 프레임과 같은 결과
+TEMPORAL_THRESHOLD = 1.5  # ROI 주변(crop) 평균 픽셀 차이가 이 이하면 이전 인페인팅 결과 재사용 (인코딩 노이즈 수준)
+TELEA_RADIUS = 3
+STDERR_TAIL_LINES = 20
+
+Region = Tuple[int, int, int, int]  # (x, y, w, h)
+Box = Tuple[int, int, int, int]  # (x0, y0, x1, y1)
+
+# crop(H, W, 3) + mask(H, W) → 인페인팅된 crop
+InpaintFn = Callable[['np.ndarray', 'np.ndarray'], 'np.ndarray']
+
+
+class FramePipelineError(RuntimeError):
+    """디코더 / 인코더 ffmpeg 실패"""
+
+
+@dataclass
+class VideoInfo:
+    width: int
+    height: int
+    fps: str  # ffprobe r_frame_rate 그대로 (예: '30000/1001') - 인코더에 그대로 넘겨 오차 없음
+    frames: Optional[int]
+    has_audio: bool
+    duration: Optional[float] = None
+
+    @property
+    def fps_value(self) -> float:
+        num, _, den = self.fps.partition('/')
+        return float(num) / float(den or 1) if float(den or 1) else 0.0
+
+
+def parse_probe(data: dict) -> VideoInfo:
+    """ffprobe -show_streams JSON → VideoInfo"""
+    streams = data.get('streams', [])
+    video = next((s for s in streams if s.get('codec_type') == 'video'), None)
+    if video is None:
+        raise FramePipelineError("비디오 스트림이 없습니다")
+    fps = video.get('r_frame_rate') or video.get('avg_frame_rate') or '30/1'
+    if fps.startswith('0/'):
+        fps = video.get('avg_frame_rate') or '30/1'
+    frames = video.get('nb_frames')
+    duration = video.get('duration') or data.get('format', {}).get('duration')
+    return VideoInfo(
+        width=int(video['width']),
+        height=int(video['height']),
+        fps=fps,
+        frames=int(frames) if frames and str(frames).isdigit() else None,
+        has_audio=any(s.get('codec_type') == 'audio' for s in streams),
+        duration=float(duration) if duration not in (None, 'N/A') else None,
+    )
+
+
+def probe_video(path: Path, ffmpeg: str = 'ffmpeg') -> VideoInfo:
+    ffprobe = ffmpeg.replace('ffmpeg', 'ffprobe')
+    result = subprocess.run(
+        [ffprobe, '-v', 'error', '-show_streams', '-show_format', '-of', 'json', str(path)],
+        capture_output=True, text=True, timeout=30,
+    )
+    if result.returncode != 0:
+        raise FramePipelineError(f"ffprobe 실패: {result.stderr.strip()[-300:]}")
+    return parse_probe(json.loads(result.stdout or '{}'))
+
+
+def as_regions(region) -> List[Region]:
+    """(x, y, w, h) 하나 또는 여러 개 → 영역 목록"""
+    if len(region) == 4 and all(isinstance(v, int) for v in region):
+        return [tuple(region)]
+    return [tuple(r) for r in region]
+
+
+def roi_box(region: Region, width: int, height: int, margin: int = DEFAULT_MARGIN) -> Box:
+    """워터마크 영역(x, y, w, h) + 여백을 프레임 안으로 자른 (x0, y0, x1, y1)"""
+    x, y, w, h = region
+    x0, y0 = max(0, x - margin), max(0, y - margin)
+    x1, y1 = min(width, x + w + margin), min(height, y + h + margin)
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError(f"워터마크 영역이 프레임 밖입니다: {region} ({width}x{height})")
+    return x0, y0, x1, y1
+
+
+def roi_layout(regions: List[Region], width: int, height: int,
+               margin: int = DEFAULT_MARGIN) -> List[Tuple[Box, List[Region]]]:
+    """
+    영역별 ROI 상자 (겹치는 상자는 하나로 합침) → [(상자, 상자 안의 영역들)]
+
+    상단 로고 + 하단 자막처럼 떨어진 영역은 각각 따로 잘라서 처리 (합친 상자가 프레임 전체가 되지 않도록)
+    """
+    groups = [(roi_box(region, width, height, margin), [region]) for region in regions]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(groups)):
+            for j in range(i + 1, len(groups)):
+                (a, ra), (b, rb) = groups[i], groups[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    union = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    groups[i] = (union, ra + rb)
+                    del groups[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return sorted(groups, key=lambda g: (g[0][1], g[0][0]))
+
+
+def roi_mask(region, box: Box) -> 'np.ndarray':
+    """crop 좌표계의 마스크 (영역 하나 또는 여러 개를 255로) - 한 번 만들어 모든 프레임에 재사용"""
+    x0, y0, x1, y1 = box
+    mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+    for x, y, w, h in as_regions(region):
+        mask[max(0, y - y0):max(0, y + h - y0), max(0, x - x0):max(0, x + w - x0)] = 255
+    return mask
+
+
+def telea_inpaint(crop: 'np.ndarray', mask: 'np.ndarray') -> 'np.ndarray':
+    """OpenCV Telea 인페인팅 (fast 모드)"""
+    return cv2.inpaint(crop, mask, inpaintRadius=TELEA_RADIUS, flags=cv2.INPAINT_TELEA)
+
+
+def telea_inpainter(threads: int = 1) -> InpaintFn:
+    """병렬 워커용 팩토리 - 프로세스끼리 코어를 나눠 쓰므로 OpenCV 내부 스레드는 줄임"""
+    cv2.setNumThreads(threads)
+    return telea_inpaint
+
+
+
+class TemporalReuse:
+    """
+    정적인 워터마크 영역의 인페인팅 결과 재사용
+
+    기준 프레임(마지막으로 실제 인페인팅한 프레임)의 원본 crop과 현재 crop의 평균 차이가
+    threshold 이하면 현재 프레임은 인페인팅하지 않고 기준 프레임 결과를 마스크 영역에 붙인다.
+    항상 기준 프레임과 비교하므로 작은 변화가 쌓여 어긋나지 않는다.
+
+    판정(matches)은 읽은 순서대로, 결과 저장(remember) / 적용(apply)은 쓰는 순서대로 호출하면
+    병렬 처리에서도 "적용할 결과 = 바로 앞 기준 프레임의 결과"가 성립한다.
+    """
+
+    def __init__(self, mask: 'np.ndarray', threshold: float = TEMPORAL_THRESHOLD):
+        self.threshold = threshold
+        self._mask = (mask > 0)[..., None]
+        self._source = np.empty(mask.shape + (3,), dtype=np.uint8)
+        self._diff = np.empty_like(self._source)
+        self._result = np.empty_like(self._source)
+        self._has_source = False
+        self.reused = 0
+        self.inpainted = 0
+
+    def matches(self, crop: 'np.ndarray') -> bool:
+        """재사용 가능하면 True, 아니면 crop을 새 기준으로 기억하고 False"""
+        if self._has_source:
+            cv2.absdiff(crop, self._source, dst=self._diff)
+            if self._diff.mean() <= self.threshold:
+                self.reused += 1
+                return True
+        np.copyto(self._source, crop)
+        self._has_source = True
+        self.inpainted += 1
+        return False
+
+    def remember(self, result: 'np.ndarray'):
+        np.copyto(self._result, result)
+
+    def apply(self, crop: 'np.ndarray'):
+        np.copyto(crop, self._result, where=self._mask)
+
+
+def reuse_summary(reuses: List[Optional[TemporalReuse]]) -> str:
+    reuses = [r for r in reuses if r is not None]
+    if not reuses:
+        return ''
+    return (f" (ROI 인페인팅 {sum(r.inpainted for r in reuses)}, "
+            f"재사용 {sum(r.reused for r in reuses)})")
+
+
+class _FFmpegPipe:
+    """별도 프로세스 그룹의 ffmpeg + stderr 마지막 몇 줄 보관 (파이프가 가득 차서 멈추지 않도록 계속 읽음)"""
+
+    def __init__(self, cmd: List[str], **popen_kwargs):
+        self.cmd = cmd
+        self.process = subprocess.Popen(cmd, stderr=subprocess.PIPE, **popen_group_kwargs(), **popen_kwargs)
+        self._stderr = deque(maxlen=STDERR_TAIL_LINES)
+        self._drain = threading.Thread(target=self._read_stderr, name='ffmpeg-stderr', daemon=True)
+        self._drain.start()
+
+    def _read_stderr(self):
+        for line in iter(self.process.stderr.readline, b''):
+            self._stderr.append(line.decode('utf-8', errors='replace').rstrip())
+
+    @property
+    def stderr_tail(self) -> str:
+        return '\n'.join(self._stderr)
+
+    def kill(self):
+        terminate_process_group(self.process, grace=0)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        returncode = self.process.wait(timeout=timeout)
+        self._drain.join(timeout=5)
+        return returncode
+
+
+class FrameReader:
+    """
+    디코더 ffmpeg의 rawvideo(bgr24) 출력을 프레임 단위로 읽기
+
+    같은 NumPy 버퍼를 매 프레임 재사용하므로, 다음 프레임을 읽은 뒤에도 필요한 데이터는 복사해 둘 것.
+    """
+
+    def __init__(self, input_video: Path, info: VideoInfo, ffmpeg: str = 'ffmpeg'):
+        self.info = info
+        self.frame = np.empty((info.height, info.width, 3), dtype=np.uint8)
+        self._pipe = _FFmpegPipe(
+            [ffmpeg, '-v', 'error', '-i', str(input_video), '-map', '0:v:0',
+             '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-vsync', 'passthrough', '-'],
+            stdout=subprocess.PIPE, bufsize=0,
+        )
+
+    def read_into(self, buffer: 'np.ndarray') -> bool:
+        """다음 프레임을 buffer(H, W, 3 uint8, 연속 메모리)에 직접 채움 - 끝이면 False"""
+        stdout = self._pipe.process.stdout
+        with memoryview(buffer).cast('B') as view:
+            size = len(view)
+            filled = 0
+            while filled < size:
+                n = stdout.readinto(view[filled:])
+                if not n:
+                    break
+                filled += n
+        if filled == 0:
+            return False
+        if filled < size:
+            raise FramePipelineError(f"프레임이 잘렸습니다 ({filled}/{size} bytes)")
+        return True
+
+    def __iter__(self) -> Iterator['np.ndarray']:
+        while self.read_into(self.frame):
+            yield self.frame
+
+    def close(self, kill: bool = False):
+        if kill:
+            self._pipe.kill()
+        self._pipe.process.stdout.close()
+        returncode = self._pipe.wait(timeout=30)
+        if returncode != 0 and not kill:
+            raise FramePipelineError(f"디코더 ffmpeg 실패 (코드 {returncode}): {self._pipe.stderr_tail}")
+
+
+@dataclass
+class EncodePlan:
+    """
+    최종 출력까지 한 번에 인코딩할 때의 인코더 설정 (인페인팅 결과 → 오디오 교체 / 자막 굽기)
+
+    중간 영상을 인코딩했다가 다시 디코딩 / 인코딩하지 않도록 FrameWriter의 ffmpeg에 그대로 붙인다.
+    """
+    audio: Optional[Path] = None              # 이 오디오로 교체 (None이면 원본 오디오 복사)
+    audio_args: List[str] = field(default_factory=lambda: ['-c:a', 'aac', '-b:a', '192k'])
+    video_filter: Optional[str] = None        # 인페인팅된 프레임에 적용할 -vf (자막 굽기 등)
+    output_args: List[str] = field(default_factory=list)  # 예: ['-shortest']
+    duration: Optional[float] = None          # 출력 길이 (초) - 이만큼 프레임을 쓰면 입력을 멈춤 (오디오가 더 짧을 때)
+
+
+class FrameWriter:
+    """
+    rawvideo(bgr24) 프레임 → 인코더 ffmpeg (원본 fps, 원본 오디오 복사 또는 plan의 오디오 / 필터)
+
+    plan.duration만큼 쓰거나 인코더가 정상 종료하면(-shortest) finished - 이후 write()는 무시하므로
+    호출하는 쪽은 finished를 보고 디코딩을 멈추면 된다.
+    """
+
+    def __init__(self, output_video: Path, info: VideoInfo, audio_source: Optional[Path] = None,
+                 ffmpeg: str = 'ffmpeg', video_args: Optional[List[str]] = None,
+                 plan: Optional[EncodePlan] = None):
+        video_args = video_args or ['-c:v', 'libx264', '-preset', 'medium', '-crf', '23']
+        cmd = [ffmpeg, '-v', 'error', '-y',
+               '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f"{info.width}x{info.height}",
+               '-r', info.fps, '-i', '-']
+        if plan is not None and plan.audio is not None:
+            cmd += ['-i', str(plan.audio), '-map', '0:v:0', '-map', '1:a:0'] + plan.audio_args
+        elif audio_source is not None and info.has_audio:
+            cmd += ['-i', str(audio_source), '-map', '0:v:0', '-map', '1:a:0', '-c:a', 'copy']
+        if plan is not None and plan.video_filter:
+            cmd += ['-vf', plan.video_filter]
+        cmd += video_args + ['-pix_fmt', 'yuv420p']
+        if plan is not None:
+            cmd += plan.output_args
+        cmd.append(str(output_video))
+        self.frames = 0
+        self.finished = False
+        self._frame_limit = None
+        if plan is not None and plan.duration is not None and info.fps_value > 0:
+            self._frame_limit = max(1, math.ceil(plan.duration * info.fps_value))
+        # 버퍼드 stdin: write()가 프레임 전체를 다 쓸 때까지 블록 (raw 파이프는 일부만 쓰고 반환할 수 있음)
+        self._pipe = _FFmpegPipe(cmd, stdin=subprocess.PIPE)
+
+    def write(self, frame: 'np.ndarray'):
+        if self.finished:
+            return
+        try:
+            self._pipe.process.stdin.write(memoryview(frame).cast('B'))
+        except BrokenPipeError:
+            if self._pipe.wait(timeout=30) == 0:
+                self.finished = True  # -shortest: 짧은 오디오가 끝나 인코더가 출력을 마침
+                return
+            raise FramePipelineError(f"인코더 ffmpeg 종료됨: {self._pipe.stderr_tail}")
+        self.frames += 1
+        if self._frame_limit is not None and self.frames >= self._frame_limit:
+            self.finished = True
+
+    def close(self, kill: bool = False):
+        if kill:
+            self._pipe.kill()
+        try:
+            self._pipe.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = self._pipe.wait(timeout=None if not kill else 30)
+        if returncode != 0 and not kill:
+            raise FramePipelineError(f"인코더 ffmpeg 실패 (코드 {returncode}): {self._pipe.stderr_tail}")
+
+
+def inpaint_video(input_video: Path, output_video: Path, region,
+                  inpaint: InpaintFn = telea_inpaint, margin: int = DEFAULT_MARGIN,
+                  cancel_check: Optional[Callable[[], bool]] = None, ffmpeg: str = 'ffmpeg',
+                  video_args: Optional[List[str]] = None, info: Optional[VideoInfo] = None,
+                  temporal_threshold: Optional[float] = None, plan: Optional[EncodePlan] = None) -> int:
+    """
+    영상의 고정 영역을 프레임마다 인페인팅 (ROI만 처리, 디스크 임시 파일 없음)
+
+    Args:
+        region: 워터마크 영역 (x, y, w, h) 또는 그 목록 (떨어진 영역은 ROI를 따로 잘라 처리)
+        inpaint: crop + mask → 인페인팅된 crop
+        margin: ROI 주변 여백 (인페인팅 알고리즘이 참고하는 주변 픽셀)
+        cancel_check: 매 프레임 확인 (True면 ffmpeg 종료, 부분 출력 삭제 후 OperationCancelled)
+        video_args: 인코더 인자 (기본: libx264 medium crf 23)
+        temporal_threshold: 지정하면 ROI가 거의 안 변한 프레임은 이전 결과 재사용 (TemporalReuse)
+        plan: 오디오 교체 / 자막 굽기까지 같은 인코딩에서 (EncodePlan, 없으면 원본 오디오 복사만)
+
+    Returns:
+        처리한 프레임 수
+    """
+    info = info or probe_video(input_video, ffmpeg)
+    plans = []  # (ROI 슬라이스, 마스크, TemporalReuse 또는 None)
+    for (x0, y0, x1, y1), group in roi_layout(as_regions(region), info.width, info.height, margin):
+        mask = roi_mask(group, (x0, y0, x1, y1))
+        reuse = TemporalReuse(mask, temporal_threshold) if temporal_threshold is not None else None
+        plans.append(((slice(y0, y1), slice(x0, x1)), mask, reuse))
+    total = info.frames
+    logger.info(f"🎞️ 프레임 파이프라인: {info.width}x{info.height} @ {info.fps_value:.3f}fps, "
+                f"ROI {', '.join(f'{m.shape[1]}x{m.shape[0]}' for _, m, _ in plans)} (여백 {margin}px)")
+
+    reader = FrameReader(input_video, info, ffmpeg)
+    writer = FrameWriter(output_video, info, audio_source=input_video, ffmpeg=ffmpeg, video_args=video_args,
+                         plan=plan)
+    count = 0
+    try:
+        for frame in reader:
+            if cancel_check and cancel_check():
+                raise OperationCancelled(f"인페인팅 중 작업 취소됨 ({count}/{total or '?'} 프레임)")
+            for window, mask, reuse in plans:
+                roi = frame[window]
+                if reuse is not None and reuse.matches(roi):
+                    reuse.apply(roi)
+                else:
+                    roi[...] = inpaint(roi, mask)
+                    if reuse is not None:
+                        reuse.remember(roi)
+            writer.write(frame)
+            count += 1
+            if writer.finished:
+                break  # 출력 길이(오디오)에 도달 - 남은 프레임은 디코딩하지 않음
+            if count % 300 == 0:
+                progress = f" ({count * 100 // total}%)" if total else ''
+                logger.info(f"   처리 중: {count}/{total or '?'} 프레임{progress}")
+        reader.close(kill=writer.finished)
+    except BaseException:
+        reader.close(kill=True)
+        writer.close(kill=True)
+        Path(output_video).unlink(missing_ok=True)
+        raise
+    writer.close()
+
+    if count == 0:
+        raise FramePipelineError("디코딩된 프레임이 없습니다")
+    logger.info(f"✅ 프레임 처리 완료: {count}개 프레임{reuse_summary([r for _, _, r in plans])}")
+    return count
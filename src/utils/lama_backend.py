@@ -0,0 +1,218 @@
+"""
+Big-LaMa 인페인팅 백엔드 (워터마크 ROI 배치 추론)
+
+video-subtitle-remover의 LamaInpaint는 전체 해상도 프레임을 한 장씩 처리한다. 여기서는:
+- ROI crop(주변 문맥 여백 포함)만 모델에 넣음
+- 같은 크기 crop 여러 장을 한 번의 forward로 처리 (배치)
+- 마스크는 crop 좌표계 텐서 하나를 만들어 배치 전체에 재사용 (프레임마다 마스크 파일 없음)
+- 입력은 8의 배수로 패딩 (모델 다운샘플링 단위), 결과는 마스크 영역만 원본 crop에 붙임
+- CPU: torch intra-op 스레드 수 지정, 선택적으로 ONNX Runtime / int8 동적 양자화
+
+모델 파일: models/big-lama/big-lama.pt (저장소에는 big-lama_1.pt, big-lama_2.pt ... 로 나뉘어 있으면 합쳐서 사용)
+
+    inpaint = lama_inpainter(model_dir, device='cpu', threads=4)
+    results = inpaint.inpaint_batch(crops, mask)
+"""
+import logging
+import os
+import re
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from .lazy_import import lazy_module
+
+np = lazy_module('numpy')
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'big-lama.pt'
+ONNX_NAME = 'big-lama.onnx'
+ONNX_INT8_NAME = 'big-lama.int8.onnx'
+PAD_MULTIPLE = 8
+RUNTIMES = ('torch', 'onnx')
+
+
+class LamaBackendError(RuntimeError):
+    """모델 파일 없음 / 로딩 / 변환 실패"""
+
+
+def _part_number(path: Path) -> int:
+    match = re.search(r'_(\d+)\.pt$', path.name)
+    return int(match.group(1)) if match else 0
+
+
+def model_path(model_dir: Path) -> Path:
+    """big-lama.pt 경로 (분할 파일 big-lama_N.pt만 있으면 번호 순서로 이어 붙여 한 번 만들어 둠)"""
+    model_dir = Path(model_dir)
+    merged = model_dir / MODEL_NAME
+    if merged.exists():
+        return merged
+    parts = sorted(model_dir.glob('big-lama_*.pt'), key=_part_number)
+    if not parts:
+        raise LamaBackendError(f"LaMa 모델 파일이 없습니다: {model_dir}")
+
+    logger.info(f"🔗 LaMa 모델 분할 파일 {len(parts)}개 병합 → {merged.name}")
+    tmp = merged.with_name(f"{merged.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as out:
+        for part in parts:
+            with open(part, 'rb') as f:
+                while chunk := f.read(1024 * 1024):
+                    out.write(chunk)
+    os.replace(tmp, merged)  # 워커 여러 개가 동시에 병합해도 결과는 같은 파일
+    return merged
+
+
+def pad_amounts(height: int, width: int, multiple: int = PAD_MULTIPLE):
+    return (-height) % multiple, (-width) % multiple
+
+
+def to_batch(crops: Sequence['np.ndarray'], multiple: int = PAD_MULTIPLE) -> 'np.ndarray':
+    """BGR uint8 crop 목록 → (B, 3, H', W') float32 RGB [0, 1] (H', W'는 multiple의 배수, 가장자리 대칭 패딩)"""
+    batch = np.stack(crops)[..., ::-1].astype(np.float32) / 255.0
+    pad_h, pad_w = pad_amounts(batch.shape[1], batch.shape[2], multiple)
+    if pad_h or pad_w:
+        batch = np.pad(batch, ((0, 0), (0, pad_h), (0, pad_w), (0, 0)), mode='symmetric')
+    return np.ascontiguousarray(batch.transpose(0, 3, 1, 2))
+
+
+def mask_tensor(mask: 'np.ndarray', multiple: int = PAD_MULTIPLE) -> 'np.ndarray':
+    """(H, W) 마스크 → (1, 1, H', W') float32 0/1 (배치에서는 broadcast로 재사용)"""
+    pad_h, pad_w = pad_amounts(*mask.shape, multiple)
+    binary = (mask > 0).astype(np.float32)
+    if pad_h or pad_w:
+        binary = np.pad(binary, ((0, pad_h), (0, pad_w)), mode='symmetric')
+    return binary[None, None]
+
+
+def from_batch(output: 'np.ndarray', height: int, width: int) -> List['np.ndarray']:
+    """모델 출력 (B, 3, H', W') RGB [0, 1] → 패딩 제거한 BGR uint8 crop 목록"""
+    images = np.clip(output[:, :, :height, :width] * 255.0, 0, 255).astype(np.uint8)
+    return [np.ascontiguousarray(image.transpose(1, 2, 0)[..., ::-1]) for image in images]
+
+
+class LamaInpainter:
+    """
+    LaMa 배치 인페인터 (parallel_inpaint 워커에서 팩토리 lama_inpainter로 생성)
+
+    __call__(crop, mask)는 한 장, inpaint_batch(crops, mask)는 같은 크기 crop 여러 장을 한 번에 처리.
+    결과는 마스크 영역만 모델 출력, 나머지(문맥 여백)는 원본 픽셀 그대로.
+    """
+
+    def __init__(self, model_dir: Path, device: str = 'cpu', threads: Optional[int] = None,
+                 runtime: str = 'torch', int8: bool = False):
+        if runtime not in RUNTIMES:
+            raise ValueError(f"알 수 없는 LaMa 런타임: {runtime} (가능: {', '.join(RUNTIMES)})")
+        self.device = device
+        self._mask_key = None  # ROI 마스크는 작업 내내 같으므로 변환 결과 하나만 보관
+        self._mask_value = None
+        import torch
+        if threads:
+            torch.set_num_threads(threads)
+            try:
+                torch.set_num_interop_threads(1)  # 연산 간 병렬은 워커 프로세스가 담당
+            except RuntimeError:
+                pass  # 이미 병렬 작업이 시작된 뒤에는 바꿀 수 없음
+
+        path = model_path(model_dir)
+        self._session = None
+        if runtime == 'onnx' and device == 'cpu':
+            try:
+                self._session = self._onnx_session(path, threads, int8)
+            except Exception as e:
+                logger.warning(f"⚠️ ONNX Runtime 사용 불가, torch로 실행: {e}")
+        if self._session is None:
+            self._model = torch.jit.load(str(path), map_location=device).eval()
+        logger.info(f"🤖 LaMa 로딩 완료 ({'onnx' + (' int8' if int8 else '') if self._session else 'torch'}, "
+                    f"{device}, 스레드 {threads or torch.get_num_threads()})")
+
+    @staticmethod
+    def _onnx_session(path: Path, threads: Optional[int], int8: bool):
+        import onnxruntime as ort
+
+        onnx_path = path.with_name(ONNX_NAME)
+        if not onnx_path.exists():
+            export_onnx(path, onnx_path)
+        if int8:
+            int8_path = path.with_name(ONNX_INT8_NAME)
+            if not int8_path.exists():
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                logger.info(f"🔧 LaMa int8 동적 양자화 → {int8_path.name}")
+                tmp = int8_path.with_name(f"{int8_path.name}.{os.getpid()}.tmp")
+                quantize_dynamic(str(onnx_path), str(tmp), weight_type=QuantType.QUInt8)
+                os.replace(tmp, int8_path)
+            onnx_path = int8_path
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        return ort.InferenceSession(str(onnx_path), options, providers=['CPUExecutionProvider'])
+
+    def _mask(self, mask: 'np.ndarray'):
+        key = (mask.shape, mask.tobytes())
+        if key != self._mask_key:
+            value = mask_tensor(mask)
+            if self._session is None:
+                import torch
+                value = torch.from_numpy(value).to(self.device)
+            self._mask_key, self._mask_value = key, value
+        return self._mask_value
+
+    def _forward(self, batch: 'np.ndarray', mask) -> 'np.ndarray':
+        if self._session is not None:
+            masks = np.broadcast_to(mask, (len(batch),) + mask.shape[1:]).copy()
+            return self._session.run(None, {'image': batch, 'mask': masks})[0]
+        import torch
+        with torch.inference_mode():
+            images = torch.from_numpy(batch).to(self.device)
+            output = self._model(images, mask.expand(len(batch), -1, -1, -1))
+            return output.float().cpu().numpy()
+
+    def inpaint_batch(self, crops: Sequence['np.ndarray'], mask: 'np.ndarray') -> List['np.ndarray']:
+        height, width = mask.shape
+        results = from_batch(self._forward(to_batch(crops), self._mask(mask)), height, width)
+        keep = (mask > 0)[..., None]
+        for crop, result in zip(crops, results):
+            np.copyto(result, crop, where=~keep)
+        return results
+
+    def __call__(self, crop: 'np.ndarray', mask: 'np.ndarray') -> 'np.ndarray':
+        return self.inpaint_batch([crop], mask)[0]
+
+
+def export_onnx(model_file: Path, onnx_path: Path, opset: int = 17):
+    """TorchScript LaMa → ONNX (배치 / 높이 / 너비 동적). FFT 연산 때문에 opset 17 이상 필요"""
+    import torch
+
+    logger.info(f"🔧 LaMa ONNX 변환 → {onnx_path.name}")
+    model = torch.jit.load(str(model_file), map_location='cpu').eval()
+    image = torch.rand(1, 3, 64, 64)
+    mask = torch.zeros(1, 1, 64, 64)
+    mask[..., 16:48, 16:48] = 1
+    tmp = onnx_path.with_name(f"{onnx_path.name}.{os.getpid()}.tmp")
+    try:
+        torch.onnx.export(
+            model, (image, mask), str(tmp), opset_version=opset,
+            input_names=['image', 'mask'], output_names=['output'],
+            dynamic_axes={name: {0: 'batch', 2: 'height', 3: 'width'} for name in ('image', 'mask', 'output')},
+        )
+    except Exception as e:
+        Path(tmp).unlink(missing_ok=True)
+        raise LamaBackendError(f"ONNX 변환 실패: {e}") from e
+    os.replace(tmp, onnx_path)
+
+
+def lama_inpainter(model_dir: str, device: str = 'cpu', threads: Optional[int] = None,
+                   runtime: Optional[str] = None, int8: Optional[bool] = None) -> LamaInpainter:
+    """
+    parallel_inpaint 워커용 팩토리
+
+    runtime / int8을 안 주면 LAMA_RUNTIME (torch / onnx), LAMA_INT8 (1 / true) 환경변수 사용.
+    int8은 ONNX Runtime 양자화 모델이므로 runtime='onnx'를 함께 뜻함.
+    """
+    if runtime is None:
+        runtime = os.environ.get('LAMA_RUNTIME', 'torch').strip().lower() or 'torch'
+    if int8 is None:
+        int8 = os.environ.get('LAMA_INT8', '').strip().lower() in ('1', 'true', 'yes', 'on')
+    if int8:
+        runtime = 'onnx'
+    return LamaInpainter(Path(model_dir), device=device, threads=threads, runtime=runtime, int8=int8)
@@ -0,0 +1,64 @@
+"""
+지연 import (lazy import)
+
+edge_tts / google-cloud-texttospeech / boto3 / PIL / numpy / cv2 / openai 같은 무거운 패키지를
+모듈 최상단에서 바로 import하지 않고, 실제로 속성에 처음 접근할 때 import한다.
+Edge TTS만 쓰는 렌더처럼 특정 제공자를 선택하지 않은 실행은 그 패키지를 로드하지 않는다.
+
+    cv2 = lazy_module('cv2')                  # 아직 import 안 함
+    OPENCV_AVAILABLE = module_available('cv2')  # 설치 여부만 확인 (import 안 함)
+    img = cv2.imread(path)                    # 여기서 import
+"""
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """첫 속성 접근 시 실제 모듈을 import하는 대리 모듈"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_loaded'] = False
+
+    def _load(self) -> ModuleType:
+        with self.__dict__['_lazy_lock']:
+            module = importlib.import_module(self.__name__)
+            if not self.__dict__['_lazy_loaded']:
+                # 이후 접근은 일반 속성 조회로 처리 (반복 호출 경로에서 __getattr__ 비용 없음)
+                self.__dict__.update(module.__dict__)
+                self.__dict__['_lazy_loaded'] = True
+            return module
+
+    def __getattr__(self, name: str):
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_loaded'] else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_module(name: str) -> ModuleType:
+    """이미 import된 모듈이면 그대로, 아니면 지연 로드 대리 모듈 반환"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def module_available(name: str) -> bool:
+    """모듈을 import하지 않고 설치 여부만 확인 (상위 패키지는 import될 수 있음)"""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -0,0 +1,34 @@
+"""
+프로세스 단위 모델 캐시
+
+whisper 같은 무거운 모델을 한 번만 로드해서 재사용한다.
+CLI로 작업마다 새 프로세스를 띄우면 효과가 없지만, 워커 데몬(src/worker_daemon.py)에서는
+이 모듈이 sys.modules에 남아 있으므로 다음 작업부터 로드 시간이 없어진다.
+"""
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_models: Dict[Tuple, object] = {}
+_lock = threading.Lock()
+
+
+def get_whisper_model(name: str = 'medium', device: Optional[str] = None):
+    """로컬 whisper 모델 (캐시됨). whisper 미설치 시 ImportError"""
+    key = ('whisper', name, device)
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            import whisper
+            logger.info(f"🧠 whisper 모델 로드: {name}")
+            model = whisper.load_model(name, device=device)
+            _models[key] = model
+        return model
+
+
+def clear_models():
+    """캐시된 모델 해제 (메모리 확보용)"""
+    with _lock:
+        _models.clear()
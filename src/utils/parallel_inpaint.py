@@ -0,0 +1,221 @@
+"""
+멀티코어 병렬 인페인팅 (프로세스 풀 + 공유 메모리 프레임 링)
+
+frame_pipeline.inpaint_video는 한 코어에서 프레임을 하나씩 처리한다.
+프레임마다 인페인팅은 서로 독립이므로:
+- 공유 메모리에 프레임 슬롯 N개(링)를 만들고, 디코더가 빈 슬롯에 바로 프레임을 채움
+- 슬롯 번호 묶음(batch)만 워커 프로세스로 보냄 (프레임 데이터는 복사 / pickle 없음)
+- 워커는 슬롯 안의 ROI를 제자리에서 인페인팅
+- 제출 순서대로 결과를 기다려 인코더에 씀 → 출력 프레임 순서 보장
+- 동시에 처리 중인 슬롯은 N개로 고정 → 긴 영상도 메모리 일정
+
+워커 안에서 쓸 인페인팅 함수는 'module:factory' 문자열로 지정한다 (프로세스 경계를 넘어야 하므로).
+팩토리가 돌려준 객체에 inpaint_batch(crops, mask)가 있으면 묶음 단위로 호출한다:
+
+    parallel_inpaint_video(src, dst, (x, y, w, h), 'src.utils.frame_pipeline:telea_inpainter')
+"""
+import importlib
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .cancellation import OperationCancelled
+from .frame_pipeline import (
+    DEFAULT_MARGIN, Box, EncodePlan, FramePipelineError, FrameReader, FrameWriter, InpaintFn, TemporalReuse, VideoInfo,
+    as_regions, inpaint_video, probe_video, reuse_summary, roi_layout, roi_mask,
+)
+from .lazy_import import lazy_module
+
+np = lazy_module('numpy')
+
+logger = logging.getLogger(__name__)
+
+TELEA_INPAINTER = 'src.utils.frame_pipeline:telea_inpainter'
+DEFAULT_BATCH = 4
+SLOTS_PER_BATCH_IN_FLIGHT = 2  # 워커당 처리 중 1묶음 + 대기 1묶음 → 워커가 쉬지 않음
+
+
+def inpaint_workers() -> int:
+    """병렬 인페인팅 워커 수 (INPAINT_WORKERS 환경변수, 기본: 코어 수)"""
+    value = os.environ.get('INPAINT_WORKERS', '').strip()
+    if value.isdigit() and int(value) > 0:
+        return int(value)
+    return os.cpu_count() or 1
+
+
+def resolve_inpainter(spec: str, **kwargs) -> InpaintFn:
+    """'package.module:factory' → factory(**kwargs)가 돌려주는 인페인팅 함수"""
+    module_name, _, attr = spec.partition(':')
+    if not module_name or not attr:
+        raise ValueError(f"인페인터는 'module:factory' 형식이어야 합니다: {spec!r}")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory(**kwargs)
+
+
+# ---- 워커 프로세스 상태 (initializer에서 한 번 설정) ----
+_worker = {}
+
+
+def _init_worker(shm_name: str, shape: Tuple[int, ...], rois: List[Tuple[Box, 'np.ndarray']],
+                 spec: str, factory_kwargs: dict):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker.update(
+        shm=shm,  # 참조 유지 (해제되면 frames 버퍼가 사라짐)
+        frames=np.ndarray(shape, dtype=np.uint8, buffer=shm.buf),
+        rois=rois,
+        inpaint=resolve_inpainter(spec, **factory_kwargs),
+    )
+
+
+def _inpaint_slots(work: List[List[int]]) -> int:
+    """work[i] = i번째 ROI를 인페인팅할 슬롯 목록"""
+    frames, inpaint = _worker['frames'], _worker['inpaint']
+    # 모델 인페인터는 묶음을 한 번의 forward로 (inpaint_batch), 나머지는 한 장씩
+    batch_fn = getattr(inpaint, 'inpaint_batch', None)
+    done = 0
+    for ((x0, y0, x1, y1), mask), slots in zip(_worker['rois'], work):
+        if not slots:
+            continue
+        crops = [frames[slot, y0:y1, x0:x1] for slot in slots]
+        results = batch_fn(crops, mask) if batch_fn else (inpaint(crop, mask) for crop in crops)
+        for crop, result in zip(crops, results):
+            crop[...] = result
+        done += len(slots)
+    return done
+
+
+def parallel_inpaint_video(input_video: Path, output_video: Path, region,
+                           inpainter: str = TELEA_INPAINTER, inpainter_kwargs: Optional[dict] = None,
+                           workers: Optional[int] = None, batch: int = DEFAULT_BATCH,
+                           slots: Optional[int] = None, margin: int = DEFAULT_MARGIN,
+                           cancel_check: Optional[Callable[[], bool]] = None, ffmpeg: str = 'ffmpeg',
+                           video_args: Optional[List[str]] = None, info: Optional[VideoInfo] = None,
+                           temporal_threshold: Optional[float] = None, plan: Optional[EncodePlan] = None) -> int:
+    """
+    inpaint_video의 멀티프로세스 버전 (출력은 같고 프레임 순서도 같음)
+
+    Args:
+        inpainter: 워커에서 불러올 'module:factory' (factory(**inpainter_kwargs) → crop, mask → crop)
+        workers: 워커 프로세스 수 (기본: inpaint_workers())
+        batch: 워커에 한 번에 보낼 프레임 수 (가벼운 인페인팅일수록 크게 - 프로세스 간 왕복 횟수 감소,
+               inpaint_batch 인페인터는 forward 한 번의 배치 크기)
+               workers와 batch가 모두 1이면 풀 없이 현재 프로세스에서 순차 처리
+        slots: 공유 메모리 프레임 슬롯 수 = 동시에 메모리에 있는 최대 프레임 수
+               (기본: workers × batch × 2)
+        temporal_threshold: 재사용 판정은 읽는 순서대로 여기서 하고, 재사용 프레임은 워커로 보내지 않음
+        나머지: inpaint_video 참고
+
+    Returns:
+        처리한 프레임 수
+    """
+    inpainter_kwargs = inpainter_kwargs or {}
+    workers = workers or inpaint_workers()
+    if workers <= 1 and batch <= 1:
+        return inpaint_video(input_video, output_video, region,
+                             inpaint=resolve_inpainter(inpainter, **inpainter_kwargs), margin=margin,
+                             cancel_check=cancel_check, ffmpeg=ffmpeg, video_args=video_args, info=info,
+                             temporal_threshold=temporal_threshold, plan=plan)
+
+    info = info or probe_video(input_video, ffmpeg)
+    rois = [(box, roi_mask(group, box))
+            for box, group in roi_layout(as_regions(region), info.width, info.height, margin)]
+    windows = [(slice(y0, y1), slice(x0, x1)) for (x0, y0, x1, y1), _ in rois]
+    reuses = [TemporalReuse(mask, temporal_threshold) if temporal_threshold is not None else None
+              for _, mask in rois]
+    batch = max(1, batch)
+    slots = max(slots or workers * batch * SLOTS_PER_BATCH_IN_FLIGHT, batch * 2)
+    shape = (slots, info.height, info.width, 3)
+    total = info.frames
+    logger.info(f"🧵 병렬 인페인팅: 워커 {workers}개, 묶음 {batch}프레임, 슬롯 {slots}개 "
+                f"({slots * info.height * info.width * 3 / 1024 / 1024:.0f}MB)")
+
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+    frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    # spawn: 부모의 스레드 / 열린 파이프 / CUDA 상태를 물려받지 않음
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(shm.name, shape, rois, inpainter, inpainter_kwargs),
+    )
+    reader = FrameReader(input_video, info, ffmpeg)
+    writer = FrameWriter(output_video, info, audio_source=input_video, ffmpeg=ffmpeg, video_args=video_args,
+                         plan=plan)
+
+    free = deque(range(slots))
+    in_flight = deque()  # (future 또는 None, [(slot, ROI별 재사용 여부)]) - 제출 순서 = 출력 순서
+    count = 0
+
+    def reused_flags(slot):
+        frame = frames[slot]
+        return [reuse is not None and reuse.matches(frame[window]) for window, reuse in zip(windows, reuses)]
+
+    def submit(entries):
+        work = [[slot for slot, flags in entries if not flags[i]] for i in range(len(rois))]
+        in_flight.append((pool.submit(_inpaint_slots, work) if any(work) else None, entries))
+
+    def write_oldest():
+        nonlocal count
+        future, done = in_flight.popleft()
+        if future is not None:
+            future.result()
+        for slot, flags in done:
+            frame = frames[slot]
+            for window, reuse, reused in zip(windows, reuses, flags):
+                if reused:
+                    reuse.apply(frame[window])
+                elif reuse is not None:
+                    reuse.remember(frame[window])
+            writer.write(frame)  # 출력이 끝났으면(writer.finished) 무시됨
+        free.extend(slot for slot, _ in done)
+        count += len(done)
+        if total and count // 300 != (count - len(done)) // 300:
+            logger.info(f"   처리 중: {count}/{total} 프레임 ({count * 100 // total}%)")
+
+    try:
+        pending: List[Tuple[int, List[bool]]] = []
+        while True:
+            if cancel_check and cancel_check():
+                raise OperationCancelled(f"인페인팅 중 작업 취소됨 ({count}/{total or '?'} 프레임)")
+            if not free:
+                write_oldest()
+            if writer.finished:
+                break  # 출력 길이(오디오)에 도달 - 남은 프레임은 디코딩하지 않음
+            slot = free.popleft()
+            if not reader.read_into(frames[slot]):
+                free.appendleft(slot)
+                break
+            pending.append((slot, reused_flags(slot)))
+            if len(pending) == batch:
+                submit(pending)
+                pending = []
+        if pending and not writer.finished:
+            submit(pending)
+        while in_flight and not writer.finished:
+            write_oldest()
+        reader.close(kill=writer.finished)
+    except BaseException:
+        pool.shutdown(wait=True, cancel_futures=True)
+        reader.close(kill=True)
+        writer.close(kill=True)
+        Path(output_video).unlink(missing_ok=True)
+        raise
+    else:
+        pool.shutdown(wait=True)
+        writer.close()
+    finally:
+        del frames
+        try:
+            shm.close()
+        except BufferError:
+            pass  # 전파 중인 예외의 traceback이 아직 프레임 뷰를 잡고 있음 - 매핑은 GC 때 해제
+        shm.unlink()
+
+    if count == 0:
+        raise FramePipelineError("디코딩된 프레임이 없습니다")
+    logger.info(f"✅ 프레임 처리 완료: {count}개 프레임 (워커 {workers}개){reuse_summary(reuses)}")
+    return count
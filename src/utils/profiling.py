@@ -0,0 +1,370 @@
+"""
+작업 단위 프로파일링 (옵트인)
+
+느린 작업이 Python 처리(텍스트 정규화, 자막 배치, MoviePy)인지, ffmpeg 하위 프로세스인지,
+TTS / LLM / 이미지 API 네트워크 대기인지 구분하기 위한 도구.
+
+모드 (--profile 또는 PIPELINE_PROFILE 환경변수):
+- stages: StageMetrics 단계별 벽시계 / CPU 시간만 (오버헤드 거의 없음)
+- sample: stages + 모든 스레드 스택 샘플링 (샘플마다 실행 중인 단계와 대기 종류 기록)
+- cprofile: stages + cProfile (시작한 스레드만, 즉 asyncio 루프 / 메인 스레드)
+
+결과는 출력 영상 옆에 저장:
+- <영상>.speedscope.json: https://www.speedscope.app 에서 열기 (단계 타임라인 + 샘플 플레임그래프)
+- <영상>.profile.txt: 단계별 요약 (벽시계 / Python CPU / 대기 시간, 샘플 분류)
+- <영상>.prof: cProfile 모드일 때 pstats 파일 (snakeviz 등으로 열기)
+
+    profiler = JobProfiler(metrics, mode='sample')
+    profiler.start()
+    try:
+        result = run_pipeline()
+    finally:
+        profiler.stop()
+        profiler.write(result or output_dir)
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .stage_metrics import StageMetrics
+
+try:
+    import resource  # 하위 프로세스 CPU 합계 (Windows에는 없음)
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ('stages', 'sample', 'cprofile')
+SAMPLE_INTERVAL = 0.01
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+# 샘플의 가장 안쪽 프레임 파일로 대기 종류 분류
+_SUBPROCESS_FILES = ('subprocess.py', 'ffmpeg_runner.py', 'cancellation.py')
+_NETWORK_FILES = ('socket.py', 'ssl.py', 'selectors.py', 'client.py', 'connection.py',
+                  'connectionpool.py', 'streams.py', 'sslproto.py')
+_WAIT_FILES = ('threading.py', 'queue.py', 'thread.py', 'resource_broker.py')
+
+
+def profile_mode(value: Optional[str] = None) -> Optional[str]:
+    """CLI 값 또는 PIPELINE_PROFILE 환경변수 → 프로파일링 모드 (끄면 None)"""
+    mode = (value or os.environ.get('PIPELINE_PROFILE') or '').strip().lower()
+    if mode in ('', '0', 'off', 'false', 'no'):
+        return None
+    if mode in ('1', 'true', 'yes', 'on'):
+        return 'stages'
+    if mode not in PROFILE_MODES:
+        logger.warning(f"⚠️ 알 수 없는 프로파일링 모드 '{mode}' (사용 가능: {', '.join(PROFILE_MODES)}) - stages로 진행")
+        return 'stages'
+    return mode
+
+
+def _children_cpu() -> float:
+    """종료된 하위 프로세스(ffmpeg 등)의 CPU 시간 합계"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def classify_frame(filename: str, parent_files: Tuple[str, ...] = ()) -> str:
+    """
+    샘플 분류: python / subprocess / network / wait
+
+    Args:
+        filename: 가장 안쪽 프레임의 파일
+        parent_files: 바깥쪽 프레임 파일들 (락 / 이벤트 대기 중이면 누구를 기다리는지 확인)
+    """
+    name = os.path.basename(filename)
+    if name in _SUBPROCESS_FILES:
+        return 'subprocess'
+    if name in _NETWORK_FILES:
+        return 'network'
+    if name in _WAIT_FILES:
+        for parent in parent_files:
+            parent_name = os.path.basename(parent)
+            if parent_name in _SUBPROCESS_FILES:
+                return 'subprocess'
+            if parent_name in _NETWORK_FILES:
+                return 'network'
+        return 'wait'
+    return 'python'
+
+
+class _SpeedscopeFrames:
+    """speedscope shared.frames 인덱스"""
+
+    def __init__(self):
+        self.frames: List[Dict] = []
+        self._index: Dict[tuple, int] = {}
+
+    def index(self, name: str, file: Optional[str] = None, line: Optional[int] = None) -> int:
+        key = (name, file, line)
+        if key not in self._index:
+            frame = {'name': name}
+            if file:
+                frame['file'] = file
+                frame['line'] = line
+            self._index[key] = len(self.frames)
+            self.frames.append(frame)
+        return self._index[key]
+
+
+class _StackSampler(threading.Thread):
+    """모든 스레드의 Python 스택을 주기적으로 기록 (단계 / 대기 종류 포함)"""
+
+    def __init__(self, metrics: StageMetrics, interval: float):
+        super().__init__(name='job-profiler-sampler', daemon=True)
+        self.metrics = metrics
+        self.interval = interval
+        self.frames = _SpeedscopeFrames()
+        # 스레드 이름 → (스택 프레임 인덱스 목록, 가중치)
+        self.samples: Dict[str, List[Tuple[List[int], float]]] = {}
+        # 단계 → 분류 → 샘플 시간
+        self.breakdown: Dict[str, Dict[str, float]] = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=5)
+
+    def _sample(self, weight: float):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self.ident:
+                continue
+            stack = []
+            files = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(self.frames.index(code.co_name, code.co_filename, code.co_firstlineno))
+                files.append(code.co_filename)
+                frame = frame.f_back
+            if not stack:
+                continue
+            stack.reverse()
+
+            stage = self.metrics.active_stage(thread_id) or '(단계 밖)'
+            kind = classify_frame(files[0], tuple(files[1:4]))
+            by_kind = self.breakdown.setdefault(stage, {})
+            by_kind[kind] = by_kind.get(kind, 0.0) + weight
+
+            # 플레임그래프에서 단계별로 묶이도록 루트에 단계 프레임 추가
+            root = self.frames.index(f"[{stage}]")
+            stack.insert(0, root)
+            samples = self.samples.setdefault(names.get(thread_id, str(thread_id)), [])
+            # 같은 스택이 이어지면 가중치만 더함 (긴 ffmpeg / 네트워크 대기에서 메모리 절약)
+            if samples and samples[-1][0] == stack:
+                samples[-1] = (stack, samples[-1][1] + weight)
+            else:
+                samples.append((stack, weight))
+
+
+class JobProfiler:
+    """작업 단위 프로파일러 (StageMetrics 단계 타이머 + 선택적 샘플링 / cProfile)"""
+
+    def __init__(self, metrics: StageMetrics, mode: str = 'stages', interval: float = SAMPLE_INTERVAL):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"지원하지 않는 프로파일링 모드: {mode}")
+        self.metrics = metrics
+        self.mode = mode
+        self.interval = interval
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._children_cpu_started = 0.0
+        self.children_cpu = 0.0
+        self._sampler: Optional[_StackSampler] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+
+    def start(self) -> 'JobProfiler':
+        self.started = time.time()
+        self._children_cpu_started = _children_cpu()
+        if self.mode == 'sample':
+            self._sampler = _StackSampler(self.metrics, self.interval)
+            self._sampler.start()
+        elif self.mode == 'cprofile':
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        logger.info(f"🔬 프로파일링 시작 (모드: {self.mode})")
+        return self
+
+    def stop(self):
+        if self.finished is not None:
+            return
+        self.finished = time.time()
+        self.children_cpu = _children_cpu() - self._children_cpu_started
+        if self._sampler:
+            self._sampler.stop()
+        if self._cprofile:
+            self._cprofile.disable()
+
+    def __enter__(self) -> 'JobProfiler':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    # ------------------------------------------------------------------
+    # 결과
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Dict]:
+        """단계별 횟수 / 벽시계 / Python CPU / 대기 시간 (+ 샘플 분류)"""
+        result: Dict[str, Dict] = {}
+        for record in list(self.metrics.records):
+            item = result.setdefault(record['stage'], {'count': 0, 'wall': 0.0, 'cpu': 0.0})
+            item['count'] += 1
+            item['wall'] = round(item['wall'] + record['elapsed'], 3)
+            item['cpu'] = round(item['cpu'] + record.get('cpu', 0.0), 3)
+        for item in result.values():
+            item['wait'] = round(max(0.0, item['wall'] - item['cpu']), 3)
+        if self._sampler:
+            for stage, by_kind in self._sampler.breakdown.items():
+                item = result.setdefault(stage, {'count': 0, 'wall': 0.0, 'cpu': 0.0, 'wait': 0.0})
+                item['samples'] = {kind: round(seconds, 3) for kind, seconds in by_kind.items()}
+        return result
+
+    def speedscope(self, name: str = 'job') -> Dict:
+        """speedscope 파일 형식 (단계 타임라인 evented 프로파일 + 스레드별 sampled 프로파일)"""
+        frames = self._sampler.frames if self._sampler else _SpeedscopeFrames()
+        offset = (self.started or self.metrics.started_at) - self.metrics.started_at
+        total = ((self.finished or time.time()) - (self.started or self.metrics.started_at))
+        profiles = []
+
+        by_thread: Dict[str, List[Dict]] = {}
+        for record in list(self.metrics.records):
+            by_thread.setdefault(record.get('thread', 'MainThread'), []).append(record)
+        for thread_name, records in sorted(by_thread.items()):
+            events = self._stage_events(records, frames, offset, total)
+            profiles.append({
+                'type': 'evented', 'name': f"단계 ({thread_name})", 'unit': 'seconds',
+                'startValue': 0, 'endValue': round(total, 6), 'events': events,
+            })
+
+        if self._sampler:
+            for thread_name, samples in sorted(self._sampler.samples.items()):
+                profiles.append({
+                    'type': 'sampled', 'name': f"샘플 ({thread_name})", 'unit': 'seconds',
+                    'startValue': 0, 'endValue': round(sum(w for _, w in samples), 6),
+                    'samples': [stack for stack, _ in samples],
+                    'weights': [round(w, 6) for _, w in samples],
+                })
+
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'trend-video-backend JobProfiler',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames.frames},
+            'profiles': profiles,
+        }
+
+    @staticmethod
+    def _stage_events(records: List[Dict], frames: _SpeedscopeFrames, offset: float, total: float) -> List[Dict]:
+        """한 스레드의 단계 기록 → 열기/닫기 이벤트 (반올림 오차로 겹치면 바깥 단계 안으로 자름)"""
+        spans = sorted(
+            ((r['started_at'] - offset, r['started_at'] - offset + r['elapsed'], r['stage']) for r in records),
+            key=lambda span: (span[0], -(span[1] - span[0])),
+        )
+        events: List[Dict] = []
+        stack: List[Tuple[float, int]] = []
+        at = 0.0
+
+        def close_until(limit: float):
+            nonlocal at
+            while stack and stack[-1][0] <= limit:
+                end, frame = stack.pop()
+                at = max(at, end)
+                events.append({'type': 'C', 'frame': frame, 'at': round(at, 6)})
+
+        for start, end, stage in spans:
+            close_until(start)
+            at = max(at, min(max(start, 0.0), total))
+            if stack:
+                end = min(end, stack[-1][0])
+            frame = frames.index(f"[{stage}]")
+            events.append({'type': 'O', 'frame': frame, 'at': round(at, 6)})
+            stack.append((max(end, at), frame))
+        close_until(float('inf'))
+        return events
+
+    def _format_summary(self, name: str) -> str:
+        total = (self.finished or time.time()) - (self.started or self.metrics.started_at)
+        lines = [
+            f"작업 프로파일: {name}",
+            f"모드: {self.mode}, 전체 {total:.1f}초, 하위 프로세스(ffmpeg 등) CPU 합계 {self.children_cpu:.1f}초",
+            "",
+            f"{'단계':<16}{'횟수':>6}{'벽시계(초)':>12}{'Python CPU':>12}{'대기(초)':>10}",
+        ]
+        summary = self.summary()
+        for stage, item in sorted(summary.items(), key=lambda kv: -kv[1]['wall']):
+            if not item['count']:
+                continue
+            lines.append(f"{stage:<16}{item['count']:>6}{item['wall']:>12.2f}{item['cpu']:>12.2f}{item['wait']:>10.2f}")
+        lines.append("")
+        lines.append("* 병렬 단계(씬 렌더링 등)는 스레드별 시간을 더한 값이라 전체 시간보다 클 수 있음")
+        lines.append("* 대기 = 벽시계 - Python CPU (ffmpeg / 네트워크 / 락 대기)")
+
+        if self._sampler:
+            lines += ["", "샘플 분류 (초): python / subprocess / network / wait"]
+            for stage, item in sorted(summary.items(), key=lambda kv: -kv[1]['wall']):
+                samples = item.get('samples')
+                if samples:
+                    parts = ' / '.join(f"{samples.get(kind, 0.0):.2f}"
+                                       for kind in ('python', 'subprocess', 'network', 'wait'))
+                    lines.append(f"  {stage:<16}{parts}")
+
+        if self._cprofile:
+            stream = io.StringIO()
+            pstats.Stats(self._cprofile, stream=stream).sort_stats('cumulative').print_stats(25)
+            lines += ["", "cProfile 상위 함수 (누적 시간, 프로파일러를 시작한 스레드만)", stream.getvalue()]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, target: Path) -> List[Path]:
+        """
+        결과 파일 저장
+
+        Args:
+            target: 출력 영상 경로(영상 옆에 <이름>.speedscope.json 등) 또는 폴더(profile.*)
+
+        Returns:
+            저장한 파일 목록
+        """
+        self.stop()
+        target = Path(target)
+        base = target / 'profile' if target.is_dir() else target.with_suffix('')
+        base.parent.mkdir(parents=True, exist_ok=True)
+        name = base.name
+
+        written = []
+        speedscope_path = base.with_name(f"{name}.speedscope.json")
+        speedscope_path.write_text(json.dumps(self.speedscope(name), ensure_ascii=False), encoding='utf-8')
+        written.append(speedscope_path)
+
+        summary_path = base.with_name(f"{name}.profile.txt")
+        summary_path.write_text(self._format_summary(name), encoding='utf-8')
+        written.append(summary_path)
+
+        if self._cprofile:
+            prof_path = base.with_name(f"{name}.prof")
+            self._cprofile.dump_stats(str(prof_path))
+            written.append(prof_path)
+
+        logger.info(f"🔬 프로파일 저장: {', '.join(p.name for p in written)} ({base.parent})")
+        return written
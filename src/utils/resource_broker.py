@@ -0,0 +1,580 @@
+"""
+호스트 자원 브로커 (프로세스 간 자원 리스)
+
+프론트엔드가 작업 여러 개를 동시에 띄우면 각 프로세스가 ffmpeg 스레드 / TTS 동시 실행 /
+Chrome / Whisper 모델을 제각각 잡아서 CPU와 메모리가 과점유된다. 무거운 단계는 시작 전에
+이 브로커에서 자원 리스를 받고, 끝나면 반납한다.
+
+자원 (기본 용량은 자동 감지, RESOURCE_<NAME> 환경변수나 set_capacity()로 변경):
+- cpu: CPU 슬롯 (코어 수)
+- gpu: GPU 슬롯 (nvidia-smi가 있으면 1, 없으면 0 → GPU 요청은 대기 없이 통과)
+- ram_mb: 메모리 (MB, 전체의 80%)
+- browser: 브라우저 인스턴스 (2)
+
+동작:
+- 리스는 SQLite(WAL) 테이블 한 곳에 기록 (기본: <프로젝트>/.queue/resources.db)
+- 여러 자원을 한 트랜잭션에서 한꺼번에 받음 (일부만 잡고 기다리는 교착 없음)
+- 먼저 기다린 요청이 같은 자원을 기다리고 있으면 뒤 요청은 끼어들지 않음 (큰 요청 기아 방지)
+- 프로세스별 하트비트로 리스 연장, 죽은 프로세스의 리스는 만료되거나 PID 확인으로 바로 회수
+- 같은 스레드에서 중첩 요청하면 이미 가진 만큼은 다시 받지 않음
+
+    with resource_lease('render_gpu'):          # STAGE_RESOURCES 기본값
+        run_ffmpeg(cmd)
+    with resource_lease('whisper', ram_mb=6000):  # 일부만 덮어쓰기
+        model.transcribe(...)
+
+RESOURCE_BROKER=0이면 리스 없이 바로 통과한다. DB를 열 수 없을 때도 작업을 막지 않고 통과한다.
+"""
+import json
+import logging
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+RESOURCES = ('cpu', 'gpu', 'ram_mb', 'browser')
+DEFAULT_BROWSER_SLOTS = 2
+
+# 단계별 기본 요청량 (호출부에서 키워드로 덮어쓸 수 있음)
+STAGE_RESOURCES: Dict[str, Dict[str, int]] = {
+    'render': {'cpu': 2, 'ram_mb': 1024},             # libx264 씬 렌더링 / 병합
+    'render_gpu': {'cpu': 1, 'gpu': 1, 'ram_mb': 1024},  # NVENC / QSV / AMF 인코딩
+    'whisper': {'cpu': 2, 'ram_mb': 3072},
+    'inpaint': {'cpu': 2, 'gpu': 1, 'ram_mb': 4096},  # 워터마크 / 자막 제거
+    'browser': {'browser': 1, 'ram_mb': 1024},
+}
+
+LEASE_SECONDS = 60.0  # 하트비트가 끊긴 리스가 회수되기까지 (초)
+WAITER_SECONDS = 10.0  # 대기 표시 유지 시간 (대기 루프가 주기적으로 갱신)
+# 다른 프로세스의 반납을 확인하는 최대 간격 (초) - 같은 프로세스의 반납은 즉시 깨어남
+CROSS_PROCESS_CHECK_INTERVAL = 1.0
+
+
+class ResourceTimeout(TimeoutError):
+    """제한 시간 안에 자원 리스를 받지 못함"""
+
+
+def default_broker_db() -> Path:
+    return Path(os.environ.get('RESOURCE_BROKER_DB') or PROJECT_ROOT / '.queue' / 'resources.db')
+
+
+def _total_memory_mb() -> Optional[int]:
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        pass
+    try:
+        import psutil
+        return psutil.virtual_memory().total // (1024 * 1024)
+    except ImportError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _detect_hardware() -> Dict[str, int]:
+    total_mb = _total_memory_mb()
+    return {
+        'cpu': os.cpu_count() or 2,
+        'gpu': 1 if shutil.which('nvidia-smi') else 0,
+        'ram_mb': int(total_mb * 0.8) if total_mb else 8192,
+        'browser': DEFAULT_BROWSER_SLOTS,
+    }
+
+
+def detect_capacity() -> Dict[str, int]:
+    """이 호스트의 기본 용량 (환경변수 RESOURCE_CPU / RESOURCE_GPU / RESOURCE_RAM_MB / RESOURCE_BROWSER 우선)"""
+    detected = dict(_detect_hardware())
+    for name in RESOURCES:
+        value = os.environ.get(f'RESOURCE_{name.upper()}')
+        if value:
+            try:
+                detected[name] = max(0, int(value))
+            except ValueError:
+                logger.warning(f"⚠️ RESOURCE_{name.upper()} 값이 숫자가 아님: {value}")
+    return detected
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+# 프로세스 내 대기용 Condition (DB 파일별로 공유)
+_conditions: Dict[str, threading.Condition] = {}
+_conditions_lock = threading.Lock()
+
+
+def _condition_for(db_path: str) -> threading.Condition:
+    key = os.path.abspath(db_path)
+    with _conditions_lock:
+        if key not in _conditions:
+            _conditions[key] = threading.Condition()
+        return _conditions[key]
+
+
+class ResourceLease:
+    """받은 자원 리스 (release() 또는 with 블록 종료 시 반납)"""
+
+    def __init__(self, broker: Optional['ResourceBroker'], lease_id: Optional[str],
+                 label: str, amounts: Dict[str, int], waited: float = 0.0):
+        self.broker = broker
+        self.id = lease_id
+        self.label = label
+        self.amounts = amounts
+        self.waited = waited
+        self.released = False
+        self._held: Optional[Dict[str, int]] = None  # 획득한 스레드의 보유량 (중첩 요청 계산용)
+
+    def release(self):
+        if self.released:
+            return
+        self.released = True
+        if self.broker is not None:
+            self.broker._release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class ResourceBroker:
+    """SQLite 기반 호스트 자원 브로커 (스레드/프로세스 안전)"""
+
+    def __init__(self, db_path: Optional[str] = None, lease_seconds: float = LEASE_SECONDS,
+                 busy_timeout_ms: int = 10000):
+        self.db_path = str(db_path or default_broker_db())
+        self.lease_seconds = lease_seconds
+        self.busy_timeout_ms = busy_timeout_ms
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self._local = threading.local()
+        self._condition = _condition_for(self.db_path)
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_schema()
+
+    # ------------------------------------------------------------------
+    # 연결 / 스키마
+    # ------------------------------------------------------------------
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                                   isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _ensure_schema(self):
+        with self._transaction() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS resource_capacity (
+                    resource TEXT PRIMARY KEY,
+                    capacity INTEGER NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS resource_leases (
+                    id TEXT PRIMARY KEY,
+                    holder TEXT NOT NULL,
+                    pid INTEGER NOT NULL,
+                    label TEXT,
+                    amounts TEXT NOT NULL,
+                    acquired_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS resource_waiters (
+                    id TEXT PRIMARY KEY,
+                    holder TEXT NOT NULL,
+                    pid INTEGER NOT NULL,
+                    amounts TEXT NOT NULL,
+                    since REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _notify(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    # ------------------------------------------------------------------
+    # 용량
+    # ------------------------------------------------------------------
+    def set_capacity(self, resource: str, capacity: Optional[int]):
+        """자원 용량 고정 (None이면 자동 감지값으로 되돌림)"""
+        with self._transaction() as conn:
+            if capacity is None:
+                conn.execute('DELETE FROM resource_capacity WHERE resource = ?', (resource,))
+            else:
+                conn.execute('INSERT OR REPLACE INTO resource_capacity (resource, capacity) VALUES (?, ?)',
+                             (resource, int(capacity)))
+        self._notify()
+
+    def capacity(self, conn: Optional[sqlite3.Connection] = None) -> Dict[str, int]:
+        capacity = detect_capacity()
+        for row in (conn or self._conn).execute('SELECT resource, capacity FROM resource_capacity'):
+            capacity[row['resource']] = row['capacity']
+        return capacity
+
+    # ------------------------------------------------------------------
+    # 리스
+    # ------------------------------------------------------------------
+    def _held(self) -> Dict[str, int]:
+        """현재 스레드가 이미 가진 자원량 (중첩 요청용)"""
+        held = getattr(self._local, 'held', None)
+        if held is None:
+            held = self._local.held = {}
+        return held
+
+    def _purge_stale(self, conn: sqlite3.Connection, now: float):
+        """만료되었거나 이 호스트에서 이미 종료된 프로세스의 리스/대기 제거"""
+        host = socket.gethostname()
+        for table in ('resource_leases', 'resource_waiters'):
+            conn.execute(f'DELETE FROM {table} WHERE expires_at < ?', (now,))
+            for row in conn.execute(f'SELECT DISTINCT holder, pid FROM {table}').fetchall():
+                if row['holder'].rsplit(':', 1)[0] == host and not _pid_alive(row['pid']):
+                    conn.execute(f'DELETE FROM {table} WHERE holder = ?', (row['holder'],))
+
+    def _try_grant(self, lease_id: str, label: str, amounts: Dict[str, int]) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            self._purge_stale(conn, now)
+            capacity = self.capacity(conn)
+
+            used: Dict[str, int] = {}
+            for row in conn.execute('SELECT amounts FROM resource_leases'):
+                for name, amount in json.loads(row['amounts']).items():
+                    used[name] = used.get(name, 0) + amount
+            for name, amount in amounts.items():
+                if used.get(name, 0) + amount > capacity.get(name, 0):
+                    break
+            else:
+                # 들어갈 자리는 있어도 먼저 기다린 요청이 같은 자원을 원하면 양보
+                waiter = conn.execute('SELECT since FROM resource_waiters WHERE id = ?', (lease_id,)).fetchone()
+                since = waiter['since'] if waiter else now
+                for row in conn.execute('SELECT amounts FROM resource_waiters WHERE since < ? AND id != ?',
+                                        (since, lease_id)):
+                    if set(json.loads(row['amounts'])) & set(amounts):
+                        break
+                else:
+                    conn.execute('DELETE FROM resource_waiters WHERE id = ?', (lease_id,))
+                    conn.execute('''
+                        INSERT INTO resource_leases (id, holder, pid, label, amounts, acquired_at, expires_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (lease_id, self.holder, os.getpid(), label, json.dumps(amounts), now,
+                          now + self.lease_seconds))
+                    return True
+
+            # 대기 등록 / 갱신
+            conn.execute('''
+                INSERT INTO resource_waiters (id, holder, pid, amounts, since, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET expires_at = excluded.expires_at
+            ''', (lease_id, self.holder, os.getpid(), json.dumps(amounts), now, now + WAITER_SECONDS))
+            return False
+
+    def acquire(self, label: str = '', timeout: Optional[float] = None,
+                cancel_check: Optional[Callable[[], bool]] = None, reentrant: bool = True,
+                **amounts: int) -> ResourceLease:
+        """
+        자원 리스 받기 (모두 받을 수 있을 때까지 대기)
+
+        Args:
+            label: 로그 / 상태 표시용 이름
+            timeout: 최대 대기 시간 (초, 넘으면 ResourceTimeout)
+            cancel_check: True를 반환하면 대기 중단 (OperationCancelled)
+            reentrant: 같은 스레드가 이미 가진 자원은 다시 받지 않음 (스레드 풀에서 대신 받을 때는 False)
+            **amounts: cpu=2, ram_mb=1024 처럼 자원별 요청량 (용량보다 크면 용량만큼만 요청)
+        """
+        capacity = self.capacity()
+        held = self._held() if reentrant else {}
+        request = {}
+        for name, amount in amounts.items():
+            if name not in RESOURCES:
+                raise ValueError(f"알 수 없는 자원: {name}")
+            # 같은 스레드가 이미 가진 만큼은 빼고, 용량을 넘는 요청은 영원히 못 받으므로 용량으로 제한
+            amount = min(int(amount) - held.get(name, 0), capacity.get(name, 0))
+            if amount > 0:
+                request[name] = amount
+        if not request:
+            return ResourceLease(None, None, label, {})
+
+        lease_id = uuid.uuid4().hex
+        started = time.time()
+        deadline = None if timeout is None else started + timeout
+        announced = False
+        last_version = None
+        try:
+            while True:
+                version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+                if version != last_version:
+                    if self._try_grant(lease_id, label, request):
+                        break
+                    last_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+                if cancel_check and cancel_check():
+                    from .cancellation import OperationCancelled
+                    raise OperationCancelled(f"{label}: 자원 대기 중 취소됨")
+                now = time.time()
+                if deadline is not None and now >= deadline:
+                    raise ResourceTimeout(f"{label}: {timeout:.0f}초 안에 자원을 받지 못함 ({request})")
+                if not announced and now - started >= 1.0:
+                    logger.info(f"⏳ 자원 대기 중: {label or '작업'} {request}")
+                    announced = True
+
+                wait = CROSS_PROCESS_CHECK_INTERVAL
+                if deadline is not None:
+                    wait = min(wait, max(0.0, deadline - now))
+                with self._condition:
+                    self._condition.wait(timeout=wait)
+                # 만료 리스 회수와 대기 표시 갱신을 위해 주기적으로 다시 시도
+                last_version = None
+        except BaseException:
+            with self._transaction() as conn:
+                conn.execute('DELETE FROM resource_waiters WHERE id = ?', (lease_id,))
+            self._notify()
+            raise
+
+        waited = time.time() - started
+        if announced:
+            logger.info(f"✅ 자원 할당: {label or '작업'} {request} ({waited:.1f}초 대기)")
+        _heartbeat_for(self).add(lease_id)
+        lease = ResourceLease(self, lease_id, label, request, waited)
+        if reentrant:
+            for name, amount in request.items():
+                held[name] = held.get(name, 0) + amount
+            lease._held = held
+        return lease
+
+    def _release(self, lease: ResourceLease):
+        _heartbeat_for(self).discard(lease.id)
+        held = lease._held
+        if held is not None:
+            for name, amount in lease.amounts.items():
+                held[name] = held.get(name, 0) - amount
+                if held[name] <= 0:
+                    held.pop(name, None)
+        try:
+            with self._transaction() as conn:
+                conn.execute('DELETE FROM resource_leases WHERE id = ?', (lease.id,))
+        except sqlite3.Error as e:
+            logger.debug(f"자원 반납 실패 (리스 만료로 회수됨): {e}")
+        self._notify()
+
+    def renew(self, lease_ids) -> int:
+        """리스 만료 시각 연장"""
+        lease_ids = list(lease_ids)
+        if not lease_ids:
+            return 0
+        with self._transaction() as conn:
+            cur = conn.execute(
+                f"UPDATE resource_leases SET expires_at = ? WHERE id IN ({','.join('?' * len(lease_ids))})",
+                (time.time() + self.lease_seconds, *lease_ids))
+        return cur.rowcount
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict:
+        """자원별 용량 / 사용량 / 리스 / 대기 목록"""
+        with self._transaction() as conn:
+            self._purge_stale(conn, time.time())
+            capacity = self.capacity(conn)
+            leases = [dict(row) for row in conn.execute(
+                'SELECT id, holder, label, amounts, acquired_at FROM resource_leases ORDER BY acquired_at')]
+            waiters = [dict(row) for row in conn.execute(
+                'SELECT id, holder, amounts, since FROM resource_waiters ORDER BY since')]
+        used = {name: 0 for name in capacity}
+        for lease in leases:
+            lease['amounts'] = json.loads(lease['amounts'])
+            for name, amount in lease['amounts'].items():
+                used[name] = used.get(name, 0) + amount
+        for waiter in waiters:
+            waiter['amounts'] = json.loads(waiter['amounts'])
+        return {'capacity': capacity, 'used': used, 'leases': leases, 'waiters': waiters}
+
+
+class _ProcessHeartbeat:
+    """프로세스가 가진 모든 리스를 한 스레드에서 주기적으로 연장"""
+
+    def __init__(self, broker: ResourceBroker):
+        self._broker = ResourceBroker(broker.db_path, lease_seconds=broker.lease_seconds)
+        self._ids = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.interval = max(1.0, broker.lease_seconds / 3)
+
+    def add(self, lease_id: str):
+        with self._lock:
+            self._ids.add(lease_id)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='resource-heartbeat', daemon=True)
+                self._thread.start()
+
+    def discard(self, lease_id: str):
+        with self._lock:
+            self._ids.discard(lease_id)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                ids = list(self._ids)
+                if not ids:
+                    self._thread = None
+                    return
+            try:
+                self._broker.renew(ids)
+            except sqlite3.Error as e:
+                logger.debug(f"자원 리스 연장 실패: {e}")
+
+
+_heartbeats: Dict[str, _ProcessHeartbeat] = {}
+_heartbeats_lock = threading.Lock()
+
+
+def _heartbeat_for(broker: ResourceBroker) -> _ProcessHeartbeat:
+    key = f"{os.path.abspath(broker.db_path)}|{os.getpid()}"
+    with _heartbeats_lock:
+        heartbeat = _heartbeats.get(key)
+        if heartbeat is None:
+            heartbeat = _heartbeats[key] = _ProcessHeartbeat(broker)
+        return heartbeat
+
+
+# ----------------------------------------------------------------------
+# 공용 브로커
+# ----------------------------------------------------------------------
+_broker: Optional[ResourceBroker] = None
+_broker_failed = False
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> Optional[ResourceBroker]:
+    """프로세스 공용 브로커 (RESOURCE_BROKER=0이거나 DB를 열 수 없으면 None)"""
+    global _broker, _broker_failed
+    if os.environ.get('RESOURCE_BROKER', '1').lower() in ('0', 'false', 'off', 'no'):
+        return None
+    with _broker_lock:
+        if _broker is None and not _broker_failed:
+            try:
+                _broker = ResourceBroker()
+            except (sqlite3.Error, OSError) as e:
+                _broker_failed = True
+                logger.warning(f"⚠️ 자원 브로커를 사용할 수 없음 (자원 제한 없이 진행): {e}")
+        return _broker
+
+
+def _stage_amounts(stage: str, overrides: Dict[str, int]) -> Dict[str, int]:
+    amounts = dict(STAGE_RESOURCES.get(stage, {}))
+    amounts.update(overrides)
+    return amounts
+
+
+def acquire_stage(stage: str, timeout: Optional[float] = None,
+                  cancel_check: Optional[Callable[[], bool]] = None, **overrides: int) -> ResourceLease:
+    """
+    단계용 자원 리스 받기 (반납은 lease.release()) - with 블록으로 감싸기 어려운 곳용
+
+    Args:
+        stage: STAGE_RESOURCES 이름 (없는 이름이면 overrides만 요청)
+        timeout / cancel_check: ResourceBroker.acquire 참고
+        **overrides: 자원별 요청량 덮어쓰기 (예: ram_mb=6000, gpu=0)
+    """
+    broker = get_broker()
+    if broker is None:
+        return ResourceLease(None, None, stage, {})
+    return broker.acquire(stage, timeout=timeout, cancel_check=cancel_check,
+                          **_stage_amounts(stage, overrides))
+
+
+@contextmanager
+def resource_lease(stage: str, timeout: Optional[float] = None,
+                   cancel_check: Optional[Callable[[], bool]] = None, **overrides: int):
+    """단계 실행 동안 자원 리스 유지 (인자는 acquire_stage와 같음)"""
+    lease = acquire_stage(stage, timeout=timeout, cancel_check=cancel_check, **overrides)
+    try:
+        yield lease
+    finally:
+        lease.release()
+
+
+@asynccontextmanager
+async def async_resource_lease(stage: str, timeout: Optional[float] = None, **overrides: int):
+    """resource_lease의 asyncio 버전 (대기는 스레드에서, 이벤트 루프는 막지 않음)"""
+    import asyncio
+    broker = get_broker()
+    if broker is None:
+        yield ResourceLease(None, None, stage, {})
+        return
+    cancelled = threading.Event()
+    future = asyncio.get_running_loop().run_in_executor(
+        None, lambda: broker.acquire(stage, timeout, cancelled.is_set, reentrant=False,
+                                     **_stage_amounts(stage, overrides)))
+    try:
+        lease = await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # 대기 스레드 중단, 그 사이 이미 받았으면 바로 반납
+        cancelled.set()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception() or f.result().release())
+        raise
+    try:
+        yield lease
+    finally:
+        await asyncio.to_thread(lease.release)
+
+
+def main():
+    """현재 자원 사용 현황 출력: python -m src.utils.resource_broker"""
+    broker = ResourceBroker()
+    state = broker.snapshot()
+    print(f"DB: {broker.db_path}")
+    for name in RESOURCES:
+        print(f"  {name:8s} {state['used'].get(name, 0):>6} / {state['capacity'].get(name, 0)}")
+    for lease in state['leases']:
+        print(f"  [lease] {lease['holder']} {lease['label'] or '-'} {lease['amounts']}")
+    for waiter in state['waiters']:
+        print(f"  [wait]  {waiter['holder']} {waiter['amounts']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+단계별 실행 시간 측정 (probe / tts / render / concat / upload)
+
+각 단계의 소요 시간을 작업 로그(DB 로그 핸들러가 붙은 logger)에 남기고,
+작업 폴더의 JSON 메트릭 파일에 누적 저장한다.
+
+elapsed는 벽시계 시간, cpu는 그 단계를 실행한 스레드의 Python CPU 시간이다.
+둘의 차이가 ffmpeg 같은 하위 프로세스나 네트워크(TTS / LLM / 이미지 API)를 기다린 시간.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+METRICS_FILENAME = 'metrics.json'
+
+
+class StageMetrics:
+    """작업 단위 단계별 메트릭 수집기 (스레드 안전)"""
+
+    def __init__(self, job_id: Optional[str] = None, logger: Optional[logging.Logger] = None):
+        self.job_id = job_id or os.environ.get('JOB_ID') or os.environ.get('TASK_ID')
+        self.logger = logger or logging.getLogger(__name__)
+        self.started_at = time.time()
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+        # 스레드별 실행 중인 단계 (프로파일러 샘플을 단계에 귀속)
+        self._active: Dict[int, List[str]] = {}
+        self._open: Dict[int, tuple] = {}
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """
+        단계 시간 측정
+
+        Example:
+            with metrics.stage('render', scene=3) as record:
+                result = run_ffmpeg(cmd)
+                record['speed'] = result.progress.speed
+        """
+        record = self.begin(name, **fields)
+        try:
+            yield record
+        except BaseException as e:
+            self.end(record, error=e)
+            raise
+        self.end(record)
+
+    def begin(self, name: str, **fields) -> Dict:
+        """
+        단계 시작 (with 블록으로 감싸기 어려운 긴 함수용, 같은 스레드에서 end() 호출)
+
+        Example:
+            record = metrics.begin('images', scenes=12)
+            ...
+            metrics.end(record)
+        """
+        record = {'stage': name, **fields, 'thread': threading.current_thread().name}
+        with self._lock:
+            self._open[id(record)] = (time.time(), time.thread_time(), fields)
+            self._active.setdefault(threading.get_ident(), []).append(name)
+        return record
+
+    def end(self, record: Dict, error: Optional[BaseException] = None) -> Dict:
+        """단계 종료 (begin()이 돌려준 record)"""
+        finished, cpu_finished = time.time(), time.thread_time()
+        with self._lock:
+            started, cpu_started, fields = self._open.pop(id(record))
+            stack = self._active.get(threading.get_ident(), [])
+            if record['stage'] in stack:
+                del stack[len(stack) - 1 - stack[::-1].index(record['stage'])]
+            if not stack:
+                self._active.pop(threading.get_ident(), None)
+
+        if error is not None:
+            record['status'] = 'error'
+            record['error'] = f"{type(error).__name__}: {error}"[:300]
+        record.setdefault('status', 'ok')
+        record['elapsed'] = round(finished - started, 3)
+        record['cpu'] = round(cpu_finished - cpu_started, 3)
+        record['started_at'] = round(started - self.started_at, 3)
+        with self._lock:
+            self.records.append(record)
+        extra = ', '.join(f"{k}={v}" for k, v in fields.items())
+        self.logger.info(f"⏱️ [{record['stage']}] {record['elapsed']:.2f}초 (CPU {record['cpu']:.2f}초)"
+                         f"{f' ({extra})' if extra else ''} - {record['status']}")
+        return record
+
+    def active_stage(self, thread_id: int) -> Optional[str]:
+        """해당 스레드에서 실행 중인 가장 안쪽 단계"""
+        with self._lock:
+            stack = self._active.get(thread_id)
+            return stack[-1] if stack else None
+
+    def summary(self) -> Dict[str, Dict]:
+        """단계별 합계 / 횟수 / 최대 시간"""
+        summary: Dict[str, Dict] = {}
+        with self._lock:
+            for record in self.records:
+                item = summary.setdefault(record['stage'], {'count': 0, 'total': 0.0, 'max': 0.0})
+                item['count'] += 1
+                item['total'] = round(item['total'] + record['elapsed'], 3)
+                item['max'] = max(item['max'], record['elapsed'])
+        return summary
+
+    def log_summary(self):
+        total = time.time() - self.started_at
+        self.logger.info(f"📊 단계별 소요 시간 (전체 {total:.1f}초)")
+        for name, item in sorted(self.summary().items(), key=lambda kv: -kv[1]['total']):
+            share = item['total'] / total * 100 if total > 0 else 0.0
+            self.logger.info(f"   {name}: {item['total']:.1f}초 ({share:.0f}%), "
+                             f"{item['count']}회, 최대 {item['max']:.1f}초")
+
+    def save(self, path: Path) -> Path:
+        """
+        JSON 메트릭 파일 저장 (같은 파일에 기존 기록이 있으면 이어 붙임)
+
+        렌더링과 업로드처럼 다른 프로세스에서 실행되는 단계도 한 파일에 모인다.
+        """
+        path = Path(path)
+        records = []
+        if path.exists():
+            try:
+                records = json.loads(path.read_text(encoding='utf-8')).get('records', [])
+            except (OSError, ValueError):
+                records = []
+
+        with self._lock:
+            run = datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds')
+            records.extend({**record, 'run': run} for record in self.records)
+
+        stages: Dict[str, Dict] = {}
+        for record in records:
+            item = stages.setdefault(record['stage'], {'count': 0, 'total': 0.0, 'max': 0.0})
+            item['count'] += 1
+            item['total'] = round(item['total'] + record['elapsed'], 3)
+            item['max'] = max(item['max'], record['elapsed'])
+
+        data = {
+            'job_id': self.job_id,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'stages': stages,
+            'records': records,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+        tmp.replace(path)
+        return path
@@ -0,0 +1,140 @@
+"""
+VAD 청크 단위 스트리밍 음성 인식 (whisper)
+
+WAV 전체를 transcribe 한 번으로 돌리면 마지막 문장까지 인식이 끝나야 번역이 시작된다. 여기서는:
+- 16kHz mono WAV를 프레임(30ms) 에너지로 음성 / 무음 판정 (NumPy, 잡음 바닥 기준 적응 임계값)
+- 무음 경계에서 whisper 창(30초) 이하 청크로 묶음 (긴 무음 구간은 인식하지 않음)
+- 청크마다 transcribe 후 타임스탬프를 원본 시각으로 옮겨 바로 yield → 호출하는 쪽이 번역 / TTS를 먼저 시작
+- 모델은 오디오 길이에 맞춰 선택 (짧으면 medium, 길면 small / base). WHISPER_MODEL 환경변수가 있으면 그 모델
+
+    for segments in stream_transcribe(wav_path, language='zh'):
+        ...  # [{'start', 'end', 'text'}]
+"""
+import logging
+import math
+import os
+import wave
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .cancellation import OperationCancelled
+from .lazy_import import lazy_module
+
+np = lazy_module('numpy')
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+CHUNK_SECONDS = 30.0        # whisper 입력 창 길이
+MIN_SILENCE = 0.4           # 이보다 짧은 무음은 말 사이 쉼으로 보고 이어 붙임
+SPEECH_PADDING = 0.2        # 음성 구간 앞뒤 여유 (첫 / 마지막 음절 잘림 방지)
+NOISE_PERCENTILE = 10       # 프레임 에너지 하위 10% = 잡음 바닥
+SPEECH_OVER_NOISE_DB = 12.0
+SPEECH_BELOW_LOUD_DB = 20.0  # 쉼 없이 말만 있는 오디오는 하위 10%도 음성 - 큰 프레임(상위 10%) 기준으로 상한
+MIN_SPEECH_DB = -50.0
+# (오디오 길이 상한 초, 모델) - 길수록 작은 모델로 전체 인식 시간을 제한
+MODEL_BY_DURATION = ((180.0, 'medium'), (900.0, 'small'), (math.inf, 'base'))
+
+Chunk = Tuple[int, int]  # 샘플 [start, end)
+
+
+def choose_model(duration: float) -> str:
+    """오디오 길이에 맞는 whisper 모델 이름 (WHISPER_MODEL 환경변수 우선)"""
+    override = os.environ.get('WHISPER_MODEL', '').strip()
+    if override:
+        return override
+    return next(name for limit, name in MODEL_BY_DURATION if duration <= limit)
+
+
+def wav_duration(path: Path) -> float:
+    with wave.open(str(path), 'rb') as w:
+        return w.getnframes() / w.getframerate()
+
+
+def load_pcm(path: Path) -> 'np.ndarray':
+    """16-bit mono WAV → float32 [-1, 1] (extract_audio 출력 형식)"""
+    with wave.open(str(path), 'rb') as w:
+        if w.getsampwidth() != 2 or w.getnchannels() != 1 or w.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"16kHz 16-bit mono WAV가 필요합니다: {path} "
+                             f"({w.getframerate()}Hz, {w.getsampwidth() * 8}bit, {w.getnchannels()}ch)")
+        data = w.readframes(w.getnframes())
+    return np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768.0
+
+
+def speech_frames(pcm: 'np.ndarray', sample_rate: int = SAMPLE_RATE,
+                  frame_seconds: float = FRAME_SECONDS) -> 'np.ndarray':
+    """프레임별 음성 여부 (잡음 바닥보다 SPEECH_OVER_NOISE_DB 이상, 단 큰 프레임보다 SPEECH_BELOW_LOUD_DB 이하로는 안 내려감)"""
+    frame = max(1, int(sample_rate * frame_seconds))
+    count = len(pcm) // frame
+    if count == 0:
+        return np.zeros(0, dtype=bool)
+    frames = pcm[:count * frame].reshape(count, frame)
+    level = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    noise, loud = np.percentile(level, [NOISE_PERCENTILE, 100 - NOISE_PERCENTILE])
+    threshold = max(min(noise + SPEECH_OVER_NOISE_DB, loud - SPEECH_BELOW_LOUD_DB), MIN_SPEECH_DB)
+    return level >= threshold
+
+
+def vad_chunks(pcm: 'np.ndarray', sample_rate: int = SAMPLE_RATE,
+               chunk_seconds: float = CHUNK_SECONDS) -> List[Chunk]:
+    """음성 구간을 무음 경계에서 chunk_seconds 이하 청크로 묶음 (한 구간이 더 길면 잘라서 나눔)"""
+    frame = max(1, int(sample_rate * FRAME_SECONDS))
+    flags = speech_frames(pcm, sample_rate)
+    index = np.flatnonzero(flags)
+    if len(index) == 0:
+        return []
+
+    gap = max(1, round(MIN_SILENCE / FRAME_SECONDS))
+    breaks = np.flatnonzero(np.diff(index) > gap)
+    pad = int(SPEECH_PADDING * sample_rate)
+    runs = [(max(0, int(s) * frame - pad), min(len(pcm), (int(e) + 1) * frame + pad))
+            for s, e in zip(np.concatenate(([index[0]], index[breaks + 1])),
+                            np.concatenate((index[breaks], [index[-1]])))]
+
+    limit = int(chunk_seconds * sample_rate)
+    chunks: List[Chunk] = []
+    for start, end in runs:
+        if chunks:
+            start = max(start, chunks[-1][1])  # 앞뒤 여유가 겹쳐도 같은 소리를 두 번 인식하지 않음
+        while end - start > limit:
+            chunks.append((start, start + limit))
+            start += limit
+        if chunks and end - chunks[-1][0] <= limit:
+            chunks[-1] = (chunks[-1][0], end)
+        else:
+            chunks.append((start, end))
+    return chunks
+
+
+def stream_transcribe(audio_path: Path, language: str = 'zh', model_name: Optional[str] = None,
+                      cancel_check: Optional[Callable[[], bool]] = None) -> Iterator[List[Dict]]:
+    """
+    청크 단위 인식 결과를 순서대로 yield ([{'start', 'end', 'text'}], 타임스탬프는 원본 오디오 기준)
+
+    이전 청크의 마지막 문장을 다음 청크의 initial_prompt로 넘겨 청크 경계에서도 문맥 유지.
+    """
+    from .model_cache import get_whisper_model
+
+    pcm = load_pcm(audio_path)
+    duration = len(pcm) / SAMPLE_RATE
+    chunks = vad_chunks(pcm)
+    name = model_name or choose_model(duration)
+    speech = sum(end - start for start, end in chunks) / SAMPLE_RATE
+    logger.info(f"🎤 스트리밍 음성 인식: {duration:.1f}초 중 음성 {speech:.1f}초, "
+                f"{len(chunks)}개 청크, 모델 {name}")
+    model = get_whisper_model(name)
+
+    prompt = None
+    for i, (start, end) in enumerate(chunks, 1):
+        if cancel_check and cancel_check():
+            raise OperationCancelled(f"음성 인식 중 작업 취소됨 ({i - 1}/{len(chunks)} 청크)")
+        result = model.transcribe(pcm[start:end], language=language, task='transcribe', verbose=None,
+                                  initial_prompt=prompt)
+        offset = start / SAMPLE_RATE
+        segments = [{'start': offset + s['start'], 'end': offset + s['end'], 'text': s['text'].strip()}
+                    for s in result['segments'] if s['text'].strip()]
+        if segments:
+            prompt = segments[-1]['text']
+        logger.info(f"   청크 {i}/{len(chunks)} ({offset:.1f}~{end / SAMPLE_RATE:.1f}초): {len(segments)}개 세그먼트")
+        yield segments
@@ -0,0 +1,146 @@
+"""
+자막 / 워터마크 글자 영역 자동 감지
+
+중국 원본 영상의 하드코딩 자막은 위치는 고정이고 내용만 바뀐다. 하단 150px을 통째로 지우는 대신:
+- 영상 전체에서 프레임 수십 장을 저해상도 흑백으로 샘플링 (ffmpeg 한 번)
+- 가로 방향 밝기 변화(글자 세로획) 밀도 + 행 밝기 분산(대비)으로 프레임마다 "글자 행" 판정 (NumPy 벡터 연산)
+- 여러 프레임에 걸쳐 반복되는 행 → 띠, 띠 안에서 글자가 나온 열 범위 → 영역
+- 원본 해상도 좌표 (x, y, w, h) 목록으로 돌려줌 (상단 로고 + 하단 자막처럼 여러 개일 수 있음)
+
+    regions = detect_subtitle_regions(video_path)   # [] 이면 글자 영역 없음
+"""
+import logging
+import math
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .frame_pipeline import FramePipelineError, Region, VideoInfo, probe_video
+from .lazy_import import lazy_module
+
+np = lazy_module('numpy')
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_FRAMES = 32
+ANALYSIS_WIDTH = 480
+EDGE_THRESHOLD = 40       # 이웃 픽셀 밝기 차이 (글자 획 경계)
+MIN_ROW_DENSITY = 0.03    # 행에서 경계 픽셀 비율 최소값
+DENSITY_OVER_MEDIAN = 3.0  # 같은 프레임의 보통 행보다 이 배수 이상 획이 많아야 글자 행
+MIN_ROW_CONTRAST = 20.0   # 행 밝기 표준편차 (평평한 배경 제외)
+ROW_PRESENCE = 0.25       # 샘플 프레임 중 이 비율 이상에서 글자 행이면 고정 글자 띠
+COLUMN_PRESENCE = 0.05    # 띠에 글자가 있던 프레임 중 이 비율 이상(최소 1장)에서 획이 나온 열만 영역에 포함
+MAX_BAND_RATIO = 0.3      # 프레임 높이 대비 띠 최대 높이 (넘으면 글자가 아니라 질감)
+PADDING = 6               # 원본 해상도 기준 영역 여유
+
+
+def sample_frames(video_path: Path, count: int = SAMPLE_FRAMES, width: int = ANALYSIS_WIDTH,
+                  ffmpeg: str = 'ffmpeg', info: Optional[VideoInfo] = None) -> Tuple['np.ndarray', float]:
+    """
+    영상 전체에 고르게 흩어진 프레임 count장을 흑백 저해상도로 디코딩
+
+    Returns:
+        (프레임 배열 (N, H, W) uint8, 원본 / 분석 해상도 배율)
+    """
+    info = info or probe_video(video_path, ffmpeg)
+    out_w = min(width, info.width) // 2 * 2
+    out_h = max(2, round(info.height * out_w / info.width / 2) * 2)
+    rate = count / info.duration if info.duration else 2
+    result = subprocess.run(
+        [ffmpeg, '-v', 'error', '-i', str(video_path), '-map', '0:v:0',
+         '-vf', f'fps={rate:.6f},scale={out_w}:{out_h},format=gray',
+         '-frames:v', str(count), '-f', 'rawvideo', '-'],
+        capture_output=True, timeout=300,
+    )
+    if result.returncode != 0:
+        raise FramePipelineError(f"샘플 프레임 추출 실패: {result.stderr.decode('utf-8', 'replace')[-300:]}")
+    n = len(result.stdout) // (out_w * out_h)
+    if n == 0:
+        raise FramePipelineError("샘플 프레임이 없습니다")
+    frames = np.frombuffer(result.stdout[:n * out_w * out_h], dtype=np.uint8).reshape(n, out_h, out_w)
+    return frames, info.width / out_w
+
+
+def _runs(flags: 'np.ndarray', max_gap: int, min_length: int) -> List[Tuple[int, int]]:
+    """True 구간 [start, end) 목록 (max_gap 이하 틈은 이어 붙임)"""
+    index = np.flatnonzero(flags)
+    if len(index) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(index) > max_gap + 1)
+    starts = np.concatenate(([index[0]], index[breaks + 1]))
+    ends = np.concatenate((index[breaks], [index[-1]])) + 1
+    return [(int(s), int(e)) for s, e in zip(starts, ends) if e - s >= min_length]
+
+
+def detect_text_bands(frames: 'np.ndarray', edge_threshold: int = EDGE_THRESHOLD,
+                      row_presence: float = ROW_PRESENCE,
+                      column_presence: float = COLUMN_PRESENCE) -> List[Region]:
+    """
+    흑백 프레임 묶음 (N, H, W)에서 여러 프레임에 걸쳐 반복되는 글자 영역 (같은 좌표계의 x, y, w, h)
+
+    한 장만 있어도 동작하지만, 샘플이 많을수록 배경의 우연한 질감이 걸러진다.
+    """
+    frames = np.asarray(frames)
+    if frames.ndim == 2:
+        frames = frames[None]
+    n, height, width = frames.shape
+    pixels = frames.astype(np.int16)
+
+    strokes = np.abs(np.diff(pixels, axis=2)) > edge_threshold              # (N, H, W-1)
+    density = strokes.mean(axis=2)                                          # (N, H)
+    contrast = pixels.std(axis=2)                                           # (N, H)
+    typical = np.median(density, axis=1, keepdims=True)
+    text_rows = ((density >= MIN_ROW_DENSITY)
+                 & (density >= typical * DENSITY_OVER_MEDIAN)
+                 & (contrast >= MIN_ROW_CONTRAST))
+    persistent = text_rows.mean(axis=0) >= row_presence                     # (H,)
+
+    min_height = max(2, height // 100)
+    regions = []
+    for top, bottom in _runs(persistent, max_gap=max(1, height // 100), min_length=min_height):
+        if bottom - top > height * MAX_BAND_RATIO:
+            continue
+        # 자막 길이는 줄마다 다르므로 글자가 있던 프레임들의 합집합 (가장 긴 줄까지 덮어야 잔상이 안 남음)
+        active = text_rows[:, top:bottom].any(axis=1)
+        needed = max(1, math.ceil(column_presence * active.sum()))
+        columns = strokes[active, top:bottom, :].any(axis=1).sum(axis=0) >= needed
+        # 글자 / 단어 사이 간격은 이어 붙이고, 화면 폭의 8% 이상 떨어지면 별개 영역
+        for left, right in _runs(columns, max_gap=max(2, width * 8 // 100), min_length=max(2, width // 100)):
+            regions.append((left, top, right + 1 - left, bottom - top))
+    return regions
+
+
+def scale_regions(regions: List[Region], scale: float, width: int, height: int,
+                  padding: int = PADDING) -> List[Region]:
+    """분석 해상도 영역 → 원본 해상도 (여유 padding 포함, 프레임 안으로 자름)"""
+    scaled = []
+    for x, y, w, h in regions:
+        x0 = max(0, int(x * scale) - padding)
+        y0 = max(0, int(y * scale) - padding)
+        x1 = min(width, math.ceil((x + w) * scale) + padding)
+        y1 = min(height, math.ceil((y + h) * scale) + padding)
+        scaled.append((x0, y0, x1 - x0, y1 - y0))
+    return scaled
+
+
+def detect_subtitle_regions(video_path: Path, ffmpeg: str = 'ffmpeg', info: Optional[VideoInfo] = None,
+                            count: int = SAMPLE_FRAMES) -> List[Region]:
+    """영상에서 고정 위치 자막 / 워터마크 영역 감지 (원본 해상도 x, y, w, h 목록, 없으면 [])"""
+    info = info or probe_video(video_path, ffmpeg)
+    frames, scale = sample_frames(video_path, count=count, ffmpeg=ffmpeg, info=info)
+    regions = scale_regions(detect_text_bands(frames), scale, info.width, info.height)
+    area = sum(w * h for _, _, w, h in regions)
+    logger.info(f"🔎 글자 영역 감지: 샘플 {len(frames)}장 → {len(regions)}개 영역 "
+                f"(프레임 면적의 {area * 100 / (info.width * info.height):.1f}%)")
+    for x, y, w, h in regions:
+        logger.info(f"   영역: x={x}, y={y}, w={w}, h={h}")
+    return regions
+
+
+def bounding_region(regions: List[Region]) -> Region:
+    """영역 목록을 모두 덮는 사각형 하나 (영역 하나만 받는 외부 도구용)"""
+    x0 = min(x for x, _, _, _ in regions)
+    y0 = min(y for _, y, _, _ in regions)
+    x1 = max(x + w for x, _, w, _ in regions)
+    y1 = max(y + h for _, y, _, h in regions)
+    return x0, y0, x1 - x0, y1 - y0
@@ -0,0 +1,169 @@
+"""
+세그먼트 번역 엔진 (토큰 예산 청크 + 동시 요청 + 번역 메모리)
+
+세그먼트 전체를 요청 하나에 넣으면 긴 영상에서 max_tokens를 넘겨 응답 JSON이 잘리고 전부 원문으로 남는다.
+여기서는:
+- 번역 메모리(SQLite)에 있는 문장과 같은 작업 안의 중복 문장은 요청에서 뺌
+- 나머지를 추정 토큰 예산 단위 청크로 나눠 동시에 요청
+- 청크 응답은 id → 번역 dict로 합침, 빠진 id만 모아 재시도
+- 청크 하나가 끝내 실패해도 그 청크만 원문 유지
+
+API 호출은 호출하는 쪽이 request_fn(items) → 응답 문자열로 넘긴다 (Claude / OpenAI 공용):
+
+    translations = translate_texts(texts, request_fn, 'zh', 'ko')   # 실패한 항목은 None
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+CHUNK_TOKEN_BUDGET = 1500   # 청크당 원문 추정 토큰 (한국어 출력은 원문의 약 2배 → max_tokens 4096 안쪽)
+CHUNK_MAX_ITEMS = 60
+TRANSLATE_CONCURRENCY = 4
+CHUNK_RETRIES = 2
+RETRY_DELAY = 2.0           # 재시도 대기 (초, 시도마다 두 배)
+
+RequestFn = Callable[[List[Dict]], str]
+
+
+def default_memory_db() -> str:
+    return os.environ.get('TRANSLATION_MEMORY_DB') or str(PROJECT_ROOT / '.cache' / 'translation_memory.db')
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 (CJK / 한글은 글자당 1, 나머지는 4글자당 1) + JSON 포장 여유"""
+    wide = sum(1 for ch in text if ord(ch) >= 0x1100)
+    return wide + (len(text) - wide + 3) // 4 + 8
+
+
+def chunk_items(items: Sequence[Dict], token_budget: int = CHUNK_TOKEN_BUDGET,
+                max_items: int = CHUNK_MAX_ITEMS) -> List[List[Dict]]:
+    """{'id', 'text'} 목록을 추정 토큰 합이 예산 이하인 청크로 (예산보다 긴 항목은 단독 청크)"""
+    chunks, current, used = [], [], 0
+    for item in items:
+        cost = estimate_tokens(item['text'])
+        if current and (used + cost > token_budget or len(current) >= max_items):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def parse_translations(response_text: str) -> Dict[int, str]:
+    """모델 응답 (```json 코드블록 허용)의 [{"id", "text"}] → {id: text}"""
+    text = response_text.strip()
+    if '```json' in text:
+        text = text.split('```json')[1].split('```')[0].strip()
+    elif '```' in text:
+        text = text.split('```')[1].split('```')[0].strip()
+    data = json.loads(text)
+    return {int(item['id']): item['text'] for item in data
+            if isinstance(item, dict) and 'id' in item and isinstance(item.get('text'), str)}
+
+
+class TranslationMemory:
+    """(원문 언어, 번역 언어, 원문) → 번역 캐시 (SQLite, 작업 / 프로세스 사이에 공유)"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or default_memory_db()
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS translation_memory ('
+                ' source_lang TEXT NOT NULL, target_lang TEXT NOT NULL, source TEXT NOT NULL,'
+                ' translation TEXT NOT NULL, PRIMARY KEY (source_lang, target_lang, source))'
+            )
+
+    def lookup(self, texts: Iterable[str], source_lang: str, target_lang: str) -> Dict[str, str]:
+        texts = list(set(texts))
+        found = {}
+        with self._lock:
+            for start in range(0, len(texts), 500):  # SQLite 바인딩 변수 수 제한
+                part = texts[start:start + 500]
+                rows = self._conn.execute(
+                    f'SELECT source, translation FROM translation_memory WHERE source_lang = ? AND target_lang = ?'
+                    f' AND source IN ({",".join("?" * len(part))})',
+                    [source_lang, target_lang, *part],
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def store(self, pairs: Dict[str, str], source_lang: str, target_lang: str):
+        if not pairs:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO translation_memory (source_lang, target_lang, source, translation)'
+                ' VALUES (?, ?, ?, ?)',
+                [(source_lang, target_lang, source, translation) for source, translation in pairs.items()],
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+def _translate_chunk(chunk: List[Dict], request_fn: RequestFn, retries: int) -> Dict[int, str]:
+    """청크 번역 - 응답에서 빠진 id만 다시 요청 (최대 retries번)"""
+    result: Dict[int, str] = {}
+    pending = chunk
+    for attempt in range(retries + 1):
+        try:
+            translated = parse_translations(request_fn(pending))
+            result.update((item['id'], translated[item['id']]) for item in pending if item['id'] in translated)
+        except Exception as e:
+            logger.warning(f"⚠️ 번역 청크 실패 (항목 {len(pending)}개, 시도 {attempt + 1}/{retries + 1}): {e}")
+        pending = [item for item in pending if item['id'] not in result]
+        if not pending:
+            break
+        if attempt < retries:
+            time.sleep(RETRY_DELAY * 2 ** attempt)
+    return result
+
+
+def translate_texts(texts: Sequence[str], request_fn: RequestFn, source_lang: str, target_lang: str,
+                    memory: Optional[TranslationMemory] = None, token_budget: int = CHUNK_TOKEN_BUDGET,
+                    concurrency: int = TRANSLATE_CONCURRENCY,
+                    retries: int = CHUNK_RETRIES) -> List[Optional[str]]:
+    """
+    문장 목록 번역 (입력 순서 그대로, 번역 못 한 항목은 None)
+
+    Args:
+        request_fn: [{'id', 'text'}] → 같은 형식 JSON 배열이 담긴 모델 응답 문자열
+        memory: 번역 메모리 (None이면 캐시 없이 전부 요청)
+    """
+    unique = list(dict.fromkeys(text.strip() for text in texts if text and text.strip()))
+    known = memory.lookup(unique, source_lang, target_lang) if memory else {}
+    missing = [text for text in unique if text not in known]
+    chunks = chunk_items([{'id': i, 'text': text} for i, text in enumerate(missing)], token_budget)
+    logger.info(f"🌐 번역 요청: 고유 문장 {len(unique)}개 중 메모리 {len(known)}개, "
+                f"요청 {len(missing)}개 ({len(chunks)}개 청크, 동시 {min(concurrency, len(chunks)) or 0}개)")
+
+    translated: Dict[int, str] = {}
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as pool:
+            for part in pool.map(lambda chunk: _translate_chunk(chunk, request_fn, retries), chunks):
+                translated.update(part)
+    new = {missing[i]: text for i, text in translated.items()}
+    if memory:
+        memory.store(new, source_lang, target_lang)
+    if len(new) < len(missing):
+        logger.warning(f"⚠️ 번역 실패 {len(missing) - len(new)}개 문장은 원문 유지")
+
+    lookup = {**known, **new}
+    return [lookup.get(text.strip()) if text else None for text in texts]
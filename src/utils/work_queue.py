@@ -0,0 +1,424 @@
+"""
+SQLite(WAL) 기반 작업 큐
+
+- 원자적 claim: BEGIN IMMEDIATE 트랜잭션 안에서 다음 작업을 골라 processing으로 UPDATE
+- 리스(lease) + 하트비트: 워커가 죽으면 리스 만료 후 다른 워커가 다시 가져감
+  (차례를 기다리는 작업도 리스를 둘 수 있음 - 대기하던 프로세스가 죽으면 만료 후 삭제)
+- 우선순위 (priority 높은 순 → 먼저 들어온 순)
+- 작업 타입별 동시 실행 제한 (queue_limits) - 전역 락 대신
+- 대기: 같은 프로세스에서는 Condition으로 즉시 깨어나고, 다른 프로세스의 변경은
+  PRAGMA data_version으로 감지 (파일 락 + 1초 sleep 폴링 대체)
+
+이 모듈 전용 DB 파일에서만 사용한다 (프론트엔드 DB의 queue_tasks는 형식이 달라 열지 않음).
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# 작업 상태
+PENDING = 'pending'
+PROCESSING = 'processing'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+DEFAULT_LEASE_SECONDS = 60.0
+# 다른 프로세스의 변경을 확인하는 최대 간격 (초) - 같은 프로세스의 변경은 즉시 깨어남
+CROSS_PROCESS_CHECK_INTERVAL = 2.0
+
+# queue_tasks 컬럼 (id 제외)
+_TASK_COLUMNS = {
+    'type': "TEXT NOT NULL DEFAULT 'default'",
+    'status': f"TEXT NOT NULL DEFAULT '{PENDING}'",
+    'priority': 'INTEGER NOT NULL DEFAULT 0',
+    'payload': 'TEXT',
+    'error': 'TEXT',
+    'attempts': 'INTEGER NOT NULL DEFAULT 0',
+    'max_attempts': 'INTEGER NOT NULL DEFAULT 1',
+    'lease_owner': 'TEXT',
+    'lease_expires_at': 'REAL',
+    'created_at': 'TEXT',
+    'started_at': 'TEXT',
+    'completed_at': 'TEXT',
+}
+
+# 프로세스 내 대기용 Condition (DB 파일별로 공유)
+_conditions: Dict[str, threading.Condition] = {}
+_conditions_lock = threading.Lock()
+
+
+def _condition_for(db_path: str) -> threading.Condition:
+    key = os.path.abspath(db_path)
+    with _conditions_lock:
+        if key not in _conditions:
+            _conditions[key] = threading.Condition()
+        return _conditions[key]
+
+
+def _now_iso() -> str:
+    return datetime.now().isoformat()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+@dataclass
+class Task:
+    """큐 작업"""
+    id: str
+    type: str
+    status: str
+    priority: int = 0
+    payload: Dict = field(default_factory=dict)
+    attempts: int = 0
+    error: Optional[str] = None
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> 'Task':
+        try:
+            payload = json.loads(row['payload']) if row['payload'] else {}
+        except ValueError:
+            payload = {}
+        return cls(id=row['id'], type=row['type'], status=row['status'], priority=row['priority'] or 0,
+                   payload=payload, attempts=row['attempts'] or 0, error=row['error'],
+                   lease_owner=row['lease_owner'], lease_expires_at=row['lease_expires_at'])
+
+
+class WorkQueue:
+    """SQLite 작업 큐 (스레드/프로세스 안전)"""
+
+    def __init__(self, db_path: str, worker_id: Optional[str] = None,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS, busy_timeout_ms: int = 10000):
+        self.db_path = str(db_path)
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._condition = _condition_for(self.db_path)
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_schema()
+
+    # ------------------------------------------------------------------
+    # 연결 / 스키마
+    # ------------------------------------------------------------------
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 (autocommit, 트랜잭션은 직접 BEGIN)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                                   isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 락을 먼저 잡는 트랜잭션 (claim 경쟁 시 원자성 보장)"""
+        conn = self._conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _ensure_schema(self):
+        with self._transaction() as conn:
+            columns = ', '.join(f'{name} {ddl}' for name, ddl in _TASK_COLUMNS.items())
+            conn.execute(f'CREATE TABLE IF NOT EXISTS queue_tasks (id TEXT PRIMARY KEY, {columns})')
+            existing = {row[1] for row in conn.execute('PRAGMA table_info(queue_tasks)')}
+            missing = [name for name in _TASK_COLUMNS if name not in existing]
+            if missing:
+                # 다른 프로그램(프론트엔드 등)이 만든 테이블은 변경하지 않음
+                raise sqlite3.OperationalError(
+                    f"queue_tasks 테이블 형식이 다릅니다 (없는 컬럼: {', '.join(missing)}): {self.db_path}")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS queue_limits (
+                    task_type TEXT PRIMARY KEY,
+                    max_concurrent INTEGER NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_queue_tasks_claim '
+                         'ON queue_tasks (status, type, priority DESC, created_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_queue_tasks_lease '
+                         'ON queue_tasks (status, lease_expires_at)')
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _notify(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    # ------------------------------------------------------------------
+    # 등록 / 설정
+    # ------------------------------------------------------------------
+    def set_limit(self, task_type: str, max_concurrent: Optional[int]):
+        """작업 타입별 동시 실행 수 제한 (None이면 제한 없음)"""
+        with self._transaction() as conn:
+            if max_concurrent is None:
+                conn.execute('DELETE FROM queue_limits WHERE task_type = ?', (task_type,))
+            else:
+                conn.execute('INSERT OR REPLACE INTO queue_limits (task_type, max_concurrent) VALUES (?, ?)',
+                             (task_type, int(max_concurrent)))
+        self._notify()
+
+    def enqueue(self, task_type: str, payload: Optional[Dict] = None, task_id: Optional[str] = None,
+                priority: int = 0, max_attempts: int = 1, lease: bool = False) -> str:
+        """
+        작업 등록 (같은 id가 있으면 pending으로 되돌림)
+
+        lease=True: 등록한 워커가 직접 차례를 기다리는 작업 (wait_and_claim(task_id=...)).
+        대기 중에도 리스를 두고 하트비트로 연장해야 하며, 만료되면 (대기하던 프로세스가 죽음) 삭제된다.
+        """
+        task_id = task_id or uuid.uuid4().hex
+        owner, expires = (self.worker_id, time.time() + self.lease_seconds) if lease else (None, None)
+        with self._transaction() as conn:
+            conn.execute('''
+                INSERT INTO queue_tasks (id, type, status, priority, payload, attempts, max_attempts, created_at,
+                                         lease_owner, lease_expires_at)
+                VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    type = excluded.type, status = excluded.status, priority = excluded.priority,
+                    payload = excluded.payload, error = NULL,
+                    lease_owner = excluded.lease_owner, lease_expires_at = excluded.lease_expires_at
+            ''', (task_id, task_type, PENDING, priority, json.dumps(payload or {}, ensure_ascii=False),
+                  max_attempts, _now_iso(), owner, expires))
+        self._notify()
+        return task_id
+
+    # ------------------------------------------------------------------
+    # claim / 리스
+    # ------------------------------------------------------------------
+    def _reclaim_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        """리스가 만료된 작업: 재시도 가능하면 pending, 아니면 failed (리스가 만료된 대기 작업은 삭제)"""
+        waiters = conn.execute('''
+            DELETE FROM queue_tasks WHERE status = ? AND lease_expires_at IS NOT NULL AND lease_expires_at < ?
+        ''', (PENDING, now))
+        cur = conn.execute('''
+            UPDATE queue_tasks
+            SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END,
+                error = CASE WHEN attempts < max_attempts THEN error ELSE 'lease expired' END,
+                completed_at = CASE WHEN attempts < max_attempts THEN completed_at ELSE ? END,
+                lease_owner = NULL, lease_expires_at = NULL
+            WHERE status = ? AND lease_expires_at IS NOT NULL AND lease_expires_at < ?
+        ''', (PENDING, FAILED, _now_iso(), PROCESSING, now))
+        return waiters.rowcount + cur.rowcount
+
+    def claim(self, task_types: Optional[Iterable[str]] = None,
+              task_id: Optional[str] = None) -> Optional[Task]:
+        """
+        실행 가능한 다음 작업을 원자적으로 가져옴
+
+        Args:
+            task_types: 가져올 작업 타입 (None이면 전체)
+            task_id: 이 작업의 차례일 때만 가져옴 (같은 타입에서 앞선 작업이 있으면 None)
+
+        Returns:
+            가져온 작업 또는 None
+        """
+        types = list(task_types or [])
+        now = time.time()
+        with self._transaction() as conn:
+            self._reclaim_expired(conn, now)
+
+            query = '''
+                SELECT t.id, t.type FROM queue_tasks t
+                LEFT JOIN queue_limits l ON l.task_type = t.type
+                WHERE t.status = ?
+                  AND (l.max_concurrent IS NULL OR
+                       (SELECT COUNT(*) FROM queue_tasks r
+                        WHERE r.type = t.type AND r.status = ?) < l.max_concurrent)
+            '''
+            params: list = [PENDING, PROCESSING]
+            if types:
+                query += f" AND t.type IN ({','.join('?' * len(types))})"
+                params.extend(types)
+            query += ' ORDER BY t.priority DESC, t.created_at, t.rowid'
+
+            rows = conn.execute(query, params).fetchall()
+            if task_id is not None:
+                # 같은 타입 안에서 이 작업이 맨 앞일 때만 (공정한 FIFO)
+                own = next((r for r in rows if r['id'] == task_id), None)
+                first_of_type = next((r for r in rows if own is not None and r['type'] == own['type']), None)
+                row = own if own is not None and first_of_type['id'] == task_id else None
+            else:
+                row = rows[0] if rows else None
+            if row is None:
+                return None
+
+            conn.execute('''
+                UPDATE queue_tasks
+                SET status = ?, lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1,
+                    started_at = COALESCE(started_at, ?)
+                WHERE id = ? AND status = ?
+            ''', (PROCESSING, self.worker_id, now + self.lease_seconds, _now_iso(), row['id'], PENDING))
+            task = conn.execute('SELECT * FROM queue_tasks WHERE id = ?', (row['id'],)).fetchone()
+        return Task.from_row(task)
+
+    def wait_and_claim(self, task_types: Optional[Iterable[str]] = None, task_id: Optional[str] = None,
+                       timeout: Optional[float] = None) -> Optional[Task]:
+        """
+        작업을 가져올 수 있을 때까지 대기
+
+        같은 프로세스의 enqueue/complete는 Condition으로 즉시 깨우고, 다른 프로세스의
+        커밋은 PRAGMA data_version 변화로 감지한다. 가장 빠른 리스 만료 시각에도 깨어난다.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        last_version = None
+        while True:
+            version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+            if version != last_version:
+                task = self.claim(task_types, task_id)
+                if task:
+                    return task
+                last_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+            now = time.time()
+            if deadline is not None and now >= deadline:
+                return None
+
+            wait = CROSS_PROCESS_CHECK_INTERVAL
+            next_expiry = self._conn.execute(
+                'SELECT MIN(lease_expires_at) FROM queue_tasks WHERE status IN (?, ?)', (PENDING, PROCESSING)
+            ).fetchone()[0]
+            if next_expiry is not None:
+                wait = min(wait, max(0.0, next_expiry - now) + 0.01)
+                if next_expiry <= now:
+                    last_version = None  # 만료된 리스 회수를 위해 다시 claim
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - now))
+
+            with self._condition:
+                if self._condition.wait(timeout=wait):
+                    last_version = None
+
+    def heartbeat(self, task_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """리스 연장 - 실행 중이거나 리스를 두고 기다리는 작업 (다른 워커에게 넘어갔거나 삭제됐으면 False)"""
+        lease = lease_seconds or self.lease_seconds
+        with self._transaction() as conn:
+            cur = conn.execute('''
+                UPDATE queue_tasks SET lease_expires_at = ?
+                WHERE id = ? AND status IN (?, ?) AND lease_owner = ?
+            ''', (time.time() + lease, task_id, PENDING, PROCESSING, self.worker_id))
+        return cur.rowcount == 1
+
+    @contextmanager
+    def keep_alive(self, task_id: str, interval: Optional[float] = None):
+        """블록 실행 동안 백그라운드에서 하트비트 전송"""
+        heartbeat = LeaseHeartbeat(self, task_id, interval)
+        heartbeat.start()
+        try:
+            yield heartbeat
+        finally:
+            heartbeat.stop()
+
+    # ------------------------------------------------------------------
+    # 상태 변경
+    # ------------------------------------------------------------------
+    def update_status(self, task_id: str, status: str, error: Optional[str] = None) -> bool:
+        """작업 상태 변경 (completed/failed/cancelled면 리스 해제 + 완료 시각 기록)"""
+        with self._transaction() as conn:
+            if status in FINISHED_STATUSES:
+                cur = conn.execute('''
+                    UPDATE queue_tasks
+                    SET status = ?, error = ?, completed_at = ?, lease_owner = NULL, lease_expires_at = NULL
+                    WHERE id = ?
+                ''', (status, (error or 'Unknown error') if status == FAILED else error, _now_iso(), task_id))
+            else:
+                cur = conn.execute('UPDATE queue_tasks SET status = ? WHERE id = ?', (status, task_id))
+        self._notify()
+        return cur.rowcount == 1
+
+    def complete(self, task_id: str) -> bool:
+        return self.update_status(task_id, COMPLETED)
+
+    def fail(self, task_id: str, error: str, retry: bool = False) -> bool:
+        """실패 처리 (retry=True이고 재시도 횟수가 남았으면 pending으로 되돌림)"""
+        if retry:
+            with self._transaction() as conn:
+                cur = conn.execute('''
+                    UPDATE queue_tasks
+                    SET status = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL
+                    WHERE id = ? AND attempts < max_attempts
+                ''', (PENDING, error, task_id))
+            if cur.rowcount == 1:
+                self._notify()
+                return True
+        return self.update_status(task_id, FAILED, error)
+
+    def remove(self, task_id: str) -> bool:
+        with self._transaction() as conn:
+            cur = conn.execute('DELETE FROM queue_tasks WHERE id = ?', (task_id,))
+        self._notify()
+        return cur.rowcount == 1
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get(self, task_id: str) -> Optional[Task]:
+        row = self._conn.execute('SELECT * FROM queue_tasks WHERE id = ?', (task_id,)).fetchone()
+        return Task.from_row(row) if row else None
+
+    def list_tasks(self, status: Optional[str] = None, task_type: Optional[str] = None) -> List[Task]:
+        query = 'SELECT * FROM queue_tasks WHERE 1 = 1'
+        params: list = []
+        if status:
+            query += ' AND status = ?'
+            params.append(status)
+        if task_type:
+            query += ' AND type = ?'
+            params.append(task_type)
+        query += ' ORDER BY priority DESC, created_at, rowid'
+        return [Task.from_row(row) for row in self._conn.execute(query, params)]
+
+
+class LeaseHeartbeat:
+    """작업 리스를 주기적으로 연장하는 백그라운드 스레드"""
+
+    def __init__(self, queue: WorkQueue, task_id: str, interval: Optional[float] = None):
+        self.task_id = task_id
+        self.interval = interval or max(1.0, queue.lease_seconds / 3)
+        # 하트비트 스레드는 자기 연결을 사용 (같은 worker_id로 리스 소유 확인)
+        self._queue = WorkQueue(queue.db_path, worker_id=queue.worker_id, lease_seconds=queue.lease_seconds)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'queue-heartbeat-{task_id}', daemon=True)
+        self.lost = False  # 리스를 다른 워커에게 빼앗김
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                if not self._queue.heartbeat(self.task_id):
+                    self.lost = True
+                    break
+        finally:
+            self._queue.close()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=self.interval + 5)
@@ -19,7 +19,7 @@ import logging
 from pathlib import Path
 import subprocess
 import asyncio
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import tempfile
 import shutil
 import cv2
@@ -40,23 +40,69 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# TTS 기본 음성 / 세그먼트 동시 합성 수
+EDGE_TTS_VOICE = 'ko-KR-SunHiNeural'
+OPENAI_TTS_VOICE = 'shimmer'
+SEGMENT_TTS_CONCURRENCY = 8
+
+# LaMa CPU 병렬 처리: 워커당 torch 스레드 수 / 최대 워커 수 / 모델에 주는 주변 문맥 여백
+LAMA_THREADS_PER_WORKER = 4
+LAMA_MAX_WORKERS = 4
+LAMA_MARGIN = 64
+# forward 한 번에 넣는 ROI crop 수 (CPU는 캐시에 맞게 작게)
+LAMA_CPU_BATCH = 4
+LAMA_GPU_BATCH = 16
+
+# 프레임 파이프라인으로 인페인팅하는 워터마크 모드 - 오디오 교체 / 자막 굽기까지 인코딩 1회로 합성
+FUSED_RENDER_MODES = ('fast', 'fast-temporal', 'lama')
+
+try:
+    from src.utils.cancellation import OperationCancelled, cancel_token_for, release_cancel_token, run_cancellable
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from src.utils.cancellation import OperationCancelled, cancel_token_for, release_cancel_token, run_cancellable
+from src.utils.resource_broker import resource_lease
+from src.utils.audio_metadata import probe_audio_bytes, get_exact_audio_duration
+from src.utils.dubbing_timeline import render_dub_track
+from src.utils.translation_engine import TranslationMemory, translate_texts
+from src.utils.streaming_asr import stream_transcribe, wav_duration
+from src.utils.frame_pipeline import TEMPORAL_THRESHOLD, EncodePlan, as_regions, probe_video
+from src.utils.text_regions import detect_subtitle_regions, bounding_region
+from src.utils.parallel_inpaint import parallel_inpaint_video, inpaint_workers, TELEA_INPAINTER
+from src.utils.stage_metrics import StageMetrics, METRICS_FILENAME
+from src.utils.profiling import JobProfiler, profile_mode, PROFILE_MODES
+
+
 def should_stop(output_dir: Path) -> bool:
     """
-    STOP 파일 존재 여부 확인 (영상 제작과 동일한 방식)
+    STOP 신호 여부 확인 (영상 제작과 동일한 STOP 파일)
+
+    폴더별 공유 취소 토큰이 STOP 파일을 감시해 실행 중인 외부 프로세스를 바로 종료한다.
+    감시 이벤트는 조금 늦게 올 수 있으므로 파일도 직접 확인 (토큰은 convert_chinese_video가 끝날 때 해제).
 
     Args:
         output_dir: 작업 디렉토리
 
     Returns:
-        bool: STOP 파일 존재 여부
+        bool: STOP 신호 여부
     """
-    stop_file = Path(output_dir) / 'STOP'
-    return stop_file.exists()
+    token = cancel_token_for(output_dir, names=('STOP',))
+    return token.cancelled or (Path(output_dir) / 'STOP').exists()
+
 
-class CancelledException(Exception):
+class CancelledException(OperationCancelled):
     """작업이 취소되었을 때 발생하는 예외"""
     pass
 
+
+def _run(cmd, output_dir: Path = None, **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run 대체: output_dir에 STOP 파일이 생기면 실행 중인 프로세스 그룹을 즉시 종료"""
+    token = cancel_token_for(output_dir, names=('STOP',)) if output_dir else None
+    try:
+        return run_cancellable(cmd, token, **kwargs)
+    except OperationCancelled:
+        raise CancelledException(f"외부 프로세스 실행 중 작업 취소됨: {Path(str(cmd[0])).name}")
+
 # OpenAI API (Whisper 및 TTS)
 try:
     from openai import OpenAI
@@ -144,11 +190,10 @@ def _remove_subtitle_vsr(input_video: Path, output_video: Path, x: int, y: int,
         # STOP 체크
         if output_dir and should_stop(output_dir):
             raise CancelledException("VSR 자막 제거 시작 전 작업 취소됨")
-        import sys
         vsr_dir = Path(__file__).parent / "video-subtitle-remover"
         backend_dir = vsr_dir / "backend"
 
-        # 경로 추가
+        # 경로 추가 (backend 패키지는 video-subtitle-remover 안에 있음)
         if str(vsr_dir) not in sys.path:
             sys.path.insert(0, str(vsr_dir))
         if str(backend_dir) not in sys.path:
@@ -196,15 +241,17 @@ def _remove_subtitle_vsr(input_video: Path, output_video: Path, x: int, y: int,
         return False
 
 
-def _remove_watermark_lama(input_video: Path, output_video: Path, x: int, y: int, w: int, h: int, output_dir: Path = None) -> bool:
+def _remove_watermark_lama(input_video: Path, output_video: Path, regions: List[tuple], output_dir: Path = None,
+                           encode_plan: Optional[EncodePlan] = None) -> bool:
     """
-    LAMA를 사용한 워터마크 제거 (video-subtitle-remover의 LAMA 모델 사용)
+    LAMA를 사용한 워터마크 제거 (video-subtitle-remover의 Big-LaMa 모델, src.utils.lama_backend로 ROI 배치 추론)
 
     Args:
         input_video: 입력 비디오 경로
         output_video: 출력 비디오 경로
-        x, y, w, h: 워터마크 영역
+        regions: 워터마크 영역 (x, y, w, h) 목록 - 떨어진 영역은 ROI를 따로 잘라 처리
         output_dir: 작업 디렉토리 (STOP 파일 체크용)
+        encode_plan: 최종 영상까지 한 번에 인코딩 (remove_watermark_ai 참고)
 
     Returns:
         성공 여부
@@ -213,140 +260,59 @@ def _remove_watermark_lama(input_video: Path, output_video: Path, x: int, y: int
         # STOP 체크
         if output_dir and should_stop(output_dir):
             raise CancelledException("LAMA 워터마크 제거 시작 전 작업 취소됨")
-        import sys
-        vsr_dir = Path(__file__).parent / "video-subtitle-remover"
-        backend_dir = vsr_dir / "backend"
+        backend_dir = Path(__file__).parent / "video-subtitle-remover" / "backend"
 
-        # 경로 추가
-        if str(vsr_dir) not in sys.path:
-            sys.path.insert(0, str(vsr_dir))
-        if str(backend_dir) not in sys.path:
-            sys.path.insert(0, str(backend_dir))
-
-        # LAMA 모델 경로 확인
+        # LAMA 모델 경로 확인 (분할 파일은 lama_backend가 병합)
         lama_model_dir = backend_dir / "models" / "big-lama"
         if not lama_model_dir.exists():
             logger.error(f"❌ LAMA 모델 디렉토리가 없습니다: {lama_model_dir}")
             return False
 
         # 모델 파일 확인
-        model_files = list(lama_model_dir.glob("big-lama_*.pt"))
+        model_files = list(lama_model_dir.glob("big-lama*.pt"))
         if len(model_files) == 0:
             logger.error(f"❌ LAMA 모델 파일이 없습니다: {lama_model_dir}")
             return False
 
         logger.info(f"✅ LAMA 모델 파일 발견: {len(model_files)}개")
 
-        # LAMA 인페인트 임포트
-        from backend.inpaint.lama_inpaint import LamaInpaint
         import torch
-        import cv2
-        import numpy as np
-
-        # 임시 디렉토리 생성
-        temp_dir = Path(tempfile.mkdtemp())
-        frames_dir = temp_dir / "frames"
-        mask_dir = temp_dir / "masks"
-        inpaint_dir = temp_dir / "inpainted"
 
-        frames_dir.mkdir(exist_ok=True)
-        mask_dir.mkdir(exist_ok=True)
-        inpaint_dir.mkdir(exist_ok=True)
+        # GPU는 모델 하나를 공유, CPU는 워커 몇 개에 torch 스레드를 나눠 줌
+        # (LaMa 한 번의 forward가 이미 여러 코어를 쓰므로 코어 수만큼 워커를 띄우면 오히려 느림)
+        if torch.cuda.is_available():
+            device, workers, threads, batch = 'cuda', 1, None, LAMA_GPU_BATCH
+        else:
+            cores = inpaint_workers()
+            workers = max(1, min(LAMA_MAX_WORKERS, cores // LAMA_THREADS_PER_WORKER))
+            device, threads, batch = 'cpu', max(1, cores // workers), LAMA_CPU_BATCH
+        logger.info(f"🤖 LAMA 인페인팅 진행 중... (디바이스: {device}, 워커 {workers}개 × 스레드 {threads or '-'}, "
+                    f"배치 {batch})")
 
         try:
-            ffmpeg = get_ffmpeg_path()
-
-            # 1. 프레임 추출
-            logger.info(f"🎞️ 프레임 추출 중...")
-            cmd = [
-                ffmpeg, '-i', str(input_video),
-                '-vf', 'fps=30',  # 30fps로 고정
-                str(frames_dir / 'frame_%06d.png')
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error(f"❌ 프레임 추출 실패: {result.stderr}")
-                return False
-
-            # 프레임 파일 목록
-            frame_files = sorted(frames_dir.glob("frame_*.png"))
-            total_frames = len(frame_files)
-            logger.info(f"✅ {total_frames}개 프레임 추출 완료")
-
-            # 2. 마스크 생성
-            logger.info(f"🎨 마스크 생성 중...")
-            first_frame = cv2.imread(str(frame_files[0]))
-            mask = np.zeros(first_frame.shape[:2], dtype=np.uint8)
-            mask[y:y+h, x:x+w] = 255
-
-            # 모든 프레임에 동일한 마스크 적용
-            for frame_file in frame_files:
-                mask_file = mask_dir / frame_file.name
-                cv2.imwrite(str(mask_file), mask)
-
-            logger.info(f"✅ {total_frames}개 마스크 생성 완료")
-
-            # 3. LAMA 인페인팅 초기화
-            logger.info(f"🤖 LAMA 모델 로딩 중...")
-            device = 'cuda' if torch.cuda.is_available() else 'cpu'
-            logger.info(f"   디바이스: {device}")
-
-            lama_inpaint = LamaInpaint(device=device)
-            logger.info(f"✅ LAMA 모델 로딩 완료")
-
-            # 4. 프레임별 인페인팅
-            logger.info(f"🎨 LAMA 인페인팅 진행 중...")
-            for i, frame_file in enumerate(frame_files, 1):
-                # STOP 체크 (10프레임마다)
-                if i % 10 == 0 and output_dir and should_stop(output_dir):
-                    raise CancelledException(f"LAMA 인페인팅 중 작업 취소됨 ({i}/{total_frames} 프레임)")
-
-                if i % 30 == 0 or i == total_frames:
-                    logger.info(f"   처리 중: {i}/{total_frames} 프레임 ({i*100//total_frames}%)")
-
-                frame = cv2.imread(str(frame_file))
-                mask_file = mask_dir / frame_file.name
-                mask_img = cv2.imread(str(mask_file), cv2.IMREAD_GRAYSCALE)
-
-                # LAMA 인페인팅 수행
-                result_frame = lama_inpaint.inpaint(frame, mask_img)
-
-                # 결과 저장
-                output_frame_file = inpaint_dir / frame_file.name
-                cv2.imwrite(str(output_frame_file), result_frame)
-
-            logger.info(f"✅ {total_frames}개 프레임 인페인팅 완료")
-
-            # 5. 비디오 재조립
-            logger.info(f"🎬 비디오 재조립 중...")
-            cmd = [
-                ffmpeg, '-framerate', '30',
-                '-i', str(inpaint_dir / 'frame_%06d.png'),
-                '-i', str(input_video),  # 오디오 소스
-                '-c:v', 'libx264',
-                '-preset', 'medium',
-                '-crf', '18',
-                '-pix_fmt', 'yuv420p',
-                '-c:a', 'copy',  # 오디오 복사
-                '-map', '0:v:0',  # 비디오는 첫 번째 입력
-                '-map', '1:a:0?',  # 오디오는 두 번째 입력 (있으면)
-                '-y',
-                str(output_video)
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error(f"❌ 비디오 재조립 실패: {result.stderr}")
-                return False
+            parallel_inpaint_video(
+                input_video, output_video, regions,
+                inpainter='src.utils.lama_backend:lama_inpainter',
+                inpainter_kwargs={'model_dir': str(lama_model_dir), 'device': device, 'threads': threads},
+                workers=workers, batch=batch, margin=LAMA_MARGIN,
+                cancel_check=(lambda: should_stop(output_dir)) if output_dir else None,
+                ffmpeg=get_ffmpeg_path(),
+                # 중간 결과는 한 번 더 인코딩되므로 고화질, 최종 영상이면 최종 설정(FrameWriter 기본값)
+                video_args=None if encode_plan else ['-c:v', 'libx264', '-preset', 'medium', '-crf', '18'],
+                plan=encode_plan,
+            )
+        except OperationCancelled as e:
+            raise CancelledException(str(e))
 
-            logger.info(f"✅ LAMA 워터마크 제거 완료")
-            return True
+        logger.info(f"✅ LAMA 워터마크 제거 완료")
+        return True
 
-        finally:
-            # 임시 파일 정리
-            shutil.rmtree(temp_dir, ignore_errors=True)
+    except OperationCancelled:
+        raise  # 취소는 실패(False)로 바꾸지 않음
 
     except Exception as e:
         logger.error(f"❌ LAMA 워터마크 제거 실패: {e}")
+        import traceback
         traceback.print_exc()
         return False
 
@@ -405,7 +371,7 @@ def _remove_watermark_sttn(input_video: Path, output_video: Path, x: int, y: int
 
         logger.info(f"   실행: {' '.join(cmd)}")
 
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=str(backend_dir))
+        result = _run(cmd, capture_output=True, text=True, cwd=str(backend_dir), output_dir=output_dir)
 
         if result.returncode == 0:
             logger.info("✅ STTN 워터마크 제거 완료")
@@ -474,7 +440,7 @@ def _remove_watermark_e2fgvi(input_video: Path, output_video: Path, x: int, y: i
                 str(frames_dir / '%d.jpg')
             ]
 
-            result = subprocess.run(extract_cmd, capture_output=True, text=True)
+            result = _run(extract_cmd, capture_output=True, text=True, output_dir=output_dir)
             if result.returncode != 0:
                 logger.error(f"❌ 프레임 추출 실패: {result.stderr}")
                 return False
@@ -541,7 +507,7 @@ def _remove_watermark_e2fgvi(input_video: Path, output_video: Path, x: int, y: i
                 str(output_video)
             ]
 
-            result = subprocess.run(assemble_cmd, capture_output=True, text=True)
+            result = _run(assemble_cmd, capture_output=True, text=True, output_dir=output_dir)
             if result.returncode != 0:
                 logger.error(f"❌ 비디오 재조립 실패: {result.stderr}")
                 return False
@@ -635,12 +601,13 @@ def _remove_watermark_propainter(input_video: Path, output_video: Path, x: int,
                 '--height', str(height_vid)
             ]
 
-            result = subprocess.run(
+            result = _run(
                 cmd,
                 capture_output=True,
                 text=True,
                 timeout=600,  # 10분 타임아웃
-                cwd=str(propainter_dir)
+                cwd=str(propainter_dir),
+                output_dir=output_dir
             )
 
             if result.returncode != 0:
@@ -671,16 +638,19 @@ def _remove_watermark_propainter(input_video: Path, output_video: Path, x: int,
         return False
 
 
-def remove_watermark_ai(input_video: Path, output_video: Path, watermark_region: tuple = None, quality_mode: str = 'fast', output_dir: Path = None) -> bool:
+def remove_watermark_ai(input_video: Path, output_video: Path, watermark_region: tuple = None, quality_mode: str = 'fast', output_dir: Path = None,
+                        encode_plan: Optional[EncodePlan] = None) -> bool:
     """
     AI 기반 워터마크 제거
 
     Args:
         input_video: 입력 비디오 경로
         output_video: 출력 비디오 경로
-        watermark_region: (x, y, w, h) 워터마크 영역, None이면 자동 감지 (하단 중국어 자막)
+        watermark_region: (x, y, w, h) 워터마크 영역 또는 그 목록, None이면 자동 감지
+            (샘플 프레임에서 고정 위치 글자 영역을 찾고, 못 찾으면 하단 150px)
         quality_mode:
             - 'fast' (기본값, OpenCV Telea - 빠르고 안정적)
+            - 'fast-temporal' (fast + 영역이 안 변한 프레임은 이전 결과 재사용 - 정적 배경에서 훨씬 빠름)
             - 'lama-vsr' (LAMA-VSR - 최고 품질, 느림)
             - 'black' (검은색 박스 - 초고속)
             - 'lama' (LAMA 인페인팅 - 고품질, 느림)
@@ -688,6 +658,8 @@ def remove_watermark_ai(input_video: Path, output_video: Path, watermark_region:
             - 'e2fgvi' (E2FGVI, 모델 필요)
             - 'high' (ProPainter, 최고 품질, 매우 느림)
         output_dir: 작업 디렉토리 (STOP 파일 체크용)
+        encode_plan: 프레임 파이프라인 모드(FUSED_RENDER_MODES)에서 오디오 교체 / 자막 굽기까지
+            같은 인코딩으로 최종 영상을 만듦. 다른 모드에서는 무시되고, 실패해도 원본을 복사하지 않음
 
     Returns:
         성공 여부
@@ -705,17 +677,23 @@ def remove_watermark_ai(input_video: Path, output_video: Path, watermark_region:
 
         # 워터마크 영역 결정
         if watermark_region is None:
-            # 중국어 자막은 보통 화면 하단에 고정 위치
-            subtitle_height = 150
-            x = 0
-            y = height - subtitle_height
-            w = width
-            h = subtitle_height
             logger.info(f"🤖 중국어 자막 영역 자동 감지")
-            logger.info(f"   영역: x={x}, y={y}, w={w}, h={h} (하단 {subtitle_height}px)")
+            try:
+                regions = detect_subtitle_regions(input_video, ffmpeg=ffmpeg)
+            except Exception as e:
+                logger.warning(f"⚠️ 자막 영역 감지 실패: {e}")
+                regions = []
+            if not regions:
+                # 중국어 자막은 보통 화면 하단에 고정 위치
+                subtitle_height = 150
+                regions = [(0, height - subtitle_height, width, subtitle_height)]
+                logger.info(f"   감지된 영역 없음 → 하단 {subtitle_height}px 사용")
         else:
-            x, y, w, h = watermark_region
-            logger.info(f"🤖 워터마크 제거 중 (지정 영역: x={x}, y={y}, w={w}, h={h})")
+            regions = as_regions(watermark_region)
+            logger.info(f"🤖 워터마크 제거 중 (지정 영역: {regions})")
+
+        # 영역 하나만 받는 외부 도구(VSR / STTN / E2FGVI / ProPainter)에는 전체를 덮는 사각형
+        x, y, w, h = bounding_region(regions)
 
         # 품질 모드에 따른 처리 방법 결정
         if quality_mode == 'fast':
@@ -724,6 +702,9 @@ def remove_watermark_ai(input_video: Path, output_video: Path, watermark_region:
             # fast 모드는 아래에서 처리됨
             pass
 
+        elif quality_mode == 'fast-temporal':
+            logger.info(f"   방법: OpenCV Inpainting (Telea) + 시간축 결과 재사용")
+
         elif quality_mode == 'lama-vsr':
             # video-subtitle-remover의 LAMA 사용 (가장 효과적인 자막 제거)
             logger.info(f"   방법: LAMA-VSR (AI 자막 제거 전용, 고품질)")
@@ -732,21 +713,23 @@ def remove_watermark_ai(input_video: Path, output_video: Path, watermark_region:
         elif quality_mode == 'lama':
             # LAMA (Big-LaMa) AI 인페인팅 (균형잡힌 속도와 품질)
             logger.info(f"   방법: LAMA (AI 인페인팅, 균형잡힌 성능)")
-            return _remove_watermark_lama(input_video, output_video, x, y, w, h, output_dir)
+            return _remove_watermark_lama(input_video, output_video, regions, output_dir, encode_plan=encode_plan)
 
         elif quality_mode == 'black':
             # 검은색으로 가리기 (가장 빠름, 1-2초)
             logger.info(f"   방법: 검은색 박스로 가리기 (초고속)")
 
+            boxes = ','.join(f'drawbox=x={rx}:y={ry}:w={rw}:h={rh}:color=black:t=fill'
+                             for rx, ry, rw, rh in regions)
             cmd = [
                 ffmpeg, '-i', str(input_video),
-                '-vf', f'drawbox=x={x}:y={y}:w={w}:h={h}:color=black:t=fill',
+                '-vf', boxes,
                 '-c:a', 'copy',
                 '-y',
                 str(output_video)
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run(cmd, capture_output=True, text=True, output_dir=output_dir)
             if result.returncode == 0:
                 logger.info(f"✅ 검은색 박스 처리 완료")
                 return True
@@ -765,91 +748,38 @@ def remove_watermark_ai(input_video: Path, output_video: Path, watermark_region:
             return _remove_watermark_propainter(input_video, output_video, x, y, w, h, output_dir)
 
         # fast 모드 처리 (기본값)
-        if quality_mode == 'fast' or quality_mode not in ['lama-vsr', 'lama', 'black', 'sttn', 'e2fgvi', 'high']:
+        if quality_mode == 'fast' or quality_mode not in ['fast-temporal', 'lama-vsr', 'lama', 'black', 'sttn', 'e2fgvi', 'high']:
             if quality_mode != 'fast':
                 logger.warning(f"⚠️ 알 수 없는 quality_mode: {quality_mode}, 기본값(fast) 사용")
                 logger.info(f"   방법: OpenCV Inpainting (Telea 알고리즘) - 폴백")
 
-        # 임시 디렉토리 생성
-        temp_dir = Path(tempfile.mkdtemp())
-        frames_dir = temp_dir / "frames"
-        frames_dir.mkdir(exist_ok=True)
-
+        # rawvideo 파이프로 프레임을 스트리밍하며 워터마크 영역 + 여백만 인페인팅
+        # (PNG 추출 / 재조립 없음, 원본 fps와 오디오 그대로)
+        logger.info(f"🎞️ 프레임 스트리밍 인페인팅 중... (ROI만 처리, 멀티코어, 임시 파일 없음)")
         try:
-            # 1. 비디오에서 프레임 추출
-            logger.info(f"🎞️ 비디오 프레임 추출 및 워터마크 제거 중...")
-            cmd = [
-                ffmpeg,
-                '-i', str(input_video),
-                '-qscale:v', '2',  # 고품질 유지
-                str(frames_dir / 'frame_%05d.png')
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-            if result.returncode != 0:
-                raise Exception(f"프레임 추출 실패: {result.stderr}")
-
-            # 2. 각 프레임에 인페인팅 적용
-            frame_files = sorted(frames_dir.glob('frame_*.png'))
-            total_frames = len(frame_files)
-
-            # 마스크 생성 (워터마크 영역을 흰색으로)
-            mask = np.zeros((height, width), dtype=np.uint8)
-            mask[y:y+h, x:x+w] = 255
-
-            for idx, frame_file in enumerate(frame_files):
-                # STOP 체크 (10프레임마다)
-                if idx % 10 == 0 and output_dir and should_stop(output_dir):
-                    raise CancelledException(f"OpenCV 인페인팅 중 작업 취소됨 ({idx+1}/{total_frames} 프레임)")
-
-                # 프레임 읽기
-                frame = cv2.imread(str(frame_file))
-
-                # 인페인팅 적용 (Telea 알고리즘, radius=3)
-                inpainted = cv2.inpaint(frame, mask, inpaintRadius=3, flags=cv2.INPAINT_TELEA)
-
-                # 결과 저장 (원본 파일 덮어쓰기)
-                cv2.imwrite(str(frame_file), inpainted)
-
-                # 진행률 출력 (30프레임마다)
-                if (idx + 1) % 30 == 0 or (idx + 1) == total_frames:
-                    progress = (idx + 1) / total_frames * 100
-                    logger.info(f"   처리 중: {idx+1}/{total_frames} 프레임 ({progress:.1f}%)")
-
-            logger.info(f"✅ 프레임 처리 완료: {total_frames}개 프레임")
-
-            # 3. 프레임을 비디오로 재조립
-            logger.info(f"🎬 비디오 재조립 중...")
-            cmd = [
-                ffmpeg,
-                '-framerate', '30',  # 원본 프레임레이트
-                '-i', str(frames_dir / 'frame_%05d.png'),
-                '-i', str(input_video),  # 원본 비디오 (오디오용)
-                '-map', '0:v',  # 새 비디오 스트림
-                '-map', '1:a',  # 원본 오디오 스트림
-                '-c:v', 'libx264',
-                '-preset', 'medium',
-                '-crf', '23',
-                '-c:a', 'copy',
-                '-pix_fmt', 'yuv420p',
-                '-y',
-                str(output_video)
-            ]
+            parallel_inpaint_video(
+                input_video, output_video, regions,
+                inpainter=TELEA_INPAINTER,
+                temporal_threshold=TEMPORAL_THRESHOLD if quality_mode == 'fast-temporal' else None,
+                cancel_check=(lambda: should_stop(output_dir)) if output_dir else None,
+                ffmpeg=ffmpeg,
+                plan=encode_plan,
+            )
+        except OperationCancelled as e:
+            raise CancelledException(str(e))
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            if result.returncode != 0:
-                raise Exception(f"비디오 재조립 실패: {result.stderr}")
+        logger.info(f"✅ OpenCV Inpainting 워터마크 제거 완료")
+        return True
 
-            logger.info(f"✅ OpenCV Inpainting 워터마크 제거 완료")
-            return True
-
-        finally:
-            # 임시 파일 정리
-            shutil.rmtree(temp_dir, ignore_errors=True)
+    except OperationCancelled:
+        raise  # 취소는 오류가 아님 - 원본을 복사해 성공으로 처리하지 않고 호출하는 쪽에서 중단
 
     except Exception as e:
         logger.error(f"❌ 워터마크 제거 오류: {e}")
         import traceback
         traceback.print_exc()
+        if encode_plan is not None:
+            return False  # 최종 영상 자리에 원본을 복사하면 더빙 / 자막 없는 영상이 결과가 됨
         # 오류 시 원본 복사
         try:
             shutil.copy(input_video, output_video)
@@ -889,30 +819,15 @@ def extract_audio(video_path: Path, output_audio: Path) -> bool:
         return False
 
 
-def transcribe_audio_whisper(audio_path: Path, language: str = 'zh') -> Optional[List[Dict]]:
-    """Whisper를 사용하여 오디오 전사 (타임스탬프 포함)"""
+def transcribe_audio_whisper(audio_path: Path, language: str = 'zh',
+                             model_name: Optional[str] = None) -> Optional[List[Dict]]:
+    """Whisper를 사용하여 오디오 전사 (타임스탬프 포함, VAD 청크 결과를 모두 모아서 반환)"""
     try:
-        import whisper
         logger.info(f"🎤 Whisper로 음성 인식 중 (언어: {language})...")
 
-        # 모델 로드 (medium 추천, 정확도와 속도 균형)
-        model = whisper.load_model("medium")
-
-        # 전사
-        result = model.transcribe(
-            str(audio_path),
-            language=language,
-            task='transcribe',
-            verbose=False
-        )
-
-        segments = []
-        for segment in result['segments']:
-            segments.append({
-                'start': segment['start'],
-                'end': segment['end'],
-                'text': segment['text'].strip()
-            })
+        # 모델은 오디오 길이에 맞춰 선택 - 워커 데몬에서는 작업 간 재사용
+        segments = [segment for batch in stream_transcribe(audio_path, language=language, model_name=model_name)
+                    for segment in batch]
 
         logger.info(f"✅ 음성 인식 완료: {len(segments)}개 세그먼트")
         return segments
@@ -967,42 +882,16 @@ def transcribe_audio_openai(audio_path: Path) -> Optional[List[Dict]]:
         return None
 
 
-def translate_segments_claude(segments: List[Dict], source_lang: str = 'zh', target_lang: str = 'ko') -> List[Dict]:
-    """Claude API로 세그먼트 일괄 번역 (빠르고 저렴)"""
-    if not ANTHROPIC_AVAILABLE:
-        logger.error("❌ Anthropic 모듈이 없습니다.")
-        return segments
-
-    try:
-        client = Anthropic()
-        logger.info(f"🌐 Claude로 번역 중: {source_lang} → {target_lang} ({len(segments)}개 세그먼트)")
+TRANSLATE_MAX_TOKENS = 4096  # 청크 응답 상한 (translation_engine.CHUNK_TOKEN_BUDGET 기준)
 
-        # 전체 텍스트를 JSON 형태로 한 번에 보내기
-        texts_to_translate = []
-        for i, segment in enumerate(segments):
-            texts_to_translate.append({
-                'id': i,
-                'text': segment['text']
-            })
 
-        # JSON 문자열로 변환
-        import json
-        batch_input = json.dumps(texts_to_translate, ensure_ascii=False, indent=2)
-
-        # Claude API 호출 (한 번에 전체 번역)
-        message = client.messages.create(
-            model="claude-3-5-haiku-20241022",  # 가장 저렴하고 빠른 모델
-            max_tokens=8000,
-            temperature=0.3,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"""다음 JSON 배열의 모든 텍스트를 {source_lang}에서 {target_lang}로 번역해주세요.
+def _translation_prompt(items: List[Dict], source_lang: str, target_lang: str) -> str:
+    return f"""다음 JSON 배열의 모든 텍스트를 {source_lang}에서 {target_lang}로 번역해주세요.
 같은 형식의 JSON으로 응답하되, text 필드만 번역된 내용으로 바꿔주세요.
 자연스럽고 정확하게 번역하세요.
 
 입력:
-{batch_input}
+{json.dumps(items, ensure_ascii=False, indent=2)}
 
 출력 형식 예시:
 [
@@ -1012,47 +901,54 @@ def translate_segments_claude(segments: List[Dict], source_lang: str = 'zh', tar
 ]
 
 JSON만 출력하고 다른 설명은 붙이지 마세요."""
-                }
-            ]
-        )
 
-        # 응답 파싱
-        response_text = message.content[0].text.strip()
 
-        # JSON 부분만 추출 (```json ... ``` 등 제거)
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0].strip()
+def _translate_segments(segments: List[Dict], request_fn, source_lang: str, target_lang: str) -> List[Dict]:
+    """translation_engine으로 번역 후 세그먼트 형식으로 (번역 못 한 세그먼트는 원문 유지)"""
+    memory = TranslationMemory()
+    try:
+        translations = translate_texts([segment['text'] for segment in segments], request_fn,
+                                       source_lang, target_lang, memory=memory)
+    finally:
+        memory.close()
 
-        translated_data = json.loads(response_text)
+    translated_segments = [{
+        'start': segment['start'],
+        'end': segment['end'],
+        'original': segment['text'],
+        'translated': translated if translated is not None else segment['text'],
+    } for segment, translated in zip(segments, translations)]
 
-        # 번역된 텍스트를 세그먼트에 매핑
-        translated_segments = []
-        for segment in segments:
-            segment_id = segments.index(segment)
-            translated_item = next((item for item in translated_data if item['id'] == segment_id), None)
+    logger.info(f"✅ 번역 완료: {len(translated_segments)}개 세그먼트")
 
-            if translated_item:
-                translated_text = translated_item['text']
-            else:
-                translated_text = segment['text']  # 실패 시 원문 유지
+    # 샘플 출력
+    for i in range(min(3, len(translated_segments))):
+        logger.info(f"  [{i+1}] {translated_segments[i]['original'][:40]}...")
+        logger.info(f"      → {translated_segments[i]['translated'][:40]}...")
 
-            translated_segments.append({
-                'start': segment['start'],
-                'end': segment['end'],
-                'original': segment['text'],
-                'translated': translated_text
-            })
+    return translated_segments
+
+
+def translate_segments_claude(segments: List[Dict], source_lang: str = 'zh', target_lang: str = 'ko') -> List[Dict]:
+    """Claude API로 세그먼트 번역 (청크 단위 동시 요청, 빠르고 저렴)"""
+    if not ANTHROPIC_AVAILABLE:
+        logger.error("❌ Anthropic 모듈이 없습니다.")
+        return segments
 
-        logger.info(f"✅ 번역 완료: {len(translated_segments)}개 세그먼트")
+    try:
+        client = Anthropic()
+        logger.info(f"🌐 Claude로 번역 중: {source_lang} → {target_lang} ({len(segments)}개 세그먼트)")
 
-        # 샘플 출력
-        for i in range(min(3, len(translated_segments))):
-            logger.info(f"  [{i+1}] {translated_segments[i]['original'][:40]}...")
-            logger.info(f"      → {translated_segments[i]['translated'][:40]}...")
+        def request(items: List[Dict]) -> str:
+            message = client.messages.create(
+                model="claude-3-5-haiku-20241022",  # 가장 저렴하고 빠른 모델
+                max_tokens=TRANSLATE_MAX_TOKENS,
+                temperature=0.3,
+                messages=[{"role": "user", "content": _translation_prompt(items, source_lang, target_lang)}]
+            )
+            return message.content[0].text
 
-        return translated_segments
+        return _translate_segments(segments, request, source_lang, target_lang)
 
     except Exception as e:
         logger.error(f"❌ Claude 번역 실패: {e}")
@@ -1062,7 +958,7 @@ JSON만 출력하고 다른 설명은 붙이지 마세요."""
 
 
 def translate_segments_openai(segments: List[Dict], source_lang: str = 'zh', target_lang: str = 'ko') -> List[Dict]:
-    """OpenAI API로 세그먼트 일괄 번역 (대체 옵션)"""
+    """OpenAI API로 세그먼트 번역 (대체 옵션, Claude와 같은 청크 엔진)"""
     if not OPENAI_AVAILABLE:
         logger.error("❌ OpenAI 모듈이 없습니다.")
         return segments
@@ -1071,64 +967,29 @@ def translate_segments_openai(segments: List[Dict], source_lang: str = 'zh', tar
         client = OpenAI()
         logger.info(f"🌐 OpenAI로 번역 중: {source_lang} → {target_lang} ({len(segments)}개 세그먼트)")
 
-        # 전체 텍스트를 한 번에 보내기
-        import json
-        texts_to_translate = []
-        for i, segment in enumerate(segments):
-            texts_to_translate.append({
-                'id': i,
-                'text': segment['text']
-            })
-
-        batch_input = json.dumps(texts_to_translate, ensure_ascii=False, indent=2)
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"당신은 {source_lang}에서 {target_lang}로 번역하는 전문 번역가입니다."
-                },
-                {
-                    "role": "user",
-                    "content": f"""다음 JSON 배열의 모든 텍스트를 번역하고 같은 형식으로 응답하세요:
-{batch_input}"""
-                }
-            ],
-            temperature=0.3
-        )
-
-        response_text = response.choices[0].message.content.strip()
-
-        # JSON 추출
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0].strip()
-
-        translated_data = json.loads(response_text)
-
-        translated_segments = []
-        for segment in segments:
-            segment_id = segments.index(segment)
-            translated_item = next((item for item in translated_data if item['id'] == segment_id), None)
-
-            translated_segments.append({
-                'start': segment['start'],
-                'end': segment['end'],
-                'original': segment['text'],
-                'translated': translated_item['text'] if translated_item else segment['text']
-            })
+        def request(items: List[Dict]) -> str:
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": f"당신은 {source_lang}에서 {target_lang}로 번역하는 전문 번역가입니다."
+                    },
+                    {"role": "user", "content": _translation_prompt(items, source_lang, target_lang)}
+                ],
+                max_tokens=TRANSLATE_MAX_TOKENS,
+                temperature=0.3
+            )
+            return response.choices[0].message.content
 
-        logger.info(f"✅ 번역 완료: {len(translated_segments)}개")
-        return translated_segments
+        return _translate_segments(segments, request, source_lang, target_lang)
 
     except Exception as e:
         logger.error(f"❌ OpenAI 번역 실패: {e}")
         return segments
 
 
-async def generate_tts_edge(text: str, output_path: Path, voice: str = 'ko-KR-SunHiNeural') -> bool:
+async def generate_tts_edge(text: str, output_path: Path, voice: str = EDGE_TTS_VOICE) -> bool:
     """Edge TTS로 음성 생성
 
     추천 한국어 음성:
@@ -1148,7 +1009,7 @@ async def generate_tts_edge(text: str, output_path: Path, voice: str = 'ko-KR-Su
         return False
 
 
-def generate_tts_openai(text: str, output_path: Path, voice: str = 'shimmer') -> bool:
+def generate_tts_openai(text: str, output_path: Path, voice: str = OPENAI_TTS_VOICE) -> bool:
     """OpenAI TTS로 음성 생성
 
     음성 옵션:
@@ -1178,120 +1039,102 @@ def generate_tts_openai(text: str, output_path: Path, voice: str = 'shimmer') ->
         return False
 
 
-async def generate_audio_for_segments(segments: List[Dict], output_dir: Path, use_openai: bool = False) -> List[Dict]:
-    """각 세그먼트에 대한 오디오 파일 생성 (실제 오디오 길이 반환)"""
-    logger.info(f"🎤 TTS 생성 중: {len(segments)}개 세그먼트")
+async def _segment_tts_bytes(text: str, client=None) -> Optional[bytes]:
+    """세그먼트 하나 음성 합성 → 오디오 바이트 (client가 있으면 OpenAI, 없으면 Edge TTS)"""
+    try:
+        if client is None:
+            audio = bytearray()
+            async for chunk in edge_tts.Communicate(text, EDGE_TTS_VOICE).stream():
+                if chunk['type'] == 'audio':
+                    audio.extend(chunk['data'])
+            return bytes(audio)
+        # 동기 SDK는 스레드에서 (클라이언트 / HTTP 연결 풀은 모든 세그먼트가 공유)
+        response = await asyncio.to_thread(
+            client.audio.speech.create, model="tts-1-hd", voice=OPENAI_TTS_VOICE, input=text, speed=1.0)
+        return response.content
+    except Exception as e:
+        logger.error(f"❌ TTS 생성 실패: {e}")
+        return None
 
-    audio_segments = []
 
-    for i, segment in enumerate(segments, 1):
-        audio_path = output_dir / f"segment_{i:03d}.mp3"
-        text = segment.get('translated', segment.get('text', ''))
+async def generate_audio_for_segments(segments: List[Dict], output_dir: Path, use_openai: bool = False,
+                                      concurrency: int = SEGMENT_TTS_CONCURRENCY,
+                                      start_index: int = 1) -> List[Dict]:
+    """
+    각 세그먼트에 대한 오디오 파일 생성 (실제 오디오 길이 반환)
 
-        if not text:
-            logger.warning(f"⚠️ 세그먼트 {i}: 텍스트 없음")
-            continue
+    최대 concurrency개를 동시에 합성하고, 길이는 받은 오디오 바이트의 헤더에서 바로 계산
+    (세그먼트마다 ffmpeg 실행 없음). 결과 순서는 세그먼트 순서 그대로.
+    start_index: 파일 번호 시작값 (청크별로 나눠 호출해도 segment_NNN.mp3가 겹치지 않게)
+    """
+    logger.info(f"🎤 TTS 생성 중: {len(segments)}개 세그먼트 (동시 {concurrency}개)")
 
-        logger.info(f"  [{i}/{len(segments)}] TTS 생성: {text[:50]}...")
+    client = None
+    if not EDGE_TTS_AVAILABLE:
+        if not (use_openai and OPENAI_AVAILABLE):
+            logger.error("❌ 사용할 수 있는 TTS가 없습니다 (edge-tts / OpenAI)")
+            return []
+        logger.warning(f"⚠️ Edge TTS 사용 불가, OpenAI TTS 사용 (유료)")
+        client = OpenAI()
 
-        success = False
-        if EDGE_TTS_AVAILABLE:
-            success = await generate_tts_edge(text, audio_path)
-        elif use_openai and OPENAI_AVAILABLE:
-            logger.warning(f"⚠️ Edge TTS 사용 불가, OpenAI TTS 사용 (유료)")
-            success = generate_tts_openai(text, audio_path)
+    semaphore = asyncio.Semaphore(concurrency)
 
-        if success and audio_path.exists():
-            # 실제 오디오 길이 측정
-            try:
-                import subprocess
-                ffmpeg = get_ffmpeg_path()
-                result = subprocess.run(
-                    [ffmpeg, '-i', str(audio_path)],
-                    capture_output=True,
-                    text=True
-                )
-                # FFmpeg stderr에서 Duration 추출
-                duration_match = None
-                for line in result.stderr.split('\n'):
-                    if 'Duration:' in line:
-                        import re
-                        duration_match = re.search(r'Duration: (\d{2}):(\d{2}):(\d{2}\.\d{2})', line)
-                        if duration_match:
-                            h, m, s = duration_match.groups()
-                            actual_duration = int(h) * 3600 + int(m) * 60 + float(s)
-                            break
-
-                if duration_match:
-                    audio_segments.append({
-                        'path': audio_path,
-                        'text': text,
-                        'original_start': segment['start'],
-                        'original_end': segment['end'],
-                        'actual_duration': actual_duration
-                    })
-                else:
-                    # Duration을 못 찾으면 원본 길이 사용
-                    audio_segments.append({
-                        'path': audio_path,
-                        'text': text,
-                        'original_start': segment['start'],
-                        'original_end': segment['end'],
-                        'actual_duration': segment['end'] - segment['start']
-                    })
-            except Exception as e:
-                logger.warning(f"⚠️ 오디오 길이 측정 실패 (원본 길이 사용): {e}")
-                audio_segments.append({
-                    'path': audio_path,
-                    'text': text,
-                    'original_start': segment['start'],
-                    'original_end': segment['end'],
-                    'actual_duration': segment['end'] - segment['start']
-                })
-        else:
+    async def synthesize(i: int, segment: Dict) -> Optional[Dict]:
+        text = segment.get('translated', segment.get('text', ''))
+        if not text:
+            logger.warning(f"⚠️ 세그먼트 {i}: 텍스트 없음")
+            return None
+
+        async with semaphore:
+            logger.info(f"  [{i}/{start_index + len(segments) - 1}] TTS 생성: {text[:50]}...")
+            data = await _segment_tts_bytes(text, client)
+        if not data:
             logger.error(f"❌ 세그먼트 {i} TTS 생성 실패")
+            return None
+
+        audio_path = output_dir / f"segment_{i:03d}.mp3"
+        audio_path.write_bytes(data)
+        info = probe_audio_bytes(data)
+        if info is None:
+            # 헤더를 못 읽으면 원본 길이 사용
+            logger.warning(f"⚠️ 세그먼트 {i}: 오디오 길이 측정 실패 (원본 길이 사용)")
+        return {
+            'path': audio_path,
+            'text': text,
+            'original_start': segment['start'],
+            'original_end': segment['end'],
+            'actual_duration': info.duration if info else segment['end'] - segment['start']
+        }
+
+    results = await asyncio.gather(*(synthesize(i, segment) for i, segment in enumerate(segments, start_index)))
+    audio_segments = [result for result in results if result is not None]
 
     logger.info(f"✅ TTS 생성 완료: {len(audio_segments)}개 파일")
     return audio_segments
 
 
-def merge_audio_segments(audio_segments: List[Dict], output_audio: Path) -> bool:
-    """세그먼트 오디오를 순서대로 연결"""
+def merge_audio_segments(audio_segments: List[Dict], output_audio: Path,
+                         total_duration: Optional[float] = None) -> bool:
+    """
+    세그먼트 오디오를 원본 시작 시각에 배치해 더빙 트랙 하나로 합성
+
+    구간보다 긴 세그먼트는 atempo로 압축 (dubbing_timeline 참고).
+    세그먼트마다 timeline_start / timeline_end를 기록 → create_srt_subtitle이 같은 타이밍 사용.
+    """
     try:
         ffmpeg = get_ffmpeg_path()
-        logger.info(f"🔊 오디오 세그먼트 병합 중...")
+        logger.info(f"🔊 오디오 세그먼트 타임라인 합성 중...")
 
         if len(audio_segments) == 0:
             logger.error("❌ 병합할 오디오 파일이 없습니다.")
             return False
 
-        # 파일 리스트 생성
-        list_file = output_audio.parent / "audio_list.txt"
-        with open(list_file, 'w', encoding='utf-8') as f:
-            for seg in audio_segments:
-                f.write(f"file '{seg['path'].absolute()}'\n")
-
-        cmd = [
-            ffmpeg,
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', str(list_file),
-            '-c', 'copy',
-            '-y',
-            str(output_audio)
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            logger.error(f"❌ 오디오 병합 실패: {result.stderr}")
-            return False
+        placements = render_dub_track(audio_segments, output_audio, total_duration=total_duration, ffmpeg=ffmpeg)
+        for seg, placement in zip(audio_segments, placements):
+            seg['timeline_start'] = placement.start
+            seg['timeline_end'] = placement.end
 
         logger.info(f"✅ 오디오 병합 완료: {output_audio.name}")
-
-        # 정리
-        list_file.unlink()
-
         return True
 
     except Exception as e:
@@ -1412,9 +1255,9 @@ def create_srt_subtitle(audio_segments: List[Dict], output_srt: Path) -> bool:
                     else:
                         text = "\n".join(lines)
 
-                # 실제 TTS 길이 기반으로 타임스탬프 생성
-                start_time = current_time
-                end_time = current_time + actual_duration
+                # 타임라인 합성 결과가 있으면 그 배치, 없으면 실제 TTS 길이를 이어 붙인 타이밍
+                start_time = segment.get('timeline_start', current_time)
+                end_time = segment.get('timeline_end', start_time + actual_duration)
 
                 # SRT 시간 형식 변환 (HH:MM:SS,mmm)
                 start_srt = format_srt_time(start_time)
@@ -1465,30 +1308,8 @@ def replace_video_audio_with_subtitle(
         logger.info(f"🎞️ 영상 합성 중...")
 
         if burn_subtitle:
-            # 자막을 비디오에 하드코딩 (burned-in)
-            # Windows 경로 이스케이프 처리
-            subtitle_path_escaped = str(subtitle_path).replace('\\', '/').replace(':', '\\:')
-
-            # 자막 스타일 (적당한 크기, 하단에서 20px 위)
-            subtitle_style = (
-                "FontName=NanumGothic,"       # 나눔고딕
-                "Fontsize=21,"                # 폰트 크기 (23 * 0.9 = 20.7 ≈ 21)
-                "Bold=1,"                     # 볼드
-                "PrimaryColour=&H00FFFFFF,"   # 흰색
-                "OutlineColour=&H00000000,"   # 검은 테두리
-                "BorderStyle=1,"              # 외곽선 스타일
-                "Outline=2,"                  # 테두리
-                "Shadow=1,"                   # 그림자
-                "MarginV=20,"                 # 하단에서 20px 위
-                "Alignment=2"                 # 하단 중앙
-            )
-
-            # 중국어 자막 위에 완전 불투명 검은 레이어 (화면 하단 150px)
-            # 하단 150px를 완전히 검은색으로 덮음
-            video_filter = (
-                f"drawbox=x=0:y=ih-150:w=iw:h=150:color=black:t=fill,"  # 하단 150px 완전 불투명 검은 박스
-                f"subtitles='{subtitle_path_escaped}':force_style='{subtitle_style}'"  # 한국어 자막
-            )
+            # 자막을 비디오에 하드코딩 (burned-in) - 하단 검은 박스 + 한국어 자막
+            video_filter = subtitle_burn_filter(subtitle_path)
 
             # 오디오 길이 측정
             result = subprocess.run(
@@ -1561,15 +1382,207 @@ def replace_video_audio_with_subtitle(
         return False
 
 
+def subtitle_burn_filter(subtitle_path: Path) -> str:
+    """한국어 자막 굽기 필터 (중국어 자막 위 하단 150px 검은 박스 + 스타일 지정 SRT)"""
+    # Windows 경로 이스케이프 처리
+    subtitle_path_escaped = str(subtitle_path).replace('\\', '/').replace(':', '\\:')
+
+    # 자막 스타일 (적당한 크기, 하단에서 20px 위)
+    subtitle_style = (
+        "FontName=NanumGothic,"       # 나눔고딕
+        "Fontsize=21,"                # 폰트 크기 (23 * 0.9 = 20.7 ≈ 21)
+        "Bold=1,"                     # 볼드
+        "PrimaryColour=&H00FFFFFF,"   # 흰색
+        "OutlineColour=&H00000000,"   # 검은 테두리
+        "BorderStyle=1,"              # 외곽선 스타일
+        "Outline=2,"                  # 테두리
+        "Shadow=1,"                   # 그림자
+        "MarginV=20,"                 # 하단에서 20px 위
+        "Alignment=2"                 # 하단 중앙
+    )
+
+    # 중국어 자막 위에 완전 불투명 검은 레이어 (화면 하단 150px)
+    return (
+        f"drawbox=x=0:y=ih-150:w=iw:h=150:color=black:t=fill,"  # 하단 150px 완전 불투명 검은 박스
+        f"subtitles='{subtitle_path_escaped}':force_style='{subtitle_style}'"  # 한국어 자막
+    )
+
+
+def final_encode_plan(video_path: Path, audio_path: Path, subtitle_path: Path,
+                      ffmpeg: str = 'ffmpeg') -> EncodePlan:
+    """
+    워터마크 제거 인코딩에 붙일 최종 설정 (replace_video_audio_with_subtitle과 같은 결과)
+
+    영상 길이는 오디오에 맞춤 (-shortest). 오디오가 더 길면 마지막 프레임을 늘려서 채우고
+    (rawvideo 파이프 입력은 -stream_loop로 반복할 수 없음), 더 짧으면 오디오 길이까지만 프레임을 보냄.
+    """
+    video_filter = subtitle_burn_filter(subtitle_path)
+    audio_duration = get_exact_audio_duration(audio_path)
+    video_duration = probe_video(video_path, ffmpeg).duration or 0.0
+    if audio_duration > video_duration > 0:
+        video_filter = f"tpad=stop_mode=clone:stop_duration={audio_duration - video_duration:.3f},{video_filter}"
+    logger.info(f"🎵 오디오 길이: {audio_duration:.2f}초 (영상 {video_duration:.2f}초)")
+    return EncodePlan(audio=audio_path, video_filter=video_filter, output_args=['-shortest'],
+                      duration=audio_duration)
+
+
+def render_converted_video(input_video: Path, audio_path: Path, subtitle_path: Path, output_video: Path,
+                           watermark_mode: str = 'fast', output_dir: Optional[Path] = None,
+                           cancel_check=None) -> bool:
+    """
+    최종 영상 생성: 워터마크 제거 + 오디오 교체 + 자막 굽기
+
+    프레임 파이프라인 모드(FUSED_RENDER_MODES)는 인페인팅 결과를 바로 최종 인코더로 보내 인코딩 1회.
+    그 외 모드나 한 번에 만들기가 실패하면 워터마크 제거 영상을 따로 만든 뒤 replace_video_audio_with_subtitle.
+    """
+    plan = None
+    if watermark_mode in FUSED_RENDER_MODES:
+        try:
+            plan = final_encode_plan(input_video, audio_path, subtitle_path, get_ffmpeg_path())
+        except Exception as e:  # ffprobe 없음 (imageio-ffmpeg) / 오디오 길이 확인 실패 등
+            logger.warning(f"⚠️ 한 번에 합성 준비 실패 ({e}) → 워터마크 제거 후 따로 합성")
+    if plan is not None:
+        logger.info(f"🎞️ 워터마크 제거 + 오디오 교체 + 자막 굽기 (인코딩 1회, {watermark_mode})")
+        with resource_lease('inpaint', cancel_check=cancel_check, cpu=inpaint_workers()):
+            if remove_watermark_ai(input_video, output_video, quality_mode=watermark_mode,
+                                   output_dir=output_dir, encode_plan=plan):
+                logger.info(f"✅ 영상 합성 완료: {output_video.name}")
+                return True
+        if cancel_check and cancel_check():
+            raise CancelledException("영상 합성 중 작업 취소됨")  # 취소로 실패한 것이면 다시 인코딩하지 않음
+        logger.warning("⚠️ 한 번에 합성 실패 → 워터마크 제거 후 따로 합성")
+
+    watermark_removed_video = output_video.with_name(f"{output_video.stem}.no_watermark.mp4")
+    with resource_lease('inpaint', cancel_check=cancel_check, cpu=inpaint_workers()):
+        removed = remove_watermark_ai(input_video, watermark_removed_video,
+                                      quality_mode=watermark_mode, output_dir=output_dir)
+    if not removed:
+        logger.error("❌ 워터마크 제거 실패 (원본 사용)")
+        watermark_removed_video = input_video
+    try:
+        with resource_lease('render', cancel_check=cancel_check):
+            return replace_video_audio_with_subtitle(
+                watermark_removed_video,  # 워터마크 제거된 비디오 사용
+                audio_path,
+                subtitle_path,
+                output_video,
+                burn_subtitle=True  # 자막을 비디오에 하드코딩
+            )
+    finally:
+        if watermark_removed_video != input_video:
+            watermark_removed_video.unlink(missing_ok=True)
+
+
+async def transcribe_translate_dub(
+    audio_path: Path,
+    tts_dir: Path,
+    use_openai_whisper: bool = False,
+    use_claude: bool = True,
+    use_openai_tts: bool = False,
+    metrics: Optional[StageMetrics] = None,
+    cancel_check=None
+) -> Optional[Tuple[List[Dict], List[Dict], List[Dict]]]:
+    """
+    음성 인식 → 번역 → 세그먼트 TTS 파이프라인
+
+    로컬 whisper는 VAD 청크 단위로 인식 결과를 내보내고(스레드), 청크마다 번역과 TTS를 바로 시작한다.
+    뒤쪽 오디오를 인식하는 동안 앞쪽 청크의 번역 / TTS가 진행되므로 전체 대기 시간이 겹친다.
+    (OpenAI Whisper API는 전체 결과가 한 번에 오므로 청크 하나)
+
+    Returns:
+        (중국어 세그먼트, 번역 세그먼트, TTS 세그먼트) - 모두 원래 순서. 번역 API가 없거나 인식 실패 시 None
+    """
+    if use_claude and ANTHROPIC_AVAILABLE:
+        translate = translate_segments_claude
+    elif OPENAI_AVAILABLE:
+        translate = translate_segments_openai
+    else:
+        logger.error("❌ 번역 API가 없습니다 (Claude 또는 OpenAI 필요)")
+        return None
+
+    metrics = metrics or StageMetrics(logger=logger)
+    loop = asyncio.get_running_loop()
+    batches: asyncio.Queue = asyncio.Queue()
+
+    def emit(batch):
+        loop.call_soon_threadsafe(batches.put_nowait, batch)
+
+    def recognize():
+        try:
+            with metrics.stage('asr', api=use_openai_whisper):
+                if use_openai_whisper:
+                    emit(transcribe_audio_openai(audio_path) or [])
+                else:
+                    with resource_lease('whisper', cancel_check=cancel_check):
+                        for batch in stream_transcribe(audio_path, language='zh', cancel_check=cancel_check):
+                            emit(batch)
+        finally:
+            emit(None)  # 인식 끝 (실패 포함)
+
+    def translate_batch(batch: List[Dict]) -> List[Dict]:
+        with metrics.stage('translate', segments=len(batch)):
+            result = translate(batch, source_lang='zh', target_lang='ko')
+        # 번역 함수는 실패하면 입력을 그대로 돌려줌 → 원문 유지 형식으로 맞춤
+        return [item if 'translated' in item else
+                {'start': item['start'], 'end': item['end'], 'original': item['text'], 'translated': item['text']}
+                for item in result]
+
+    # TTS 동시 합성 수는 generate_audio_for_segments 한 번 분량으로 유지 (청크끼리는 차례로)
+    tts_lock = asyncio.Lock()
+
+    async def dub(batch: List[Dict], start_index: int):
+        translated = await asyncio.to_thread(translate_batch, batch)
+        async with tts_lock:
+            with metrics.stage('tts', segments=len(translated)):
+                audio = await generate_audio_for_segments(translated, tts_dir, use_openai=use_openai_tts,
+                                                          start_index=start_index)
+        return translated, audio
+
+    asr = asyncio.create_task(asyncio.to_thread(recognize))
+    segments: List[Dict] = []
+    tasks = []
+    while (batch := await batches.get()) is not None:
+        if batch:
+            tasks.append(asyncio.create_task(dub(batch, len(segments) + 1)))
+            segments.extend(batch)
+
+    try:
+        await asr
+    except Exception as e:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if isinstance(e, OperationCancelled):
+            raise
+        logger.error(f"❌ 음성 인식 실패: {e}")
+        return None
+
+    results = await asyncio.gather(*tasks)
+    translated_segments = [item for translated, _ in results for item in translated]
+    audio_segments = [item for _, audio in results for item in audio]
+    logger.info(f"✅ 인식 / 번역 / TTS 완료: 세그먼트 {len(segments)}개, 청크 {len(tasks)}개, "
+                f"음성 {len(audio_segments)}개")
+    return segments, translated_segments, audio_segments
+
+
 async def convert_chinese_video(
     input_video: Path,
     output_dir: Path,
     title: str = None,
     use_openai_whisper: bool = False,
     use_openai_tts: bool = False,  # Edge TTS 사용 (무료)
-    use_claude: bool = True
+    use_claude: bool = True,
+    profile: Optional[str] = None,
+    watermark_mode: str = 'fast'
 ) -> Optional[Path]:
-    """중국어 영상을 한국어로 변환하는 메인 함수"""
+    """
+    중국어 영상을 한국어로 변환하는 메인 함수
+
+    단계별 소요 시간은 출력 폴더의 metrics.json에 저장.
+    profile("stages" / "sample" / "cprofile", 없으면 PIPELINE_PROFILE 환경변수)을 주면
+    출력 영상 옆에 speedscope 프로파일과 단계별 요약도 저장.
+    watermark_mode는 remove_watermark_ai의 quality_mode (정적 배경이면 'fast-temporal').
+    """
 
     logger.info("=" * 60)
     logger.info("🇨🇳 → 🇰🇷 중국어 영상 변환 시작")
@@ -1583,36 +1596,26 @@ async def convert_chinese_video(
     temp_dir = output_dir / "temp"
     temp_dir.mkdir(exist_ok=True)
 
+    metrics = StageMetrics(logger=logger)
+    mode = profile_mode(profile)
+    profiler = JobProfiler(metrics, mode).start() if mode else None
+    output_video = None
+
     try:
-        # 1. 중국어 자막 워터마크 제거
+        # 1. 오디오 추출 (워터마크 제거는 오디오를 바꾸지 않으므로 원본에서 바로 - 영상 인코딩은 마지막 한 번)
         logger.info("\n" + "=" * 60)
-        logger.info("1️⃣ 단계 1: 중국어 자막 워터마크 제거")
+        logger.info("1️⃣ 단계 1: 오디오 추출")
         logger.info("=" * 60)
 
         # 취소 체크
         if should_stop(output_dir):
-            raise CancelledException("워터마크 제거 전 작업 취소됨")
-
-        # 워터마크 제거된 비디오 경로
-        watermark_removed_video = temp_dir / "no_watermark.mp4"
-        if not remove_watermark_ai(input_video, watermark_removed_video, output_dir=output_dir):
-            logger.error("❌ 워터마크 제거 실패 (원본 사용)")
-            watermark_removed_video = input_video
-
-        # 이후 단계에서는 워터마크 제거된 비디오 사용
-        working_video = watermark_removed_video
-
-        # 취소 체크
-        if should_stop(output_dir):
-            raise CancelledException("워터마크 제거 후 작업 취소됨")
-
-        # 2. 오디오 추출
-        logger.info("\n" + "=" * 60)
-        logger.info("2️⃣ 단계 2: 오디오 추출")
-        logger.info("=" * 60)
+            raise CancelledException("오디오 추출 전 작업 취소됨")
+        stop_check = lambda: should_stop(output_dir)
 
         audio_path = temp_dir / "original_audio.wav"
-        if not extract_audio(working_video, audio_path):
+        with metrics.stage('extract_audio'):
+            extracted = extract_audio(input_video, audio_path)
+        if not extracted:
             logger.error("❌ 오디오 추출 실패")
             return None
 
@@ -1620,44 +1623,30 @@ async def convert_chinese_video(
         if should_stop(output_dir):
             raise CancelledException("오디오 추출 후 작업 취소됨")
 
-        # 3. 음성 인식 (중국어)
+        # 2~4. 음성 인식 → 번역 → 한국어 음성 (청크가 인식되는 대로 번역 / TTS 시작)
         logger.info("\n" + "=" * 60)
-        logger.info("3️⃣ 단계 3: 중국어 음성 인식")
+        logger.info("2️⃣ 단계 2~4: 음성 인식 → 번역 → 한국어 음성 (청크 파이프라인)")
         logger.info("=" * 60)
 
-        if use_openai_whisper:
-            segments = transcribe_audio_openai(audio_path)
-        else:
-            segments = transcribe_audio_whisper(audio_path, language='zh')
+        tts_dir = temp_dir / "tts_segments"
+        tts_dir.mkdir(exist_ok=True)
+        dubbed = await transcribe_translate_dub(
+            audio_path, tts_dir, use_openai_whisper=use_openai_whisper, use_claude=use_claude,
+            use_openai_tts=use_openai_tts, metrics=metrics, cancel_check=stop_check)
+        if dubbed is None:
+            return None
+        segments, translated_segments, audio_segments = dubbed
 
         if not segments:
             logger.error("❌ 음성 인식 실패")
             return None
 
-        # 자막 저장
+        # 자막 / 번역 저장
         transcript_file = output_dir / "chinese_transcript.json"
         with open(transcript_file, 'w', encoding='utf-8') as f:
             json.dump(segments, f, ensure_ascii=False, indent=2)
         logger.info(f"💾 중국어 자막 저장: {transcript_file.name}")
 
-        # 취소 체크
-        if should_stop(output_dir):
-            raise CancelledException("음성 인식 후 작업 취소됨")
-
-        # 4. 번역 (중국어 → 한국어)
-        logger.info("\n" + "=" * 60)
-        logger.info("4️⃣ 단계 4: 번역 (중국어 → 한국어)")
-        logger.info("=" * 60)
-
-        if use_claude and ANTHROPIC_AVAILABLE:
-            translated_segments = translate_segments_claude(segments, source_lang='zh', target_lang='ko')
-        elif OPENAI_AVAILABLE:
-            translated_segments = translate_segments_openai(segments, source_lang='zh', target_lang='ko')
-        else:
-            logger.error("❌ 번역 API가 없습니다 (Claude 또는 OpenAI 필요)")
-            return None
-
-        # 번역 저장
         translation_file = output_dir / "korean_translation.json"
         with open(translation_file, 'w', encoding='utf-8') as f:
             json.dump(translated_segments, f, ensure_ascii=False, indent=2)
@@ -1665,56 +1654,35 @@ async def convert_chinese_video(
 
         # 취소 체크
         if should_stop(output_dir):
-            raise CancelledException("번역 후 작업 취소됨")
-
-        # 5. 전체 텍스트를 하나의 TTS로 생성
-        logger.info("\n" + "=" * 60)
-        logger.info("5️⃣ 단계 5: 한국어 음성 생성 (전체)")
-        logger.info("=" * 60)
-
-        # 번역된 텍스트 전체 합치기 (각 세그먼트 사이에 24개 줄바꿈 추가)
-        newline_separator = '\n' * 24
-        full_korean_text = newline_separator.join([seg.get('translated', '') for seg in translated_segments])
-        logger.info(f"📝 한국어 텍스트 길이: {len(full_korean_text)}자")
-        logger.info(f"📝 미리보기: {full_korean_text[:100]}...")
-        logger.info(f"🫁 숨쉬는 포인트 추가 완료 (세그먼트 사이마다 24개 줄바꿈)")
-
-        # 하나의 TTS 파일로 생성
-        korean_audio_path = temp_dir / "korean_audio.mp3"
-
-        if EDGE_TTS_AVAILABLE:
-            logger.info("🎤 Edge TTS로 음성 생성 중...")
-            success = await generate_tts_edge(full_korean_text, korean_audio_path)
-        elif use_openai_tts and OPENAI_AVAILABLE:
-            logger.warning("⚠️ Edge TTS 사용 불가, OpenAI TTS 사용 (유료)")
-            success = generate_tts_openai(full_korean_text, korean_audio_path)
-        else:
-            logger.error("❌ TTS 모듈이 없습니다")
-            return None
+            raise CancelledException("TTS 생성 후 작업 취소됨")
 
-        if not success or not korean_audio_path.exists():
+        if not audio_segments:
             logger.error("❌ TTS 생성 실패")
             return None
 
-        logger.info(f"✅ TTS 생성 완료: {korean_audio_path.name}")
-
-        # 취소 체크
-        if should_stop(output_dir):
-            raise CancelledException("TTS 생성 후 작업 취소됨")
+        # 세그먼트 음성을 원본 타이밍에 배치한 더빙 트랙 하나로
+        korean_audio_path = temp_dir / "korean_audio.mp3"
+        with metrics.stage('dub_mix', segments=len(audio_segments)):
+            mixed = merge_audio_segments(audio_segments, korean_audio_path, total_duration=wav_duration(audio_path))
+        if not mixed:
+            logger.error("❌ 더빙 트랙 생성 실패")
+            return None
 
-        # 6. 간단한 자막 생성 (전체 텍스트를 25자 단위로 분할)
+        # 5. 자막 생성 (더빙 트랙의 세그먼트 배치와 같은 타이밍)
         logger.info("\n" + "=" * 60)
-        logger.info("6️⃣ 단계 6: 한국어 자막 생성")
+        logger.info("5️⃣ 단계 5: 한국어 자막 생성")
         logger.info("=" * 60)
 
         subtitle_path = output_dir / "korean_subtitle.srt"
-        if not create_simple_srt(full_korean_text, korean_audio_path, subtitle_path):
+        with metrics.stage('subtitles'):
+            subtitled = create_srt_subtitle(audio_segments, subtitle_path)
+        if not subtitled:
             logger.error("❌ 자막 생성 실패")
             return None
 
-        # 7. 영상 합성 (한국어 자막 + 오디오)
+        # 6. 영상 합성 (중국어 자막 제거 + 한국어 오디오 + 한국어 자막, 인코딩 1회)
         logger.info("\n" + "=" * 60)
-        logger.info("7️⃣ 단계 7: 영상 합성")
+        logger.info("6️⃣ 단계 6: 영상 합성 (워터마크 제거 포함)")
         logger.info("=" * 60)
 
         # 출력 파일명 결정 (제목이 있으면 제목 사용)
@@ -1728,16 +1696,20 @@ async def convert_chinese_video(
         else:
             output_filename = f"converted_{input_video.stem}.mp4"
 
-        # 워터마크 제거된 비디오 사용
         output_video = output_dir / output_filename
-        if not replace_video_audio_with_subtitle(
-            working_video,  # 워터마크 제거된 비디오 사용
-            korean_audio_path,
-            subtitle_path,
-            output_video,
-            burn_subtitle=True  # 자막을 비디오에 하드코딩
-        ):
+        with metrics.stage('render', fused=watermark_mode in FUSED_RENDER_MODES):
+            merged = render_converted_video(
+                input_video,
+                korean_audio_path,
+                subtitle_path,
+                output_video,
+                watermark_mode=watermark_mode,
+                output_dir=output_dir,
+                cancel_check=stop_check
+            )
+        if not merged:
             logger.error("❌ 영상 합성 실패")
+            output_video = None
             return None
 
         # 임시 파일 정리
@@ -1751,7 +1723,7 @@ async def convert_chinese_video(
 
         return output_video
 
-    except CancelledException as e:
+    except OperationCancelled as e:
         logger.warning(f"\n🛑 작업이 취소되었습니다: {e}")
         # 임시 파일 정리
         if 'temp_dir' in locals():
@@ -1764,6 +1736,16 @@ async def convert_chinese_video(
         traceback.print_exc()
         return None
 
+    finally:
+        release_cancel_token(output_dir, names=('STOP',))
+        metrics.log_summary()
+        try:
+            metrics.save(output_dir / METRICS_FILENAME)
+            if profiler:
+                profiler.write(output_video if output_video and output_video.exists() else output_dir)
+        except OSError as e:
+            logger.warning(f"⚠️ 메트릭 / 프로파일 저장 실패: {e}")
+
 
 def main():
     parser = argparse.ArgumentParser(description='중국어 영상을 한국어로 변환')
@@ -1773,6 +1755,10 @@ def main():
     parser.add_argument('--use-openai-whisper', action='store_true', help='OpenAI Whisper API 사용 (기본: 로컬 whisper)')
     parser.add_argument('--use-edge-tts', action='store_true', help='Edge TTS 사용 (기본: OpenAI TTS)')
     parser.add_argument('--use-openai-translate', action='store_true', help='OpenAI로 번역 (기본: Claude)')
+    parser.add_argument('--profile', choices=PROFILE_MODES, default=None,
+                        help='프로파일링 (stages / sample / cprofile) - 결과는 출력 영상 옆에 저장')
+    parser.add_argument('--watermark-mode', type=str, default='fast',
+                        help='워터마크 제거 방식 (fast / fast-temporal / lama / black ...)')
 
     args = parser.parse_args()
 
@@ -1798,7 +1784,9 @@ def main():
         title=args.title,
         use_openai_whisper=args.use_openai_whisper,
         use_openai_tts=not args.use_edge_tts,
-        use_claude=not args.use_openai_translate
+        use_claude=not args.use_openai_translate,
+        profile=args.profile,
+        watermark_mode=args.watermark_mode
     ))
 
     if result:
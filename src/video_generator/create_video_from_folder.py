@@ -20,7 +20,6 @@ import logging
 from pathlib import Path
 import warnings
 from time import time
-import signal
 
 # .env 파일 로드
 try:
@@ -41,48 +40,62 @@ warnings.filterwarnings("ignore", category=UserWarning, module="pytorch_lightnin
 import logging as base_logging
 base_logging.getLogger("pytorch_lightning").setLevel(base_logging.WARNING)
 from typing import Dict, List, Optional
-import edge_tts
 import asyncio
-
-# Google Cloud TTS (선택적)
-try:
-    from google.cloud import texttospeech
-    GOOGLE_TTS_AVAILABLE = True
-except ImportError:
-    GOOGLE_TTS_AVAILABLE = False
-    logger_msg = "⚠️ google-cloud-texttospeech 패키지가 없습니다. pip install google-cloud-texttospeech"
-
-# AWS Polly (선택적)
-try:
-    import boto3
-    from botocore.exceptions import BotoCoreError, ClientError
-    AWS_POLLY_AVAILABLE = True
-except ImportError:
-    AWS_POLLY_AVAILABLE = False
-    logger_msg = "⚠️ boto3 패키지가 없습니다. pip install boto3"
 import re
 import subprocess
+import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import multiprocessing
 import tempfile
-from PIL import Image as PILImage
-import numpy as np
+
+# 무거운 패키지는 지연 import: 선택된 TTS/이미지 제공자의 패키지만 실제로 로드된다
+from src.utils.lazy_import import lazy_module, module_available
+
+edge_tts = lazy_module('edge_tts')
+
+# Google Cloud TTS (선택적)
+texttospeech = lazy_module('google.cloud.texttospeech')
+GOOGLE_TTS_AVAILABLE = module_available('google.cloud.texttospeech')
+
+# AWS Polly (선택적)
+boto3 = lazy_module('boto3')
+botocore_exceptions = lazy_module('botocore.exceptions')
+AWS_POLLY_AVAILABLE = module_available('boto3')
+
+PILImage = lazy_module('PIL.Image')
 
 # 공통 유틸리티 모듈 import
 from src.utils import (
     get_ffmpeg_path,
     get_video_duration,
     get_audio_duration,
-    detect_best_encoder,
     format_ass_time,
 )
-# OpenCV 임포트 시도 (얼굴 감지용)
-try:
-    import cv2
-    OPENCV_AVAILABLE = True
-except ImportError:
-    OPENCV_AVAILABLE = False
-    logger_msg = "⚠️ OpenCV가 없습니다. 얼굴 감지 없이 중앙 크롭만 수행합니다. 설치: pip install opencv-python"
+from src.utils.encoder_session import get_encoder_session
+from src.utils.ffmpeg_runner import run_ffmpeg, FFmpegCancelled
+from src.utils.cancellation import CancellationToken, OperationCancelled
+from src.utils.resource_broker import resource_lease
+from src.utils.stage_metrics import StageMetrics, METRICS_FILENAME
+from src.utils.profiling import JobProfiler, profile_mode, PROFILE_MODES
+from src.utils.checkpoint import CheckpointJournal, CHECKPOINT_FILENAME, fingerprint, file_signature
+from src.utils.audio_mastering import (
+    AudioTimeline,
+    decode_audio_pcm,
+    normalize_loudness,
+    mux_pcm_with_video,
+    MASTER_SAMPLE_RATE,
+    MASTER_CHANNELS,
+)
+from src.utils.audio_mixing import (
+    speech_intervals_from_word_timings,
+    mix_music_bed,
+    parse_scene_sfx,
+    db_to_gain,
+    DEFAULT_BGM_VOLUME_DB,
+)
+# OpenCV (얼굴 감지용, 선택적)
+cv2 = lazy_module('cv2')
+OPENCV_AVAILABLE = module_available('cv2')
 
 # 로깅 설정 (먼저 설정)
 # Windows에서 UTF-8 출력을 위해 stdout을 UTF-8로 재설정
@@ -104,42 +117,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global cancellation flag and child processes tracking
-cancellation_requested = False
-child_processes = []
-
-def signal_handler(signum, frame):
-    """Handle SIGTERM/SIGINT for graceful shutdown"""
-    global cancellation_requested, child_processes
-    logger.info("🛑 취소 시그널 수신, 작업을 중단합니다...")
-    cancellation_requested = True
-
-    # 모든 자식 프로세스 강제 종료
-    for proc in child_processes:
-        try:
-            if proc.poll() is None:  # 아직 실행 중
-                logger.info(f"🛑 자식 프로세스 종료 중: PID {proc.pid}")
-                proc.kill()  # SIGKILL
-                proc.wait(timeout=2)
-        except Exception as e:
-            logger.error(f"❌ 프로세스 종료 실패: {e}")
-
-    sys.exit(1)
-
 # DALL-E (옵션)
-try:
-    from openai import OpenAI
-    DALLE_AVAILABLE = True
-except ImportError:
-    DALLE_AVAILABLE = False
+openai = lazy_module('openai')
+DALLE_AVAILABLE = module_available('openai')
+if not DALLE_AVAILABLE:
     logger.warning("[WARNING] openai module not found. DALL-E image generation disabled.")
 
 # Anthropic Claude API (프롬프트 수정용)
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+anthropic = lazy_module('anthropic')
+ANTHROPIC_AVAILABLE = module_available('anthropic')
+if not ANTHROPIC_AVAILABLE:
     logger.warning("[WARNING] anthropic module not found. Claude prompt refinement disabled.")
 
 
@@ -148,7 +135,11 @@ class VideoFromFolderCreator:
 
     def __init__(self, folder_path: str, voice: str = "ko-KR-SoonBokNeural",
                  speed: float = 1.0, aspect_ratio: str = "16:9", add_subtitles: bool = False,
-                 image_source: str = "none", image_provider: str = "openai", is_admin: bool = False):
+                 image_source: str = "none", image_provider: str = "openai", is_admin: bool = False,
+                 master_audio: bool = True, bgm_path: Optional[str] = None,
+                 bgm_volume: float = DEFAULT_BGM_VOLUME_DB,
+                 cancel_token: Optional[CancellationToken] = None, resume: bool = True,
+                 profile: Optional[str] = None):
         """
         Args:
             folder_path: story.json과 이미지가 있는 폴더 경로
@@ -159,6 +150,12 @@ class VideoFromFolderCreator:
             image_source: 이미지 소스 ("none", "dalle", "imagen3")
             image_provider: 이미지 생성 제공자 ("openai", "imagen3")
             is_admin: 관리자 모드 (비용 로그 표시)
+            master_audio: 프로젝트 단위 오디오 마스터링 (씬별 AAC 인코딩 대신 최종 1회 인코딩)
+            bgm_path: 배경음악 파일 (없으면 story.json의 "bgm" 사용)
+            bgm_volume: 배경음악 음량 dB (나레이션 구간에서는 추가로 덕킹)
+            cancel_token: 취소 토큰 (없으면 새로 만들고 폴더의 STOP / .cancel 파일을 감시)
+            resume: 체크포인트로 이어하기 (False면 기존 기록을 지우고 처음부터)
+            profile: 프로파일링 모드 ("stages", "sample", "cprofile", 없으면 PIPELINE_PROFILE 환경변수)
         """
         self.folder_path = Path(folder_path)
 
@@ -186,6 +183,12 @@ class VideoFromFolderCreator:
         self.image_provider = image_provider.lower()
         self.is_admin = is_admin
 
+        # 오디오 마스터링: 씬 비디오는 무음으로 렌더링하고 병합 시 한 번만 AAC 인코딩
+        self.master_audio = master_audio
+        self._scene_audio_muted = False
+        self.bgm_path = bgm_path
+        self.bgm_volume = bgm_volume
+
         # 이미지 생성 클라이언트 초기화
         self.dalle_client = None
         self.imagen_client = None
@@ -204,14 +207,14 @@ class VideoFromFolderCreator:
                     logger.error("❌ OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
                     self.image_source = "none"
                 else:
-                    self.dalle_client = OpenAI(api_key=api_key)
+                    self.dalle_client = openai.OpenAI(api_key=api_key)
                     logger.info("✅ DALL-E 3 이미지 생성 활성화됨")
 
                     # Anthropic Claude 클라이언트 초기화 (프롬프트 수정용)
                     if ANTHROPIC_AVAILABLE:
                         anthropic_key = os.getenv('ANTHROPIC_API_KEY')
                         if anthropic_key:
-                            self.anthropic_client = Anthropic(api_key=anthropic_key)
+                            self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key)
                             logger.info("✅ Claude API 활성화됨 (프롬프트 자동 수정)")
                         else:
                             logger.warning("⚠️ ANTHROPIC_API_KEY 환경변수가 없습니다. 프롬프트 자동 수정 비활성화")
@@ -243,7 +246,7 @@ class VideoFromFolderCreator:
                 if ANTHROPIC_AVAILABLE:
                     anthropic_key = os.getenv('ANTHROPIC_API_KEY')
                     if anthropic_key:
-                        self.anthropic_client = Anthropic(api_key=anthropic_key)
+                        self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key)
                         logger.info("✅ Claude API 활성화됨 (프롬프트 자동 수정)")
                     else:
                         logger.warning("⚠️ ANTHROPIC_API_KEY 환경변수가 없습니다. 프롬프트 자동 수정 비활성화")
@@ -269,27 +272,28 @@ class VideoFromFolderCreator:
         # 썸네일 자동 생성
         self._create_thumbnail()
 
-        # GPU 인코더 감지
-        self.video_codec, self.codec_preset = self._detect_best_encoder()
+        # 인코더 세션 (GPU 인코더는 프로세스당 한 번만 프로브, 런타임 실패 시 CPU로 자동 폴백)
+        self.encoder_session = get_encoder_session()
+        self.video_codec, self.codec_preset = self.encoder_session.select()
 
-        # Whisper 모델 캐싱 (한 번만 로드)
-        self._whisper_model = None
+        # 단계별 소요 시간 (작업 로그 + generated_videos/metrics.json)
+        self.metrics = StageMetrics(logger=logger)
+        self.profile_mode = profile_mode(profile)
 
-    def _detect_best_encoder(self):
-        """사용 가능한 최고의 비디오 인코더 감지 (공통 모듈 사용)"""
-        encoder_name, encoder_type = detect_best_encoder()
+        # 취소 토큰: STOP / .cancel 파일 생성(inotify) 또는 시그널 → ffmpeg 프로세스 그룹 종료,
+        # TTS 태스크 / 씬 스레드 풀 취소, 부분 출력 삭제
+        # 호출한 쪽이 넘긴 토큰은 닫지 않음 (여기서 추가한 폴더 감시만 해제)
+        self._owns_cancel_token = cancel_token is None
+        self.cancel_token = cancel_token or CancellationToken()
+        self._cancel_watcher = self.cancel_token.watch_files(self.folder_path)
+        self._cancel_check = self.cancel_token
 
-        # preset 매핑
-        preset_map = {
-            'h264_nvenc': 'p4',
-            'h264_qsv': 'fast',
-            'h264_amf': 'speed',
-            'h264_videotoolbox': 'medium',
-            'libx264': 'ultrafast'
-        }
+        # 체크포인트 (generated_videos/checkpoint.json): 크래시 / 취소 후 완료된 단계는 건너뜀
+        self.resume = resume
+        self.checkpoint: Optional[CheckpointJournal] = None
 
-        preset = preset_map.get(encoder_name, 'medium')
-        return encoder_name, preset
+        # Whisper 모델 캐싱 (한 번만 로드)
+        self._whisper_model = None
 
     def _load_story_json(self) -> Dict:
         """story로 시작하는 JSON 파일 로드"""
@@ -814,9 +818,8 @@ class VideoFromFolderCreator:
             def generate_single_image(scene_data):
                 scene_num, scene = scene_data
 
-                # 취소 플래그 파일 체크
-                cancel_file = self.folder_path / '.cancel'
-                if cancel_file.exists():
+                # 취소 체크 (STOP / .cancel 파일은 토큰이 감시)
+                if self.cancel_token.cancelled:
                     logger.warning("🛑 취소 플래그 감지됨. 이미지 생성을 중단합니다.")
                     return (scene_num, None, "cancelled")
 
@@ -877,6 +880,9 @@ class VideoFromFolderCreator:
             logger.info(f"🚀 {len(missing_scenes)}개 이미지를 최대 {max_workers}개씩 병렬 생성합니다...")
 
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # 취소 시 아직 시작하지 않은 이미지 생성 작업은 바로 취소
+                self.cancel_token.bind_executor(executor)
+
                 # 모든 씬에 대해 작업 제출
                 future_to_scene = {
                     executor.submit(generate_single_image, scene_data): scene_data[0]
@@ -992,8 +998,7 @@ Return ONLY the refined prompt without any explanation or additional text."""
             생성된 이미지 경로 (실패 시 None)
         """
         # 취소 플래그 체크 (DALL-E 시작 전)
-        cancel_file = self.folder_path / '.cancel'
-        if cancel_file.exists():
+        if self.cancel_token.cancelled:
             logger.warning("🛑 취소 플래그 감지됨. DALL-E 이미지 생성을 시작하지 않습니다.")
             raise KeyboardInterrupt("User cancelled the operation")
 
@@ -1040,8 +1045,7 @@ Return ONLY the refined prompt without any explanation or additional text."""
                         logger.warning(f"   ⚠️ Claude 수정 실패, 폴백 프롬프트 사용: {current_prompt}")
 
                 # 취소 플래그 체크 (DALL-E API 호출 직전)
-                cancel_file = self.folder_path / '.cancel'
-                if cancel_file.exists():
+                if self.cancel_token.cancelled:
                     logger.warning("🛑 취소 플래그 감지됨. DALL-E API 호출을 중단합니다.")
                     raise KeyboardInterrupt("User cancelled the operation")
 
@@ -1058,8 +1062,7 @@ Return ONLY the refined prompt without any explanation or additional text."""
                 image_url = response.data[0].url
 
                 # 취소 플래그 체크 (이미지 다운로드 전)
-                cancel_file = self.folder_path / '.cancel'
-                if cancel_file.exists():
+                if self.cancel_token.cancelled:
                     logger.warning("🛑 취소 플래그 감지됨. DALL-E 이미지 다운로드를 중단합니다.")
                     raise KeyboardInterrupt("User cancelled the operation")
 
@@ -1117,8 +1120,7 @@ Return ONLY the refined prompt without any explanation or additional text."""
             생성된 이미지 경로 (실패 시 None)
         """
         # 취소 플래그 체크
-        cancel_file = self.folder_path / '.cancel'
-        if cancel_file.exists():
+        if self.cancel_token.cancelled:
             logger.warning("🛑 취소 플래그 감지됨. Imagen 3 이미지 생성을 시작하지 않습니다.")
             raise KeyboardInterrupt("User cancelled the operation")
 
@@ -1167,8 +1169,7 @@ Return ONLY the refined prompt without any explanation or additional text."""
                     logger.warning(f"⚠️ 프롬프트가 2048자를 초과하여 잘렸습니다.")
 
                 # 취소 플래그 체크 (API 호출 직전)
-                cancel_file = self.folder_path / '.cancel'
-                if cancel_file.exists():
+                if self.cancel_token.cancelled:
                     logger.warning("🛑 취소 플래그 감지됨. Imagen 3 API 호출을 중단합니다.")
                     raise KeyboardInterrupt("User cancelled the operation")
 
@@ -1801,13 +1802,10 @@ Return ONLY the refined prompt without any explanation or additional text."""
                         "end": response.timepoints[i + 1].time_seconds if i + 1 < len(response.timepoints) else timepoint.time_seconds + 0.5
                     })
 
-            # 오디오 길이 가져오기
-            try:
-                audio_clip = AudioFileClip(str(output_path))
-                duration = audio_clip.duration
-                audio_clip.close()
-            except Exception as e:
-                logger.warning(f"오디오 길이 측정 실패, 기본값 1초 사용: {e}")
+            # 오디오 길이 가져오기 (MP3 헤더 파싱, 서브프로세스 없음)
+            duration = self._get_audio_duration(output_path)
+            if duration == 0.0:
+                logger.warning(f"오디오 길이 측정 실패, 기본값 1초 사용")
                 duration = 1.0
 
             # 타임스탬프가 없으면 텍스트 기반으로 생성
@@ -1887,13 +1885,10 @@ Return ONLY the refined prompt without any explanation or additional text."""
                             "end": mark['time'] / 1000.0 + 0.3  # 임시 duration
                         })
 
-            # 오디오 길이 가져오기
-            try:
-                audio_clip = AudioFileClip(str(output_path))
-                duration = audio_clip.duration
-                audio_clip.close()
-            except Exception as e:
-                logger.warning(f"오디오 길이 측정 실패, 기본값 1초 사용: {e}")
+            # 오디오 길이 가져오기 (MP3 헤더 파싱, 서브프로세스 없음)
+            duration = self._get_audio_duration(output_path)
+            if duration == 0.0:
+                logger.warning(f"오디오 길이 측정 실패, 기본값 1초 사용")
                 duration = 1.0
 
             # end 시간 조정 (다음 단어 시작 시간 또는 duration 기준)
@@ -1905,7 +1900,7 @@ Return ONLY the refined prompt without any explanation or additional text."""
             logger.info(f"AWS Polly 생성 완료: {duration:.2f}초, 단어 {len(word_timings)}개")
             return duration, word_timings
 
-        except (BotoCoreError, ClientError) as e:
+        except (botocore_exceptions.BotoCoreError, botocore_exceptions.ClientError) as e:
             logger.error(f"AWS Polly 실패: {e}")
             logger.warning("Edge TTS로 대체합니다.")
             # Edge TTS로 폴백
@@ -1925,9 +1920,28 @@ Return ONLY the refined prompt without any explanation or additional text."""
         return get_video_duration(str(video_path))
 
     def _get_audio_duration(self, audio_path: Path) -> float:
-        """FFprobe로 오디오 길이 확인 (공통 모듈 사용)"""
+        """오디오 길이 확인 (헤더 파싱 우선, 공통 모듈 사용)"""
         return get_audio_duration(str(audio_path))
 
+    def _scene_audio_args(self, audio_duration: float = None, from_image: bool = False) -> list:
+        """
+        씬 비디오의 오디오 출력 인자
+
+        마스터링 모드에서는 씬에 오디오를 넣지 않고(-an) 병합 단계에서
+        전체 타임라인을 한 번만 인코딩한다. 이미지 루프는 -shortest 대신
+        오디오 길이(-t)로 끊는다.
+        """
+        if self._scene_audio_muted:
+            args = ['-an']
+            if from_image and audio_duration:
+                args.extend(['-t', f"{audio_duration:.3f}"])
+            return args
+
+        args = ['-c:a', 'aac']
+        if from_image:
+            args.append('-shortest')
+        return args
+
     def _combine_video_audio(self, scene_num: int, video_path: Path,
                             audio_path: Path, output_path: Path) -> Optional[Path]:
         """비디오 파일에 오디오 결합 - FFmpeg 직접 사용 (자막 없음)"""
@@ -1942,7 +1956,7 @@ Return ONLY the refined prompt without any explanation or additional text."""
                 '-i', str(video_path.resolve()),  # 입력 비디오
                 '-i', str(audio_path.resolve()),  # 입력 오디오
                 '-c:v', 'copy',  # 비디오 재인코딩 없이 복사 (빠름)
-                '-c:a', 'aac',  # 오디오 AAC 인코딩
+                *self._scene_audio_args(),  # 오디오 AAC 인코딩 (마스터링 모드: 무음)
                 '-map', '0:v:0',  # 첫 번째 입력의 비디오
                 '-map', '1:a:0',  # 두 번째 입력의 오디오
                 '-y',  # 덮어쓰기
@@ -1991,8 +2005,8 @@ Return ONLY the refined prompt without any explanation or additional text."""
                 freeze_duration = audio_duration - video_duration
                 video_filter_parts.append(f"tpad=stop_mode=clone:stop_duration={freeze_duration:.3f}")
                 logger.info(f"⚠️ 비디오가 TTS보다 짧습니다. 마지막 프레임을 {freeze_duration:.2f}초 freeze합니다.")
-            elif audio_duration < video_duration:
-                # 오디오가 짧으면: 무음 추가하여 비디오 길이에 맞춤
+            elif audio_duration < video_duration and not self._scene_audio_muted:
+                # 오디오가 짧으면: 무음 추가하여 비디오 길이에 맞춤 (마스터링 모드는 타임라인에서 처리)
                 audio_filter = f"apad=whole_dur={video_duration:.3f}"
                 logger.info(f"⚠️ TTS가 비디오보다 짧습니다. 무음을 추가하여 비디오 길이에 맞춥니다.")
 
@@ -2000,31 +2014,33 @@ Return ONLY the refined prompt without any explanation or additional text."""
             video_filter_parts.append(f"ass={ass_absolute_path}")
             vf_combined = ",".join(video_filter_parts)
 
-            # FFmpeg 명령어로 비디오 + 오디오 + 자막 결합
-            cmd = [
-                'ffmpeg',
-                '-y',
-                '-i', str(video_path.resolve()),  # 입력 비디오
-                '-i', str(audio_path.resolve()),  # 입력 오디오
-                '-vf', vf_combined,  # 비디오 필터 (tpad + ass)
-                '-c:v', self.video_codec,  # 비디오 재인코딩 (자막 때문에)
-                '-preset', self.codec_preset,
-                '-c:a', 'aac',  # 오디오 AAC 인코딩
-                '-map', '0:v:0',  # 첫 번째 입력의 비디오
-                '-map', '1:a:0',  # 두 번째 입력의 오디오
-                '-pix_fmt', 'yuv420p',  # 호환성
-            ]
+            # FFmpeg 명령어로 비디오 + 오디오 + 자막 결합 (인코더 인자는 세션이 결정)
+            def build_cmd(video_args):
+                cmd = [
+                    'ffmpeg',
+                    '-y',
+                    '-i', str(video_path.resolve()),  # 입력 비디오
+                    '-i', str(audio_path.resolve()),  # 입력 오디오
+                    '-vf', vf_combined,  # 비디오 필터 (tpad + ass)
+                    *video_args,  # 비디오 재인코딩 (자막 때문에)
+                    *self._scene_audio_args(),  # 오디오 AAC 인코딩 (마스터링 모드: 무음)
+                    '-map', '0:v:0',  # 첫 번째 입력의 비디오
+                    '-map', '1:a:0',  # 두 번째 입력의 오디오
+                    '-pix_fmt', 'yuv420p',  # 호환성
+                ]
 
-            # 오디오 필터 추가 (패딩이 필요한 경우)
-            if audio_filter:
-                cmd.extend(['-af', audio_filter])
+                # 오디오 필터 추가 (패딩이 필요한 경우)
+                if audio_filter:
+                    cmd.extend(['-af', audio_filter])
 
-            cmd.extend([
-                '-y',  # 덮어쓰기
-                str(output_path.resolve())  # 출력 경로
-            ])
+                cmd.extend([
+                    '-y',  # 덮어쓰기
+                    str(output_path.resolve())  # 출력 경로
+                ])
+                return cmd
 
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+            self.encoder_session.run(build_cmd, duration=max(video_duration, audio_duration),
+                                     label=f"씬 {scene_num}", cancel_check=self._cancel_check)
             logger.info(f"씬 {scene_num} 비디오+오디오+자막 결합 완료: {output_path}")
 
             # 자막 파일 삭제
@@ -2036,54 +2052,24 @@ Return ONLY the refined prompt without any explanation or additional text."""
             return output_path
 
         except subprocess.CalledProcessError as e:
-            # GPU 인코더 실패 시 CPU 폴백
-            if 'h264_nvenc' in str(e.stderr) or 'nvenc' in str(e.stderr):
-                logger.warning(f"씬 {scene_num} GPU 인코더 실패, CPU 인코더로 재시도...")
-                try:
-                    cmd_cpu = [
-                        'ffmpeg',
-                        '-y',
-                        '-i', str(video_path.resolve()),
-                        '-i', str(audio_path.resolve()),
-                        '-vf', vf_combined,  # 비디오 필터 (tpad + ass)
-                        '-c:v', 'libx264',  # CPU 인코더
-                        '-preset', 'ultrafast',
-                        '-c:a', 'aac',
-                        '-map', '0:v:0',
-                        '-map', '1:a:0',
-                        '-pix_fmt', 'yuv420p',
-                    ]
-
-                    if audio_filter:
-                        cmd_cpu.extend(['-af', audio_filter])
-
-                    cmd_cpu.extend(['-y', str(output_path.resolve())])
-
-                    result = subprocess.run(cmd_cpu, check=True, capture_output=True, text=True, encoding='utf-8', errors='ignore')
-                    logger.info(f"씬 {scene_num} 비디오+오디오+자막 결합 완료 (CPU): {output_path}")
-
-                    if ass_path.exists():
-                        ass_path.unlink()
-                    if srt_path.exists():
-                        srt_path.unlink()
-
-                    return output_path
-                except subprocess.CalledProcessError as e2:
-                    logger.error(f"씬 {scene_num} CPU 인코더도 실패: {e2.stderr}")
-                    return None
-            else:
-                logger.error(f"씬 {scene_num} 비디오+오디오+자막 결합 실패: {e.stderr}")
-                return None
+            logger.error(f"씬 {scene_num} 비디오+오디오+자막 결합 실패: {e.stderr}")
+            return None
+        except FFmpegCancelled:
+            raise
         except Exception as e:
             logger.error(f"씬 {scene_num} 비디오+오디오+자막 결합 실패: {e}")
             return None
 
     def _create_scene_video(self, scene_num: int, image_path: Path,
-                           audio_path: Path, output_path: Path) -> Optional[Path]:
+                           audio_path: Path, output_path: Path,
+                           audio_duration: float = None) -> Optional[Path]:
         """씬 비디오 생성 (이미지 + 오디오) - FFmpeg 직접 사용"""
         try:
             logger.info(f"씬 {scene_num} 비디오 생성 중...")
 
+            if audio_duration is None and self._scene_audio_muted:
+                audio_duration = self._get_audio_duration(audio_path)
+
             # ============================================================
             # 숏폼 영상인 경우 16:9 이미지를 9:16으로 스마트 크롭
             # ============================================================
@@ -2126,58 +2112,32 @@ Return ONLY the refined prompt without any explanation or additional text."""
             # -pix_fmt yuv420p: 호환성
             # -vf scale: 리스케일 + 레터박스
 
-            cmd = [
-                'ffmpeg',
-                '-loop', '1',  # 이미지 반복
-                '-i', str(image_path.resolve()),  # 입력 이미지 (절대 경로)
-                '-i', str(audio_path.resolve()),  # 입력 오디오 (절대 경로)
-                '-vf', f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,crop={self.width}:{self.height},fps=25",  # 리스케일 + 크롭 + FPS 통일
-                '-c:v', self.video_codec,  # GPU 가속 코덱
-                '-preset', self.codec_preset,  # 프리셋
-                '-c:a', 'aac',  # 오디오 코덱
-                '-shortest',  # 오디오 길이만큼
-                '-pix_fmt', 'yuv420p',  # 호환성
-                '-y',  # 덮어쓰기
-                str(output_path.resolve())  # 출력 경로 (절대 경로)
-            ]
+            def build_cmd(video_args):
+                return [
+                    'ffmpeg',
+                    '-loop', '1',  # 이미지 반복
+                    '-i', str(image_path.resolve()),  # 입력 이미지 (절대 경로)
+                    '-i', str(audio_path.resolve()),  # 입력 오디오 (절대 경로)
+                    '-vf', f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,crop={self.width}:{self.height},fps=25",  # 리스케일 + 크롭 + FPS 통일
+                    *video_args,  # GPU 가속 코덱 + 프리셋 (실패 시 세션이 CPU로 폴백)
+                    *self._scene_audio_args(audio_duration, from_image=True),  # 오디오 코덱 + 오디오 길이만큼
+                    '-pix_fmt', 'yuv420p',  # 호환성
+                    '-y',  # 덮어쓰기
+                    str(output_path.resolve())  # 출력 경로 (절대 경로)
+                ]
 
-            # FFmpeg 실행 (UTF-8 인코딩)
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+            # FFmpeg 실행 (stderr 스트리밍으로 인코더 실패 조기 감지)
+            self.encoder_session.run(build_cmd, duration=audio_duration, label=f"씬 {scene_num}",
+                                     cancel_check=self._cancel_check)
 
             logger.info(f"씬 {scene_num} 비디오 생성 완료: {output_path}")
             return output_path
 
         except subprocess.CalledProcessError as e:
-            # GPU 인코더 실패 시 CPU 폴백
-            if 'h264_nvenc' in str(e.stderr) or 'nvenc' in str(e.stderr):
-                logger.warning(f"씬 {scene_num} GPU 인코더 실패, CPU 인코더로 재시도...")
-
-                # CPU 인코더로 재시도
-                cmd_cpu = [
-                    'ffmpeg',
-                    '-loop', '1',
-                    '-i', str(image_path.resolve()),
-                    '-i', str(audio_path.resolve()),
-                    '-vf', f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,crop={self.width}:{self.height},fps=25",
-                    '-c:v', 'libx264',  # CPU 인코더
-                    '-preset', 'ultrafast',
-                    '-c:a', 'aac',
-                    '-shortest',
-                    '-pix_fmt', 'yuv420p',
-                    '-y',
-                    str(output_path.resolve())
-                ]
-
-                try:
-                    result = subprocess.run(cmd_cpu, check=True, capture_output=True, text=True, encoding='utf-8', errors='ignore')
-                    logger.info(f"씬 {scene_num} 비디오 생성 완료 (CPU): {output_path}")
-                    return output_path
-                except subprocess.CalledProcessError as e2:
-                    logger.error(f"씬 {scene_num} CPU 인코더도 실패: {e2.stderr}")
-                    return None
-            else:
-                logger.error(f"씬 {scene_num} FFmpeg 실행 실패: {e.stderr}")
-                return None
+            logger.error(f"씬 {scene_num} FFmpeg 실행 실패: {e.stderr}")
+            return None
+        except FFmpegCancelled:
+            raise
         except Exception as e:
             logger.error(f"씨 {scene_num} 비디오 생성 실패: {e}")
             return None
@@ -2199,66 +2159,34 @@ Return ONLY the refined prompt without any explanation or additional text."""
             logger.info(f"DEBUG 씬 {scene_num}: ass_filename = {ass_filename}")
 
             # FFmpeg 명령어: 이미지 + 오디오 + 자막을 한번에 처리 (ass 필터 사용)
-            cmd = [
-                'ffmpeg',
-                '-loop', '1',
-                '-i', str(image_path.resolve()),
-                '-i', str(audio_path.resolve()),
-                '-vf', f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,crop={self.width}:{self.height},fps=25,ass={ass_filename}",
-                '-c:v', self.video_codec,
-                '-preset', self.codec_preset,
-                '-c:a', 'aac',
-                '-shortest',
-                '-pix_fmt', 'yuv420p',
-                '-y',
-                str(output_path.resolve())
-            ]
-
-            logger.info(f"DEBUG 씬 {scene_num}: FFmpeg 명령어 = {' '.join(cmd)}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True, encoding='utf-8', errors='ignore', cwd=str(output_path.parent))
-            if result.stderr and 'error' in result.stderr.lower():
-                logger.warning(f"FFmpeg 경고 (씬 {scene_num}): {result.stderr[:500]}")
-            logger.info(f"씬 {scene_num} 비디오 + 자막 생성 완료: {output_path}")
-            return output_path
-
-        except subprocess.CalledProcessError as e:
-            # GPU 인코더 실패 시 CPU 폴백 (stderr 확인 불가하므로 파일 크기로 판단)
-            if not output_path.exists() or output_path.stat().st_size == 0:
-                logger.warning(f"씬 {scene_num} GPU 인코더 실패, CPU 인코더로 재시도...")
-
-                # ASS 자막 파일 경로 (이미 생성됨)
-                srt_path = audio_path.with_suffix('.srt')
-                ass_path = srt_path.with_suffix('.ass')
-                # FFmpeg ass 필터에는 파일명만 전달
-                ass_filename = ass_path.name
-
-                cmd_cpu = [
+            def build_cmd(video_args):
+                cmd = [
                     'ffmpeg',
                     '-loop', '1',
                     '-i', str(image_path.resolve()),
                     '-i', str(audio_path.resolve()),
                     '-vf', f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,crop={self.width}:{self.height},fps=25,ass={ass_filename}",
-                    '-c:v', 'libx264',
-                    '-preset', 'ultrafast',
-                    '-c:a', 'aac',
-                    '-shortest',
+                    *video_args,
+                    *self._scene_audio_args(audio_duration, from_image=True),
                     '-pix_fmt', 'yuv420p',
                     '-y',
                     str(output_path.resolve())
                 ]
+                logger.info(f"DEBUG 씬 {scene_num}: FFmpeg 명령어 = {' '.join(cmd)}")
+                return cmd
 
-                try:
-                    result_cpu = subprocess.run(cmd_cpu, check=True, capture_output=True, text=True, encoding='utf-8', errors='ignore', cwd=str(output_path.parent))
-                    if result_cpu.stderr and 'error' in result_cpu.stderr.lower():
-                        logger.warning(f"FFmpeg CPU 경고 (씬 {scene_num}): {result_cpu.stderr[:500]}")
-                    logger.info(f"씬 {scene_num} CPU 인코더로 성공")
-                    return output_path
-                except subprocess.CalledProcessError as e2:
-                    logger.error(f"씬 {scene_num} CPU 인코더도 실패: {e2.stderr if hasattr(e2, 'stderr') else str(e2)}")
-                    return None
-            else:
-                logger.error(f"씬 {scene_num} FFmpeg 실행 실패")
-                return None
+            result = self.encoder_session.run(build_cmd, cwd=str(output_path.parent), duration=audio_duration,
+                                              label=f"씬 {scene_num}", cancel_check=self._cancel_check)
+            if result.stderr and 'error' in result.stderr.lower():
+                logger.warning(f"FFmpeg 경고 (씬 {scene_num}): {result.stderr[:500]}")
+            logger.info(f"씬 {scene_num} 비디오 + 자막 생성 완료: {output_path}")
+            return output_path
+
+        except subprocess.CalledProcessError as e:
+            logger.error(f"씬 {scene_num} FFmpeg 실행 실패: {e.stderr}")
+            return None
+        except FFmpegCancelled:
+            raise
         except Exception as e:
             logger.error(f"씬 {scene_num} 비디오 + 자막 생성 실패: {e}")
             return None
@@ -2311,13 +2239,9 @@ Return ONLY the refined prompt without any explanation or additional text."""
             ]
 
             logger.info(f"FFmpeg filter_complex 병합 실행 중...")
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore'
-            )
+            with resource_lease('render', cancel_check=self._cancel_check), \
+                    self.metrics.stage('concat', scenes=len(scene_videos)):
+                result = run_ffmpeg(cmd, label="비디오 병합", cancel_check=self._cancel_check)
 
             if result.returncode != 0:
                 logger.error(f"FFmpeg 실패 (종료 코드: {result.returncode})")
@@ -2338,10 +2262,168 @@ Return ONLY the refined prompt without any explanation or additional text."""
 
             return output_path
 
+        except FFmpegCancelled:
+            raise
         except Exception as e:
             logger.error(f"비디오 결합 중 오류: {e}")
             return None
 
+    def _resolve_bgm_path(self) -> Optional[Path]:
+        """배경음악 경로 결정 (인자 > story.json "bgm" > metadata.bgm)"""
+        bgm = self.bgm_path or self.story_data.get('bgm') or \
+            self.story_data.get('metadata', {}).get('bgm')
+        if not bgm:
+            return None
+
+        path = Path(bgm)
+        if not path.is_absolute():
+            path = self.folder_path / path
+        if not path.exists():
+            logger.warning(f"⚠️ 배경음악 파일 없음: {path}")
+            return None
+        return path
+
+    def _combine_videos_mastered(self, scene_tracks: List[Dict], output_path: Path, start_time: float) -> Optional[Path]:
+        """
+        무음 씬 비디오 병합 + 프로젝트 단위 오디오 마스터링
+
+        1. 씬마다 슬롯 길이(max(비디오, 나레이션))를 25fps 프레임 단위로 고정하여 비디오만 병합
+        2. 나레이션을 한 번씩 디코딩하여 PCM 타임라인의 프레임 경계(샘플 단위)에 배치
+        3. 씬 효과음 배치 + 배경음악을 단어 타임스탬프 기반 덕킹 엔벨로프로 믹스
+        4. EBU R128 라우드니스 정규화 후 AAC 1회 인코딩, 비디오는 스트림 복사로 먹싱
+        """
+        import math
+
+        fps = 25
+        samples_per_frame = MASTER_SAMPLE_RATE // fps
+        logger.info(f"비디오 결합 시작 (오디오 마스터링): {len(scene_tracks)}개 씬")
+
+        video_only_path = output_path.with_name(f"{output_path.stem}.video_only.mp4")
+
+        try:
+            # 씬별 슬롯 길이 (프레임 단위)
+            slot_frames = []
+            with self.metrics.stage('probe', files=len(scene_tracks)):
+                for track in scene_tracks:
+                    video_duration = self._get_video_duration(track['video_path'])
+                    slot = max(video_duration, track['audio_duration'] or 0.0)
+                    frames = max(1, math.ceil(slot * fps - 1e-6))
+                    track['pad_duration'] = max(0.0, slot - video_duration)
+                    slot_frames.append(frames)
+
+            # 1. 비디오만 병합 (FPS/해상도 통일 + 슬롯 길이 고정)
+            input_args = []
+            scale_filters = []
+            concat_inputs = []
+            for i, (track, frames) in enumerate(zip(scene_tracks, slot_frames)):
+                input_args.extend(['-i', str(track['video_path'])])
+                scale_filters.append(
+                    f"[{i}:v]scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,"
+                    f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},"
+                    f"tpad=stop_mode=clone:stop_duration={track['pad_duration'] + 1.0 / fps:.3f},"
+                    f"trim=end_frame={frames},setpts=PTS-STARTPTS[v{i}]"
+                )
+                concat_inputs.append(f"[v{i}]")
+
+            filter_str = ";".join(scale_filters) + ";" + "".join(concat_inputs) + \
+                f"concat=n={len(scene_tracks)}:v=1:a=0[outv]"
+
+            cmd = [
+                'ffmpeg',
+                '-y',
+                *input_args,
+                '-filter_complex', filter_str,
+                '-map', '[outv]',
+                '-c:v', 'libx264',
+                '-preset', 'medium',
+                '-crf', '18',
+                '-pix_fmt', 'yuv420p',
+                '-an',
+                str(video_only_path)
+            ]
+
+            logger.info(f"FFmpeg filter_complex 비디오 병합 실행 중...")
+            with resource_lease('render', cancel_check=self._cancel_check), \
+                    self.metrics.stage('concat', scenes=len(scene_tracks)):
+                result = run_ffmpeg(cmd, duration=sum(slot_frames) / fps, label="비디오 병합",
+                                    cancel_check=self._cancel_check)
+            if result.returncode != 0:
+                logger.error(f"FFmpeg 실패 (종료 코드: {result.returncode})")
+                if result.stderr:
+                    logger.error(f"에러 메시지:\n{result.stderr[-1000:]}")
+                return None
+
+            # 2. PCM 타임라인 구성 (씬 오프셋 = 프레임 경계, 샘플 단위로 정확)
+            with self.metrics.stage('audio_mix', scenes=len(scene_tracks)):
+                total_samples = sum(slot_frames) * samples_per_frame
+                timeline = AudioTimeline(MASTER_SAMPLE_RATE, MASTER_CHANNELS, total_samples)
+                speech_intervals = []
+                offset = 0
+                for track, frames in zip(scene_tracks, slot_frames):
+                    slot_samples = frames * samples_per_frame
+                    pcm = decode_audio_pcm(track['audio_path'])
+                    placed = timeline.place(pcm, offset, max_samples=slot_samples)
+
+                    # 덕킹용 발화 구간 (단어 타임스탬프가 없으면 나레이션 전체 구간)
+                    offset_sec = offset / MASTER_SAMPLE_RATE
+                    slot_sec = slot_samples / MASTER_SAMPLE_RATE
+                    intervals = speech_intervals_from_word_timings(
+                        track.get('word_timings'), offset_sec, limit=slot_sec)
+                    speech_intervals.extend(intervals or [(offset_sec, offset_sec + placed / MASTER_SAMPLE_RATE)])
+
+                    # 씬 효과음 (슬롯 안에서만)
+                    for sfx in track.get('sfx', []):
+                        sfx_path = self.folder_path / sfx['file']
+                        if not sfx_path.exists():
+                            logger.warning(f"⚠️ 효과음 파일 없음: {sfx_path}")
+                            continue
+                        sfx_offset = min(timeline.seconds_to_samples(max(0.0, sfx['offset'])), slot_samples)
+                        timeline.place(decode_audio_pcm(sfx_path), offset + sfx_offset,
+                                       max_samples=slot_samples - sfx_offset, gain=db_to_gain(sfx['volume']))
+
+                    offset += slot_samples
+
+                logger.info(f"🎵 오디오 타임라인: {len(scene_tracks)}개 나레이션, {timeline.duration:.2f}초")
+
+                # 3. 배경음악 (덕킹 엔벨로프 적용, 타임라인에 한 번에 믹스)
+                mix = timeline.render()
+                bgm_path = self._resolve_bgm_path()
+                if bgm_path:
+                    logger.info(f"🎵 배경음악: {bgm_path.name}")
+                    mix = mix_music_bed(mix, decode_audio_pcm(bgm_path), MASTER_SAMPLE_RATE,
+                                        speech_intervals, bgm_volume_db=self.bgm_volume)
+
+                # 4. 라우드니스 정규화 + AAC 1회 인코딩 + 비디오 스트림 복사 먹싱
+                master, _ = normalize_loudness(mix)
+            with self.metrics.stage('mux'):
+                muxed = mux_pcm_with_video(video_only_path, master, output_path)
+            if not muxed:
+                return None
+
+            if not output_path.exists():
+                logger.error(f"병합된 비디오 파일이 생성되지 않았습니다: {output_path}")
+                return None
+
+            elapsed_time = time() - start_time
+            minutes = int(elapsed_time // 60)
+            seconds = int(elapsed_time % 60)
+            logger.info(f"비디오 결합 완료: {output_path}")
+            logger.info(f"총 수행 시간: {minutes}분 {seconds}초")
+
+            return output_path
+
+        except FFmpegCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"비디오 결합 중 오류: {e}")
+            return None
+        finally:
+            if video_only_path.exists():
+                try:
+                    video_only_path.unlink()
+                except OSError:
+                    pass
+
     def _backup_previous_videos(self):
         """기존 generated_videos 폴더를 backup으로 이동 (파일 사용 중이면 건너뛰기)"""
         import shutil
@@ -2385,7 +2467,41 @@ Return ONLY the refined prompt without any explanation or additional text."""
                     pass
 
     async def create_all_videos(self, combine: bool = True) -> Optional[Path]:
-        """모든 씬의 비디오 생성 및 결합"""
+        """모든 씬의 비디오 생성 및 결합 (단계별 소요 시간은 generated_videos/metrics.json에 저장)"""
+        # 취소 토큰 → 이 태스크 취소 (대기 중인 TTS gather까지 즉시 중단)
+        task_handle = self.cancel_token.bind_task()
+        # 프로파일링 모드: 최종 영상 옆에 speedscope 프로파일 + 단계별 요약 저장
+        profiler = JobProfiler(self.metrics, self.profile_mode).start() if self.profile_mode else None
+        result = None
+        try:
+            result = await self._create_all_videos(combine)
+            return result
+        except OperationCancelled as e:
+            logger.warning(f"🛑 {e}")
+            raise KeyboardInterrupt("User cancelled the operation")
+        except (asyncio.CancelledError, concurrent.futures.CancelledError):
+            if not self.cancel_token.cancelled:
+                raise
+            logger.warning(f"🛑 작업 취소됨 ({self.cancel_token.reason})")
+            raise KeyboardInterrupt("User cancelled the operation")
+        finally:
+            self.cancel_token.remove_callback(task_handle)
+            if self._owns_cancel_token:
+                self.cancel_token.close()
+            else:
+                self.cancel_token.unwatch(self._cancel_watcher)
+            self.metrics.log_summary()
+            try:
+                self.metrics.save(self.folder_path / "generated_videos" / METRICS_FILENAME)
+            except OSError as e:
+                logger.warning(f"⚠️ 메트릭 저장 실패: {e}")
+            if profiler:
+                try:
+                    profiler.write(result or self.folder_path / "generated_videos")
+                except OSError as e:
+                    logger.warning(f"⚠️ 프로파일 저장 실패: {e}")
+
+    async def _create_all_videos(self, combine: bool = True) -> Optional[Path]:
         start_time = time()
 
         # 기존 generated_videos 폴더 백업 (비활성화 - backup 폴더 생성 방지)
@@ -2560,6 +2676,14 @@ Return ONLY the refined prompt without any explanation or additional text."""
         output_folder = self.folder_path / "generated_videos"
         output_folder.mkdir(exist_ok=True)
 
+        # 체크포인트: 입력(나레이션 / 음성 / 미디어 / 설정)이 같고 출력 파일이 남아 있는 단계는 건너뜀
+        self.checkpoint = CheckpointJournal(output_folder / CHECKPOINT_FILENAME)
+        if not self.resume:
+            self.checkpoint.clear()
+        elif self.checkpoint.completed('render'):
+            logger.info(f"♻️ 체크포인트 발견: 완료된 단계는 건너뛰고 이어서 진행합니다")
+        reused = {'tts': 0, 'render': 0}
+
         # 1단계: TTS 생성 (병렬 처리)
         logger.info("=" * 70)
         logger.info("1단계: TTS 음성 생성 (병렬 처리)")
@@ -2572,9 +2696,8 @@ Return ONLY the refined prompt without any explanation or additional text."""
         last_media_type = None
 
         for scene in scenes:
-            # 취소 플래그 파일 체크
-            cancel_file = self.folder_path / '.cancel'
-            if cancel_file.exists():
+            # 취소 체크 (STOP / .cancel 파일은 토큰이 감시)
+            if self.cancel_token.cancelled:
                 logger.warning("🛑 취소 플래그 감지됨. 영상 생성을 중단합니다.")
                 raise KeyboardInterrupt("User cancelled the operation")
 
@@ -2620,14 +2743,17 @@ Return ONLY the refined prompt without any explanation or additional text."""
 
             # TTS 태스크 생성
             audio_path = output_folder / f"scene_{scene_num:02d}_audio.mp3"
-            tts_tasks.append(self._generate_tts(narration, audio_path))
+            tts_key = fingerprint(narration, self.voice, self.speed, self.tts_provider)
+            tts_tasks.append(self._generate_tts_checkpointed(scene_num, narration, audio_path, tts_key, reused))
 
             scene_data_list.append({
                 'scene_num': scene_num,
                 'media_path': media_path,
                 'media_type': media_type,
                 'audio_path': audio_path,
-                'clean_narration': clean_narration
+                'clean_narration': clean_narration,
+                'sfx': parse_scene_sfx(scene),
+                'tts_key': tts_key
             })
 
         # TTS 병렬 생성 (8개씩 제한) - 타임스탬프도 함께 받음!
@@ -2635,13 +2761,14 @@ Return ONLY the refined prompt without any explanation or additional text."""
 
         tts_results = []
         batch_size = 8
-        for i in range(0, len(tts_tasks), batch_size):
-            batch = tts_tasks[i:i+batch_size]
-            batch_results = await asyncio.gather(*batch)
-            tts_results.extend(batch_results)
-            logger.info(f"TTS 배치 완료: {i+1}~{min(i+len(batch), len(tts_tasks))}/{len(tts_tasks)}")
+        with self.metrics.stage('tts', scenes=len(tts_tasks)):
+            for i in range(0, len(tts_tasks), batch_size):
+                batch = tts_tasks[i:i+batch_size]
+                batch_results = await asyncio.gather(*batch)
+                tts_results.extend(batch_results)
+                logger.info(f"TTS 배치 완료: {i+1}~{min(i+len(batch), len(tts_tasks))}/{len(tts_tasks)}")
 
-        logger.info(f"TTS 생성 완료: {len(tts_tasks)}개")
+        logger.info(f"TTS 생성 완료: {len(tts_tasks)}개" + (f" (체크포인트 재사용 {reused['tts']}개)" if reused['tts'] else ""))
 
         # 오디오 길이와 타임스탬프를 scene_data에 저장
         for i, scene_data in enumerate(scene_data_list):
@@ -2661,6 +2788,13 @@ Return ONLY the refined prompt without any explanation or additional text."""
         logger.info(f"🎬 비디오 인코더: {self.video_codec} ({encoder_type})")
         logger.info(f"📊 총 {len(scene_data_list)}개 씬 처리 예정")
 
+        # 여러 씬을 병합할 때만 마스터링 (씬 비디오는 무음, 최종 병합에서 오디오 1회 인코딩)
+        self._scene_audio_muted = self.master_audio and combine and len(scene_data_list) > 1
+        if not self._scene_audio_muted and self._resolve_bgm_path():
+            logger.warning("⚠️ 배경음악/효과음은 오디오 마스터링(여러 씬 병합) 시에만 적용됩니다")
+        if self._scene_audio_muted:
+            logger.info("🎚️ 오디오 마스터링 모드: 씬 비디오는 무음으로 렌더링, 병합 시 AAC 1회 인코딩")
+
         # 시스템에 무리 안 가도록 워커 수 제한 (CPU 코어의 75%, 최소 2, 최대 3)
         cpu_count = multiprocessing.cpu_count()
         max_workers = max(2, min(3, (cpu_count * 3) // 4))
@@ -2669,8 +2803,32 @@ Return ONLY the refined prompt without any explanation or additional text."""
         scene_videos = []
         all_narrations = []
 
-        # 병렬 처리 함수
+        # 병렬 처리 함수 (씬별 렌더링 시간 기록)
+        # 다른 작업과 함께 실행될 때 호스트 전체 CPU/GPU/메모리를 넘지 않도록 씬마다 자원 리스
+        render_stage = 'render' if self.video_codec == 'libx264' else 'render_gpu'
+
+        # 씬 렌더링 체크포인트 키: TTS 입력 + 미디어 파일 + 렌더 설정
+        for scene_data in scene_data_list:
+            scene_data['render_key'] = fingerprint(
+                scene_data['tts_key'], file_signature(scene_data['media_path']), scene_data['media_type'],
+                self.width, self.height, self.add_subtitles, self._scene_audio_muted,
+            )
+
         def process_scene(idx, scene_data):
+            scene_num = scene_data['scene_num']
+            cached = self.checkpoint.lookup('render', scene_num, scene_data['render_key'])
+            if cached is not None:
+                reused['render'] += 1
+                logger.info(f"♻️ 씬 {scene_num}: 체크포인트의 렌더링 결과 사용")
+                return (scene_num, output_folder / f"scene_{scene_num:02d}.mp4", scene_data['clean_narration'])
+            with resource_lease(render_stage, cancel_check=self._cancel_check):
+                with self.metrics.stage('render', scene=scene_num):
+                    result = render_scene(idx, scene_data)
+            if result:
+                self.checkpoint.record('render', scene_num, scene_data['render_key'], outputs=[result[1]])
+            return result
+
+        def render_scene(idx, scene_data):
             scene_num = scene_data['scene_num']
             media_path = scene_data['media_path']
             media_type = scene_data['media_type']
@@ -2707,7 +2865,8 @@ Return ONLY the refined prompt without any explanation or additional text."""
                         clean_narration, audio_duration, word_timings
                     )
                 else:
-                    result = self._create_scene_video(scene_num, media_path, audio_path, video_path)
+                    result = self._create_scene_video(scene_num, media_path, audio_path, video_path,
+                                                      scene_data.get('audio_duration'))
 
             if result:
                 logger.info(f"{progress} ✅ 씬 {scene_num} 완료!")
@@ -2716,6 +2875,8 @@ Return ONLY the refined prompt without any explanation or additional text."""
 
         # 병렬 실행
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 취소 시 대기 중인 씬은 시작하지 않음 (실행 중인 씬은 ffmpeg 종료로 바로 끝남)
+            self.cancel_token.bind_executor(executor)
             futures = {executor.submit(process_scene, idx, scene_data): idx
                       for idx, scene_data in enumerate(scene_data_list, 1)}
 
@@ -2726,6 +2887,9 @@ Return ONLY the refined prompt without any explanation or additional text."""
                     scene_videos.append((scene_num, video_path))
                     all_narrations.append(narration)
 
+        if reused['render']:
+            logger.info(f"♻️ 체크포인트 재사용: 씬 렌더링 {reused['render']}개")
+
         # 씬 번호 순서로 정렬
         scene_videos.sort(key=lambda x: x[0])
         scene_videos = [path for _, path in scene_videos]
@@ -2756,13 +2920,57 @@ Return ONLY the refined prompt without any explanation or additional text."""
             final_path = self.folder_path / f"{safe_title}.mp4"
             logger.info(f"📝 최종 영상 제목: {title} → {safe_title}.mp4")
             logger.info(f"📂 최종 영상 위치: {final_path}")
-            return self._combine_videos(scene_videos, final_path, start_time)
+
+            # 병합 체크포인트: 같은 씬 결과 + 같은 오디오 설정으로 이미 병합했으면 그대로 반환
+            rendered = {Path(p) for p in scene_videos}
+            bgm_path = self._resolve_bgm_path() if self._scene_audio_muted else None
+            concat_key = fingerprint(
+                [(d['scene_num'], d['render_key'], d.get('sfx'))
+                 for d in sorted(scene_data_list, key=lambda d: d['scene_num'])
+                 if output_folder / f"scene_{d['scene_num']:02d}.mp4" in rendered],
+                self._scene_audio_muted, file_signature(bgm_path), self.bgm_volume,
+            )
+            if self.checkpoint.lookup('concat', final_path.name, concat_key) is not None:
+                logger.info(f"♻️ 체크포인트: 최종 영상이 이미 병합되어 있습니다 - {final_path}")
+                return final_path
+
+            if self._scene_audio_muted:
+                scene_tracks = [
+                    {
+                        'video_path': output_folder / f"scene_{d['scene_num']:02d}.mp4",
+                        'audio_path': d['audio_path'],
+                        'audio_duration': d.get('audio_duration', 0.0),
+                        'word_timings': d.get('word_timings', []),
+                        'sfx': d.get('sfx', []),
+                    }
+                    for d in sorted(scene_data_list, key=lambda d: d['scene_num'])
+                    if output_folder / f"scene_{d['scene_num']:02d}.mp4" in rendered
+                ]
+                combined = self._combine_videos_mastered(scene_tracks, final_path, start_time)
+            else:
+                combined = self._combine_videos(scene_videos, final_path, start_time)
+            if combined:
+                self.checkpoint.record('concat', final_path.name, concat_key, outputs=[combined])
+            return combined
         elif scene_videos:
             logger.info(f"씬 비디오 {len(scene_videos)}개 생성 완료 (결합 안 함)")
             return scene_videos[0]
 
         return None
 
+    async def _generate_tts_checkpointed(self, scene_num: int, narration: str, audio_path: Path,
+                                         tts_key: str, reused: Dict) -> tuple:
+        """체크포인트에 같은 입력으로 만든 음성이 있으면 재사용, 없으면 생성 후 기록"""
+        cached = self.checkpoint.lookup('tts', scene_num, tts_key)
+        if cached is not None:
+            reused['tts'] += 1
+            return cached['duration'], cached.get('word_timings', [])
+        duration, word_timings = await self._generate_tts(narration, audio_path)
+        if audio_path.exists():
+            self.checkpoint.record('tts', scene_num, tts_key, outputs=[audio_path],
+                                   duration=duration, word_timings=word_timings)
+        return duration, word_timings
+
     async def _generate_word_timestamps_async(self, audio_path: Path) -> list:
         """Whisper로 음성 분석하여 단어별 타임스탬프 생성 (async 버전)"""
         import concurrent.futures
@@ -2773,16 +2981,17 @@ Return ONLY the refined prompt without any explanation or additional text."""
 
                 logger.info(f"Whisper 분석 중: {Path(audio_path_str).name}")
 
-                # Whisper 모델 로드 (base 모델: 빠르고 충분히 정확함)
-                model = whisper.load_model("base")
+                with resource_lease('whisper', cancel_check=self._cancel_check):
+                    # Whisper 모델 로드 (base 모델: 빠르고 충분히 정확함)
+                    model = whisper.load_model("base")
 
-                # 음성 인식 실행 (세그먼트 단위로 타임스탬프 추출)
-                result = model.transcribe(
-                    audio_path_str,
-                    language="ko",
-                    verbose=False,
-                    fp16=False  # CPU에서 FP16 경고 방지
-                )
+                    # 음성 인식 실행 (세그먼트 단위로 타임스탬프 추출)
+                    result = model.transcribe(
+                        audio_path_str,
+                        language="ko",
+                        verbose=False,
+                        fp16=False  # CPU에서 FP16 경고 방지
+                    )
 
                 # 세그먼트별 타임스탬프를 단어 단위로 변환
                 word_segments = []
@@ -2831,16 +3040,17 @@ Return ONLY the refined prompt without any explanation or additional text."""
 
             logger.info(f"Whisper로 음성 분석 중: {audio_path.name}")
 
-            # Whisper 모델 로드 (base 모델: 빠르고 충분히 정확함)
-            model = whisper.load_model("base")
+            with resource_lease('whisper', cancel_check=self._cancel_check):
+                # Whisper 모델 로드 (base 모델: 빠르고 충분히 정확함)
+                model = whisper.load_model("base")
 
-            # 음성 인식 실행
-            result = model.transcribe(
-                str(audio_path),
-                language="ko",
-                verbose=False,
-                fp16=False  # CPU에서 FP16 경고 방지
-            )
+                # 음성 인식 실행
+                result = model.transcribe(
+                    str(audio_path),
+                    language="ko",
+                    verbose=False,
+                    fp16=False  # CPU에서 FP16 경고 방지
+                )
 
             # 세그먼트별 타임스탬프 추출 후 단어로 분할
             word_segments = []
@@ -3312,9 +3522,9 @@ Return ONLY the refined prompt without any explanation or additional text."""
 
 
 def main():
-    # Register signal handlers for graceful shutdown
-    signal.signal(signal.SIGTERM, signal_handler)
-    signal.signal(signal.SIGINT, signal_handler)
+    # SIGTERM/SIGINT → 취소 토큰 (ffmpeg 프로세스 그룹 종료 + 부분 출력 정리 후 종료, 두 번째 시그널은 즉시 종료)
+    cancel_token = CancellationToken()
+    cancel_token.install_signal_handlers()
 
     parser = argparse.ArgumentParser(description="story.json과 이미지로 영상 생성")
     parser.add_argument("--folder", "-f", required=True, help="story.json과 이미지가 있는 폴더 경로")
@@ -3336,6 +3546,16 @@ def main():
                        help="관리자 모드 (비용 로그 표시)")
     parser.add_argument("--job-id", "--task-id", default=None, dest="task_id",
                        help="Task ID (추적용)")
+    parser.add_argument("--no-audio-mastering", action="store_false", dest="master_audio",
+                       help="오디오 마스터링 끄기 (씬마다 AAC 인코딩하는 기존 방식)")
+    parser.add_argument("--bgm", default=None, dest="bgm_path",
+                       help="배경음악 파일 (기본: story.json의 bgm, 오디오 마스터링 시에만 적용)")
+    parser.add_argument("--bgm-volume", type=float, default=DEFAULT_BGM_VOLUME_DB,
+                       help=f"배경음악 음량 dB (기본: {DEFAULT_BGM_VOLUME_DB})")
+    parser.add_argument("--no-resume", action="store_false", dest="resume",
+                       help="체크포인트 무시하고 처음부터 다시 생성")
+    parser.add_argument("--profile", default=None, choices=PROFILE_MODES,
+                       help="프로파일링 (stages: 단계별 시간, sample: 스택 샘플링, cprofile: cProfile) - 결과는 최종 영상 옆에 저장")
 
     args = parser.parse_args()
 
@@ -3373,11 +3593,23 @@ def main():
         add_subtitles=args.add_subtitles,
         image_source=args.image_source,
         image_provider=args.image_provider,
-        is_admin=args.is_admin
+        is_admin=args.is_admin,
+        master_audio=args.master_audio,
+        bgm_path=args.bgm_path,
+        bgm_volume=args.bgm_volume,
+        cancel_token=cancel_token,
+        resume=args.resume,
+        profile=args.profile
     )
 
     # 비디오 생성 (항상 병합)
-    result = asyncio.run(creator.create_all_videos(combine=True))
+    try:
+        result = asyncio.run(creator.create_all_videos(combine=True))
+    except KeyboardInterrupt:
+        print("🛑 작업이 취소되었습니다.")
+        if args.task_id:
+            print(f"🆔 Task ID: {args.task_id}")
+        sys.exit(1)
 
     if result:
         print("=" * 70)
@@ -1,16 +1,25 @@
 """Create long-form story videos with multiple scenes."""
+from __future__ import annotations
 
+import functools
 import logging
 import os
 import json
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from openai import OpenAI
-from moviepy.editor import VideoFileClip, concatenate_videoclips, AudioFileClip, ImageClip
-import requests
-from PIL import Image, ImageOps
 import io
+
+from src.utils.lazy_import import lazy_module
+from src.utils.resource_broker import resource_lease
+from src.utils.stage_metrics import StageMetrics, METRICS_FILENAME
+from src.utils.profiling import JobProfiler, profile_mode
+
+# LLM / 이미지 제공자 패키지는 선택된 제공자를 처음 쓸 때 로드
+openai = lazy_module('openai')
+requests = lazy_module('requests')
+Image = lazy_module('PIL.Image')
+ImageOps = lazy_module('PIL.ImageOps')
 from tqdm import tqdm
 import time
 # 공통 유틸리티 모듈 import
@@ -23,6 +32,34 @@ from app.utils import (
 )
 
 
+def _profiled_entry(method):
+    """
+    프로파일링 모드(config["profile"] 또는 PIPELINE_PROFILE)면 진입점 전체를 프로파일러로 감싸고
+    최종 영상(없으면 프로젝트 폴더) 옆에 프로파일과 metrics.json 저장
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.profile_mode:
+            return method(self, *args, **kwargs)
+
+        profiler = JobProfiler(self.metrics, self.profile_mode).start()
+        result = None
+        try:
+            result = method(self, *args, **kwargs)
+            return result
+        finally:
+            result = result if isinstance(result, dict) else {}
+            final_video = Path(result['final_video']) if result.get('final_video') else None
+            project_dir = Path(result['project_dir']) if result.get('project_dir') else Path('logs')
+            self.metrics.log_summary()
+            try:
+                self.metrics.save(project_dir / METRICS_FILENAME)
+                profiler.write(final_video if final_video and final_video.exists() else project_dir)
+            except OSError as e:
+                self.logger.warning(f"⚠️ 메트릭 / 프로파일 저장 실패: {e}")
+    return wrapper
+
+
 class LongFormStoryCreator:
     """Create long-form story videos with multiple scenes and images."""
 
@@ -46,6 +83,10 @@ class LongFormStoryCreator:
         else:
             self.logger = logging.getLogger("AutoShortsEditor.LongFormCreator")
 
+        # 단계별 벽시계 / CPU 시간 (프로파일링 모드에서 프로젝트 폴더에 저장)
+        self.metrics = StageMetrics(job_id, logger=self.logger)
+        self.profile_mode = profile_mode(config.get("profile"))
+
         self.client = None
         self.hf_api_key = None
 
@@ -100,7 +141,7 @@ class LongFormStoryCreator:
             if not api_key:
                 raise ValueError("GROQ_API_KEY required when using Groq/Grok provider. Get free API key at: https://console.groq.com")
 
-            self.client = OpenAI(
+            self.client = openai.OpenAI(
                 api_key=api_key,
                 base_url="https://api.groq.com/openai/v1"
             )
@@ -113,7 +154,7 @@ class LongFormStoryCreator:
             self.openai_client = None
             openai_key = os.getenv("OPENAI_API_KEY")
             if openai_key:
-                self.openai_client = OpenAI(api_key=openai_key)
+                self.openai_client = openai.OpenAI(api_key=openai_key)
                 self.logger.info("OpenAI client also initialized for vision tasks")
 
             provider_label = self.llm_provider.capitalize()
@@ -125,7 +166,7 @@ class LongFormStoryCreator:
             ollama_config = llm_config.get("ollama", {})
             base_url = ollama_config.get("base_url", "http://localhost:11434/v1")
 
-            self.client = OpenAI(
+            self.client = openai.OpenAI(
                 api_key="ollama",  # Ollama doesn't need a real API key
                 base_url=base_url
             )
@@ -137,7 +178,7 @@ class LongFormStoryCreator:
             self.openai_client = None
             openai_key = os.getenv("OPENAI_API_KEY")
             if openai_key:
-                self.openai_client = OpenAI(api_key=openai_key)
+                self.openai_client = openai.OpenAI(api_key=openai_key)
                 self.logger.info("OpenAI client also initialized for vision tasks")
 
             self.logger.info(f"Using Ollama (LOCAL): {self.llm_model} at {base_url}")
@@ -149,7 +190,7 @@ class LongFormStoryCreator:
             if not api_key:
                 raise ValueError("OPENAI_API_KEY required when using OpenAI provider")
 
-            self.client = OpenAI(api_key=api_key)
+            self.client = openai.OpenAI(api_key=api_key)
             self.openai_client = self.client  # Same client for vision
             self.llm_provider = "openai"
             self.llm_model = llm_config.get("openai", {}).get("model", os.getenv("NARRATION_MODEL", "gpt-4o"))
@@ -206,6 +247,7 @@ class LongFormStoryCreator:
         # Save as last project for easy resume
         self._save_last_project(project_dir)
 
+    @_profiled_entry
     def resume_from_project(self, project_dir: Path, auto_confirm: bool = False) -> Dict[str, Any]:
         """Resume video creation from existing project folder.
 
@@ -442,6 +484,7 @@ class LongFormStoryCreator:
         print(f"[Step 2-C] Creating Videos for {num_scenes} Scenes... (병렬 처리)")
         print(f"{'='*70}")
         step_start = time.time()
+        stage = self.metrics.begin('videos')
 
         # Parallel video generation (handles both images and videos)
         scene_videos = self._create_scene_videos_parallel(
@@ -450,6 +493,7 @@ class LongFormStoryCreator:
             num_scenes
         )
 
+        self.metrics.end(stage)
         step_elapsed = time.time() - step_start
         print(f"\n[OK] Step 2-C 완료 - 소요시간: {self._format_elapsed_time(step_elapsed)}\n")
 
@@ -458,6 +502,7 @@ class LongFormStoryCreator:
         print(f"[Step 3] Combining All Scenes...")
         print(f"{'='*70}")
         step_start = time.time()
+        stage = self.metrics.begin('combine')
 
         from tqdm import tqdm
         with tqdm(total=1, desc="최종 비디오 결합", bar_format='{l_bar}{bar}| {elapsed}') as pbar:
@@ -466,6 +511,7 @@ class LongFormStoryCreator:
             self._combine_scenes(scene_videos, final_video_path)
             pbar.update(1)
 
+        self.metrics.end(stage)
         step_elapsed = time.time() - step_start
         print(f"[OK] Step 3 완료 - 소요시간: {self._format_elapsed_time(step_elapsed)}\n")
 
@@ -485,6 +531,7 @@ class LongFormStoryCreator:
             'num_scenes': num_scenes
         }
 
+    @_profiled_entry
     def create_from_title(
         self,
         title: str,
@@ -543,11 +590,13 @@ class LongFormStoryCreator:
         print(f"[Step 1] Generating & Evaluating Scenario...")
         print(f"{'='*70}")
         step_start = time.time()
+        stage = self.metrics.begin('story')
 
         with tqdm(total=1, desc="시나리오 생성 및 평가", bar_format='{l_bar}{bar}| {elapsed}') as pbar:
             story_data = self._generate_full_story(title, num_scenes, seed, target_minutes)
             pbar.update(1)
 
+        self.metrics.end(stage)
         step_elapsed = time.time() - step_start
         print(f"[OK] Step 1 완료 - 소요시간: {self._format_elapsed_time(step_elapsed)}")
         print(f"  (Total Elapsed: {self._format_elapsed_time(time.time() - total_start_time)})\n")
@@ -660,6 +709,7 @@ class LongFormStoryCreator:
             print(f"[Scenario Only Mode] 상세 나레이션 생성을 시작합니다...")
             print(f"{'='*70}")
             step_start = time.time()
+            stage = self.metrics.begin('narration')
 
             # Calculate target per scene
             target_length = int(target_minutes * 60 * 11)
@@ -705,6 +755,7 @@ class LongFormStoryCreator:
 
             print(f"[OK] 전체 나레이션 파일 저장: {combined_narration_path.name}")
 
+            self.metrics.end(stage)
             step_elapsed = time.time() - step_start
             print(f"\n[OK] 상세 나레이션 완료 - 소요시간: {self._format_elapsed_time(step_elapsed)}")
             print(f"  (Total Elapsed: {self._format_elapsed_time(time.time() - total_start_time)})")
@@ -736,6 +787,7 @@ class LongFormStoryCreator:
         print(f"[Step 2-A] Generating Images for {num_scenes} Scenes...")
         print(f"{'='*70}")
         step_start = time.time()
+        stage = self.metrics.begin('images')
 
         scene_images = []
         previous_image_path = None
@@ -805,6 +857,7 @@ class LongFormStoryCreator:
                         self.logger.warning(f"Failed to create thumbnail: {e}")
                         print(f"[Warning] Thumbnail creation failed: {e}\n")
 
+        self.metrics.end(stage)
         step_elapsed = time.time() - step_start
         print(f"\n[OK] Step 2-A 완료 - 소요시간: {self._format_elapsed_time(step_elapsed)}")
         print(f"  (Total Elapsed: {self._format_elapsed_time(time.time() - total_start_time)})")
@@ -900,6 +953,7 @@ class LongFormStoryCreator:
         print(f"[Step 2-B] Generating Detailed Narrations for {num_scenes} Scenes...")
         print(f"{'='*70}")
         step_start = time.time()
+        stage = self.metrics.begin('narration')
 
         # Calculate target per scene (use target_minutes from arguments)
         target_length = int(target_minutes * 60 * 11)
@@ -948,6 +1002,7 @@ class LongFormStoryCreator:
 
         print(f"[OK] 전체 나레이션 파일 저장: {combined_narration_path.name}")
 
+        self.metrics.end(stage)
         step_elapsed = time.time() - step_start
         print(f"\n[OK] Step 2-B 완료 - 소요시간: {self._format_elapsed_time(step_elapsed)}")
         print(f"  (Total Elapsed: {self._format_elapsed_time(time.time() - total_start_time)})")
@@ -967,6 +1022,7 @@ class LongFormStoryCreator:
             print(f"[Step 2-C] Creating Videos for {num_scenes} Scenes... (병렬 처리)")
         print(f"{'='*70}")
         step_start = time.time()
+        stage = self.metrics.begin('videos')
 
         # Parallel video generation
         scene_videos = self._create_scene_videos_parallel(
@@ -975,6 +1031,7 @@ class LongFormStoryCreator:
             num_scenes
         )
 
+        self.metrics.end(stage)
         step_elapsed = time.time() - step_start
         print(f"\n[OK] Step 2-C 완료 - 소요시간: {self._format_elapsed_time(step_elapsed)}")
         print(f"  (Total Elapsed: {self._format_elapsed_time(time.time() - total_start_time)})\n")
@@ -998,6 +1055,7 @@ class LongFormStoryCreator:
         print(f"[Step 3] Combining All Scenes...")
         print(f"{'='*70}")
         step_start = time.time()
+        stage = self.metrics.begin('combine')
 
         with tqdm(total=1, desc="최종 비디오 결합", bar_format='{l_bar}{bar}| {elapsed}') as pbar:
             final_video_path = self._combine_scenes(
@@ -1006,6 +1064,7 @@ class LongFormStoryCreator:
             )
             pbar.update(1)
 
+        self.metrics.end(stage)
         step_elapsed = time.time() - step_start
         print(f"\n[OK] Step 3 완료 - 소요시간: {self._format_elapsed_time(step_elapsed)}")
         print(f"  (Total Elapsed: {self._format_elapsed_time(time.time() - total_start_time)})\n")
@@ -1051,6 +1110,7 @@ class LongFormStoryCreator:
 
         return summary
 
+    @_profiled_entry
     def create_from_json(
         self,
         story_data: Dict[str, Any],
@@ -1129,6 +1189,7 @@ class LongFormStoryCreator:
         print(f"[Step 1] Generating Images...")
         print(f"{'='*70}")
         step_start = time.time()
+        stage = self.metrics.begin('images')
 
         # Determine image dimensions based on aspect ratio
         if aspect_ratio == "16:9":
@@ -1296,6 +1357,7 @@ class LongFormStoryCreator:
 
                     pbar.update(1)
 
+        self.metrics.end(stage)
         step_elapsed = time.time() - step_start
         print(f"\n[OK] Step 1 완료 - 소요시간: {self._format_elapsed_time(step_elapsed)}")
         print(f"  (Total Elapsed: {self._format_elapsed_time(time.time() - total_start_time)})")
@@ -2467,15 +2529,16 @@ Style: Cinematic, high quality, natural lighting, professional Korean drama aest
         scene_videos = [None] * len(scene_media)  # Pre-allocate list
         completed = 0
 
+        def create_scene(media_data):
+            # 동시에 도는 다른 작업과 호스트 CPU/메모리를 나눠 쓰도록 씬마다 자원 리스
+            with resource_lease('render'):
+                return self._create_single_scene_video(media_data, aspect_ratio)
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all tasks
             future_to_scene = {}
             for media_data in scene_media:
-                future = executor.submit(
-                    self._create_single_scene_video,
-                    media_data,
-                    aspect_ratio
-                )
+                future = executor.submit(create_scene, media_data)
                 future_to_scene[future] = media_data
 
             # Process completed tasks
@@ -2576,10 +2639,8 @@ Style: Cinematic, high quality, natural lighting, professional Korean drama aest
         audio_path = scene_dir / f"scene_{scene_num:02d}_audio.mp3"
         narrator.generate_speech(narration_text, audio_path)
 
-        # Get duration
-        audio_clip = AudioFileClip(str(audio_path))
-        duration = audio_clip.duration
-        audio_clip.close()
+        # Get duration (header parsing, no ffmpeg reader process)
+        duration = get_audio_duration(audio_path)
 
         self.logger.info(f"Scene {scene_num} narration generated ({duration:.1f}s)")
 
@@ -2596,6 +2657,8 @@ Style: Cinematic, high quality, natural lighting, professional Korean drama aest
         """Create video from scene image and audio with optional subtitles."""
 
         try:
+            from moviepy.editor import AudioFileClip, ImageClip
+
             # Load audio
             audio = AudioFileClip(str(audio_path))
             duration = audio.duration
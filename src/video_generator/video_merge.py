@@ -22,6 +22,13 @@ from app.utils import (
     create_korean_subtitle_style,
 )
 
+try:
+    from src.utils.resource_broker import resource_lease
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from src.utils.resource_broker import resource_lease
+from src.utils.text_regions import detect_text_bands
+
 # 워터마크 제거 기능
 try:
     import cv2
@@ -42,10 +49,19 @@ logger = logging.getLogger(__name__)
 
 
 def detect_watermark_region(frame, threshold=200):
-    """프레임에서 워터마크 영역 감지"""
+    """
+    프레임에서 워터마크 영역 감지
+
+    프레임 목록을 주면 밝기 threshold 대신 여러 프레임에 걸쳐 반복되는 글자 띠(자막 / 로고)를 찾음
+    (src.utils.text_regions.detect_text_bands)
+    """
     if not OPENCV_AVAILABLE:
         return []
 
+    if isinstance(frame, (list, tuple)):
+        gray = np.stack([cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) if f.ndim == 3 else f for f in frame])
+        return detect_text_bands(gray)
+
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
     _, thresh = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
 
@@ -141,12 +157,13 @@ def concatenate_videos(video_paths: List[Path], output_path: Path) -> Path:
         str(output_path)
     ]
 
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=600
-    )
+    with resource_lease('render'):
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=600
+        )
 
     if result.returncode != 0:
         logger.error(f"❌ FFmpeg stderr: {result.stderr}")
@@ -264,12 +281,13 @@ def align_videos_to_scenes(video_paths: list, scenes: list, whisper_segments: li
         str(output_path)
     ]
 
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=600
-    )
+    with resource_lease('render'):
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=600
+        )
 
     if result.returncode != 0:
         logger.error(f"❌ FFmpeg stderr: {result.stderr}")
@@ -354,12 +372,13 @@ def align_videos_to_segments(video_paths: list, segments: list, output_path: Pat
         str(output_path)
     ]
 
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=600
-    )
+    with resource_lease('render'):
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=600
+        )
 
     if result.returncode != 0:
         logger.error(f"❌ FFmpeg stderr: {result.stderr}")
@@ -381,7 +400,8 @@ def transcribe_audio_with_whisper(audio_path: Path, original_text: str) -> list:
         logger.info(f"🎧 Whisper로 타이밍 분석 중...")
 
         # Whisper로 세그먼트 추출 (공통 모듈 사용)
-        whisper_segments_objs = transcribe_audio_to_segments(str(audio_path), model_name="base", language="ko")
+        with resource_lease('whisper'):
+            whisper_segments_objs = transcribe_audio_to_segments(str(audio_path), model_name="base", language="ko")
 
         # SubtitleSegment 객체를 딕셔너리로 변환
         whisper_segments = []
@@ -777,12 +797,13 @@ def add_audio_to_video(video_path: Path, audio_path: Path, output_path: Path, su
                 logger.info(f"🎬 FFmpeg 명령어 실행 중...")
                 logger.info(f"   자막 필터: ass={ass_path_str}")
 
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=600
-                )
+                with resource_lease('render'):
+                    result = subprocess.run(
+                        cmd,
+                        capture_output=True,
+                        text=True,
+                        timeout=600
+                    )
 
                 logger.info(f"📤 FFmpeg 반환 코드: {result.returncode}")
                 if result.stdout:
@@ -846,12 +867,13 @@ def add_audio_to_video(video_path: Path, audio_path: Path, output_path: Path, su
 
         cmd.append(str(output_path))
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600
-        )
+        with resource_lease('render'):
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=600
+            )
 
     if result.returncode != 0:
         raise RuntimeError(f"오디오 추가 실패:\n{result.stderr}")
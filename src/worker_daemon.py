@@ -0,0 +1,390 @@
+"""
+상주 워커 데몬
+
+작업마다 새 Python 프로세스를 띄우면 edge_tts / PIL / numpy / cv2 / whisper import,
+인코더 감지(GPU 프로브), 모델 로드를 매번 다시 한다. 워커 데몬은 이것들을 메모리에
+올려 둔 채 큐 DB(src.utils.work_queue)에서 작업을 받아 같은 프로세스에서 실행한다.
+
+- 작업 = 기존 CLI 스크립트 + 인자. runpy로 __main__ 실행 → 스크립트 전역 상태는 작업마다 새로 만들고,
+  import된 라이브러리 / 인코더 세션 / 모델 캐시(src.utils.model_cache)만 재사용
+- 작업이 끝나면 argv / cwd / 환경변수 / sys.path / 로깅 핸들러 / 시그널 핸들러 / stdout 복원
+- N개 작업 처리 또는 메모리 임계치 초과 시 워커 종료 → supervisor가 새 워커 실행 (누수 정리)
+- 워커가 죽으면 리스 만료 후 작업이 다시 pending으로 돌아감 (max_attempts 범위 안에서)
+
+사용법:
+    python -m src.worker_daemon serve --max-jobs 20 --max-memory-mb 4096
+    python -m src.worker_daemon submit create_video_from_folder --wait -- --folder /path/to/project
+"""
+import argparse
+import gc
+import importlib
+import logging
+import os
+import runpy
+import signal
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.utils.work_queue import WorkQueue, Task, FINISHED_STATUSES, COMPLETED
+
+logger = logging.getLogger('worker_daemon')
+
+# 워커에서 실행할 수 있는 스크립트 (이름 → 프로젝트 루트 기준 경로)
+JOB_SCRIPTS: Dict[str, str] = {
+    'create_video_from_folder': 'src/video_generator/create_video_from_folder.py',
+    'video_merge': 'src/video_generator/video_merge.py',
+    'chinese_video_converter': 'src/video_generator/chinese_video_converter.py',
+    'image_crawler': 'src/image_crawler/image_crawler_working.py',
+}
+JOB_TYPE_PREFIX = 'job:'
+
+# 미리 import해 둘 무거운 모듈 (없으면 건너뜀)
+WARM_MODULES = ('numpy', 'PIL.Image', 'cv2', 'edge_tts', 'moviepy', 'whisper')
+
+DEFAULT_MAX_JOBS = 20
+DEFAULT_MAX_MEMORY_MB = 4096
+RECYCLE_EXIT_CODE = 75  # 워커가 재시작을 요청할 때의 종료 코드
+RESTART_DELAY = 5.0  # 워커 비정상 종료 후 재시작 대기 (초)
+
+
+def default_queue_db() -> str:
+    return os.environ.get('WORKER_QUEUE_DB') or str(PROJECT_ROOT / '.queue' / 'worker.db')
+
+
+def current_memory_mb() -> Optional[float]:
+    """현재 프로세스 RSS (MB). 측정할 수 없으면 None"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+# ----------------------------------------------------------------------
+# 작업 격리
+# ----------------------------------------------------------------------
+def _all_loggers() -> List[logging.Logger]:
+    loggers = [logging.getLogger()]
+    loggers.extend(l for l in logging.Logger.manager.loggerDict.values() if isinstance(l, logging.Logger))
+    return loggers
+
+
+@contextmanager
+def isolated_job(argv: List[str], cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None,
+                 log_file: Optional[str] = None):
+    """
+    작업 하나를 실행하는 동안 바꾼 프로세스 전역 상태를 끝나고 되돌림
+
+    log_file을 주면 fd 1/2를 파일로 돌려서 ffmpeg 같은 자식 프로세스 출력도 같이 남긴다.
+    """
+    saved_argv = sys.argv[:]
+    saved_path = sys.path[:]
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    saved_stdout, saved_stderr = sys.stdout, sys.stderr
+    saved_handlers = {l.name: list(l.handlers) for l in _all_loggers()}
+    root_level = logging.getLogger().level
+    in_main_thread = threading.current_thread() is threading.main_thread()
+    saved_signals = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)} if in_main_thread else {}
+
+    saved_fds = []
+    log_fp = None
+    if log_file:
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        log_fp = open(log_file, 'a', encoding='utf-8', buffering=1)
+        for stream, fd in ((sys.stdout, 1), (sys.stderr, 2)):
+            stream.flush()
+            saved_fds.append((fd, os.dup(fd)))
+            os.dup2(log_fp.fileno(), fd)
+        sys.stdout = sys.stderr = log_fp
+
+    try:
+        sys.argv = list(argv)
+        sys.path.insert(0, str(Path(argv[0]).resolve().parent))  # python script.py 와 같은 sys.path[0]
+        if cwd:
+            os.chdir(cwd)
+        if env:
+            os.environ.update({k: str(v) for k, v in env.items()})
+        yield
+    finally:
+        # 스크립트가 stdout을 TextIOWrapper로 다시 감쌌으면 (Windows UTF-8 처리) 버퍼를 닫지 않도록 분리
+        for current, saved in ((sys.stdout, saved_stdout), (sys.stderr, saved_stderr)):
+            try:
+                current.flush()
+                if current is not saved and getattr(current, 'buffer', None) is getattr(saved, 'buffer', object()):
+                    current.detach()
+            except (AttributeError, ValueError, OSError):
+                pass
+        sys.stdout, sys.stderr = saved_stdout, saved_stderr
+
+        for fd, saved_fd in saved_fds:
+            os.dup2(saved_fd, fd)
+            os.close(saved_fd)
+        if log_fp:
+            log_fp.close()
+
+        for l in _all_loggers():
+            before = saved_handlers.get(l.name, [])
+            for handler in l.handlers:
+                if handler not in before:
+                    try:
+                        handler.close()  # DatabaseLogHandler 등은 close에서 flush
+                    except Exception:
+                        pass
+            l.handlers[:] = before
+        logging.getLogger().setLevel(root_level)
+
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+        sys.path[:] = saved_path
+        sys.argv = saved_argv
+        for sig, handler in saved_signals.items():
+            signal.signal(sig, handler)
+        gc.collect()
+
+
+def run_script(script_path: Path, args: Iterable[str] = (), cwd: Optional[str] = None,
+               env: Optional[Dict[str, str]] = None, log_file: Optional[str] = None) -> int:
+    """CLI 스크립트를 현재 프로세스에서 __main__으로 실행하고 종료 코드를 반환"""
+    argv = [str(script_path), *[str(a) for a in args]]
+    with isolated_job(argv, cwd=cwd, env=env, log_file=log_file):
+        try:
+            runpy.run_path(str(script_path), run_name='__main__')
+            return 0
+        except SystemExit as e:
+            if e.code is None:
+                return 0
+            if isinstance(e.code, int):
+                return e.code
+            print(e.code, file=sys.stderr)
+            return 1
+        except KeyboardInterrupt:
+            return 130
+        except Exception:
+            traceback.print_exc()
+            return 1
+
+
+# ----------------------------------------------------------------------
+# 워커
+# ----------------------------------------------------------------------
+class JobWorker:
+    """큐 DB에서 작업을 받아 실행하는 상주 워커"""
+
+    def __init__(self, db_path: Optional[str] = None, scripts: Optional[Dict[str, str]] = None,
+                 max_jobs: int = DEFAULT_MAX_JOBS, max_memory_mb: Optional[float] = DEFAULT_MAX_MEMORY_MB):
+        self.scripts = {name: (PROJECT_ROOT / path).resolve() for name, path in (JOB_SCRIPTS if scripts is None else scripts).items()}
+        self.queue = WorkQueue(db_path or default_queue_db())
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.jobs_done = 0
+
+    @property
+    def task_types(self) -> List[str]:
+        return [JOB_TYPE_PREFIX + name for name in self.scripts]
+
+    def warm_up(self, modules: Iterable[str] = WARM_MODULES):
+        """무거운 모듈 import + 인코더 프로브를 미리 실행"""
+        started = time.time()
+        loaded = []
+        for name in modules:
+            try:
+                importlib.import_module(name)
+                loaded.append(name)
+            except Exception:
+                pass
+        try:
+            from src.utils.encoder_session import get_encoder_session
+            encoder, _ = get_encoder_session().select()
+            loaded.append(f'encoder={encoder}')
+        except Exception as e:
+            logger.warning(f"⚠️ 인코더 프로브 실패: {e}")
+        logger.info(f"🔥 워커 준비 완료 ({time.time() - started:.1f}초): {', '.join(loaded) or '-'}")
+
+    def run_task(self, task: Task) -> int:
+        name = task.type[len(JOB_TYPE_PREFIX):]
+        script = self.scripts.get(name)
+        if script is None:
+            self.queue.fail(task.id, f'Unknown job script: {name}')
+            return 1
+
+        payload = task.payload
+        logger.info(f"▶️ 작업 시작: {task.id} ({name} {' '.join(map(str, payload.get('args', [])))})")
+        started = time.time()
+        with self.queue.keep_alive(task.id):
+            code = run_script(script, payload.get('args', []), cwd=payload.get('cwd'),
+                              env=payload.get('env'), log_file=payload.get('log_file'))
+        self.jobs_done += 1
+
+        if code == 0:
+            self.queue.complete(task.id)
+        else:
+            self.queue.fail(task.id, f'Exit code: {code}', retry=False)
+        logger.info(f"{'✅' if code == 0 else '❌'} 작업 종료: {task.id} "
+                    f"(코드 {code}, {time.time() - started:.1f}초, 누적 {self.jobs_done}개)")
+        return code
+
+    def recycle_reason(self) -> Optional[str]:
+        if self.max_jobs and self.jobs_done >= self.max_jobs:
+            return f'{self.jobs_done}개 작업 처리'
+        memory = current_memory_mb()
+        if self.max_memory_mb and memory is not None and memory > self.max_memory_mb:
+            return f'메모리 {memory:.0f}MB > {self.max_memory_mb:.0f}MB'
+        return None
+
+    def serve(self, idle_timeout: Optional[float] = None) -> int:
+        """
+        작업 처리 루프
+
+        Returns:
+            RECYCLE_EXIT_CODE (재시작 필요) 또는 0 (idle_timeout 동안 작업 없음)
+        """
+        while True:
+            task = self.queue.wait_and_claim(self.task_types, timeout=idle_timeout)
+            if task is None:
+                logger.info(f"💤 {idle_timeout}초 동안 작업 없음 - 워커 종료")
+                return 0
+            self.run_task(task)
+
+            reason = self.recycle_reason()
+            if reason:
+                logger.info(f"♻️ 워커 재시작: {reason}")
+                return RECYCLE_EXIT_CODE
+
+
+def supervise(worker_args: List[str]) -> int:
+    """워커 프로세스를 실행하고, 재시작 요청이나 비정상 종료 시 새로 띄움"""
+    def _terminate(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, _terminate)
+    proc = None
+    try:
+        while True:
+            proc = subprocess.Popen([sys.executable, '-m', 'src.worker_daemon', 'worker', *worker_args],
+                                    cwd=str(PROJECT_ROOT))
+            logger.info(f"🚀 워커 시작: PID {proc.pid}")
+            code = proc.wait()
+            if code == RECYCLE_EXIT_CODE:
+                continue
+            if code == 0:
+                return 0
+            logger.warning(f"⚠️ 워커 비정상 종료 (코드 {code}) - {RESTART_DELAY:.0f}초 후 재시작")
+            time.sleep(RESTART_DELAY)
+    except (KeyboardInterrupt, SystemExit):
+        return 0
+    finally:
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+# ----------------------------------------------------------------------
+# 작업 등록 (클라이언트)
+# ----------------------------------------------------------------------
+def submit_job(script: str, args: Iterable[str] = (), db_path: Optional[str] = None, cwd: Optional[str] = None,
+               env: Optional[Dict[str, str]] = None, log_file: Optional[str] = None, priority: int = 0,
+               task_id: Optional[str] = None, max_attempts: int = 1) -> str:
+    """워커 큐에 작업 등록 후 task_id 반환"""
+    if script not in JOB_SCRIPTS:
+        raise ValueError(f"Unknown job script: {script} (available: {', '.join(JOB_SCRIPTS)})")
+    payload = {'args': [str(a) for a in args], 'cwd': cwd, 'env': env or {}, 'log_file': log_file}
+    queue = WorkQueue(db_path or default_queue_db())
+    try:
+        return queue.enqueue(JOB_TYPE_PREFIX + script, payload, task_id=task_id,
+                             priority=priority, max_attempts=max_attempts)
+    finally:
+        queue.close()
+
+
+def wait_for_job(task_id: str, db_path: Optional[str] = None, timeout: Optional[float] = None,
+                 interval: float = 0.5) -> Optional[Task]:
+    """작업이 끝날 때까지 대기 (시간 초과 시 None)"""
+    queue = WorkQueue(db_path or default_queue_db())
+    deadline = None if timeout is None else time.time() + timeout
+    try:
+        while True:
+            task = queue.get(task_id)
+            if task is None or task.status in FINISHED_STATUSES:
+                return task
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(interval)
+    finally:
+        queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='상주 워커 데몬')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('serve', '워커를 실행하고 재시작 관리'), ('worker', '워커 프로세스 1개 실행 (serve가 사용)')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('--db', default=None, help='큐 DB 경로 (기본: .queue/worker.db 또는 WORKER_QUEUE_DB)')
+        p.add_argument('--max-jobs', type=int, default=DEFAULT_MAX_JOBS, help='이 개수만큼 처리하면 워커 재시작')
+        p.add_argument('--max-memory-mb', type=float, default=DEFAULT_MAX_MEMORY_MB, help='RSS가 넘으면 워커 재시작')
+        p.add_argument('--idle-timeout', type=float, default=None, help='작업이 없으면 종료할 시간 (초)')
+
+    p = sub.add_parser('submit', help='작업 등록')
+    p.add_argument('script', choices=sorted(JOB_SCRIPTS), help='스크립트 인자는 -- 뒤에 지정')
+    p.add_argument('--db', default=None)
+    p.add_argument('--cwd', default=None)
+    p.add_argument('--log-file', default=None)
+    p.add_argument('--priority', type=int, default=0)
+    p.add_argument('--wait', action='store_true', help='작업이 끝날 때까지 대기')
+
+    argv = sys.argv[1:]
+    script_args: List[str] = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, script_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [worker %(process)d] %(message)s')
+
+    if args.command == 'submit':
+        task_id = submit_job(args.script, script_args, db_path=args.db, cwd=args.cwd or os.getcwd(),
+                             log_file=args.log_file, priority=args.priority)
+        print(task_id, flush=True)
+        if args.wait:
+            task = wait_for_job(task_id, db_path=args.db)
+            if task is None or task.status != COMPLETED:
+                print(f"{task.status if task else 'missing'}: {task.error if task else ''}", file=sys.stderr)
+                sys.exit(1)
+        return
+
+    worker_args = ['--max-jobs', str(args.max_jobs), '--max-memory-mb', str(args.max_memory_mb)]
+    if args.db:
+        worker_args += ['--db', args.db]
+    if args.idle_timeout:
+        worker_args += ['--idle-timeout', str(args.idle_timeout)]
+
+    if args.command == 'serve':
+        sys.exit(supervise(worker_args))
+
+    worker = JobWorker(db_path=args.db, max_jobs=args.max_jobs, max_memory_mb=args.max_memory_mb)
+    worker.warm_up()
+    sys.exit(worker.serve(idle_timeout=args.idle_timeout))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,7 @@ import sys
 from pathlib import Path
 
 from src.youtube.uploader import YouTubeUploader, VideoMetadata
+from src.utils.stage_metrics import StageMetrics, METRICS_FILENAME
 
 
 def cmd_auth(args):
@@ -73,13 +74,26 @@ def cmd_upload(args):
         print(json.dumps({"success": False, "error": "인증 실패"}))
         return 1
 
-    result = uploader.upload_video(
-        video_path=Path(args.video),
-        metadata=metadata,
-        thumbnail_path=Path(args.thumbnail) if args.thumbnail else None,
-        captions_path=Path(args.captions) if args.captions else None,
-        cancel_flag_path=Path(args.cancel_flag) if hasattr(args, 'cancel_flag') and args.cancel_flag else None,
-    )
+    # 업로드 소요 시간은 렌더링 메트릭과 같은 파일에 누적
+    video_path = Path(args.video)
+    metrics = StageMetrics()
+    with metrics.stage('upload') as record:
+        if video_path.exists():
+            record['size_mb'] = round(video_path.stat().st_size / 1024 / 1024, 1)
+        result = uploader.upload_video(
+            video_path=video_path,
+            metadata=metadata,
+            thumbnail_path=Path(args.thumbnail) if args.thumbnail else None,
+            captions_path=Path(args.captions) if args.captions else None,
+            cancel_flag_path=Path(args.cancel_flag) if hasattr(args, 'cancel_flag') and args.cancel_flag else None,
+        )
+        record['status'] = 'ok' if result.success else 'error'
+
+    metrics_dir = video_path.parent / "generated_videos"
+    try:
+        metrics.save((metrics_dir if metrics_dir.is_dir() else video_path.parent) / METRICS_FILENAME)
+    except OSError as e:
+        print(f"[WARN] 메트릭 저장 실패: {e}")
 
     if result.success:
         # ✅ 고정댓글 추가 (pinned_comment 우선, 없으면 description 사용)